@@ -0,0 +1,123 @@
+"""
+Micro-benchmark for decoding a JSON table query rowset into a pandas DataFrame.
+
+This compares the row oriented decode that was used before 4.14.0, where every cell
+is cast with `Row.cast_values` and every column is built by looping over the `Row`
+objects, against the columnar decode used by
+`synapseclient.models.mixins.table_components._rowset_to_pandas_df`, where each page
+is transposed into per-column lists once and each column is cast in a single pass.
+
+No connection to Synapse is required, the rowset pages are generated locally.
+
+Usage:
+    python docs/scripts/rowsetToDataFrameBenchmark.py
+"""
+
+import copy
+import gc
+import random
+from collections import OrderedDict
+from time import perf_counter
+
+import pandas as pd
+
+from synapseclient import Synapse
+from synapseclient.models.mixins.table_components import (
+    _rowset_to_pandas_df,
+    row_labels_from_rows,
+)
+from synapseclient.models.table_components import QueryResultBundle, Row, RowSet
+
+ROW_COUNTS = [10_000, 100_000, 1_000_000]
+REPEATS = 3
+HEADERS = [
+    {"name": "name", "columnType": "STRING"},
+    {"name": "count", "columnType": "INTEGER"},
+    {"name": "score", "columnType": "DOUBLE"},
+    {"name": "flag", "columnType": "BOOLEAN"},
+    {"name": "created", "columnType": "DATE"},
+    {"name": "tags", "columnType": "STRING_LIST"},
+]
+
+
+def generate_rowset_json(row_count: int) -> dict:
+    """Generate the JSON for a QueryResultBundle with `row_count` rows."""
+    rows = [
+        {
+            "rowId": i,
+            "versionNumber": 1,
+            "values": [
+                f"name_{i}",
+                str(i),
+                str(random.random()),  # nosec
+                "true" if i % 2 else "false",
+                str(1_600_000_000_000 + i),
+                '["a", "b"]',
+            ],
+        }
+        for i in range(row_count)
+    ]
+    return {
+        "queryResult": {
+            "queryResults": {"tableId": "syn123", "headers": HEADERS, "rows": rows}
+        }
+    }
+
+
+def row_oriented_to_pandas_df(data: dict) -> "pd.DataFrame":
+    """The row oriented decode used before the columnar path was introduced."""
+    rowset = data["queryResult"]["queryResults"]
+    headers = rowset["headers"]
+    rows = [
+        Row.fill_from_dict(RowSet.cast_row(row=row, headers=headers))
+        for row in rowset["rows"]
+    ]
+    rownames = row_labels_from_rows(rows)
+    series = OrderedDict()
+    for i, header in enumerate(headers):
+        series[header["name"]] = pd.Series(
+            name=header["name"], data=[row.values[i] for row in rows], index=rownames
+        )
+    return pd.DataFrame(data=series)
+
+
+def columnar_to_pandas_df(data: dict, syn: Synapse) -> "pd.DataFrame":
+    """The columnar decode used by the `models` query path."""
+    bundle = QueryResultBundle.fill_from_dict(data)
+    return _rowset_to_pandas_df(query_result_bundle=bundle, synapse_client=syn)
+
+
+def time_decode(decode, data: dict) -> tuple:
+    """Return the best time out of `REPEATS` runs of `decode` and its result."""
+    best = None
+    for _ in range(REPEATS):
+        # Decoding mutates the JSON in place, so every run gets a fresh copy
+        data_copy = copy.deepcopy(data)
+        gc.collect()
+        before = perf_counter()
+        result = decode(data_copy)
+        elapsed = perf_counter() - before
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def execute_benchmark() -> None:
+    """Time both implementations for every row count in `ROW_COUNTS`."""
+    syn = Synapse(skip_checks=True, silent=True)
+    for row_count in ROW_COUNTS:
+        data = generate_rowset_json(row_count)
+        row_oriented_time, expected = time_decode(row_oriented_to_pandas_df, data)
+        columnar_time, actual = time_decode(
+            lambda data_copy: columnar_to_pandas_df(data_copy, syn), data
+        )
+
+        pd.testing.assert_frame_equal(expected, actual)
+        print(
+            f"{row_count} rows: row oriented {row_oriented_time:.2f}s, "
+            f"columnar {columnar_time:.2f}s, "
+            f"speedup {row_oriented_time / columnar_time:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    execute_benchmark()
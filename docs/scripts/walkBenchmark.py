@@ -0,0 +1,102 @@
+"""
+Micro-benchmark for walking a Synapse container with many folders.
+
+This compares the sequential `StorableContainer.walk_async`, which lists one folder at
+a time, against the concurrent walk used when `max_concurrency` is set, which lists
+up to `max_concurrency` folders at the same time. `get_children` is replaced by a mock
+that sleeps for `LATENCY_SECONDS` per folder to simulate the round trip to Synapse.
+
+No connection to Synapse is required, the folder tree is generated locally.
+
+Usage:
+    python docs/scripts/walkBenchmark.py
+"""
+
+import asyncio
+from time import perf_counter
+from unittest.mock import patch
+
+from synapseclient import Synapse
+from synapseclient.core.constants.concrete_types import FILE_ENTITY, FOLDER_ENTITY
+from synapseclient.models import Folder
+
+LATENCY_SECONDS = 0.02
+# Sub-folders per folder, the tree has 1 + 8 + 64 + 512 folders
+BRANCHING = 8
+DEPTH = 3
+FILES_PER_FOLDER = 5
+CONCURRENCY_LEVELS = [None, 10, 50, 100]
+
+
+def generate_tree() -> dict:
+    """Generate a dictionary of folder ID to the children of the folder."""
+    tree = {}
+    next_id = 2
+    level = ["syn1"]
+    for depth in range(DEPTH + 1):
+        next_level = []
+        for folder_id in level:
+            children = []
+            if depth < DEPTH:
+                for i in range(BRANCHING):
+                    children.append(
+                        {
+                            "id": f"syn{next_id}",
+                            "name": f"folder_{i}",
+                            "type": FOLDER_ENTITY,
+                        }
+                    )
+                    next_level.append(f"syn{next_id}")
+                    next_id += 1
+            for i in range(FILES_PER_FOLDER):
+                children.append(
+                    {"id": f"syn{next_id}", "name": f"file_{i}", "type": FILE_ENTITY}
+                )
+                next_id += 1
+            tree[folder_id] = children
+        level = next_level
+    return tree
+
+
+async def execute_benchmark() -> None:
+    """Time the walk for every concurrency level in `CONCURRENCY_LEVELS`."""
+    syn = Synapse(skip_checks=True, silent=True)
+    tree = generate_tree()
+
+    async def mock_get_children(parent: str, **kwargs):
+        await asyncio.sleep(LATENCY_SECONDS)
+        for child in tree[parent]:
+            yield child
+
+    expected = None
+    with (
+        patch(
+            "synapseclient.models.mixins.storable_container.get_children",
+            side_effect=mock_get_children,
+        ),
+        patch(
+            "synapseclient.api.entity_services.get_children",
+            side_effect=mock_get_children,
+        ),
+    ):
+        for max_concurrency in CONCURRENCY_LEVELS:
+            before = perf_counter()
+            results = [
+                result
+                async for result in Folder(id="syn1", name="root").walk_async(
+                    max_concurrency=max_concurrency, synapse_client=syn
+                )
+            ]
+            elapsed = perf_counter() - before
+
+            expected = expected or results
+            assert results == expected
+            label = "sequential" if max_concurrency is None else max_concurrency
+            print(
+                f"{len(tree)} folders, max_concurrency {label}: {elapsed:.2f}s "
+                f"({len(tree) / elapsed:.0f} folders/s)"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(execute_benchmark())
@@ -71,10 +71,12 @@ for key, value in updated_status.submission_annotations.items():
 
 print("\n=== 2. Batch updating submission statuses ===")
 
-# First, get all submission statuses that need updating
+# First, get all submission statuses that need updating. With limit=None every
+# page of statuses is fetched, several pages at a time.
 statuses_to_update = SubmissionStatus.get_all_submission_statuses(
     evaluation_id=EVALUATION_ID,
     status="RECEIVED",  # Get submissions that haven't been scored yet
+    limit=None,
 )
 
 print(f"Found {len(statuses_to_update)} submissions to batch update")
@@ -90,7 +92,8 @@ if statuses_to_update:
             "validator": ["automated_system"],
         }
 
-    # Perform batch update
+    # Perform batch update. Lists longer than 500 statuses are sent as a series
+    # of batches automatically.
     batch_response = SubmissionStatus.batch_update_submission_statuses(
         evaluation_id=EVALUATION_ID,
         statuses=statuses_to_update,
@@ -7,7 +7,7 @@ from .agent_services import (
     start_session,
     update_session,
 )
-from .annotations import set_annotations, set_annotations_async
+from .annotations import get_annotations_async, set_annotations, set_annotations_async
 from .api_client import rest_get_paginated_async, rest_post_paginated_async
 from .configuration_services import (
     get_client_authenticated_s3_profile,
@@ -57,6 +57,7 @@ from .entity_services import (
     get_entity_acl_list,
     get_entity_acl_with_benefactor,
     get_entity_benefactor,
+    get_entity_headers,
     get_entity_path,
     get_entity_permissions,
     get_entity_provenance,
@@ -68,10 +69,12 @@ from .entity_services import (
     post_entity_acl,
     put_entity,
     put_entity_acl,
+    put_entity_generated_by,
     set_entity_permissions,
     set_entity_provenance,
     update_activity,
     update_entity_acl,
+    walk_children,
 )
 from .evaluation_services import (
     batch_update_submission_statuses,
@@ -103,6 +106,7 @@ from .file_services import (
     get_file_handle_for_download,
     get_file_handle_for_download_async,
     get_file_handle_presigned_url,
+    get_file_handles_for_download_async,
     post_external_filehandle,
     post_external_object_store_filehandle,
     post_external_s3_file_handle,
@@ -201,6 +205,7 @@ from .wiki_services import (
 
 __all__ = [
     # annotations
+    "get_annotations_async",
     "set_annotations",
     "set_annotations_async",
     "get_entity_id_bundle2",
@@ -221,6 +226,7 @@ __all__ = [
     "AddPartResponse",
     "get_file_handle_for_download_async",
     "get_file_handle_for_download",
+    "get_file_handles_for_download_async",
     # entity_services
     "get_entity",
     "put_entity",
@@ -233,10 +239,12 @@ __all__ = [
     "get_entity_benefactor",
     "get_entity_permissions",
     "get_entity_type",
+    "get_entity_headers",
     "get_upload_destination",
     "get_upload_destination_location",
     "create_access_requirements_if_none",
     "delete_entity_generated_by",
+    "put_entity_generated_by",
     "get_entity_path",
     "get_entities_by_md5",
     "get_entity_provenance",
@@ -252,6 +260,7 @@ __all__ = [
     "set_entity_permissions",
     "update_entity_acl",
     "is_synapse_id",
+    "walk_children",
     # web_services
     "open_entity_in_browser",
     # configuration_services
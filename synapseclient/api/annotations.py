@@ -5,7 +5,7 @@ annotations that are not cleanly provided by the synapseclient library.
 
 import json
 from dataclasses import asdict
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from synapseclient.annotations import _convert_to_annotations_list
 
@@ -14,6 +14,35 @@ if TYPE_CHECKING:
     from synapseclient.models import Annotations
 
 
+async def get_annotations_async(
+    entity_id: str,
+    version_number: Optional[int] = None,
+    *,
+    synapse_client: Optional["Synapse"] = None,
+) -> Dict[str, Any]:
+    """Call to synapse and get the annotations, with the current etag, of an
+    entity.
+
+    Arguments:
+        entity_id: The ID of the entity.
+        version_number: The version of the entity to get the annotations of. The
+            current version is used if this is not set.
+        synapse_client: If not passed in and caching was not disabled by
+                `Synapse.allow_client_caching(False)` this will use the last created
+                instance from the Synapse class constructor.
+
+    Returns: The annotations of the entity in the format the Synapse REST API uses.
+    """
+    from synapseclient import Synapse
+
+    uri = (
+        f"/entity/{entity_id}/version/{version_number}/annotations2"
+        if version_number is not None
+        else f"/entity/{entity_id}/annotations2"
+    )
+    return await Synapse.get_client(synapse_client=synapse_client).rest_get_async(uri)
+
+
 def set_annotations(
     annotations: "Annotations",
     *,
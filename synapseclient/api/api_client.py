@@ -1,6 +1,17 @@
+import asyncio
+import collections
 import json
 import sys
-from typing import TYPE_CHECKING, Any, AsyncGenerator, Dict, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 
 import httpx
 
@@ -70,6 +81,7 @@ async def rest_get_paginated_async(
     retry_policy: Optional[Dict[str, Any]] = None,
     requests_session_async_synapse: Optional[httpx.AsyncClient] = None,
     *,
+    concurrent: bool = False,
     synapse_client: Optional["Synapse"] = None,
     **kwargs,
 ) -> AsyncGenerator[Dict[str, str], None]:
@@ -85,6 +97,9 @@ async def rest_get_paginated_async(
         retry_policy: Optional retry settings.
         requests_session_async_synapse: Optional async HTTPX client session.
         kwargs: Additional keyword arguments for the request.
+        concurrent: If True, the pages after the first are requested concurrently
+            with at most `synapse_client.max_threads * 2` requests in flight. Items
+            are still yielded in order. Only use this for offset/limit endpoints.
         synapse_client: Optional Synapse client instance for authentication.
     Yields:
         Individual items from each page of the response.
@@ -99,6 +114,21 @@ async def rest_get_paginated_async(
         retry_policy = {}
 
     client = Synapse.get_client(synapse_client=synapse_client)
+    if concurrent:
+        async for result in _rest_get_paginated_concurrently_async(
+            uri=uri,
+            limit=limit,
+            offset=offset,
+            client=client,
+            endpoint=endpoint,
+            headers=headers,
+            retry_policy=retry_policy,
+            requests_session_async_synapse=requests_session_async_synapse,
+            **kwargs,
+        ):
+            yield result
+        return
+
     prev_num_results = sys.maxsize
     while prev_num_results > 0:
         paginated_uri = utils._limit_and_offset(uri, limit=limit, offset=offset)
@@ -116,3 +146,81 @@ async def rest_get_paginated_async(
         for result in results:
             offset += 1
             yield result
+
+
+async def _rest_get_paginated_concurrently_async(
+    uri: str,
+    limit: int,
+    offset: int,
+    client: "Synapse",
+    **kwargs,
+) -> AsyncGenerator[Dict[str, str], None]:
+    """
+    Yield items from a paginated GET endpoint, requesting the pages after the first
+    concurrently.
+
+    A window of at most `client.max_threads * 2` pages is requested ahead of the
+    page being yielded. When the first page reports `totalNumberOfResults` no page
+    past the total is requested, otherwise pages are requested until one comes
+    back empty. A page that is shorter than `limit` before the end of the results
+    was truncated by the service, so the items it is missing are requested before
+    moving on to the next page.
+    """
+    from synapseclient.core import utils
+
+    total: Optional[int] = None
+
+    async def get_page(page_offset: int) -> List[Dict[str, str]]:
+        nonlocal total
+        response = await client.rest_get_async(
+            uri=utils._limit_and_offset(uri, limit=limit, offset=page_offset),
+            **kwargs,
+        )
+        if "totalNumberOfResults" in response:
+            total = response["totalNumberOfResults"]
+        return response["results"] if "results" in response else response["children"]
+
+    async def complete_page(
+        page_offset: int, results: List[Dict[str, str]]
+    ) -> AsyncGenerator[Dict[str, str], None]:
+        for result in results:
+            yield result
+        page_end = (
+            page_offset + limit if total is None else min(page_offset + limit, total)
+        )
+        gap_offset = page_offset + len(results)
+        while gap_offset < page_end:
+            missing = (await get_page(gap_offset))[: page_end - gap_offset]
+            if not missing:
+                return
+            for result in missing:
+                yield result
+            gap_offset += len(missing)
+
+    results = await get_page(offset)
+    if not results:
+        return
+    async for result in complete_page(offset, results):
+        yield result
+
+    window = max(client.max_threads * 2, 1)
+    pending: Deque[Tuple[int, asyncio.Task]] = collections.deque()
+    next_offset = offset + limit
+    try:
+        while True:
+            while len(pending) < window and (total is None or next_offset < total):
+                pending.append(
+                    (next_offset, asyncio.create_task(get_page(next_offset)))
+                )
+                next_offset += limit
+            if not pending:
+                return
+            page_offset, task = pending.popleft()
+            results = await task
+            if not results:
+                return
+            async for result in complete_page(page_offset, results):
+                yield result
+    finally:
+        for _, task in pending:
+            task.cancel()
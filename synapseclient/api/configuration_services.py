@@ -9,6 +9,7 @@ from typing import Dict
 
 from synapseclient.core.constants import config_file_constants
 from synapseclient.core.pool_provider import DEFAULT_NUM_THREADS
+from synapseclient.core.transfer_scheduler import TransferPolicy
 
 
 @functools.lru_cache()
@@ -125,12 +126,22 @@ def get_transfer_config(
     Raises:
         ValueError: Invalid max_threads value. Should be equal or less than 16.
         ValueError: Invalid use_boto_sts value. Should be true or false.
+        ValueError: Invalid transfer_policy value. Should be one of fifo,
+            shortest_first or fair.
+        ValueError: Invalid bandwidth limit value. Should be a positive integer.
 
     Returns:
         The transfer profile
     """
     # defaults
-    transfer_config = {"max_threads": DEFAULT_NUM_THREADS, "use_boto_sts": False}
+    transfer_config = {
+        "max_threads": DEFAULT_NUM_THREADS,
+        "use_boto_sts": False,
+        "transfer_policy": TransferPolicy.FIFO,
+        "max_upload_bytes_per_second": None,
+        "max_download_bytes_per_second": None,
+        "max_bytes_per_second": None,
+    }
 
     for k, v in get_config_section_dict(
         section_name="transfer", config_path=config_path
@@ -153,4 +164,26 @@ def get_transfer_config(
 
                 transfer_config["use_boto_sts"] = "true" == lower_v
 
+            elif k == "transfer_policy":
+                try:
+                    transfer_config["transfer_policy"] = TransferPolicy(v.lower())
+                except ValueError as cause:
+                    raise ValueError(
+                        f"Invalid transfer.transfer_policy config setting {v}"
+                    ) from cause
+
+            elif k in (
+                "max_upload_bytes_per_second",
+                "max_download_bytes_per_second",
+                "max_bytes_per_second",
+            ):
+                try:
+                    transfer_config[k] = int(v)
+                except ValueError as cause:
+                    raise ValueError(
+                        f"Invalid transfer.{k} config setting {v}"
+                    ) from cause
+                if transfer_config[k] <= 0:
+                    raise ValueError(f"Invalid transfer.{k} config setting {v}")
+
     return transfer_config
@@ -2,11 +2,24 @@
 <https://rest-docs.synapse.org/rest/#org.sagebionetworks.repo.web.controller.EntityController>
 """
 
+import asyncio
 import json
+import os
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, AsyncGenerator, Dict, List, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from synapseclient.api.api_client import rest_post_paginated_async
+from synapseclient.core.constants.limits import MAX_ENTITY_HEADERS_PER_REQUEST
 from synapseclient.core.exceptions import SynapseHTTPError
 from synapseclient.core.utils import get_synid_and_version
 
@@ -263,6 +276,34 @@ async def create_access_requirements_if_none(
         )
 
 
+async def put_entity_generated_by(
+    entity_id: str,
+    activity_id: str,
+    *,
+    synapse_client: Optional["Synapse"] = None,
+) -> Dict[str, Any]:
+    """
+    Link an entity to an Activity that is already stored in Synapse, without
+    updating the Activity.
+
+    Arguments:
+        entity_id: The ID of the entity.
+        activity_id: The ID of the Activity that generated the entity.
+        synapse_client: If not passed in and caching was not disabled by
+                `Synapse.allow_client_caching(False)` this will use the last created
+                instance from the Synapse class constructor.
+
+    Returns:
+        The Activity object as a dictionary.
+    """
+    from synapseclient import Synapse
+
+    client = Synapse.get_client(synapse_client=synapse_client)
+    return await client.rest_put_async(
+        uri=f"/entity/{entity_id}/generatedBy?generatedBy={activity_id}"
+    )
+
+
 async def delete_entity_generated_by(
     entity_id: str,
     *,
@@ -813,6 +854,54 @@ async def get_entity_type(
     return entity_header.fill_from_dict(response)
 
 
+async def get_entity_headers(
+    entity_ids: List[str],
+    *,
+    synapse_client: Optional["Synapse"] = None,
+) -> List[EntityHeader]:
+    """
+    Get the EntityHeaders of many entities, requesting up to
+    `MAX_ENTITY_HEADERS_PER_REQUEST` entities per request.
+
+    Entities that do not exist or that the caller cannot read are left out of the
+    result rather than raising an exception.
+
+    Implements:
+    <https://rest-docs.synapse.org/rest/POST/entity/header.html>
+
+    Arguments:
+        entity_ids: The IDs of the entities.
+        synapse_client: If not passed in and caching was not disabled by
+                `Synapse.allow_client_caching(False)` this will use the last created
+                instance from the Synapse class constructor.
+
+    Returns:
+        The EntityHeaders of the entities that were found.
+    """
+    from synapseclient import Synapse
+
+    client = Synapse.get_client(synapse_client=synapse_client)
+
+    headers = []
+    for start in range(0, len(entity_ids), MAX_ENTITY_HEADERS_PER_REQUEST):
+        body = {
+            "references": [
+                {"targetId": entity_id}
+                for entity_id in entity_ids[
+                    start : start + MAX_ENTITY_HEADERS_PER_REQUEST
+                ]
+            ]
+        }
+        response = await client.rest_post_async(
+            uri="/entity/header", body=json.dumps(body)
+        )
+        headers.extend(
+            EntityHeader().fill_from_dict(result)
+            for result in response.get("results", [])
+        )
+    return headers
+
+
 async def get_entities_by_md5(
     md5: str,
     *,
@@ -961,17 +1050,16 @@ async def set_entity_provenance(
         asyncio.run(main())
         ```
     """
-    from synapseclient import Synapse
-
-    client = Synapse.get_client(synapse_client=synapse_client)
-
     if "id" in activity:
         saved_activity = await update_activity(activity, synapse_client=synapse_client)
     else:
         saved_activity = await create_activity(activity, synapse_client=synapse_client)
 
-    uri = f"/entity/{entity_id}/generatedBy?generatedBy={saved_activity['id']}"
-    return await client.rest_put_async(uri=uri)
+    return await put_entity_generated_by(
+        entity_id=entity_id,
+        activity_id=saved_activity["id"],
+        synapse_client=synapse_client,
+    )
 
 
 async def delete_entity_provenance(
@@ -1261,6 +1349,179 @@ async def get_children(
         yield child
 
 
+async def walk_children(
+    parent: str,
+    parent_path: str,
+    include_types: List[str],
+    recursive: bool = True,
+    max_concurrency: Optional[int] = None,
+    ordered: bool = True,
+    dir_sort_key: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    *,
+    synapse_client: Optional["Synapse"] = None,
+) -> AsyncGenerator[
+    Tuple[Tuple[str, str], List[Dict[str, Any]], List[Dict[str, Any]]], None
+]:
+    """
+    Traverse the hierarchy of entities stored within a container, listing the
+    children of many containers concurrently. Has the same output as `os.walk()`.
+
+    The sub-containers of a container are listed once the container has been
+    yielded, with at most `max_concurrency` containers being listed at the same
+    time, so the walk does not read further ahead of the consumer than the
+    sub-containers of the containers it has already received. When `ordered` is
+    False, at most `2 * max_concurrency` listings are being listed or waiting to
+    be yielded at the same time.
+
+    Arguments:
+        parent: The ID of the Synapse container (folder or project) to walk.
+        parent_path: The directory path of the container. The paths of the
+            sub-containers are joined onto it.
+        include_types: List of entity types to include (e.g., ["folder", "file"]).
+            The "folder" type must be included to traverse the hierarchy.
+        recursive: Whether to traverse the sub-containers.
+        max_concurrency: The maximum number of containers listed at the same time.
+            Defaults to `max_threads` of the Synapse client.
+        ordered: If True, the results are yielded in the same top-down, depth-first
+            order as a sequential walk. If False, the results are yielded as soon as
+            each container has been listed, a container is still always yielded
+            before its sub-containers.
+        dir_sort_key: An optional key used to sort the sub-containers of each
+            container before they are walked in order.
+        synapse_client: If not passed in and caching was not disabled by
+                `Synapse.allow_client_caching(False)` this will use the last created
+                instance from the Synapse class constructor.
+
+    Yields:
+        Tuples of `((path, container ID), containers, non-containers)` where the
+            containers and non-containers are lists of the children dictionaries.
+
+    Example: Walking a project concurrently
+        Print the number of files in every folder of a project:
+
+        ```python
+        import asyncio
+        from synapseclient import Synapse
+        from synapseclient.api import walk_children
+
+        syn = Synapse()
+        syn.login()
+
+        async def main():
+            async for (path, folder_id), folders, files in walk_children(
+                parent="syn123456",
+                parent_path="My Project",
+                include_types=["folder", "file"],
+                max_concurrency=20,
+            ):
+                print(f"{path} ({folder_id}): {len(files)} files")
+
+        asyncio.run(main())
+        ```
+    """
+    from synapseclient import Synapse
+    from synapseclient.core.constants.concrete_types import (
+        FOLDER_ENTITY,
+        PROJECT_ENTITY,
+    )
+
+    client = Synapse.get_client(synapse_client=synapse_client)
+    concurrency = max(max_concurrency or client.max_threads, 1)
+    semaphore = asyncio.Semaphore(concurrency)
+    # Every listing that has been started, used to cancel them if the walk stops
+    started_listings = set()
+    # When walking out of order, every listing puts its result on this queue as
+    # soon as it completes
+    completed_listings = asyncio.Queue()
+    # When walking out of order, a listing takes a slot before it starts and the
+    # slot is only given back once its result has been yielded
+    unyielded_slots = asyncio.Semaphore(2 * concurrency)
+
+    def start_listing(container_id: str, path: str) -> "asyncio.Task":
+        task = asyncio.create_task(list_container(container_id=container_id, path=path))
+        started_listings.add(task)
+        task.add_done_callback(started_listings.discard)
+        return task
+
+    def start_sub_listings(
+        sub_containers: List[Dict[str, Any]], path: str
+    ) -> List["asyncio.Task"]:
+        return [
+            start_listing(
+                container_id=child["id"], path=os.path.join(path, child["name"])
+            )
+            for child in sub_containers
+        ]
+
+    async def list_container(container_id: str, path: str) -> Optional[
+        Tuple[
+            Tuple[str, str],
+            List[Dict[str, Any]],
+            List[Dict[str, Any]],
+            List[Dict[str, Any]],
+        ]
+    ]:
+        if not ordered:
+            await unyielded_slots.acquire()
+        try:
+            async with semaphore:
+                children = [
+                    child
+                    async for child in get_children(
+                        parent=container_id,
+                        include_types=include_types,
+                        synapse_client=client,
+                    )
+                ]
+        except Exception as ex:
+            if ordered:
+                raise
+            completed_listings.put_nowait(ex)
+            return None
+        dirs, nondirs = [], []
+        for child in children:
+            if child.get("type") in (FOLDER_ENTITY, PROJECT_ENTITY):
+                dirs.append(child)
+            else:
+                nondirs.append(child)
+        sub_containers = []
+        if recursive:
+            sub_containers = sorted(dirs, key=dir_sort_key) if dir_sort_key else dirs
+        result = ((path, container_id), dirs, nondirs, sub_containers)
+        if not ordered:
+            completed_listings.put_nowait(result)
+        return result
+
+    try:
+        # The sub-containers are only listed once their container is yielded, so
+        # the walk never reads further ahead than the consumer allows
+        if ordered:
+            # The listings to yield next, in reverse order
+            waiting = [start_listing(container_id=parent, path=parent_path)]
+            while waiting:
+                dirpath, dirs, nondirs, sub_containers = await waiting.pop()
+                waiting.extend(
+                    reversed(start_sub_listings(sub_containers, path=dirpath[0]))
+                )
+                yield dirpath, dirs, nondirs
+        else:
+            start_listing(container_id=parent, path=parent_path)
+            outstanding = 1
+            while outstanding:
+                result = await completed_listings.get()
+                unyielded_slots.release()
+                if isinstance(result, Exception):
+                    raise result
+                dirpath, dirs, nondirs, sub_containers = result
+                outstanding += (
+                    len(start_sub_listings(sub_containers, path=dirpath[0])) - 1
+                )
+                yield dirpath, dirs, nondirs
+    finally:
+        for task in list(started_listings):
+            task.cancel()
+
+
 async def get_child(
     entity_name: str,
     parent_id: Optional[str] = None,
@@ -11,6 +11,7 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 from synapseclient.api.entity_services import get_upload_destination
 from synapseclient.core import utils
 from synapseclient.core.constants import concrete_types
+from synapseclient.core.constants.limits import MAX_FILE_HANDLE_PER_BATCH_REQUEST
 from synapseclient.core.exceptions import (
     SynapseAuthorizationError,
     SynapseFileNotFoundError,
@@ -484,6 +485,57 @@ async def get_file_handle_for_download_async(
     return result
 
 
+async def get_file_handles_for_download_async(
+    requested_files: List[Dict[str, str]],
+    include_pre_signed_urls: bool = True,
+    *,
+    synapse_client: Optional["Synapse"] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Gets the URLs and the metadata of many file handles, requesting up to
+    `MAX_FILE_HANDLE_PER_BATCH_REQUEST` file handles per request.
+
+    Unlike `get_file_handle_for_download_async` no exception is raised for a file
+    handle that could not be retrieved, its result will contain a `failureCode`.
+
+    Arguments:
+        requested_files: The file handles to retrieve, matching
+            <https://rest-docs.synapse.org/rest/org/sagebionetworks/repo/model/file/FileHandleAssociation.html>
+            with the keys `fileHandleId`, `associateObjectId` and
+            `associateObjectType`.
+        include_pre_signed_urls: If False only the metadata of the file handles is
+            retrieved, which is enough to compare them to local files.
+        synapse_client: If not passed in and caching was not disabled by
+                `Synapse.allow_client_caching(False)` this will use the last created
+                instance from the Synapse class constructor.
+
+    Returns:
+        A dictionary of file handle ID to a dictionary with keys: fileHandle,
+            fileHandleId, preSignedURL and failureCode
+    """
+    from synapseclient import Synapse
+
+    client = Synapse.get_client(synapse_client=synapse_client)
+
+    results = {}
+    for start in range(0, len(requested_files), MAX_FILE_HANDLE_PER_BATCH_REQUEST):
+        body = {
+            "includeFileHandles": True,
+            "includePreSignedURLs": include_pre_signed_urls,
+            "requestedFiles": requested_files[
+                start : start + MAX_FILE_HANDLE_PER_BATCH_REQUEST
+            ],
+        }
+        response = await client.rest_post_async(
+            "/fileHandle/batch",
+            body=json.dumps(body),
+            endpoint=client.fileHandleEndpoint,
+        )
+        for result in response["requestedFiles"]:
+            results[result["fileHandleId"]] = result
+    return results
+
+
 def get_file_handle_for_download(
     file_handle_id: str,
     synapse_id: str,
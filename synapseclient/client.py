@@ -64,6 +64,7 @@ from synapseclient.core import (
     utils,
 )
 from synapseclient.core.async_utils import wrap_async_to_sync
+from synapseclient.core.bandwidth_limiter import BandwidthLimiter
 from synapseclient.core.constants import concrete_types, config_file_constants
 from synapseclient.core.credentials import UserLoginArgs, get_default_credential_chain
 from synapseclient.core.download import (
@@ -102,6 +103,7 @@ from synapseclient.core.retry import (
     with_retry,
     with_retry_time_based_async,
 )
+from synapseclient.core.transfer_scheduler import TransferPolicy, TransferScheduler
 from synapseclient.core.upload.multipart_upload_async import (
     multipart_upload_file_async,
     multipart_upload_string_async,
@@ -465,8 +467,14 @@ class Synapse(object):
         self.max_threads = transfer_config["max_threads"]
         self._thread_executor = {}
         self._process_executor = {}
-        self._parallel_file_transfer_semaphore = {}
+        self._transfer_scheduler = {}
         self.use_boto_sts_transfers = transfer_config["use_boto_sts"]
+        self.transfer_policy = transfer_config["transfer_policy"]
+        self._bandwidth_limiter = BandwidthLimiter(
+            upload_bytes_per_second=transfer_config["max_upload_bytes_per_second"],
+            download_bytes_per_second=transfer_config["max_download_bytes_per_second"],
+            combined_bytes_per_second=transfer_config["max_bytes_per_second"],
+        )
         self._parts_transfered_counter = 0
         if cache_client and Synapse._allow_client_caching:
             Synapse.set_client(synapse_client=self)
@@ -561,44 +569,54 @@ class Synapse(object):
         asyncio_atexit.register(close_pool)
         return self._thread_executor[asyncio_event_loop]
 
-    def _get_parallel_file_transfer_semaphore(
+    def _get_transfer_scheduler(
         self, asyncio_event_loop: asyncio.AbstractEventLoop
-    ) -> asyncio.Semaphore:
+    ) -> TransferScheduler:
         """
-        Retrieve the semaphore for the Synapse client. Or create a new one if it does
-        not exist. This semaphore is used to limit the number of files that can actively
-        enter the uploading/downloading process.
+        Retrieve the transfer scheduler for the Synapse client. Or create a new one if
+        it does not exist. The scheduler is shared by uploads, downloads, copies and
+        migrations to limit the number of files that can actively enter the
+        transferring process, and the number of parts of those files that are
+        transferred at the same time.
 
         This is expected to be called from within an AsyncIO loop.
 
-        By default the number of files that can enter the "uploading" state will be
+        By default the number of files that can enter the "transferring" state will be
         limited to 2 * max_threads. This is to ensure that the files that are entering
-        into the "uploading" state will have priority to finish. Additionally, it means
-        that there should be a good spread of files getting up to the "uploading"
-        state, entering the "uploading" state, and finishing the "uploading" state.
+        into the "transferring" state will have priority to finish. Additionally, it
+        means that there should be a good spread of files getting up to the
+        "transferring" state, entering the "transferring" state, and finishing the
+        "transferring" state.
 
         If we break these states down into large components they would look like:
-        - Before "uploading" state: HTTP rest calls to retrieve what data Synapse has
-        - Entering "uploading" state: MD5 calculation and HTTP rest calls to determine
-          how/where to upload a file to.
-        - During "uploading" state: Uploading the file to a storage provider.
-        - After "uploading" state: HTTP rest calls to finalize the upload.
+        - Before "transferring" state: HTTP rest calls to retrieve what data Synapse has
+        - Entering "transferring" state: MD5 calculation and HTTP rest calls to
+          determine how/where to transfer a file to.
+        - During "transferring" state: Moving the file to or from a storage provider.
+        - After "transferring" state: HTTP rest calls to finalize the transfer.
 
-        This has not yet been applied to parallel file downloads. That will take place
-        later on.
+        Pending files are started in the order of `transfer_policy`, and the
+        max_threads part slots are shared evenly between the files that are in the
+        "transferring" state.
         """
         if (
-            hasattr(self, "_parallel_file_transfer_semaphore")
-            and asyncio_event_loop in self._parallel_file_transfer_semaphore
-            and self._parallel_file_transfer_semaphore[asyncio_event_loop] is not None
+            hasattr(self, "_transfer_scheduler")
+            and asyncio_event_loop in self._transfer_scheduler
+            and self._transfer_scheduler[asyncio_event_loop] is not None
         ):
-            return self._parallel_file_transfer_semaphore[asyncio_event_loop]
+            return self._transfer_scheduler[asyncio_event_loop]
 
-        self._parallel_file_transfer_semaphore.update(
-            {asyncio_event_loop: asyncio.Semaphore(max(self.max_threads * 2, 1))}
+        self._transfer_scheduler.update(
+            {
+                asyncio_event_loop: TransferScheduler(
+                    max_active_transfers=self.max_threads * 2,
+                    max_active_parts=self.max_threads,
+                    policy=self.transfer_policy,
+                )
+            }
         )
 
-        return self._parallel_file_transfer_semaphore[asyncio_event_loop]
+        return self._transfer_scheduler[asyncio_event_loop]
 
     # initialize logging
     def _init_logger(self):
@@ -843,6 +861,47 @@ class Synapse(object):
     def max_threads(self, value: int):
         self._max_threads = min(max(value, 1), MAX_THREADS_CAP)
 
+    @property
+    def transfer_policy(self) -> TransferPolicy:
+        return self._transfer_policy
+
+    @transfer_policy.setter
+    def transfer_policy(self, value: Union[str, TransferPolicy]):
+        self._transfer_policy = TransferPolicy(value)
+        # Pending transfers are picked with the new policy from now on
+        for scheduler in getattr(self, "_transfer_scheduler", {}).values():
+            scheduler.policy = self._transfer_policy
+
+    @property
+    def max_upload_bytes_per_second(self) -> Optional[int]:
+        """The limit on the bandwidth used by uploads, or None for no limit. It can be
+        changed while files are being uploaded."""
+        return self._bandwidth_limiter.upload.bytes_per_second
+
+    @max_upload_bytes_per_second.setter
+    def max_upload_bytes_per_second(self, value: Optional[int]):
+        self._bandwidth_limiter.upload.bytes_per_second = value
+
+    @property
+    def max_download_bytes_per_second(self) -> Optional[int]:
+        """The limit on the bandwidth used by downloads, or None for no limit. It can
+        be changed while files are being downloaded."""
+        return self._bandwidth_limiter.download.bytes_per_second
+
+    @max_download_bytes_per_second.setter
+    def max_download_bytes_per_second(self, value: Optional[int]):
+        self._bandwidth_limiter.download.bytes_per_second = value
+
+    @property
+    def max_bytes_per_second(self) -> Optional[int]:
+        """The limit on the bandwidth used by uploads and downloads combined, or None
+        for no limit. It can be changed while files are being transferred."""
+        return self._bandwidth_limiter.combined.bytes_per_second
+
+    @max_bytes_per_second.setter
+    def max_bytes_per_second(self, value: Optional[int]):
+        self._bandwidth_limiter.combined.bytes_per_second = value
+
     @property
     def username(self) -> Union[str, None]:
         # for backwards compatability when username was a part of the Synapse object and not in credentials
@@ -7111,14 +7170,20 @@ class Synapse(object):
                 SubmissionStatus(**bundle["submissionStatus"]),
             )
 
-    def _GET_paginated(self, uri: str, limit: int = 20, offset: int = 0):
+    def _GET_paginated(
+        self, uri: str, limit: int = 20, offset: int = 0, concurrent: bool = False
+    ):
         """
         Get paginated results
 
         Arguments:
-            uri:     A URI that returns paginated results
-            limit:   How many records should be returned per request
-            offset:  At what record offset from the first should iteration start
+            uri:        A URI that returns paginated results
+            limit:      How many records should be returned per request
+            offset:     At what record offset from the first should iteration start
+            concurrent: If True, the pages after the first are requested concurrently
+                        with at most `max_threads` requests in flight. Results are
+                        still yielded in order. Only use this for offset/limit
+                        endpoints.
 
         Returns:
             A generator over some paginated results
@@ -7126,6 +7191,10 @@ class Synapse(object):
         The limit parameter is set at 20 by default. Using a larger limit results in fewer calls to the service, but if
         responses are large enough to be a burden on the service they may be truncated.
         """
+        if concurrent:
+            yield from self._GET_paginated_concurrently(uri, limit=limit, offset=offset)
+            return
+
         prev_num_results = sys.maxsize
         while prev_num_results > 0:
             uri = utils._limit_and_offset(uri, limit=limit, offset=offset)
@@ -7137,6 +7206,78 @@ class Synapse(object):
                 offset += 1
                 yield result
 
+    def _GET_paginated_concurrently(self, uri: str, limit: int, offset: int):
+        """
+        Get paginated results, requesting the pages after the first concurrently.
+
+        A window of at most `max_threads` pages is requested ahead of the page being
+        yielded. When the first page reports `totalNumberOfResults` no page past the
+        total is requested, otherwise pages are requested until one comes back
+        empty. A page that is shorter than `limit` before the end of the results was
+        truncated by the service, so the items it is missing are requested before
+        moving on to the next page.
+
+        Arguments:
+            uri:    A URI that returns paginated results
+            limit:  How many records should be returned per request
+            offset: At what record offset from the first should iteration start
+
+        Returns:
+            A generator over some paginated results
+        """
+        total = None
+
+        def get_page(page_offset):
+            nonlocal total
+            page = self.restGET(
+                utils._limit_and_offset(uri, limit=limit, offset=page_offset)
+            )
+            if "totalNumberOfResults" in page:
+                total = page["totalNumberOfResults"]
+            return page["results"] if "results" in page else page["children"]
+
+        def complete_page(page_offset, results):
+            yield from results
+            page_end = page_offset + limit
+            if total is not None:
+                page_end = min(page_end, total)
+            gap_offset = page_offset + len(results)
+            while gap_offset < page_end:
+                missing = get_page(gap_offset)[: page_end - gap_offset]
+                if not missing:
+                    return
+                yield from missing
+                gap_offset += len(missing)
+
+        results = get_page(offset)
+        if not results:
+            return
+        yield from complete_page(offset, results)
+
+        window = max(self.max_threads, 1)
+        pending = collections.deque()
+        next_offset = offset + limit
+        with get_executor(thread_count=window) as executor:
+            try:
+                while True:
+                    while len(pending) < window and (
+                        total is None or next_offset < total
+                    ):
+                        pending.append(
+                            (next_offset, executor.submit(get_page, next_offset))
+                        )
+                        next_offset += limit
+                    if not pending:
+                        return
+                    page_offset, future = pending.popleft()
+                    results = future.result()
+                    if not results:
+                        return
+                    yield from complete_page(page_offset, results)
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
     def _POST_paginated(self, uri: str, body, **kwargs):
         """
         Get paginated results
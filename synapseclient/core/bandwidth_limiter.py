@@ -0,0 +1,113 @@
+"""
+Token bucket bandwidth limiting for file transfers.
+
+The parts of uploads and downloads are transferred on the threads of the client's
+thread pool, so the limiter blocks the calling thread rather than the event loop.
+The limits are read every time bytes are consumed, which means they can be changed
+while a transfer is running.
+"""
+
+import threading
+import time
+from typing import Optional
+
+# The longest a thread sleeps before checking the limit again, so that a changed
+# limit is picked up by threads that are already waiting.
+MAX_WAIT_SECONDS = 1.0
+
+
+class TokenBucket:
+    """A thread safe token bucket where one token is one byte.
+
+    The bucket holds at most one second worth of tokens. A request for more tokens
+    than are available is granted as long as the bucket is not empty and leaves the
+    bucket in debt, which later requests wait to be paid back. This lets a single
+    part that is larger than one second of bandwidth through, while keeping the
+    average rate at the limit.
+
+    Attributes:
+        bytes_per_second: The limit in bytes per second, or None for no limit.
+    """
+
+    def __init__(self, bytes_per_second: Optional[int] = None) -> None:
+        self._lock = threading.Lock()
+        self._bytes_per_second = None
+        self._tokens = 0.0
+        self._last_refill = time.monotonic()
+        self.bytes_per_second = bytes_per_second
+
+    @property
+    def bytes_per_second(self) -> Optional[int]:
+        return self._bytes_per_second
+
+    @bytes_per_second.setter
+    def bytes_per_second(self, value: Optional[int]) -> None:
+        if value is not None and value <= 0:
+            raise ValueError(
+                f"The bandwidth limit must be a positive number of bytes per second or None, got {value}"
+            )
+        with self._lock:
+            self._bytes_per_second = value
+            self._tokens = float(value) if value else 0.0
+            self._last_refill = time.monotonic()
+
+    def _refill(self, bytes_per_second: int) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            float(bytes_per_second),
+            self._tokens + (now - self._last_refill) * bytes_per_second,
+        )
+        self._last_refill = now
+
+    def consume(self, byte_count: int) -> None:
+        """Block the calling thread until `byte_count` bytes may be transferred.
+
+        Arguments:
+            byte_count: The number of bytes about to be transferred.
+        """
+        while True:
+            with self._lock:
+                bytes_per_second = self._bytes_per_second
+                if not bytes_per_second:
+                    return
+                self._refill(bytes_per_second)
+                if self._tokens >= 0:
+                    self._tokens -= byte_count
+                    return
+                wait_seconds = -self._tokens / bytes_per_second
+            time.sleep(min(wait_seconds, MAX_WAIT_SECONDS))
+
+
+class BandwidthLimiter:
+    """Limit the bandwidth used by the uploads and downloads of a Synapse client.
+
+    Uploads and downloads each have their own limit, and both also count towards a
+    combined limit. Every limit is optional.
+
+    Attributes:
+        upload: The token bucket for uploads.
+        download: The token bucket for downloads.
+        combined: The token bucket shared by uploads and downloads.
+    """
+
+    def __init__(
+        self,
+        upload_bytes_per_second: Optional[int] = None,
+        download_bytes_per_second: Optional[int] = None,
+        combined_bytes_per_second: Optional[int] = None,
+    ) -> None:
+        self.upload = TokenBucket(upload_bytes_per_second)
+        self.download = TokenBucket(download_bytes_per_second)
+        self.combined = TokenBucket(combined_bytes_per_second)
+
+    def consume_upload(self, byte_count: int) -> None:
+        """Block the calling thread until `byte_count` bytes may be uploaded."""
+        if byte_count:
+            self.combined.consume(byte_count)
+            self.upload.consume(byte_count)
+
+    def consume_download(self, byte_count: int) -> None:
+        """Block the calling thread until `byte_count` bytes may be downloaded."""
+        if byte_count:
+            self.combined.consume(byte_count)
+            self.download.consume(byte_count)
@@ -1,3 +1,7 @@
 MAX_FILE_HANDLE_PER_COPY_REQUEST = (
     100  # The maximum number of FilesHandles that can be copied in a single request
 )
+MAX_FILE_HANDLE_PER_BATCH_REQUEST = 100  # The maximum number of FileHandles requested in a single /fileHandle/batch request
+MAX_ENTITY_HEADERS_PER_REQUEST = (
+    100  # The maximum number of references sent in a single /entity/header request
+)
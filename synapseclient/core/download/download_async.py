@@ -39,6 +39,8 @@ if TYPE_CHECKING:
 # constants
 MiB: int = 2**20
 SYNAPSE_DEFAULT_DOWNLOAD_PART_SIZE: int = 8 * MiB
+# The size of the pieces a part is read in, the bandwidth limit is applied per piece
+STREAM_READ_SIZE: int = 1 * MiB
 ISO_AWS_STR_FORMAT: str = "%Y%m%dT%H%M%SZ"
 
 tracer = get_tracer()
@@ -429,15 +431,16 @@ class _MultithreadedDownloader:
         chunk_number: int,
     ) -> Tuple[int, int]:
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            self._syn._get_thread_pool_executor(asyncio_event_loop=loop),
-            self._stream_and_write_chunk,
-            session,
-            url_provider,
-            start,
-            end,
-            chunk_number,
-        )
+        async with self._syn._get_transfer_scheduler(asyncio_event_loop=loop).part():
+            return await loop.run_in_executor(
+                self._syn._get_thread_pool_executor(asyncio_event_loop=loop),
+                self._stream_and_write_chunk,
+                session,
+                url_provider,
+                start,
+                end,
+                chunk_number,
+            )
 
     def _check_for_abort(self, start: int, end: int) -> None:
         """Check if the download has been aborted and raise an exception if so."""
@@ -552,7 +555,12 @@ def _execute_stream_and_write_chunk(
         _raise_for_status_httpx(
             response=response, logger=request._syn.logger, read_response_content=False
         )
-        data = response.read()
+        # Read the body in pieces so the bandwidth limit is applied while the chunk
+        # is being streamed rather than once it has been received.
+        data = bytearray()
+        for piece in response.iter_bytes(chunk_size=STREAM_READ_SIZE):
+            request._syn._bandwidth_limiter.consume_download(len(piece))
+            data += piece
         data_length = len(data)
         request._write_chunk(
             request=request._download_request,
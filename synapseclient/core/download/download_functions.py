@@ -10,7 +10,7 @@ import sys
 import time
 import urllib.parse as urllib_urlparse
 import urllib.request as urllib_request
-from typing import TYPE_CHECKING, Dict, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
 
 from opentelemetry import trace
 from tqdm import tqdm
@@ -225,6 +225,7 @@ async def download_file_entity_model(
     file: "File",
     if_collision: str,
     submission: str,
+    file_handle_result: Optional[Dict[str, Any]] = None,
     *,
     synapse_client: Optional["Synapse"] = None,
 ) -> None:
@@ -244,6 +245,8 @@ async def download_file_entity_model(
             - `keep.both`
 
         submission:       Access associated files through a submission rather than through an entity.
+        file_handle_result: An optional result for the file handle of the file that
+            was already retrieved with `get_file_handles_for_download_async`.
         synapse_client: If not passed in and caching was not disabled by
                 `Synapse.allow_client_caching(False)` this will use the last created
                 instance from the Synapse class constructor.
@@ -344,13 +347,17 @@ async def download_file_entity_model(
         # it won't be "downloaded" and, instead, downloadPath will just point to '~/someLocalFile.txt'
         # _downloadFileHandle may also return None to indicate that the download failed
         with logging_redirect_tqdm(loggers=[client.logger]):
-            download_path = await download_by_file_handle(
-                file_handle_id=file.data_file_handle_id,
-                synapse_id=object_id,
-                entity_type=object_type,
-                destination=download_path,
-                synapse_client=client,
-            )
+            async with client._get_transfer_scheduler(
+                asyncio_event_loop=asyncio.get_running_loop()
+            ).transfer(size=file_size or None, group=file.parent_id):
+                download_path = await download_by_file_handle(
+                    file_handle_id=file.data_file_handle_id,
+                    synapse_id=object_id,
+                    entity_type=object_type,
+                    destination=download_path,
+                    file_handle_result=file_handle_result,
+                    synapse_client=client,
+                )
 
         if download_path is None or not os.path.exists(download_path):
             return
@@ -370,6 +377,7 @@ async def download_by_file_handle(
     entity_type: str,
     destination: str,
     retries: int = 5,
+    file_handle_result: Optional[Dict[str, Any]] = None,
     *,
     synapse_client: Optional["Synapse"] = None,
 ) -> str:
@@ -382,6 +390,9 @@ async def download_by_file_handle(
         entity_type: The type of the Synapse object that uses the FileHandle e.g. "FileEntity"
         destination: The destination on local file system
         retries: The Number of download retries attempted before throwing an exception.
+        file_handle_result: An optional result for the file handle that was already
+            retrieved with `get_file_handles_for_download_async`. It is only used for
+            the first attempt, retries retrieve the file handle again.
         synapse_client: If not passed in and caching was not disabled by
                 `Synapse.allow_client_caching(False)` this will use the last created
                 instance from the Synapse class constructor.
@@ -479,14 +490,13 @@ async def download_by_file_handle(
 
     while retries > 0:
         try:
-            file_handle_result: Dict[str, str] = (
-                await get_file_handle_for_download_async(
+            if not file_handle_result or file_handle_result.get("failureCode"):
+                file_handle_result = await get_file_handle_for_download_async(
                     file_handle_id=file_handle_id,
                     synapse_id=synapse_id,
                     entity_type=entity_type,
                     synapse_client=syn,
                 )
-            )
             file_handle = file_handle_result["fileHandle"]
             concrete_type = file_handle["concreteType"]
             storage_location_id = file_handle.get("storageLocationId")
@@ -658,6 +668,8 @@ async def download_by_file_handle(
             return downloaded_path
 
         except Exception as ex:
+            # The file handle is retrieved again on the next attempt
+            file_handle_result = None
             if not is_retryable_download_error(ex):
                 close_download_progress_bar()
                 raise
@@ -1057,6 +1069,8 @@ def download_from_url(
                         for _, chunk in enumerate(
                             response.iter_content(FILE_BUFFER_SIZE)
                         ):
+                            # Wait until the bandwidth limit allows this chunk
+                            client._bandwidth_limiter.consume_download(len(chunk))
                             fd.write(chunk)
                             sig.update(chunk)
 
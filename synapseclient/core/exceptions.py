@@ -3,7 +3,7 @@ as handling error cases for HTTP requests."""
 
 import logging
 import re
-from typing import Union
+from typing import List, Union
 
 import httpx
 import requests
@@ -61,6 +61,18 @@ class SynapseProvenanceError(SynapseError):
     """Incorrect usage of provenance objects."""
 
 
+class SynapseManifestValidationError(SynapseError, ValueError):
+    """Raised when a manifest fails validation. Every problem that was found is
+    listed in the `errors` attribute."""
+
+    def __init__(self, errors: List[str]) -> None:
+        self.errors = list(errors)
+        super().__init__(
+            f"The manifest has {len(self.errors)} error(s):\n"
+            + "\n".join(f"  - {error}" for error in self.errors)
+        )
+
+
 class SynapseHTTPError(SynapseError, requests.exceptions.HTTPError):
     """Wraps recognized HTTP errors.  See
     `HTTPError <http://docs.python-requests.org/en/latest/api/?highlight=exceptions#requests.exceptions.HTTPError>`_
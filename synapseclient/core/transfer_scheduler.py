@@ -0,0 +1,268 @@
+"""
+A client wide scheduler for file transfers.
+
+Uploads, downloads, copies and migrations ask the scheduler for a transfer slot before
+a file enters the transferring state, and for a part slot before each part of that
+file is sent to the thread pool. Because the scheduler sees every pending transfer it
+can order them by a configurable policy, and because it sees every pending part it can
+share the part level concurrency between the files that are being transferred instead
+of letting the file that was started first occupy every thread.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import AsyncIterator, Deque, Dict, Hashable, List, Optional, Tuple
+
+
+class TransferPolicy(str, Enum):
+    """The order in which pending file transfers are started.
+
+    Attributes:
+        FIFO: Transfers are started in the order they were requested.
+        SHORTEST_FIRST: The smallest pending transfer is started first. Transfers of
+            an unknown size are started after the transfers of a known size. A
+            steady supply of small transfers can hold back large ones for as long
+            as it lasts, so this policy is opt-in.
+        FAIR: Pending transfers are grouped by their container and the groups take
+            turns starting a transfer. Within a group transfers are started in the
+            order they were requested.
+    """
+
+    FIFO = "fifo"
+    SHORTEST_FIRST = "shortest_first"
+    FAIR = "fair"
+
+
+@dataclass(eq=False)
+class TransferTicket:
+    """The state of a single transfer that was admitted by a `TransferScheduler`.
+
+    Attributes:
+        size: The size of the file in bytes, if known.
+        group: The key used to group transfers for the `FAIR` policy, usually the ID
+            of the container of the file.
+        sequence: The order in which the transfer was requested.
+        parts_in_flight: The number of parts of this transfer that currently hold a
+            part slot.
+    """
+
+    size: Optional[int]
+    group: Optional[Hashable]
+    sequence: int
+    parts_in_flight: int = 0
+    _waiting_parts: Deque[asyncio.Future] = field(default_factory=deque, repr=False)
+
+
+_current_ticket: contextvars.ContextVar[Optional[TransferTicket]] = (
+    contextvars.ContextVar("synapse_transfer_ticket", default=None)
+)
+
+
+class TransferScheduler:
+    """Limit and order the file transfers, and the parts of those transfers, that
+    are active at the same time.
+
+    The scheduler is not thread safe and is expected to be used from within a single
+    AsyncIO event loop, see `Synapse._get_transfer_scheduler`.
+
+    Attributes:
+        max_active_transfers: The number of files that may be transferring at the
+            same time.
+        max_active_parts: The number of parts, across every transfer, that may be
+            transferring at the same time.
+        policy: The `TransferPolicy` used to pick the next pending transfer.
+
+    Example: Transferring a file under the scheduler
+        Requesting a transfer slot is re-entrant, a task (or a task created by it)
+        that already holds a slot will not wait for a second one.
+
+        ```python
+        scheduler = syn._get_transfer_scheduler(asyncio.get_running_loop())
+        async with scheduler.transfer(size=os.path.getsize(path), group=parent_id):
+            ...
+            async with scheduler.part():
+                ...
+        ```
+    """
+
+    def __init__(
+        self,
+        max_active_transfers: int,
+        max_active_parts: int,
+        policy: TransferPolicy = TransferPolicy.FIFO,
+    ) -> None:
+        self.max_active_transfers = max(max_active_transfers, 1)
+        self.max_active_parts = max(max_active_parts, 1)
+        self.policy = TransferPolicy(policy)
+        self._sequence = itertools.count()
+        # Active transfers, in the order they were admitted
+        self._active_transfers: Dict[TransferTicket, None] = {}
+        # Pending transfers for the FIFO and SHORTEST_FIRST policies
+        self._pending_heap: List[Tuple[float, int, TransferTicket, asyncio.Future]] = []
+        # Pending transfers for the FAIR policy, keyed by group in turn order
+        self._pending_groups: (
+            "OrderedDict[Hashable, Deque[Tuple[TransferTicket, asyncio.Future]]]"
+        ) = OrderedDict()
+        self._active_part_count = 0
+        # Transfers that have parts waiting for a part slot
+        self._part_waiters: Dict[TransferTicket, None] = {}
+        # Parts that are transferred outside of a transfer slot share this ticket
+        self._untracked_ticket = TransferTicket(
+            size=None, group=None, sequence=next(self._sequence)
+        )
+
+    @property
+    def active_transfer_count(self) -> int:
+        """The number of transfers that currently hold a transfer slot."""
+        return len(self._active_transfers)
+
+    @property
+    def pending_transfer_count(self) -> int:
+        """The number of transfers that are waiting for a transfer slot."""
+        return len(self._pending_heap) + sum(
+            len(waiters) for waiters in self._pending_groups.values()
+        )
+
+    @asynccontextmanager
+    async def transfer(
+        self, size: Optional[int] = None, group: Optional[Hashable] = None
+    ) -> AsyncIterator[TransferTicket]:
+        """Wait for a transfer slot and hold it for the duration of the context.
+
+        Arguments:
+            size: The size of the file in bytes, used by the `SHORTEST_FIRST` policy.
+            group: The key used to group transfers for the `FAIR` policy, usually
+                the ID of the container of the file.
+
+        Yields:
+            The ticket of the transfer.
+        """
+        current_ticket = _current_ticket.get()
+        if current_ticket is not None and current_ticket in self._active_transfers:
+            yield current_ticket
+            return
+
+        ticket = TransferTicket(size=size, group=group, sequence=next(self._sequence))
+        await self._acquire_transfer(ticket)
+        token = _current_ticket.set(ticket)
+        try:
+            yield ticket
+        finally:
+            _current_ticket.reset(token)
+            self._release_transfer(ticket)
+
+    @asynccontextmanager
+    async def part(self) -> AsyncIterator[None]:
+        """Wait for a part slot and hold it for the duration of the context.
+
+        The part is attributed to the transfer slot held by the current task. When a
+        part slot is freed it is given to the transfer with the fewest parts in
+        flight, so every active transfer gets an even share of the part slots.
+        """
+        ticket = _current_ticket.get()
+        if ticket is None or ticket not in self._active_transfers:
+            ticket = self._untracked_ticket
+
+        await self._acquire_part(ticket)
+        try:
+            yield
+        finally:
+            self._release_part(ticket)
+
+    async def _acquire_transfer(self, ticket: TransferTicket) -> None:
+        future = asyncio.get_running_loop().create_future()
+        if self.policy == TransferPolicy.FAIR:
+            self._pending_groups.setdefault(ticket.group, deque()).append(
+                (ticket, future)
+            )
+        else:
+            if self.policy == TransferPolicy.FIFO:
+                priority = 0
+            else:
+                priority = ticket.size if ticket.size is not None else float("inf")
+            heapq.heappush(
+                self._pending_heap, (priority, ticket.sequence, ticket, future)
+            )
+        self._start_pending_transfers()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted after the waiting task was cancelled
+                self._release_transfer(ticket)
+            else:
+                future.cancel()
+            raise
+
+    def _pop_pending_transfer(self) -> Tuple[TransferTicket, asyncio.Future]:
+        if self._pending_heap:
+            _, _, ticket, future = heapq.heappop(self._pending_heap)
+            return ticket, future
+
+        group, waiters = next(iter(self._pending_groups.items()))
+        ticket, future = waiters.popleft()
+        if waiters:
+            # The group goes to the back of the line for its next transfer
+            self._pending_groups.move_to_end(group)
+        else:
+            del self._pending_groups[group]
+        return ticket, future
+
+    def _start_pending_transfers(self) -> None:
+        while len(self._active_transfers) < self.max_active_transfers and (
+            self._pending_heap or self._pending_groups
+        ):
+            ticket, future = self._pop_pending_transfer()
+            if future.done():
+                # The waiting task was cancelled
+                continue
+            self._active_transfers[ticket] = None
+            future.set_result(None)
+
+    def _release_transfer(self, ticket: TransferTicket) -> None:
+        self._active_transfers.pop(ticket, None)
+        self._start_pending_transfers()
+
+    async def _acquire_part(self, ticket: TransferTicket) -> None:
+        future = asyncio.get_running_loop().create_future()
+        ticket._waiting_parts.append(future)
+        self._part_waiters[ticket] = None
+        self._start_pending_parts()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted after the waiting task was cancelled
+                self._release_part(ticket)
+            else:
+                future.cancel()
+            raise
+
+    def _start_pending_parts(self) -> None:
+        while self._active_part_count < self.max_active_parts and self._part_waiters:
+            ticket = min(
+                self._part_waiters,
+                key=lambda waiter: (waiter.parts_in_flight, waiter.sequence),
+            )
+            future = ticket._waiting_parts.popleft()
+            if not ticket._waiting_parts:
+                del self._part_waiters[ticket]
+            if future.done():
+                # The waiting task was cancelled
+                continue
+            self._active_part_count += 1
+            ticket.parts_in_flight += 1
+            future.set_result(None)
+
+    def _release_part(self, ticket: TransferTicket) -> None:
+        self._active_part_count -= 1
+        ticket.parts_in_flight -= 1
+        self._start_pending_parts()
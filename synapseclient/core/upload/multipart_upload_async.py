@@ -337,16 +337,17 @@ class UploadAttemptAsync:
     async def _handle_part_wrapper(self, part_number: int) -> HandlePartResult:
         loop = asyncio.get_running_loop()
 
-        mem_info = psutil.virtual_memory()
+        async with self._syn._get_transfer_scheduler(asyncio_event_loop=loop).part():
+            mem_info = psutil.virtual_memory()
 
-        if mem_info.available <= self._part_size * 2:
-            gc.collect()
+            if mem_info.available <= self._part_size * 2:
+                gc.collect()
 
-        return await loop.run_in_executor(
-            self._syn._get_thread_pool_executor(asyncio_event_loop=loop),
-            self._handle_part,
-            part_number,
-        )
+            return await loop.run_in_executor(
+                self._syn._get_thread_pool_executor(asyncio_event_loop=loop),
+                self._handle_part,
+                part_number,
+            )
 
     async def _upload_parts(
         self, part_count: int, remaining_part_numbers: List[int]
@@ -574,6 +575,32 @@ class UploadAttemptAsync:
 
         return HandlePartResult(part_number, part_size, md5_hex)
 
+    def _put_part(
+        self,
+        session: httpx.Client,
+        body: bytes,
+        part_url: str,
+        signed_headers: Dict[str, str],
+    ) -> httpx.Response:
+        """Put a part to the storage provider once. Every attempt sends the whole
+        part, so each one waits until the bandwidth limit allows it.
+
+        Arguments:
+            session: The requests session to use for the put.
+            body: The body of the part to put.
+            part_url: The URL to put the part to.
+            signed_headers: The signed headers to use for the put.
+
+        Returns:
+            The response from the put.
+        """
+        self._syn._bandwidth_limiter.consume_upload(len(body) if body else 0)
+        return session.put(
+            url=part_url,
+            content=body,
+            headers=signed_headers,
+        )
+
     def _put_part_with_retry(
         self,
         session: httpx.Client,
@@ -605,10 +632,11 @@ class UploadAttemptAsync:
                 # use our backoff mechanism here, we have encountered 500s on puts to AWS signed urls
 
                 response = with_retry_time_based(
-                    lambda part_url=part_url, signed_headers=signed_headers: session.put(
-                        url=part_url,
-                        content=body,  # noqa: F821
-                        headers=signed_headers,
+                    lambda part_url=part_url, signed_headers=signed_headers: self._put_part(
+                        session=session,
+                        body=body,
+                        part_url=part_url,
+                        signed_headers=signed_headers,
                     ),
                     retry_exceptions=[requests.exceptions.ConnectionError],
                 )
@@ -738,9 +738,7 @@ def from_unix_epoch_time_secs(secs):
         )
 
         return result
-    datetime_instance = datetime.datetime.utcfromtimestamp(secs).replace(
-        tzinfo=datetime.timezone.utc
-    )
+    datetime_instance = datetime.datetime.fromtimestamp(secs, tz=datetime.timezone.utc)
 
     return datetime_instance
 
@@ -31,7 +31,7 @@ from synapseclient.models.project import Project
 from synapseclient.models.project_setting import ProjectSetting
 from synapseclient.models.recordset import RecordSet
 from synapseclient.models.schema_organization import JSONSchema, SchemaOrganization
-from synapseclient.models.services import FailureStrategy
+from synapseclient.models.services import FailureStrategy, SyncFileRecord
 from synapseclient.models.storage_location import (
     StorageLocation,
     StorageLocationType,
@@ -86,6 +86,7 @@ __all__ = [
     "UsedEntity",
     "Evaluation",
     "FailureStrategy",
+    "SyncFileRecord",
     "File",
     "FileHandle",
     "Folder",
@@ -1,4 +1,5 @@
-from dataclasses import dataclass, field
+from copy import deepcopy
+from dataclasses import dataclass, field, replace
 from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Union
 
 from opentelemetry import trace
@@ -9,6 +10,7 @@ from synapseclient.api import (
     delete_entity_provenance,
     get_activity,
     get_entity_provenance,
+    put_entity_generated_by,
     set_entity_provenance,
     update_activity,
 )
@@ -201,6 +203,27 @@ class Activity(ActivitySynchronousProtocol):
     executed: List[Union[UsedEntity, UsedURL]] = field(default_factory=list)
     """The entities executed by this Activity."""
 
+    _last_persistent_instance: Optional["Activity"] = field(
+        default=None, repr=False, compare=False
+    )
+    """The last persistent instance of this object. This is used to determine if the
+    object has been changed and needs to be updated in Synapse."""
+
+    @property
+    def has_changed(self) -> bool:
+        """Determines if the object has been changed and needs to be updated in Synapse."""
+        return (
+            not self._last_persistent_instance or self._last_persistent_instance != self
+        )
+
+    def _set_last_persistent_instance(self) -> None:
+        """Stash the last time this object interacted with Synapse. This is used to
+        determine if the object has been changed and needs to be updated in Synapse."""
+        del self._last_persistent_instance
+        self._last_persistent_instance = replace(
+            self, used=deepcopy(self.used), executed=deepcopy(self.executed)
+        )
+
     def fill_from_dict(
         self, synapse_activity: Dict[str, Union[str, List[Dict[str, Union[str, bool]]]]]
     ) -> "Activity":
@@ -352,11 +375,20 @@ class Activity(ActivitySynchronousProtocol):
         # TODO: Input validation: SYNPY-1400
         if parent:
             parent_id = parent if isinstance(parent, str) else parent.id
-            saved_activity = await set_entity_provenance(
-                entity_id=parent_id,
-                activity=self.to_synapse_request(),
-                synapse_client=synapse_client,
-            )
+            if self.id and not self.has_changed:
+                # The activity is already stored as is, so it only needs to be
+                # linked to the parent
+                saved_activity = await put_entity_generated_by(
+                    entity_id=parent_id,
+                    activity_id=self.id,
+                    synapse_client=synapse_client,
+                )
+            else:
+                saved_activity = await set_entity_provenance(
+                    entity_id=parent_id,
+                    activity=self.to_synapse_request(),
+                    synapse_client=synapse_client,
+                )
         else:
             if self.id:
                 saved_activity = await update_activity(
@@ -367,6 +399,7 @@ class Activity(ActivitySynchronousProtocol):
                     self.to_synapse_request(), synapse_client=synapse_client
                 )
         self.fill_from_dict(synapse_activity=saved_activity)
+        self._set_last_persistent_instance()
 
         if parent:
             parent_display_id = parent if isinstance(parent, str) else parent.id
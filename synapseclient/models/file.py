@@ -875,8 +875,15 @@ class File(FileSynchronousProtocol, AccessControllable, BaseJSONSchema):
         if self.path or self.external_url:
             if self.path:
                 self.path = os.path.expanduser(self.path)
-            async with client._get_parallel_file_transfer_semaphore(
+            async with client._get_transfer_scheduler(
                 asyncio_event_loop=asyncio.get_running_loop()
+            ).transfer(
+                size=(
+                    os.path.getsize(self.path)
+                    if self.path and os.path.isfile(self.path)
+                    else None
+                ),
+                group=parent.id if parent else self.parent_id,
             ):
                 await _upload_file(entity_to_upload=self, synapse_client=client)
         elif self.data_file_handle_id:
@@ -26,7 +26,7 @@ from synapseclient.models.services.storable_entity_components import (
     FailureStrategy,
     store_entity_components,
 )
-from synapseutils import copy
+from synapseutils import copy_async
 
 if TYPE_CHECKING:
     from synapseclient.models import (
@@ -480,20 +480,15 @@ class Folder(
         if not self.id or not parent_id:
             raise ValueError("The folder must have an ID and parent_id to copy.")
 
-        loop = asyncio.get_event_loop()
-
         syn = Synapse.get_client(synapse_client=synapse_client)
-        source_and_destination = await loop.run_in_executor(
-            None,
-            lambda: copy(
-                syn=syn,
-                entity=self.id,
-                destinationId=parent_id,
-                excludeTypes=exclude_types or [],
-                skipCopyAnnotations=not copy_annotations,
-                updateExisting=file_update_existing,
-                setProvenance=file_copy_activity,
-            ),
+        source_and_destination = await copy_async(
+            syn=syn,
+            entity=self.id,
+            destinationId=parent_id,
+            excludeTypes=exclude_types or [],
+            skipCopyAnnotations=not copy_annotations,
+            updateExisting=file_update_existing,
+            setProvenance=file_copy_activity,
         )
 
         new_folder_id = source_and_destination.get(self.id, None)
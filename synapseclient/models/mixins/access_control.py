@@ -13,7 +13,7 @@ from synapseclient.api import (
     get_user_group_headers_batch,
     set_entity_permissions,
 )
-from synapseclient.api.entity_services import get_entity_benefactor
+from synapseclient.api.entity_services import get_entity_benefactor, get_entity_headers
 from synapseclient.core.async_utils import async_to_sync
 from synapseclient.core.exceptions import SynapseHTTPError
 from synapseclient.core.models.acl import AclListResult
@@ -58,11 +58,17 @@ class BenefactorTracker:
     Tracks benefactor relationships during ACL deletion operations to handle
     cascading changes when entities' inheritance changes.
 
+    A tracker is shared by every entity visited in one run. It also remembers the
+    ACLs and user/group names it has fetched, and bounds the benefactor and ACL
+    requests it makes to `synapse_client.max_threads * 2` at a time.
+
     Attributes:
         entity_benefactors: Mapping of entity_id -> benefactor_id
         benefactor_children: Mapping of benefactor_id -> [child_entity_ids]
         deleted_acls: Set of entity_ids whose ACLs have been deleted
         processed_entities: Set of entity_ids that have been processed
+        entity_acls: Mapping of entity_id -> ACL, or None if it has no local ACL
+        user_group_names: Mapping of principal_id -> user or group name
     """
 
     entity_benefactors: Dict[str, str] = field(default_factory=dict)
@@ -77,6 +83,30 @@ class BenefactorTracker:
     processed_entities: Set[str] = field(default_factory=set)
     """Set of entity_ids that have been processed"""
 
+    entity_acls: Dict[str, Optional[Dict[str, Any]]] = field(default_factory=dict)
+    """Mapping of entity_id -> ACL, or None if the entity has no local ACL"""
+
+    user_group_names: Dict[str, str] = field(default_factory=dict)
+    """Mapping of principal_id -> user or group name"""
+
+    _semaphore: Optional[asyncio.Semaphore] = field(
+        default=None, init=False, repr=False
+    )
+
+    def request_semaphore(self, synapse_client: "Synapse") -> asyncio.Semaphore:
+        """
+        The semaphore every request made for this run waits on.
+
+        Arguments:
+            synapse_client: The Synapse client whose `max_threads` sizes the semaphore
+
+        Returns:
+            The semaphore, created on first use.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(synapse_client.max_threads * 2, 1))
+        return self._semaphore
+
     async def track_entity_benefactor(
         self,
         entity_ids: List[str],
@@ -93,7 +123,7 @@ class BenefactorTracker:
         """
         entities_to_process = [
             entity_id
-            for entity_id in entity_ids
+            for entity_id in dict.fromkeys(entity_ids)
             if entity_id not in self.processed_entities
         ]
 
@@ -102,11 +132,14 @@ class BenefactorTracker:
                 progress_bar.update(1)
             return
 
+        semaphore = self.request_semaphore(synapse_client)
+
         async def task_with_entity_id(entity_id: str):
             """Wrapper to pair entity_id with the task result."""
-            result = await get_entity_benefactor(
-                entity_id=entity_id, synapse_client=synapse_client
-            )
+            async with semaphore:
+                result = await get_entity_benefactor(
+                    entity_id=entity_id, synapse_client=synapse_client
+                )
             return entity_id, result
 
         tasks = [
@@ -121,19 +154,92 @@ class BenefactorTracker:
 
         for completed_task in asyncio.as_completed(tasks):
             entity_id, benefactor_result = await completed_task
-            benefactor_id = benefactor_result.id
+            self._record_benefactor(entity_id, benefactor_result.id)
+            if progress_bar:
+                progress_bar.update(1)
 
-            self.entity_benefactors[entity_id] = benefactor_id
+    async def resolve_benefactors(
+        self, entity_ids: List[str], synapse_client: "Synapse"
+    ) -> None:
+        """
+        Look up the benefactors of many entities through their EntityHeaders, up to
+        `MAX_ENTITY_HEADERS_PER_REQUEST` entities per request, so that `get_acl`
+        only requests the ACLs of the distinct benefactors. Entities whose header is
+        not returned are left untracked, and a single untracked entity is not
+        looked up.
 
-            if benefactor_id not in self.benefactor_children:
-                self.benefactor_children[benefactor_id] = []
+        Arguments:
+            entity_ids: List of entity IDs to resolve
+            synapse_client: The Synapse client to use for API calls
+        """
+        entities_to_process = [
+            entity_id
+            for entity_id in dict.fromkeys(entity_ids)
+            if entity_id not in self.entity_benefactors
+        ]
+        if len(entities_to_process) < 2:
+            # Requesting the ACL of a single entity is as cheap as its header
+            return
 
-            if entity_id != benefactor_id:
-                self.benefactor_children[benefactor_id].append(entity_id)
+        async with self.request_semaphore(synapse_client):
+            headers = await get_entity_headers(
+                entity_ids=entities_to_process, synapse_client=synapse_client
+            )
+        for header in headers:
+            if header.id and header.benefactor_id is not None:
+                self._record_benefactor(header.id, f"syn{header.benefactor_id}")
 
-            self.processed_entities.add(entity_id)
-            if progress_bar:
-                progress_bar.update(1)
+    def _record_benefactor(self, entity_id: str, benefactor_id: str) -> None:
+        """
+        Record that an entity inherits its ACL from benefactor_id.
+
+        Arguments:
+            entity_id: The ID of the entity
+            benefactor_id: The ID of the entity's benefactor
+        """
+        self.entity_benefactors[entity_id] = benefactor_id
+
+        if benefactor_id not in self.benefactor_children:
+            self.benefactor_children[benefactor_id] = []
+
+        if entity_id != benefactor_id:
+            self.benefactor_children[benefactor_id].append(entity_id)
+
+        self.processed_entities.add(entity_id)
+
+    async def get_acl(
+        self, entity_id: str, synapse_client: "Synapse"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the local ACL of an entity. Only benefactors have a local ACL, so
+        entities already tracked as inheriting from another entity are answered
+        without a request, and every ACL is fetched at most once per run.
+
+        Arguments:
+            entity_id: The ID of the entity
+            synapse_client: The Synapse client to use for API calls
+
+        Returns:
+            The ACL response, or None if the entity inherits its ACL.
+        """
+        if entity_id in self.entity_acls:
+            return self.entity_acls[entity_id]
+
+        benefactor_id = self.entity_benefactors.get(entity_id)
+        if benefactor_id is not None and benefactor_id != entity_id:
+            return None
+
+        async with self.request_semaphore(synapse_client):
+            try:
+                acl = await get_entity_acl(
+                    entity_id=entity_id, synapse_client=synapse_client
+                )
+            except SynapseHTTPError as e:
+                if e.response.status_code != 404:
+                    raise
+                acl = None
+        self.entity_acls[entity_id] = acl
+        return acl
 
     def mark_acl_deleted(self, entity_id: str) -> List[str]:
         """
@@ -146,6 +252,7 @@ class BenefactorTracker:
             List of entity IDs that will need their benefactor relationships updated
         """
         self.deleted_acls.add(entity_id)
+        self.entity_acls[entity_id] = None
 
         affected_entities = self.benefactor_children.get(entity_id, [])
 
@@ -589,6 +696,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
                     include_container_content=include_container_content,
                     recursive=recursive,
                     progress_bar=progress_bar,
+                    benefactor_tracker=benefactor_tracker,
                 )
                 if progress_bar:
                     progress_bar.update(1)
@@ -887,6 +995,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         *,
         synapse_client: Optional[Synapse] = None,
         _progress_bar: Optional[tqdm] = None,  # Internal parameter for recursive calls
+        _benefactor_tracker: Optional[BenefactorTracker] = None,
     ) -> AclListResult:
         """
         List the Access Control Lists (ACLs) for this entity and optionally its children.
@@ -920,6 +1029,9 @@ class AccessControllable(AccessControllableSynchronousProtocol):
                 instance from the Synapse class constructor.
             _progress_bar: Internal parameter. Progress bar instance to use for updates
                 when called recursively. Should not be used by external callers.
+            _benefactor_tracker: Internal parameter. Tracker shared by the recursive
+                calls of one run to bound and reuse its requests. Should not be used
+                by external callers.
 
         Returns:
             An AclListResult object containing a structured representation of ACLs where:
@@ -1032,6 +1144,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
 
         normalized_types = self._normalize_target_entity_types(target_entity_types)
         client = Synapse.get_client(synapse_client=synapse_client)
+        benefactor_tracker = _benefactor_tracker or BenefactorTracker()
 
         all_acls: Dict[str, Dict[str, List[str]]] = {}
         all_entities = []
@@ -1043,6 +1156,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         acl = await self._get_current_entity_acl(
             client=client,
             progress_bar=_progress_bar if update_progress_for_self else None,
+            benefactor_tracker=benefactor_tracker,
         )
         if acl is not None:
             all_acls[self.id] = acl
@@ -1073,6 +1187,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
                     all_entities=all_entities,
                     all_acls=all_acls,
                     progress_bar=progress_bar,
+                    benefactor_tracker=benefactor_tracker,
                 )
                 # Ensure progress bar reaches 100% completion
                 if progress_bar:
@@ -1092,6 +1207,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
                 all_entities=all_entities,
                 all_acls=all_acls,
                 progress_bar=_progress_bar,
+                benefactor_tracker=benefactor_tracker,
             )
         current_acl = all_acls.get(self.id)
         acl_result = AclListResult.from_dict(
@@ -1099,13 +1215,21 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         )
 
         if log_tree:
-            logged_tree = await self._log_acl_tree(acl_result, all_entities, client)
+            logged_tree = await self._log_acl_tree(
+                acl_result,
+                all_entities,
+                client,
+                user_group_names=benefactor_tracker.user_group_names,
+            )
             acl_result.ascii_tree = logged_tree
 
         return acl_result
 
     async def _get_current_entity_acl(
-        self, client: Synapse, progress_bar: Optional[tqdm] = None
+        self,
+        client: Synapse,
+        progress_bar: Optional[tqdm] = None,
+        benefactor_tracker: Optional[BenefactorTracker] = None,
     ) -> Optional[Dict[str, List[str]]]:
         """
         Get the ACL for the current entity.
@@ -1113,28 +1237,22 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         Arguments:
             client: The Synapse client instance to use for API calls.
             progress_bar: Progress bar to update after operation.
+            benefactor_tracker: Optional tracker that bounds and remembers the request.
 
         Returns:
             A dictionary mapping principal IDs to permission lists, or None if no ACL exists.
         """
-        try:
-            acl_response = await get_entity_acl(
-                entity_id=self.id, synapse_client=client
+        acl_response = await (benefactor_tracker or BenefactorTracker()).get_acl(
+            entity_id=self.id, synapse_client=client
+        )
+        if progress_bar:
+            progress_bar.update(1)
+        if acl_response is None:
+            client.logger.debug(
+                f"Entity {self.id} inherits permissions from its parent (no local ACL)."
             )
-            result = self._parse_acl_response(acl_response)
-            if progress_bar:
-                progress_bar.update(1)
-            return result
-        except SynapseHTTPError as e:
-            if e.response.status_code == 404:
-                client.logger.debug(
-                    f"Entity {self.id} inherits permissions from its parent (no local ACL)."
-                )
-                if progress_bar:
-                    progress_bar.update(1)
-                return None
-            else:
-                raise
+            return None
+        return self._parse_acl_response(acl_response)
 
     def _parse_acl_response(self, acl_response: Dict[str, Any]) -> Dict[str, List[str]]:
         """
@@ -1167,6 +1285,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         collect_acls: bool = False,
         collect_self: bool = False,
         all_acls: Optional[Dict[str, Dict[str, List[str]]]] = None,
+        benefactor_tracker: Optional[BenefactorTracker] = None,
     ) -> List[
         Union[
             "File",
@@ -1199,11 +1318,14 @@ class AccessControllable(AccessControllableSynchronousProtocol):
             collect_acls: Whether to collect ACLs from entities.
             collect_self: If True, include the current entity in the results.
             all_acls: Dictionary to accumulate ACL results if collecting ACLs.
+            benefactor_tracker: Tracker shared by the whole collection. It bounds
+                the number of containers listed and ACLs fetched at a time.
 
         Returns:
             Returns a list of entity objects
         """
         entities = []
+        benefactor_tracker = benefactor_tracker or BenefactorTracker()
 
         if collect_self:
             entities.append(self)
@@ -1219,6 +1341,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
                     target_entity_types=target_entity_types,
                     synapse_client=client,
                     _progress_bar=progress_bar,
+                    _benefactor_tracker=benefactor_tracker,
                 )
                 all_acls.update(entity_acls.to_dict())
 
@@ -1230,14 +1353,26 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         )
         if should_process_children:
             if not self._synced_from_synapse:
-                await self.sync_from_synapse_async(
-                    recursive=False,
-                    download_file=False,
-                    include_activity=False,
-                    synapse_client=client,
-                )
+                async with benefactor_tracker.request_semaphore(client):
+                    await self.sync_from_synapse_async(
+                        recursive=False,
+                        download_file=False,
+                        include_activity=False,
+                        synapse_client=client,
+                    )
 
             if include_container_content:
+                if collect_acls and all_acls is not None:
+                    # Only the ACLs of the distinct benefactors are then requested
+                    await benefactor_tracker.resolve_benefactors(
+                        entity_ids=[
+                            entity.id
+                            for entity_type, plural_attr in ENTITY_TYPE_MAPPING.items()
+                            if entity_type in target_entity_types
+                            for entity in getattr(self, plural_attr, [])
+                        ],
+                        synapse_client=client,
+                    )
                 for entity_type, plural_attr in ENTITY_TYPE_MAPPING.items():
                     if entity_type in target_entity_types and hasattr(
                         self, plural_attr
@@ -1259,6 +1394,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
                                         target_entity_types=[entity_type],
                                         synapse_client=client,
                                         _progress_bar=progress_bar,
+                                        _benefactor_tracker=benefactor_tracker,
                                     )
                                 )
 
@@ -1286,6 +1422,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
                             collect_self=False,
                             all_acls=all_acls,
                             progress_bar=progress_bar,
+                            benefactor_tracker=benefactor_tracker,
                         )
                     )
 
@@ -1324,7 +1461,9 @@ class AccessControllable(AccessControllableSynchronousProtocol):
             show_files_in_containers: Whether to show files within containers.
         """
         tree_data = await self._build_tree_data(
-            client=client, collected_entities=collected_entities
+            client=client,
+            collected_entities=collected_entities,
+            benefactor_tracker=benefactor_tracker,
         )
         if not tree_data["entities_by_id"]:
             client.logger.info(
@@ -1368,6 +1507,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         self,
         client: Synapse,
         collected_entities: List["AccessControllable"] = None,
+        benefactor_tracker: Optional[BenefactorTracker] = None,
     ) -> Dict[str, Any]:
         """
         Build comprehensive tree data including entities and ACL structure.
@@ -1387,7 +1527,9 @@ class AccessControllable(AccessControllableSynchronousProtocol):
             collected_entities=collected_entities
         )
         acl_result = await self._build_acl_result_from_entities(
-            entities_by_id=entities_by_id, client=client
+            entities_by_id=entities_by_id,
+            client=client,
+            benefactor_tracker=benefactor_tracker,
         )
         tree_structure = await self._build_acl_tree_structure(
             acl_result, list(entities_by_id.values())
@@ -1469,43 +1611,47 @@ class AccessControllable(AccessControllableSynchronousProtocol):
             ],
         ],
         client: Synapse,
+        benefactor_tracker: Optional[BenefactorTracker] = None,
     ) -> AclListResult:
         """
         Build AclListResult from a dictionary of entities by fetching their ACL information.
 
+        The benefactors of the entities are resolved first, so only the ACLs of the
+        unique benefactors are fetched since every other entity inherits its ACL.
+
         Arguments:
             entities_by_id: Dictionary mapping entity IDs to entity objects.
             client: The Synapse client instance to use for API calls.
+            benefactor_tracker: Optional tracker with the benefactors of the entities.
 
         Returns:
             AclListResult containing ACL information for all entities.
         """
         from synapseclient.core.models.acl import AclEntry, EntityAcl
 
+        benefactor_tracker = benefactor_tracker or BenefactorTracker()
+
         async def fetch_entity_acl(entity_id: str) -> Optional[EntityAcl]:
             """Helper function to fetch ACL for a single entity."""
-            try:
-                acl_response = await get_entity_acl(
-                    entity_id=entity_id, synapse_client=client
-                )
-                acl_info = self._parse_acl_response(acl_response)
-
-                acl_entries = []
-                for principal_id, permissions in acl_info.items():
-                    acl_entries.append(
-                        AclEntry(
-                            principal_id=int(principal_id), permissions=permissions
-                        )
-                    )
+            acl_response = await benefactor_tracker.get_acl(
+                entity_id=entity_id, synapse_client=client
+            )
+            if acl_response is None:
+                return None
+            acl_info = self._parse_acl_response(acl_response)
 
-                return EntityAcl(entity_id=entity_id, acl_entries=acl_entries)
+            acl_entries = []
+            for principal_id, permissions in acl_info.items():
+                acl_entries.append(
+                    AclEntry(principal_id=int(principal_id), permissions=permissions)
+                )
 
-            except SynapseHTTPError as e:
-                if e.response.status_code != 404:
-                    raise
-                return None
+            return EntityAcl(entity_id=entity_id, acl_entries=acl_entries)
 
         entity_ids = list(entities_by_id.keys())
+        await benefactor_tracker.resolve_benefactors(
+            entity_ids=entity_ids, synapse_client=client
+        )
         acl_tasks = [fetch_entity_acl(entity_id) for entity_id in entity_ids]
 
         entity_acls = []
@@ -1524,7 +1670,10 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         return AclListResult(all_entity_acls=entity_acls)
 
     async def _fetch_user_group_info_from_tree(
-        self, tree_structure: Dict[str, Any], synapse_client: "Synapse"
+        self,
+        tree_structure: Dict[str, Any],
+        synapse_client: "Synapse",
+        user_group_names: Optional[Dict[str, str]] = None,
     ) -> Dict[str, str]:
         """
         Fetch user and group information for all principals found in a tree structure.
@@ -1535,25 +1684,34 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         Arguments:
             tree_structure: Tree structure containing entity metadata with ACL information.
             synapse_client: Synapse client for API calls.
+            user_group_names: Optional names already fetched during this run.
 
         Returns:
             Dictionary mapping principal IDs to user/group names.
         """
         entity_metadata = tree_structure.get("entity_metadata", {})
-        return await self._fetch_user_group_info(entity_metadata, synapse_client)
+        return await self._fetch_user_group_info(
+            entity_metadata, synapse_client, user_group_names=user_group_names
+        )
 
     async def _fetch_user_group_info(
-        self, entity_metadata: Dict[str, Any], synapse_client: "Synapse"
+        self,
+        entity_metadata: Dict[str, Any],
+        synapse_client: "Synapse",
+        user_group_names: Optional[Dict[str, str]] = None,
     ) -> Dict[str, str]:
         """
         Fetch user and group information for all principals found in ACLs.
 
         Scans through entity metadata to collect all unique principal IDs from
-        ACL entries, then fetches their user/group information in a single batch call.
+        ACL entries, then fetches the user/group information of the principals not
+        already in `user_group_names` in a single batch call.
 
         Arguments:
             entity_metadata: Dictionary containing entity metadata with ACL information.
             synapse_client: Synapse client for API calls.
+            user_group_names: Optional names already fetched during this run. Newly
+                fetched names are added to it.
 
         Returns:
             Dictionary mapping principal IDs to user/group names.
@@ -1563,16 +1721,27 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         if not all_principal_ids:
             return {}
 
-        user_group_header_batch = await get_user_group_headers_batch(
-            list(all_principal_ids), synapse_client=synapse_client
-        )
+        if user_group_names is None:
+            user_group_names = {}
+        missing_principal_ids = [
+            principal_id
+            for principal_id in all_principal_ids
+            if principal_id not in user_group_names
+        ]
 
-        if not user_group_header_batch:
-            return {}
+        if missing_principal_ids:
+            user_group_header_batch = await get_user_group_headers_batch(
+                missing_principal_ids, synapse_client=synapse_client
+            )
+            for user_group_header in user_group_header_batch or []:
+                user_group_names[user_group_header["ownerId"]] = user_group_header[
+                    "userName"
+                ]
 
         return {
-            user_group_header["ownerId"]: user_group_header["userName"]
-            for user_group_header in user_group_header_batch
+            principal_id: user_group_names[principal_id]
+            for principal_id in all_principal_ids
+            if principal_id in user_group_names
         }
 
     def _extract_principal_ids_from_metadata(
@@ -1646,7 +1815,9 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         root_entities = tree_structure["root_entities"]
 
         user_group_info_map = await self._fetch_user_group_info_from_tree(
-            tree_structure, synapse_client
+            tree_structure,
+            synapse_client,
+            user_group_names=benefactor_tracker.user_group_names,
         )
 
         await self._augment_tree_with_missing_entities(
@@ -2196,6 +2367,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         acl_result: AclListResult,
         entities: List[Union["File", "Folder"]],
         client: Synapse,
+        user_group_names: Optional[Dict[str, str]] = None,
     ) -> str:
         """
         Generate and log an ASCII tree representation of ACL results.
@@ -2209,6 +2381,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
             acl_result: The ACL list result containing entity ACL information.
             entities: List of entity objects that have been processed.
             client: The Synapse client instance for API calls and logging.
+            user_group_names: Optional user/group names already fetched during this run.
         """
         if not acl_result or not acl_result.all_entity_acls:
             client.logger.info("No ACL results to display in tree format.")
@@ -2216,7 +2389,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
 
         tree_structure = await self._build_acl_tree_structure(acl_result, entities)
         tree_output = await self._format_ascii_tree_async(
-            tree_structure, synapse_client=client
+            tree_structure, synapse_client=client, user_group_names=user_group_names
         )
 
         client.logger.info("ACL Tree Structure:")
@@ -2338,6 +2511,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         tree_structure: Dict[str, Any],
         *,
         synapse_client: Optional["Synapse"] = None,
+        user_group_names: Optional[Dict[str, str]] = None,
     ) -> str:
         """
         Format the tree structure as ASCII art with ACL status icons.
@@ -2349,6 +2523,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         Arguments:
             tree_structure: The tree structure dictionary.
             synapse_client: Synapse client for fetching user/group information.
+            user_group_names: Optional user/group names already fetched during this run.
 
         Returns:
             A string containing the ASCII tree representation with ACL status indicators.
@@ -2360,6 +2535,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         user_group_info_map = await self._fetch_user_group_info_from_tree(
             tree_structure,
             synapse_client or Synapse.get_client(synapse_client=synapse_client),
+            user_group_names=user_group_names,
         )
 
         lines = []
@@ -2472,6 +2648,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
         all_entities: List,
         all_acls: Dict[str, Dict[str, List[str]]],
         progress_bar: Optional[tqdm] = None,
+        benefactor_tracker: Optional[BenefactorTracker] = None,
     ) -> None:
         """
         Process children entities with optional progress tracking.
@@ -2484,6 +2661,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
             all_entities: List to append entities to
             all_acls: Dictionary to store ACL results
             progress_bar: Progress bar for tracking
+            benefactor_tracker: Tracker shared by the requests of this run
         """
         operations_completed = 0
 
@@ -2516,6 +2694,7 @@ class AccessControllable(AccessControllableSynchronousProtocol):
             collect_self=False,
             all_acls=all_acls,
             progress_bar=progress_bar,
+            benefactor_tracker=benefactor_tracker,
         )
 
         operations_completed += 1
@@ -4,6 +4,7 @@ import asyncio
 import os
 from typing import (
     TYPE_CHECKING,
+    Any,
     AsyncGenerator,
     Dict,
     Generator,
@@ -17,8 +18,8 @@ from typing import (
 from typing_extensions import Self
 
 from synapseclient import Synapse
-from synapseclient.api import get_entity_id_bundle2
-from synapseclient.api.entity_services import EntityHeader, get_children
+from synapseclient.api import get_entity_id_bundle2, get_file_handles_for_download_async
+from synapseclient.api.entity_services import EntityHeader, get_children, walk_children
 from synapseclient.core.async_utils import (
     async_to_sync,
     otel_trace_method,
@@ -38,7 +39,9 @@ from synapseclient.core.constants.concrete_types import (
     TABLE_ENTITY,
     VIRTUAL_TABLE,
 )
+from synapseclient.core.constants.limits import MAX_FILE_HANDLE_PER_BATCH_REQUEST
 from synapseclient.core.constants.method_flags import COLLISION_OVERWRITE_LOCAL
+from synapseclient.core.download.download_functions import download_file_entity_model
 from synapseclient.core.exceptions import SynapseError
 from synapseclient.core.transfer_bar import shared_download_progress_bar
 from synapseclient.core.upload.multipart_upload_async import (
@@ -49,6 +52,7 @@ from synapseclient.models.protocols.storable_container_protocol import (
     StorableContainerSynchronousProtocol,
 )
 from synapseclient.models.services.manifest import (
+    find_unchanged_files_async,
     generate_manifest_csv,
     generate_sync_manifest,
     read_manifest_for_upload,
@@ -59,6 +63,11 @@ from synapseclient.models.services.storable_entity_components import (
     FailureStrategy,
     wrap_coroutine,
 )
+from synapseclient.models.services.streaming_sync import (
+    DEFAULT_MAX_PENDING_FILES,
+    FileRecordCallback,
+    stream_container_from_synapse_async,
+)
 
 if TYPE_CHECKING:
     # TODO: Support DockerRepo and Link in https://sagebionetworks.jira.com/browse/SYNPY-1343 epic or later
@@ -171,6 +180,7 @@ class StorableContainer(StorableContainerSynchronousProtocol):
         queue: asyncio.Queue = None,
         include_types: Optional[List[str]] = None,
         manifest: ManifestSetting = "all",
+        batch_downloads: bool = False,
         *,
         synapse_client: Optional[Synapse] = None,
     ) -> Self:
@@ -226,6 +236,14 @@ class StorableContainer(StorableContainerSynchronousProtocol):
                 - `all` (default): generate `manifest.csv` in every synced directory
                 - `root`: generate `manifest.csv` only in the root `path` directory
                 - `suppress`: do not generate any manifest file
+            batch_downloads: If True and `download_file` is True, the metadata of all
+                files is retrieved first and the files are then downloaded with the
+                download URLs of up to 100 files being requested together, instead of
+                one request per file. Only the download URLs are batched: the
+                metadata, file handle and annotations of each file are still
+                retrieved with one entity bundle request per file, because Synapse
+                has no endpoint that returns them for many entities at once.
+                Ignored when a `queue` is passed in.
             synapse_client: If not passed in and caching was not disabled by
                 `Synapse.allow_client_caching(False)` this will use the last created
                 instance from the Synapse class constructor.
@@ -458,6 +476,7 @@ class StorableContainer(StorableContainerSynchronousProtocol):
                 queue=queue,
                 include_types=include_types,
                 manifest=manifest,
+                batch_downloads=batch_downloads,
                 synapse_client=syn,
             )
 
@@ -474,6 +493,7 @@ class StorableContainer(StorableContainerSynchronousProtocol):
         queue: asyncio.Queue = None,
         include_types: Optional[List[str]] = None,
         manifest: ManifestSetting = "all",
+        batch_downloads: bool = False,
         *,
         synapse_client: Optional[Synapse] = None,
     ) -> Self:
@@ -503,6 +523,9 @@ class StorableContainer(StorableContainerSynchronousProtocol):
         )
 
         create_workers = not queue
+        # The files are downloaded in batches once the metadata of every file in
+        # the hierarchy has been retrieved
+        download_in_batches = batch_downloads and download_file and create_workers
 
         queue = queue or asyncio.Queue()
         worker_tasks = []
@@ -534,7 +557,7 @@ class StorableContainer(StorableContainerSynchronousProtocol):
                     child=child,
                     recursive=recursive,
                     path=path,
-                    download_file=download_file,
+                    download_file=download_file and not download_in_batches,
                     if_collision=if_collision,
                     failure_strategy=failure_strategy,
                     synapse_client=syn,
@@ -565,6 +588,14 @@ class StorableContainer(StorableContainerSynchronousProtocol):
                 for task in worker_tasks:
                     task.cancel()
 
+        if download_in_batches:
+            await self._download_files_in_batches(
+                path=path,
+                if_collision=if_collision,
+                failure_strategy=failure_strategy,
+                synapse_client=syn,
+            )
+
         if path and manifest != "suppress":
             if manifest == "all":
                 for (
@@ -585,6 +616,287 @@ class StorableContainer(StorableContainerSynchronousProtocol):
 
         return self
 
+    def _map_files_to_download_locations(
+        self, path: Optional[str]
+    ) -> List[Tuple["File", Optional[str]]]:
+        """
+        Recursively loop over all of the already retrieved files and folders and
+        return every file along with the directory it is synced to.
+
+        Arguments:
+            path: The directory the files directly in this container are synced to.
+
+        Returns:
+            A list of tuples of the file and the directory to download it to.
+        """
+        locations = [(file, path) for file in self.files]
+        for folder in self.folders:
+            locations.extend(
+                folder._map_files_to_download_locations(
+                    path=(
+                        os.path.join(path, folder.name)
+                        if path and folder.name
+                        else None
+                    )
+                )
+            )
+        return locations
+
+    async def _download_files_in_batches(
+        self,
+        path: Optional[str],
+        if_collision: str,
+        failure_strategy: FailureStrategy,
+        *,
+        synapse_client: Optional[Synapse] = None,
+    ) -> None:
+        """
+        Download the already retrieved files in this container and all sub-folders.
+        The download URLs of up to `MAX_FILE_HANDLE_PER_BATCH_REQUEST` files that are
+        not in the cache are requested together. Every file is fed through one
+        bounded queue to `max_threads * 2` download workers, and the URLs of the
+        next batch are requested while the files of the previous batch are still
+        downloading, so a large file does not hold up the rest of the sync.
+
+        The files must already have been retrieved; their metadata is not
+        hydrated here and costs one entity bundle request per file.
+
+        Arguments:
+            path: The directory the files directly in this container are synced to.
+            if_collision: Determines how to handle file collisions.
+            failure_strategy: Determines how to handle failures when downloading a
+                file and an exception occurs.
+            synapse_client: If not passed in and caching was not disabled by
+                `Synapse.allow_client_caching(False)` this will use the last created
+                instance from the Synapse class constructor.
+        """
+        client = Synapse.get_client(synapse_client=synapse_client)
+        downloads = [
+            (file, location)
+            for file, location in self._map_files_to_download_locations(path=path)
+            if file.data_file_handle_id
+        ]
+        worker_count = max(client.max_threads * 2, 1)
+        # Holds at most one batch, so the URLs are requested at most one batch
+        # ahead of the downloads and do not expire before they are used
+        queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_FILE_HANDLE_PER_BATCH_REQUEST)
+
+        async def request_download_urls() -> None:
+            for start in range(0, len(downloads), MAX_FILE_HANDLE_PER_BATCH_REQUEST):
+                batch = downloads[start : start + MAX_FILE_HANDLE_PER_BATCH_REQUEST]
+                requested_files = [
+                    {
+                        "fileHandleId": file.data_file_handle_id,
+                        "associateObjectId": file.id,
+                        "associateObjectType": "FileEntity",
+                    }
+                    for file, location in batch
+                    if client.cache.get(
+                        file_handle_id=file.data_file_handle_id, path=location
+                    )
+                    is None
+                ]
+                file_handle_results = (
+                    await get_file_handles_for_download_async(
+                        requested_files=requested_files, synapse_client=client
+                    )
+                    if requested_files
+                    else {}
+                )
+                for file, location in batch:
+                    await queue.put(
+                        (
+                            file,
+                            location,
+                            file_handle_results.get(file.data_file_handle_id),
+                        )
+                    )
+            for _ in range(worker_count):
+                await queue.put(None)
+
+        async def download(
+            file: "File",
+            location: Optional[str],
+            file_handle_result: Optional[Dict[str, Any]],
+        ) -> "File":
+            await download_file_entity_model(
+                download_location=location,
+                file=file,
+                if_collision=if_collision,
+                submission=None,
+                file_handle_result=file_handle_result,
+                synapse_client=client,
+            )
+            file.download_file = True
+            file._set_last_persistent_instance()
+            return file
+
+        async def download_worker() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                file, location, file_handle_result = item
+                self._resolve_sync_from_synapse_result(
+                    result=await wrap_coroutine(
+                        download(
+                            file=file,
+                            location=location,
+                            file_handle_result=file_handle_result,
+                        )
+                    ),
+                    failure_strategy=failure_strategy,
+                    synapse_client=client,
+                )
+
+        tasks = [asyncio.create_task(request_download_urls())] + [
+            asyncio.create_task(download_worker()) for _ in range(worker_count)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @otel_trace_method(
+        method_to_trace_name=lambda self, **kwargs: f"{self.__class__.__name__}_stream_from_synapse: {self.id}"
+    )
+    async def stream_from_synapse_async(
+        self: Self,
+        path: Optional[str] = None,
+        recursive: bool = True,
+        download_file: bool = True,
+        if_collision: str = COLLISION_OVERWRITE_LOCAL,
+        failure_strategy: FailureStrategy = FailureStrategy.LOG_EXCEPTION,
+        on_file: Optional[FileRecordCallback] = None,
+        manifest_path: Optional[str] = None,
+        max_pending_files: int = DEFAULT_MAX_PENDING_FILES,
+        incremental: bool = False,
+        *,
+        synapse_client: Optional[Synapse] = None,
+    ) -> int:
+        """
+        Sync the files in this container and all possible sub-folders from Synapse
+        with bounded memory. This is intended for containers with a very large number
+        of files where `sync_from_synapse` would hold too many `File` objects.
+
+        Unlike `sync_from_synapse` the `files` and `folders` attributes are not
+        populated. Instead each file is reduced to a compact
+        [SyncFileRecord][synapseclient.models.SyncFileRecord] as soon as it has been
+        retrieved, and the record is passed to `on_file` and/or written to the CSV at
+        `manifest_path`. Folders are listed concurrently, and listing pauses while
+        `max_pending_files` files are waiting to be retrieved.
+
+        Only Files and Folders are synced, links are not followed.
+
+        Arguments:
+            path: An optional path where the file hierarchy will be reproduced. If not
+                specified the files will by default be placed in the synapseCache.
+            recursive: Whether or not to recursively get the entire hierarchy of the
+                folder and sub-folders.
+            download_file: Whether to download the files found or not.
+            if_collision: Determines how to handle file collisions. May be
+
+                - `overwrite.local`
+                - `keep.local`
+                - `keep.both`
+            failure_strategy: Determines how to handle failures when listing a folder
+                or retrieving a file and an exception occurs.
+            on_file: Called with the record of every file that was synced. May be a
+                function or a coroutine function.
+            manifest_path: If set, a CSV with the `path`, `parentId`, `name`, `ID`,
+                `versionNumber`, `dataFileHandleId` and `dataFileMD5Hex` of every file
+                is written to this path as the files are synced.
+            max_pending_files: The maximum number of files that are waiting to be
+                retrieved at any time.
+            incremental: If True, the etag, version, MD5 and local path of every
+                synced file are stored in a `.synapse_sync_state.sqlite` database
+                under `path`. On the next sync, a file whose version and
+                modification time in the folder listing match this state and whose
+                local copy has not changed is not retrieved again. Requires `path`.
+            synapse_client: If not passed in and caching was not disabled by
+                `Synapse.allow_client_caching(False)` this will use the last created
+                instance from the Synapse class constructor.
+
+        Returns:
+            The number of files that were synced.
+
+        Example: Using this function
+            Suppose I want to download every file in a large Project and keep a
+            record of what was downloaded:
+
+            ```python
+            import asyncio
+            from synapseclient import Synapse
+            from synapseclient.models import Project
+
+            async def my_function():
+                syn = Synapse()
+                syn.login()
+
+                my_project = Project(id="syn12345")
+                file_count = await my_project.stream_from_synapse_async(
+                    path="/path/to/folder",
+                    manifest_path="/path/to/folder/manifest.csv",
+                )
+                print(f"Synced {file_count} files")
+
+            asyncio.run(my_function())
+            ```
+
+            Suppose I want to mirror a Project every day and only download the files
+            that changed since the previous run:
+
+            ```python
+            import asyncio
+            from synapseclient import Synapse
+            from synapseclient.models import Project
+
+            async def my_function():
+                syn = Synapse()
+                syn.login()
+
+                my_project = Project(id="syn12345")
+                await my_project.stream_from_synapse_async(
+                    path="/path/to/folder", incremental=True
+                )
+
+            asyncio.run(my_function())
+            ```
+
+        Raises:
+            ValueError: If the container does not have an id set, or if `incremental`
+                is True and no `path` is given.
+        """
+        if not self.id:
+            raise ValueError(
+                f"{self.__class__.__name__} must have an id set to stream from Synapse."
+            )
+        syn = Synapse.get_client(synapse_client=synapse_client)
+        path = os.path.expanduser(path) if path else None
+        if path:
+            os.makedirs(path, exist_ok=True)
+        syn.logger.info(
+            f"[{self.id}:{self.name}]: Streaming {self.__class__.__name__} from Synapse."
+        )
+        custom_message = "Syncing from Synapse" if not download_file else None
+        with shared_download_progress_bar(
+            file_size=1, synapse_client=syn, custom_message=custom_message
+        ):
+            return await stream_container_from_synapse_async(
+                container_id=self.id,
+                path=path,
+                recursive=recursive,
+                download_file=download_file,
+                if_collision=if_collision,
+                failure_strategy=failure_strategy,
+                on_file=on_file,
+                manifest_path=manifest_path,
+                max_pending_files=max_pending_files,
+                incremental=incremental,
+                synapse_client=syn,
+            )
+
     @otel_trace_method(
         method_to_trace_name=lambda self, **kwargs: f"{self.__class__.__name__}_sync_to_synapse: {self.id}"
     )
@@ -596,6 +908,7 @@ class StorableContainer(StorableContainerSynchronousProtocol):
         retries: int = MANIFEST_UPLOAD_MAX_RETRIES,
         merge_existing_annotations: bool = True,
         associate_activity_to_new_version: bool = False,
+        skip_unchanged: bool = False,
         *,
         synapse_client: Synapse | None = None,
     ) -> list["File"]:
@@ -625,6 +938,11 @@ class StorableContainer(StorableContainerSynchronousProtocol):
             associate_activity_to_new_version: If True and a version update
                 occurs, the existing Synapse activity is associated with the new
                 version.
+            skip_unchanged: If True, the target containers are compared to the
+                manifest before uploading and files whose name, size and MD5
+                already match a File in Synapse are left out of the upload.
+                Their annotations and provenance in the manifest are not applied.
+                Useful when re-running a sync of a mostly unchanged directory.
             synapse_client: If not passed in and caching was not disabled by
                 Synapse.allow_client_caching(False) this will use the last
                 created instance from the Synapse class constructor.
@@ -632,7 +950,8 @@ class StorableContainer(StorableContainerSynchronousProtocol):
         Returns:
             List of File entities that were created or updated. Returns an
             empty list if dry_run=True or if no rows were eligible for
-            upload.
+            upload. Files skipped because they were unchanged are not
+            included.
 
         Example: Using this function
             &nbsp;
@@ -667,20 +986,34 @@ class StorableContainer(StorableContainerSynchronousProtocol):
             associate_activity_to_new_version=associate_activity_to_new_version,
         )
 
+        unchanged_files = {}
+        if skip_unchanged and items:
+            syn.logger.info("Comparing the manifest to the files in Synapse...")
+            unchanged_files = await find_unchanged_files_async(items, syn=syn)
+            total_size -= sum(
+                file.content_size or 0 for file in unchanged_files.values()
+            )
+
         syn.logger.info(
-            f"About to upload {len(items)} files with a total size of {total_size} bytes."
+            f"About to upload {len(items) - len(unchanged_files)} files with a total "
+            f"size of {total_size} bytes."
+            + (
+                f" Skipping {len(unchanged_files)} unchanged files."
+                if skip_unchanged
+                else ""
+            )
         )
 
         if dry_run:
             syn.logger.info("Returning due to dry run.")
             return []
 
-        if not items:
+        if len(items) == len(unchanged_files):
             return []
 
         progress_bar = tqdm(
             total=total_size,
-            desc=f"Uploading {len(items)} files",
+            desc=f"Uploading {len(items) - len(unchanged_files)} files",
             unit="B",
             unit_scale=True,
             smoothing=0,
@@ -693,11 +1026,15 @@ class StorableContainer(StorableContainerSynchronousProtocol):
                         syn, f"Upload from {manifest_path}", retries=retries
                     )
                     wrapped = notify_decorator(
-                        lambda items: upload_sync_files(items, syn=syn)
+                        lambda items: upload_sync_files(
+                            items, syn=syn, unchanged_files=unchanged_files
+                        )
                     )
                     uploaded_files = await wrapped(items)
                 else:
-                    uploaded_files = await upload_sync_files(items, syn=syn)
+                    uploaded_files = await upload_sync_files(
+                        items, syn=syn, unchanged_files=unchanged_files
+                    )
                 progress_bar.update(total_size - progress_bar.n)
             finally:
                 progress_bar.close()
@@ -863,6 +1200,8 @@ class StorableContainer(StorableContainerSynchronousProtocol):
         include_types: Optional[List[str]] = None,
         recursive: bool = True,
         display_ascii_tree: bool = False,
+        max_concurrency: Optional[int] = None,
+        ordered: bool = True,
         *,
         synapse_client: Optional[Synapse] = None,
         _newpath: Optional[str] = None,
@@ -892,6 +1231,14 @@ class StorableContainer(StorableContainerSynchronousProtocol):
             display_ascii_tree: If True, display an ASCII tree representation as the
                 container structure is traversed. Tree lines are printed incrementally
                 as each container is visited. Defaults to False.
+            max_concurrency: If set, the containers are listed concurrently with at
+                most this many containers being listed at the same time. Sub-containers
+                are listed as soon as their parent has been listed rather than one at a
+                time. Cannot be combined with `display_ascii_tree`.
+            ordered: Only used with `max_concurrency`. If True, the results are
+                yielded in the same order as the sequential walk. If False, the
+                results are yielded as soon as each container has been listed, a
+                container is still always yielded before its sub-containers.
             synapse_client: If not passed in and caching was not disabled by
                 `Synapse.allow_client_caching(False)` this will use the last created
                 instance from the Synapse class constructor.
@@ -908,6 +1255,9 @@ class StorableContainer(StorableContainerSynchronousProtocol):
                 - dirs: List of EntityHeader objects for subdirectories (folders)
                 - nondirs: List of EntityHeader objects for non-directory entities (files, tables, etc.)
 
+        Raises:
+            ValueError: If `max_concurrency` is combined with `display_ascii_tree`.
+
         Example: Traverse all entities in a container
             Basic usage - traverse all entities in a container
 
@@ -1030,6 +1380,31 @@ class StorableContainer(StorableContainerSynchronousProtocol):
         else:
             dirpath = (_newpath, self.id)
 
+        if max_concurrency is not None:
+            if display_ascii_tree:
+                raise ValueError(
+                    "display_ascii_tree cannot be used together with max_concurrency."
+                )
+            async for child_dirpath, dirs, nondirs in walk_children(
+                parent=self.id,
+                parent_path=dirpath[0],
+                include_types=include_types,
+                recursive=recursive,
+                max_concurrency=max_concurrency,
+                ordered=ordered,
+                dir_sort_key=lambda child: child["name"],
+                synapse_client=synapse_client,
+            ):
+                yield (
+                    child_dirpath,
+                    [EntityHeader().fill_from_dict(synapse_response=d) for d in dirs],
+                    [
+                        EntityHeader().fill_from_dict(synapse_response=n)
+                        for n in nondirs
+                    ],
+                )
+            return
+
         all_children: List[EntityHeader] = []
         async for child in get_children(
             parent=self.id,
@@ -1147,6 +1522,8 @@ class StorableContainer(StorableContainerSynchronousProtocol):
         include_types: Optional[List[str]] = None,
         recursive: bool = True,
         display_ascii_tree: bool = False,
+        max_concurrency: Optional[int] = None,
+        ordered: bool = True,
         *,
         synapse_client: Optional[Synapse] = None,
         _newpath: Optional[str] = None,
@@ -1176,6 +1553,14 @@ class StorableContainer(StorableContainerSynchronousProtocol):
             display_ascii_tree: If True, display an ASCII tree representation as the
                 container structure is traversed. Tree lines are printed incrementally
                 as each container is visited. Defaults to False.
+            max_concurrency: If set, the containers are listed concurrently with at
+                most this many containers being listed at the same time. Sub-containers
+                are listed as soon as their parent has been listed rather than one at a
+                time. Cannot be combined with `display_ascii_tree`.
+            ordered: Only used with `max_concurrency`. If True, the results are
+                yielded in the same order as the sequential walk. If False, the
+                results are yielded as soon as each container has been listed, a
+                container is still always yielded before its sub-containers.
             synapse_client: If not passed in and caching was not disabled by
                 `Synapse.allow_client_caching(False)` this will use the last created
                 instance from the Synapse class constructor.
@@ -1192,6 +1577,9 @@ class StorableContainer(StorableContainerSynchronousProtocol):
                 - dirs: List of EntityHeader objects for subdirectories (folders)
                 - nondirs: List of EntityHeader objects for non-directory entities (files, tables, etc.)
 
+        Raises:
+            ValueError: If `max_concurrency` is combined with `display_ascii_tree`.
+
         Example: Traverse all entities in a container
             Basic usage - traverse all entities in a container
 
@@ -1286,6 +1674,8 @@ class StorableContainer(StorableContainerSynchronousProtocol):
             include_types=include_types,
             recursive=recursive,
             display_ascii_tree=display_ascii_tree,
+            max_concurrency=max_concurrency,
+            ordered=ordered,
             synapse_client=synapse_client,
             _newpath=_newpath,
             _tree_prefix=_tree_prefix,
@@ -10,9 +10,21 @@ import uuid
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import partial
 from io import BytesIO
-from typing import Any, Dict, List, Optional, Protocol, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    Union,
+)
 
+from opentelemetry import trace
 from tqdm import tqdm
 from tqdm.contrib.logging import logging_redirect_tqdm
 from typing_extensions import Self
@@ -35,6 +47,7 @@ from synapseclient.core.download.download_functions import (
     ensure_download_location_is_directory,
 )
 from synapseclient.core.exceptions import SynapseTimeoutError
+from synapseclient.core.otel_config import get_meter
 from synapseclient.core.typing_utils import DataFrame as DATA_FRAME_TYPE
 from synapseclient.core.typing_utils import Series as SERIES_TYPE
 from synapseclient.core.upload.multipart_upload_async import (
@@ -111,6 +124,25 @@ RESERVED_COLUMN_NAMES = [
     "ROW_HASH_CODE",
 ]
 
+QUERY_COUNT_PART_MASK = 0x2
+LAST_UPDATED_ON_PART_MASK = 0x80
+
+# The number of etags that are looked up in a view by a single query while waiting
+# for the view to become consistent, and the bounds of the time between polls
+ETAG_PROBE_CHUNK_SIZE = 1000
+EVENTUAL_CONSISTENCY_MIN_POLL_INTERVAL = 1
+EVENTUAL_CONSISTENCY_MAX_POLL_INTERVAL = 30
+
+EVENTUAL_CONSISTENCY_WAIT_HISTOGRAM = get_meter().create_histogram(
+    name="synapse.view.eventual_consistency.wait.duration",
+    unit="s",
+    description="Time spent waiting for changes to show up in a view",
+)
+
+# The number of rows that are measured at a time when inferring the maximum size
+# of a STRING column
+STRING_LENGTH_CHUNK_SIZE = 1_000_000
+
 LIST_COLUMN_TYPES = {
     "STRING_LIST",
     "INTEGER_LIST",
@@ -517,6 +549,10 @@ def _rowset_to_pandas_df(
     """
     Converts a Synapse table query rowset result to a pandas DataFrame.
 
+    The rows of every page are transposed into per-column lists in a single pass and
+    the DataFrame is constructed once after all pages have been read, rather than
+    building and concatenating a `pd.Series` per column for every page.
+
     Arguments:
         query_result_bundle: The query result bundle containing rows and headers from a Synapse
             table query. This is typically the response from a table query operation
@@ -533,62 +569,32 @@ def _rowset_to_pandas_df(
         A pandas DataFrame containing all the query results.
     """
     test_import_pandas()
-    import collections
-
     import pandas as pd
 
-    def construct_rownames(query_result_bundle, offset=0):
-        try:
-            return (
-                row_labels_from_rows(
-                    query_result_bundle.query_result.query_results.rows
-                )
-                if row_id_and_version_in_index
-                else None
-            )
-        except KeyError:
-            # if we don't have row id and version, just number the rows
-            # python3 cast range to list for safety
-            return list(range(offset, offset + len(rowset["rows"])))
-
-    # first page of rows
-    offset = 0
-    rownames = construct_rownames(query_result_bundle, offset)
     query_result = query_result_bundle.query_result
     rowset = query_result.query_results
 
     if not rowset:
         raise ValueError("The provided query_result_bundle has no 'rowset' data.")
 
-    rows = rowset.rows or []
-    headers = rowset.headers
-
-    offset += len(rows)
-    series = collections.OrderedDict()
-
-    if not row_id_and_version_in_index:
-        # Since we use an OrderedDict this must happen before we construct the other columns
-        # add row id, verison, and etag as rows
-        append_etag = False  # only useful when (not row_id_and_version_in_index), hooray for lazy variables!
-        series["ROW_ID"] = pd.Series(name="ROW_ID", data=[row.row_id for row in rows])
-        series["ROW_VERSION"] = pd.Series(
-            name="ROW_VERSION",
-            data=[row.version_number for row in rows],
-        )
+    headers = rowset.headers or []
+    table_id = rowset.table_id
+    row_ids = []
+    row_versions = []
+    row_etags = []
+    columns = [[] for _ in headers]
 
-        row_etag = [row.etag for row in rows]
-        if any(row_etag):
-            append_etag = True
-            series["ROW_ETAG"] = pd.Series(name="ROW_ETAG", data=row_etag)
-
-    for i, header in enumerate(headers):
-        column_name = header.name
-        series[column_name] = pd.Series(
-            name=column_name,
-            data=[row.values[i] for row in rows],
-            index=rownames,
-        )
+    def append_page(rows: List[Row]) -> None:
+        if not rows:
+            return
+        row_ids.extend([row.row_id for row in rows])
+        row_versions.extend([row.version_number for row in rows])
+        row_etags.extend([row.etag for row in rows])
+        for column, values in zip(columns, zip(*(row.values for row in rows))):
+            column.extend(values)
 
+    # first page of rows
+    append_page(rowset.rows)
     next_page_token = query_result.next_page_token
 
     while next_page_token:
@@ -596,46 +602,29 @@ def _rowset_to_pandas_df(
         # see RowSet: https://rest-docs.synapse.org/rest/org/sagebionetworks/repo/model/table/RowSet.html
         result = _query_table_next_page(
             next_page_token=next_page_token,
-            table_id=rowset.table_id,
+            table_id=table_id,
             synapse_client=synapse_client,
         )
-        rowset = result.query_result.query_results
+        append_page(result.query_result.query_results.rows)
         next_page_token = result.query_result.next_page_token
 
-        rownames = construct_rownames(rowset, offset)
-        offset += len(rowset.rows)
-
-        if not row_id_and_version_in_index:
-            # TODO: Look into why this isn't being assigned
-            series["ROW_ID"].append(
-                pd.Series(name="ROW_ID", data=[row.id for row in rowset.rows])
-            )
-            series["ROW_VERSION"].append(
-                pd.Series(
-                    name="ROW_VERSION",
-                    data=[row.version_number for row in rowset.rows],
-                )
-            )
-            if append_etag:
-                series["ROW_ETAG"] = pd.Series(
-                    name="ROW_ETAG",
-                    data=[row.etag for row in rowset.rows],
-                )
+    has_etag = any(row_etags)
+    series = OrderedDict()
+    index = None
+    if row_id_and_version_in_index:
+        index = row_labels_from_id_and_version(
+            (row_id, version, etag) if etag else (row_id, version)
+            for row_id, version, etag in zip(row_ids, row_versions, row_etags)
+        )
+    else:
+        # Since we use an OrderedDict this must happen before we construct the other columns
+        series["ROW_ID"] = pd.Series(name="ROW_ID", data=row_ids)
+        series["ROW_VERSION"] = pd.Series(name="ROW_VERSION", data=row_versions)
+        if has_etag:
+            series["ROW_ETAG"] = pd.Series(name="ROW_ETAG", data=row_etags)
 
-        for i, header in enumerate(rowset.headers):
-            column_name = header.name
-            series[column_name] = pd.concat(
-                [
-                    series[column_name],
-                    pd.Series(
-                        name=column_name,
-                        data=[row.values[i] for row in rowset.rows],
-                        index=rownames,
-                    ),
-                ],
-                # can't verify integrity when indices are just numbers instead of 'rowid_rowversion'
-                verify_integrity=row_id_and_version_in_index,
-            )
+    for header, values in zip(headers, columns):
+        series[header.name] = pd.Series(name=header.name, data=values, index=index)
 
     return pd.DataFrame(data=series)
 
@@ -1937,6 +1926,304 @@ def _construct_partial_rows_for_upsert(
     )
 
 
+_ROW_HASH_SCALAR_KINDS = {
+    "string": "str",
+    "integer": "int",
+    "boolean": "bool",
+    "floating": "float",
+}
+
+_ROW_HASH_NUMERIC_COLUMN_TYPES = {
+    ColumnType.DOUBLE: "float64",
+    ColumnType.INTEGER: "int64",
+    ColumnType.DATE: "int64",
+}
+
+
+def _canonical_cell_for_row_hash(cell: Any) -> str:
+    """
+    Convert a single cell into a canonical string so that equal values hash
+    equally regardless of whether they came from the local data or from Synapse.
+    Missing values and empty lists are both treated as a NULL cell, which matches
+    how `_construct_partial_rows_for_upsert` compares them. Scalars are prefixed
+    with their type so that `1` and `"1"` are not considered equal.
+
+    Arguments:
+        cell: The cell to convert.
+
+    Returns:
+        The canonical representation of the cell.
+    """
+    from pandas import isna
+
+    if hasattr(cell, "tolist") and not isinstance(cell, str):
+        cell = cell.tolist()
+    if isinstance(cell, (list, tuple)):
+        if not cell:
+            return "null"
+        return json.dumps(list(cell), sort_keys=True, default=str)
+    if isinstance(cell, dict):
+        return json.dumps(cell, sort_keys=True, default=str)
+    if isna(cell):
+        return "null"
+    return f"{type(cell).__name__}:{cell}"
+
+
+def _canonical_column_for_row_hash(
+    column: SERIES_TYPE, column_type: Optional[ColumnType] = None
+) -> SERIES_TYPE:
+    """
+    Convert a column into the canonical strings of
+    [_canonical_cell_for_row_hash][synapseclient.models.mixins.table_components._canonical_cell_for_row_hash].
+    Numbers in DOUBLE, INTEGER and DATE columns are converted to the type of the
+    Synapse column, so `1` and `1.0` hash equally whichever dtype pandas inferred
+    for each side. Other columns that only hold strings, integers, booleans or
+    floats are converted with vectorized operations, anything else is converted
+    cell by cell.
+
+    Arguments:
+        column: The column to convert.
+        column_type: The type of the Synapse column the cells belong to.
+
+    Returns:
+        The canonical representation of every cell in the column.
+    """
+    from pandas import Series
+    from pandas.api.types import infer_dtype
+
+    kind = infer_dtype(column, skipna=True)
+    numeric_dtype = _ROW_HASH_NUMERIC_COLUMN_TYPES.get(column_type)
+    if numeric_dtype and kind in ("integer", "floating", "mixed-integer-float"):
+        present = column.notna()
+        numbers = column[present].astype("float64")
+        if numeric_dtype == "int64" and not (numbers % 1 == 0).all():
+            # A fraction in an INTEGER column must not be truncated into a match
+            numeric_dtype = "float64"
+        if numeric_dtype == "int64":
+            numbers = column[present].astype("int64")
+        canonical = Series("null", index=column.index, dtype=object)
+        canonical[present] = f"{numeric_dtype}:" + numbers.astype(str)
+        return canonical
+    if kind in _ROW_HASH_SCALAR_KINDS:
+        canonical = f"{_ROW_HASH_SCALAR_KINDS[kind]}:" + column.astype(str)
+        return canonical.where(column.notna(), "null")
+    if kind == "empty":
+        return column.astype(object).where(column.notna(), "null")
+    return column.map(_canonical_cell_for_row_hash)
+
+
+def _hash_cells_for_upsert(
+    df: DATA_FRAME_TYPE, columns: List[str], column_types: Dict[str, ColumnType]
+) -> Tuple[DATA_FRAME_TYPE, SERIES_TYPE]:
+    """
+    Hash every cell of `columns` in the DataFrame, and combine the cell hashes of
+    each row into a single row hash. Only the 64-bit hashes are kept, the canonical
+    strings of a column are discarded as soon as they have been hashed.
+
+    Arguments:
+        df: The DataFrame to hash.
+        columns: The columns to include in the hashes.
+        column_types: The type of the Synapse column of each of `columns`.
+
+    Returns:
+        A tuple containing a DataFrame of the cell hashes with the same index as
+        `df`, and a Series of the row hashes.
+    """
+    from pandas import DataFrame
+    from pandas.util import hash_pandas_object
+
+    cell_hashes = DataFrame(
+        {
+            column: hash_pandas_object(
+                _canonical_column_for_row_hash(df[column], column_types[column]),
+                index=False,
+            ).to_numpy()
+            for column in columns
+        },
+        index=df.index,
+        dtype="uint64",
+    )
+    if not columns:
+        return cell_hashes, cell_hashes.sum(axis=1).astype("uint64")
+    return cell_hashes, hash_pandas_object(cell_hashes, index=False)
+
+
+def _partial_row_value_for_upsert(cell: Any, column_type: ColumnType) -> Any:
+    """
+    Convert a cell that is being upserted into the value sent in a PartialRow.
+    Missing values and empty lists clear the cell in Synapse.
+
+    Arguments:
+        cell: The cell that is being upserted.
+        column_type: The type of the column the cell belongs to.
+
+    Returns:
+        The value for the PartialRow.
+    """
+    if _canonical_cell_for_row_hash(cell) == "null":
+        return None
+    return _convert_pandas_row_to_python_types(cell=cell, column_type=column_type)
+
+
+def _validate_primary_keys_for_upsert(
+    entity: TableBase, primary_keys: List[str]
+) -> None:
+    """
+    Check that every column in `primary_keys` may be used to match rows.
+
+    Arguments:
+        primary_keys: A list of the columns that are used to determine if a row
+            already exists in the table.
+
+    Raises:
+        ValueError: If a primary key is a LIST or JSON column.
+    """
+    for upsert_column in primary_keys:
+        column_type = entity.columns[upsert_column].column_type
+        if column_type in LIST_COLUMN_TYPES or column_type == ColumnType.JSON:
+            raise ValueError(
+                f"Column type {column_type} is not supported for primary_keys"
+            )
+
+
+async def _construct_partial_rows_with_row_hashes(
+    entity: TableBase,
+    values: DATA_FRAME_TYPE,
+    primary_keys: List[str],
+    contains_etag: bool,
+    wait_for_eventually_consistent_view: bool,
+    synapse_client: Synapse,
+) -> Tuple[List[PartialRow], List[int], List[int], Dict[str, str]]:
+    """
+    Determine which rows of `values` need to be updated without querying Synapse
+    for every primary key. A single query through the CSV download path fetches
+    the primary keys, `ROW_ID`, `ROW_VERSION` and the upserted columns of the
+    whole table. Both sides are reduced to per-cell hashes, the rows are matched
+    with a join on `primary_keys`, and PartialRow objects are only built for the
+    rows whose hash differs.
+
+    Synapse SQL does not offer a hash function, so the row hashes of the
+    remote rows are calculated on the client as soon as the query results are
+    loaded.
+
+    Arguments:
+        values: The DataFrame that contains the data that is being upserted.
+        primary_keys: A list of the columns that are used to determine if a row
+            already exists in the table.
+        contains_etag: If True, the ROW_ETAG column is queried and added to the
+            PartialRow objects.
+        wait_for_eventually_consistent_view: If True, the id column is queried so
+            the changes may be tracked in the view.
+        synapse_client: The Synapse client to use to query the table.
+
+    Returns:
+        The same tuple as
+        [_construct_partial_rows_for_upsert][synapseclient.models.mixins.table_components._construct_partial_rows_for_upsert].
+    """
+    _validate_primary_keys_for_upsert(entity=entity, primary_keys=primary_keys)
+    compare_columns = [
+        column
+        for column in values.columns
+        if column in entity.columns and column not in primary_keys
+    ]
+
+    # `ROW_ID` and `ROW_VERSION` are always included in the query results
+    select_columns = []
+    if contains_etag:
+        select_columns.append("ROW_ETAG")
+    if wait_for_eventually_consistent_view:
+        select_columns.append("id")
+    select_columns.extend(
+        f'"{column}"'
+        for column in primary_keys + compare_columns
+        if column not in select_columns
+    )
+    results = await entity.query_async(
+        query=f"SELECT {', '.join(select_columns)} FROM {entity.id}",
+        synapse_client=synapse_client,
+    )
+    results = results.dropna(subset=primary_keys)
+
+    for name, df in (("data being upserted", values), ("table", results)):
+        duplicated = df.duplicated(subset=primary_keys, keep=False) & df[
+            primary_keys
+        ].notna().all(axis=1)
+        if duplicated.any():
+            raise ValueError(
+                f"The values for the keys being upserted must be unique in the {name}: "
+                f"[{df.loc[duplicated, primary_keys]}]"
+            )
+
+    column_types = {
+        column: entity.columns[column].column_type for column in compare_columns
+    }
+    local_cell_hashes, local_row_hashes = _hash_cells_for_upsert(
+        df=values, columns=compare_columns, column_types=column_types
+    )
+    remote_cell_hashes, remote_row_hashes = _hash_cells_for_upsert(
+        df=results, columns=compare_columns, column_types=column_types
+    )
+    matches = (
+        values[primary_keys]
+        .assign(_local_index=values.index, _local_hash=local_row_hashes.to_numpy())
+        .merge(
+            results[primary_keys].assign(
+                _remote_index=results.index,
+                _remote_hash=remote_row_hashes.to_numpy(),
+            ),
+            on=primary_keys,
+            how="inner",
+        )
+    )
+    unchanged = matches["_local_hash"] == matches["_remote_hash"]
+    changed = matches.loc[~unchanged]
+
+    cells_differ = (
+        local_cell_hashes.loc[changed["_local_index"]].to_numpy()
+        != remote_cell_hashes.loc[changed["_remote_index"]].to_numpy()
+    )
+    local_values = values.loc[changed["_local_index"], compare_columns].to_numpy()
+    remote_rows = results.loc[changed["_remote_index"]]
+    row_etags = (
+        remote_rows["ROW_ETAG"].tolist() if contains_etag else [None] * len(changed)
+    )
+    column_models = [entity.columns[column] for column in compare_columns]
+
+    rows_to_update: List[PartialRow] = []
+    syn_id_and_etags = {}
+    for position, (row_id, row_etag) in enumerate(
+        zip(remote_rows["ROW_ID"].tolist(), row_etags)
+    ):
+        rows_to_update.append(
+            PartialRow(
+                row_id=row_id,
+                etag=row_etag,
+                values=[
+                    {
+                        "key": column_models[column_position].id,
+                        "value": _partial_row_value_for_upsert(
+                            cell=local_values[position, column_position],
+                            column_type=column_models[column_position].column_type,
+                        ),
+                    }
+                    for column_position, differs in enumerate(cells_differ[position])
+                    if differs
+                ],
+            )
+        )
+        if wait_for_eventually_consistent_view and row_etag:
+            syn_id = remote_rows["id"].iat[position]
+            if syn_id:
+                syn_id_and_etags[syn_id] = row_etag
+
+    return (
+        rows_to_update,
+        changed["_local_index"].tolist(),
+        matches.loc[unchanged, "_local_index"].tolist(),
+        syn_id_and_etags,
+    )
+
+
 async def _push_row_updates_to_synapse(
     entity: TableBase,
     rows_to_update: List[PartialRow],
@@ -1991,6 +2278,64 @@ async def _push_row_updates_to_synapse(
     return results
 
 
+async def _count_etags_in_view(
+    entity: ViewBase, etags: List[str], synapse_client: Synapse
+) -> Tuple[int, Optional[str]]:
+    """
+    Count how many of the etags are still found in the view. Only the count and
+    the last updated on date of the view are requested, no rows are returned.
+
+    Arguments:
+        etags: The etags to look for.
+        synapse_client: The Synapse client to use to query the view.
+
+    Returns:
+        A tuple of the number of etags found in the view, and the date-time when
+        the view was last updated.
+    """
+    quoted_etags = [f"'{etag}'" for etag in etags]
+    bundle = await _table_query(
+        query=f"select etag from {entity.id} where etag IN ({','.join(quoted_etags)})",
+        synapse_client=synapse_client,
+        results_as="rowset",
+        part_mask=QUERY_COUNT_PART_MASK | LAST_UPDATED_ON_PART_MASK,
+    )
+    return bundle.query_count or 0, bundle.last_updated_on
+
+
+async def _probe_etags_in_view(
+    entity: ViewBase,
+    etags: List[str],
+    count: int,
+    synapse_client: Synapse,
+) -> List[str]:
+    """
+    Determine which of the etags are still found in the view. The rows are only
+    queried when some, but not all, of the etags were found.
+
+    Arguments:
+        etags: The etags to look for.
+        count: The number of etags that were found by `_count_etags_in_view`.
+        synapse_client: The Synapse client to use to query the view.
+
+    Returns:
+        The etags that are still found in the view.
+    """
+    if count == 0:
+        return []
+    if count >= len(etags):
+        return etags
+
+    quoted_etags = [f"'{etag}'" for etag in etags]
+    results = await entity.query_async(
+        query=f"select etag from {entity.id} where etag IN ({','.join(quoted_etags)})",
+        synapse_client=synapse_client,
+        include_row_id_and_row_version=False,
+    )
+    etags_in_results = set(results["etag"].values)
+    return [etag for etag in etags if etag in etags_in_results]
+
+
 async def _wait_for_eventually_consistent_changes(
     entity: TableBase,
     original_synids_and_etags_to_track: Dict[str, str],
@@ -2005,6 +2350,17 @@ async def _wait_for_eventually_consistent_changes(
     the view has not yet been updated with the changes that were made. This method
     will wait for the changes to be reflected in the view.
 
+    The etags are probed in chunks of `ETAG_PROBE_CHUNK_SIZE`, and each probe
+    first asks Synapse only for the number of matching rows. The rows are only
+    downloaded for a chunk that has partially been updated. The first probe of
+    every poll also returns the last updated on date of the view, if it did not
+    change since the previous poll the remaining chunks are not probed. The time
+    between polls doubles, up to `EVENTUAL_CONSISTENCY_MAX_POLL_INTERVAL` seconds,
+    while no progress is made and is reset whenever an etag disappears.
+
+    The time spent waiting is recorded in the
+    `synapse.view.eventual_consistency.wait.duration` histogram.
+
     Arguments:
         original_synids_and_etags_to_track: A dictionary of the synapse IDs for the
             key with the etag of the row that was changed.
@@ -2029,46 +2385,103 @@ async def _wait_for_eventually_consistent_changes(
                 for (
                     entity_with_change
                 ) in row_update_result.entities_with_changes_applied:
-                    etags_to_track.append(
-                        original_synids_and_etags_to_track.get(entity_with_change)
-                    )
-        number_of_changes_to_wait_for = len(etags_to_track)
+                    etag = original_synids_and_etags_to_track.get(entity_with_change)
+                    if etag:
+                        etags_to_track.append(etag)
+        pending_chunks = [
+            etags_to_track[i : i + ETAG_PROBE_CHUNK_SIZE]
+            for i in range(0, len(etags_to_track), ETAG_PROBE_CHUNK_SIZE)
+        ]
         progress_bar = tqdm(
-            total=number_of_changes_to_wait_for,
+            total=len(etags_to_track),
             desc="Waiting for eventually-consistent changes to show up in the view",
             unit_scale=True,
             smoothing=0,
         )
         start_time = time.time()
+        poll_interval = EVENTUAL_CONSISTENCY_MIN_POLL_INTERVAL
+        previous_last_updated_on = None
+        timed_out = False
+
+        try:
+            while pending_chunks:
+                count, last_updated_on = await _count_etags_in_view(
+                    entity=entity,
+                    etags=pending_chunks[0],
+                    synapse_client=synapse_client,
+                )
+                counts = [count]
+                if (
+                    count < len(pending_chunks[0])
+                    or previous_last_updated_on is None
+                    or last_updated_on != previous_last_updated_on
+                ):
+                    counts.extend(
+                        chunk_count
+                        for chunk_count, _ in await asyncio.gather(
+                            *[
+                                _count_etags_in_view(
+                                    entity=entity,
+                                    etags=chunk,
+                                    synapse_client=synapse_client,
+                                )
+                                for chunk in pending_chunks[1:]
+                            ]
+                        )
+                    )
+                else:
+                    # The view has not been updated since the last poll
+                    counts.extend(len(chunk) for chunk in pending_chunks[1:])
+                previous_last_updated_on = last_updated_on
+
+                remaining_chunks = await asyncio.gather(
+                    *[
+                        _probe_etags_in_view(
+                            entity=entity,
+                            etags=chunk,
+                            count=chunk_count,
+                            synapse_client=synapse_client,
+                        )
+                        for chunk, chunk_count in zip(pending_chunks, counts)
+                    ]
+                )
+                number_of_changes_found = sum(
+                    len(chunk) - len(remaining)
+                    for chunk, remaining in zip(pending_chunks, remaining_chunks)
+                )
+                pending_chunks = [chunk for chunk in remaining_chunks if chunk]
+                progress_bar.update(number_of_changes_found)
+                progress_bar.refresh()
+                if not pending_chunks:
+                    break
 
-        while time.time() - start_time < wait_for_eventually_consistent_view_timeout:
-            quoted_etags = [f"'{etag}'" for etag in etags_to_track]
-            wait_select_statement = (
-                f"select etag from {entity.id} where etag IN ({','.join(quoted_etags)})"
+                if number_of_changes_found:
+                    poll_interval = EVENTUAL_CONSISTENCY_MIN_POLL_INTERVAL
+                remaining_time = wait_for_eventually_consistent_view_timeout - (
+                    time.time() - start_time
+                )
+                if remaining_time <= 0:
+                    timed_out = True
+                    raise SynapseTimeoutError(
+                        f"Timeout waiting for eventually consistent view: {time.time() - start_time} seconds"
+                    )
+                await asyncio.sleep(min(poll_interval, remaining_time))
+                poll_interval = min(
+                    poll_interval * 2, EVENTUAL_CONSISTENCY_MAX_POLL_INTERVAL
+                )
+        finally:
+            progress_bar.close()
+            wait_time = time.time() - start_time
+            EVENTUAL_CONSISTENCY_WAIT_HISTOGRAM.record(
+                wait_time,
+                {"synapse.id": entity.id, "synapse.timed_out": timed_out},
             )
-            results = await entity.query_async(
-                query=wait_select_statement,
-                synapse_client=synapse_client,
-                include_row_id_and_row_version=False,
+            trace.get_current_span().set_attributes(
+                {"synapse.eventual_consistency.wait_seconds": wait_time}
             )
-
-            etags_in_results = results["etag"].values
-            etags_to_remove = []
-            for etag in etags_to_track:
-                if etag not in etags_in_results:
-                    etags_to_remove.append(etag)
-            for etag in etags_to_remove:
-                etags_to_track.remove(etag)
-                progress_bar.update(1)
-
-            progress_bar.refresh()
-            if not etags_to_track:
-                progress_bar.close()
-                break
-            await asyncio.sleep(1)
-        else:
-            raise SynapseTimeoutError(
-                f"Timeout waiting for eventually consistent view: {time.time() - start_time} seconds"
+            synapse_client.logger.debug(
+                f"[{entity.id}]: Waited {wait_time:.1f} seconds for "
+                f"{len(etags_to_track)} changes to show up in the view"
             )
 
 
@@ -2084,6 +2497,7 @@ async def _upsert_rows_async(
     job_timeout: int = 600,
     wait_for_eventually_consistent_view: bool = False,
     wait_for_eventually_consistent_view_timeout: int = 600,
+    use_row_hashes: bool = False,
     synapse_client: Optional[Synapse] = None,
     **kwargs,
 ) -> None:
@@ -2140,38 +2554,22 @@ async def _upsert_rows_async(
             unit_scale=True,
             smoothing=0,
         )
-        for individual_chunk in chunk_list:
-            select_statement = _construct_select_statement_for_upsert(
-                entity=entity,
-                df=individual_chunk,
-                all_columns_from_df=all_columns_from_df,
-                primary_keys=primary_keys,
-                wait_for_eventually_consistent_view=wait_for_eventually_consistent_view,
-            )
-
-            results = await entity.query_async(
-                query=select_statement, synapse_client=synapse_client
-            )
-            # Replace pd.NA with None for int64/float64 columns to avoid JSON serialization issues
-            results = convert_dtypes_to_json_serializable(results)
+        if use_row_hashes:
             (
                 rows_to_update,
-                indexes_with_updates,
-                indexes_without_updates,
-                syn_id_and_etag_dict,
-            ) = _construct_partial_rows_for_upsert(
+                indexes_of_original_df_with_changes,
+                indexes_of_original_df_with_no_changes,
+                original_synids_and_etags_to_track,
+            ) = await _construct_partial_rows_with_row_hashes(
                 entity=entity,
-                results=results,
-                chunk_to_check_for_upsert=individual_chunk,
+                values=values,
                 primary_keys=primary_keys,
                 contains_etag=contains_etag,
                 wait_for_eventually_consistent_view=wait_for_eventually_consistent_view,
+                synapse_client=client,
             )
-            total_row_count_to_update += len(rows_to_update)
-            indexes_of_original_df_with_changes.extend(indexes_with_updates)
-            indexes_of_original_df_with_no_changes.extend(indexes_without_updates)
-            if syn_id_and_etag_dict:
-                original_synids_and_etags_to_track.update(syn_id_and_etag_dict)
+            total_row_count_to_update = len(rows_to_update)
+            progress_bar.update(len(values.index) - len(rows_to_update))
             if not dry_run and rows_to_update:
                 row_update_results = await _push_row_updates_to_synapse(
                     entity=entity,
@@ -2183,9 +2581,53 @@ async def _upsert_rows_async(
                 )
             elif dry_run:
                 progress_bar.update(len(rows_to_update))
-            progress_bar.update(len(individual_chunk.index) - len(rows_to_update))
+        else:
+            for individual_chunk in chunk_list:
+                select_statement = _construct_select_statement_for_upsert(
+                    entity=entity,
+                    df=individual_chunk,
+                    all_columns_from_df=all_columns_from_df,
+                    primary_keys=primary_keys,
+                    wait_for_eventually_consistent_view=wait_for_eventually_consistent_view,
+                )
 
-            rows_to_update: List[PartialRow] = []
+                results = await entity.query_async(
+                    query=select_statement, synapse_client=synapse_client
+                )
+                # Replace pd.NA with None for int64/float64 columns to avoid JSON serialization issues
+                results = convert_dtypes_to_json_serializable(results)
+                (
+                    rows_to_update,
+                    indexes_with_updates,
+                    indexes_without_updates,
+                    syn_id_and_etag_dict,
+                ) = _construct_partial_rows_for_upsert(
+                    entity=entity,
+                    results=results,
+                    chunk_to_check_for_upsert=individual_chunk,
+                    primary_keys=primary_keys,
+                    contains_etag=contains_etag,
+                    wait_for_eventually_consistent_view=wait_for_eventually_consistent_view,
+                )
+                total_row_count_to_update += len(rows_to_update)
+                indexes_of_original_df_with_changes.extend(indexes_with_updates)
+                indexes_of_original_df_with_no_changes.extend(indexes_without_updates)
+                if syn_id_and_etag_dict:
+                    original_synids_and_etags_to_track.update(syn_id_and_etag_dict)
+                if not dry_run and rows_to_update:
+                    row_update_results = await _push_row_updates_to_synapse(
+                        entity=entity,
+                        rows_to_update=rows_to_update,
+                        update_size_bytes=update_size_bytes,
+                        progress_bar=progress_bar,
+                        client=client,
+                        job_timeout=job_timeout,
+                    )
+                elif dry_run:
+                    progress_bar.update(len(rows_to_update))
+                progress_bar.update(len(individual_chunk.index) - len(rows_to_update))
+
+                rows_to_update: List[PartialRow] = []
         progress_bar.update(progress_bar.total - progress_bar.n)
         progress_bar.refresh()
         progress_bar.close()
@@ -2246,6 +2688,7 @@ class TableUpsertMixin:
         update_size_bytes: int = 1.9 * MB,
         insert_size_bytes: int = 900 * MB,
         job_timeout: int = 600,
+        use_row_hashes: bool = False,
         synapse_client: Optional[Synapse] = None,
         **kwargs,
     ) -> None:
@@ -2371,6 +2814,16 @@ class TableUpsertMixin:
                 is reached a `SynapseTimeoutError` will be raised.
                 The default is 600 seconds
 
+            use_row_hashes: If set to True the existing rows are not queried with the
+                values of the `primary_keys` in chunks of `rows_per_query`. Instead a
+                single query downloads the `primary_keys` and the upserted columns
+                of the whole table, every row on both sides is reduced to a hash,
+                and the rows are matched with a join on the `primary_keys`. Updates
+                are only sent for rows whose hash differs. This is much faster when
+                upserting a large portion of a table, but it reads the entire table,
+                so leave it off when upserting a handful of rows into a large table.
+                The default is False.
+
             synapse_client: If not passed in and caching was not disabled by
                 `Synapse.allow_client_caching(False)` this will use the last created
                 instance from the Synapse class constructor
@@ -2474,6 +2927,7 @@ class TableUpsertMixin:
             update_size_bytes=update_size_bytes,
             insert_size_bytes=insert_size_bytes,
             job_timeout=job_timeout,
+            use_row_hashes=use_row_hashes,
             synapse_client=synapse_client,
             **kwargs,
         )
@@ -3168,6 +3622,7 @@ class TableStoreRowMixin:
         self,
         values: DATA_FRAME_TYPE,
         column_expansion_strategy: ColumnExpansionStrategy,
+        sample_size: Optional[int] = None,
     ) -> None:
         """
         Infer the columns from the data that is being stored. This method is used
@@ -3182,12 +3637,16 @@ class TableStoreRowMixin:
                 to be expanded to a larger size if the data being stored exceeds the
                 limit. A limit to list length is also enforced in Synapse by automatic
                 expansion for lists is not yet supported through this interface.
+            sample_size: The number of rows that are inspected to infer the type of
+                `object` columns. When not set every row is inspected.
 
         Returns:
             None, but the columns on the table will be updated to reflect the inferred
             columns from the data that is being stored.
         """
-        infered_columns = infer_column_type_from_data(values=values)
+        infered_columns = infer_column_type_from_data(
+            values=values, sample_size=sample_size
+        )
 
         modified_ordered_dict = OrderedDict()
         for column in self.columns.values():
@@ -3229,6 +3688,8 @@ class TableStoreRowMixin:
         read_csv_kwargs: Optional[Dict[str, Any]] = None,
         to_csv_kwargs: Optional[Dict[str, Any]] = None,
         job_timeout: int = 600,
+        upload_pipeline_depth: int = 2,
+        schema_inference_sample_size: Optional[int] = None,
         synapse_client: Optional[Synapse] = None,
     ) -> None:
         """
@@ -3300,6 +3761,7 @@ class TableStoreRowMixin:
                     FileSystem-->>Table: Return bytes
                     Table->>Synapse: Upload CSV chunk
                     Synapse-->>Table: Return `file_handle_id`
+                    note over Table, Synapse: Up to `upload_pipeline_depth` chunks upload while the previous transaction is applied
                     Table->>Synapse: Send 'TableUpdateTransaction' to append/update rows
                     Synapse-->>Table: Transaction result
                 end
@@ -3456,6 +3918,22 @@ class TableStoreRowMixin:
                 is reached a `SynapseTimeoutError` will be raised.
                 The default is 600 seconds
 
+            upload_pipeline_depth: When the data is larger than `insert_size_bytes`
+                it is split into chunks of `insert_size_bytes / upload_pipeline_depth`
+                bytes. Up to this many chunks are uploaded while Synapse is applying
+                the previous transaction, and chunks that finished uploading are
+                appended together in a single transaction when their combined size
+                fits within `insert_size_bytes`. Transactions are always applied in
+                the order of the data. A value of 1 uploads one chunk ahead of the
+                transaction that is being applied. The default is 2.
+
+            schema_inference_sample_size: Only used when `schema_storage_strategy`
+                is set to `INFER_FROM_DATA`. The number of randomly sampled rows that
+                are inspected to infer the type of columns that do not have a
+                numeric, boolean or datetime dtype. The maximum size of STRING
+                columns is always measured over every row. When not set every row is
+                inspected.
+
             synapse_client: If not passed in and caching was not disabled by
                 `Synapse.allow_client_caching(False)` this will use the last created
                 instance from the Synapse class constructor.
@@ -3670,7 +4148,9 @@ class TableStoreRowMixin:
 
         if schema_storage_strategy == SchemaStorageStrategy.INFER_FROM_DATA:
             self._infer_columns_from_data(
-                values=values, column_expansion_strategy=column_expansion_strategy
+                values=values,
+                column_expansion_strategy=column_expansion_strategy,
+                sample_size=schema_inference_sample_size,
             )
 
             schema_change_request = await self._generate_schema_change_request(
@@ -3695,6 +4175,7 @@ class TableStoreRowMixin:
                     client=client,
                     additional_changes=additional_changes,
                     job_timeout=job_timeout,
+                    upload_pipeline_depth=upload_pipeline_depth,
                 )
         elif isinstance(values, DataFrame):
             with logging_redirect_tqdm(loggers=[client.logger]):
@@ -3707,6 +4188,7 @@ class TableStoreRowMixin:
                     additional_changes=additional_changes,
                     job_timeout=job_timeout,
                     to_csv_kwargs=to_csv_kwargs,
+                    upload_pipeline_depth=upload_pipeline_depth,
                 )
 
         else:
@@ -3727,10 +4209,11 @@ class TableStoreRowMixin:
                 "AppendableRowSetRequest",
             ]
         ] = None,
+        file_handle_ids: List[str] = None,
     ) -> None:
         """
         Construct the request to send to Synapse to update the table with the
-        given file handle ID.
+        given file handle ID(s).
 
         This will also send the schema change request, or any additional changes
         that are passed in to the method.
@@ -3741,15 +4224,20 @@ class TableStoreRowMixin:
             file_handle_id: The file handle ID that is being uploaded to Synapse.
             changes: Additional changes to the table that should
                 execute within the same transaction as appending or updating rows.
+            file_handle_ids: Additional file handle IDs that are appended to the table
+                within the same transaction, one `UploadToTableRequest` per file
+                handle.
         """
         all_changes = []
         if changes:
             all_changes.extend(changes)
 
-        if file_handle_id:
+        for upload_file_handle_id in [file_handle_id, *(file_handle_ids or [])]:
+            if not upload_file_handle_id:
+                continue
             upload_request = UploadToTableRequest(
                 table_id=self.id,
-                upload_file_handle_id=file_handle_id,
+                upload_file_handle_id=upload_file_handle_id,
                 update_etag=None,
             )
             if table_descriptor:
@@ -3761,7 +4249,7 @@ class TableStoreRowMixin:
                 entity_id=self.id, changes=all_changes
             ).send_job_and_wait_async(synapse_client=client, timeout=job_timeout)
 
-    async def _stream_and_update_from_disk(
+    async def _upload_chunk_from_disk(
         self,
         client: Synapse,
         encoded_header: bytes,
@@ -3769,21 +4257,14 @@ class TableStoreRowMixin:
         path_to_csv: str,
         byte_chunk_offset: int,
         md5: str,
-        csv_table_descriptor: CsvTableDescriptor,
-        job_timeout: int,
-        progress_bar: tqdm,
-        wait_for_update_semaphore: asyncio.Semaphore,
         file_suffix: str,
-    ) -> None:
+    ) -> str:
         """
         Handle the process of reading in parts of the CSV we are going to be uploading
         into Synapse. Since the Synapse REST API has a limit of 1GB as the maximum
         size of a file that can be appended to a table, we must upload files that are
         larger than that in multiple requests.
 
-        After each chunk is uploaded we will send a `TableUpdateTransaction` to Synapse
-        to append the rows to the table.
-
         Arguments:
             client: The Synapse client that is being used to interact with the API.
             encoded_header: The header of the CSV file that is being uploaded.
@@ -3793,19 +4274,13 @@ class TableStoreRowMixin:
                 csv file for the current chunk. This is used to skip any parts of the
                 csv file that we have already uploaded.
             md5: The MD5 hash of the current chunk that is being uploaded.
-            csv_table_descriptor: The descriptor for the CSV file that is being uploaded.
-            job_timeout: The maximum amount of time to wait for a job to complete.
-            progress_bar: The progress bar that is being used to show the progress of
-                the upload.
-            wait_for_update_semaphore: The semaphore that is being used to wait for the
-                update to complete before moving on to the next chunk.
             file_suffix: The suffix that is being used to name the CSV file that is
-                being uploaded. Used in the progress bar message and the file name.
+                being uploaded.
 
         Returns:
-            None
+            The ID of the file handle that was created for the chunk.
         """
-        file_handle_id = await multipart_upload_partial_file_async(
+        return await multipart_upload_partial_file_async(
             syn=client,
             bytes_to_prepend=encoded_header,
             content_type="text/csv",
@@ -3815,19 +4290,8 @@ class TableStoreRowMixin:
             bytes_to_skip=byte_chunk_offset,
             md5=md5,
         )
-        # We are using a semaphore here because large tables can take a very long time
-        # for the update to complete. This will allow us to wait for the update to
-        # complete before moving on to the next chunk.
-        async with wait_for_update_semaphore:
-            await self._send_update(
-                client=client,
-                table_descriptor=csv_table_descriptor,
-                file_handle_id=file_handle_id,
-                job_timeout=job_timeout,
-            )
-            progress_bar.update(size_of_chunk)
 
-    async def _stream_and_update_from_df(
+    async def _upload_chunk_from_df(
         self,
         client: Synapse,
         df: DATA_FRAME_TYPE,
@@ -3837,25 +4301,12 @@ class TableStoreRowMixin:
         size_of_chunk: int,
         byte_chunk_offset: int,
         md5: str,
-        csv_table_descriptor: CsvTableDescriptor,
-        job_timeout: int,
-        progress_bar: tqdm,
-        wait_for_update_semaphore: asyncio.Semaphore,
         file_suffix: str,
-        changes: List[
-            Union[
-                "TableSchemaChangeRequest",
-                "UploadToTableRequest",
-                "AppendableRowSetRequest",
-            ]
-        ] = None,
         to_csv_kwargs: Optional[Dict[str, Any]] = None,
-    ) -> None:
+    ) -> str:
         """
         Organize the process of reading in and uploading parts of the DataFrame we are
-        going to be uploading into Synapse. Once the portion of the DataFrame is read
-        in we will send a `TableUpdateTransaction` to Synapse to append the rows to the
-        table.
+        going to be uploading into Synapse.
 
         Arguments:
             client: The Synapse client that is being used to interact with the API.
@@ -3870,20 +4321,15 @@ class TableStoreRowMixin:
                 DataFrame for the current chunk. This is used to skip any parts of the
                 DataFrame that we have already uploaded.
             md5: The MD5 hash of the current chunk that is being uploaded.
-            csv_table_descriptor: The descriptor for the CSV file that is being uploaded.
-            job_timeout: The maximum amount of time to wait for a job to complete.
-            progress_bar: The progress bar that is being used to show the progress of
-                the upload.
-            wait_for_update_semaphore: The semaphore that is being used to wait for the
-                update to complete before moving on to the next chunk.
             file_suffix: The suffix that is being used to name the CSV file that is
                 being uploaded.
-            changes: Additional changes to the table that should
-                execute within this transaction.
             to_csv_kwargs: Additional arguments to pass to the `pd.DataFrame.to_csv`
                 function when writing the data to a CSV file.
+
+        Returns:
+            The ID of the file handle that was created for the chunk.
         """
-        file_handle_id = await multipart_upload_dataframe_async(
+        return await multipart_upload_dataframe_async(
             syn=client,
             df=df,
             content_type="text/csv",
@@ -3896,18 +4342,93 @@ class TableStoreRowMixin:
             bytes_to_prepend=header,
             to_csv_kwargs=to_csv_kwargs,
         )
-        # We are using a semaphore here because large tables can take a very long time
-        # for the update to complete. This will allow us to wait for the update to
-        # complete before moving on to the next chunk.
-        async with wait_for_update_semaphore:
-            await self._send_update(
-                client=client,
-                table_descriptor=csv_table_descriptor,
-                file_handle_id=file_handle_id,
-                job_timeout=job_timeout,
-                changes=changes,
-            )
-            progress_bar.update(size_of_chunk)
+
+    async def _upload_chunks_and_apply(
+        self,
+        client: Synapse,
+        chunks: List[Tuple[int, Callable[[], Coroutine[Any, Any, str]]]],
+        csv_table_descriptor: CsvTableDescriptor,
+        job_timeout: int,
+        insert_size_bytes: int,
+        upload_pipeline_depth: int,
+        progress_bar: tqdm,
+        changes: List[
+            Union[
+                "TableSchemaChangeRequest",
+                "UploadToTableRequest",
+                "AppendableRowSetRequest",
+            ]
+        ] = None,
+    ) -> None:
+        """
+        Upload the chunks of a CSV to Synapse and append them to the table as a
+        pipeline. While a `TableUpdateTransaction` is being applied by Synapse, up to
+        `upload_pipeline_depth` of the following chunks are uploaded. Transactions are
+        applied in the order of the chunks, one at a time. When the transaction
+        before them completes, consecutive chunks that have already been uploaded are
+        appended within a single transaction as long as their combined size fits
+        within `insert_size_bytes`.
+
+        Arguments:
+            client: The Synapse client that is being used to interact with the API.
+            chunks: The chunks to upload, in order. Each chunk is a tuple of its size
+                in bytes and a function that starts the upload of the chunk and
+                returns the resulting file handle ID.
+            csv_table_descriptor: The descriptor for the CSV file that is being uploaded.
+            job_timeout: The maximum amount of time to wait for a job to complete.
+            insert_size_bytes: The maximum size of data that will be stored to Synapse
+                within a single transaction.
+            upload_pipeline_depth: The maximum number of chunks that are uploaded, or
+                uploading, ahead of the transaction that is being applied.
+            progress_bar: The progress bar that is being used to show the progress of
+                the upload.
+            changes: Additional changes to the table that should execute within the
+                first transaction.
+        """
+        upload_pipeline_depth = max(1, upload_pipeline_depth)
+        upload_tasks: List[asyncio.Task] = []
+        next_chunk_to_apply = 0
+
+        def start_uploads() -> None:
+            while (
+                len(upload_tasks) < len(chunks)
+                and len(upload_tasks) - next_chunk_to_apply < upload_pipeline_depth
+            ):
+                _, start_upload = chunks[len(upload_tasks)]
+                upload_tasks.append(asyncio.create_task(start_upload()))
+
+        try:
+            start_uploads()
+            while next_chunk_to_apply < len(chunks):
+                file_handle_ids = [await upload_tasks[next_chunk_to_apply]]
+                size_of_transaction = chunks[next_chunk_to_apply][0]
+                next_chunk_to_apply += 1
+                while (
+                    next_chunk_to_apply < len(upload_tasks)
+                    and upload_tasks[next_chunk_to_apply].done()
+                    and size_of_transaction + chunks[next_chunk_to_apply][0]
+                    <= insert_size_bytes
+                ):
+                    file_handle_ids.append(upload_tasks[next_chunk_to_apply].result())
+                    size_of_transaction += chunks[next_chunk_to_apply][0]
+                    next_chunk_to_apply += 1
+
+                # Keep uploading the following chunks while Synapse applies this
+                # transaction, which can take a long time for large tables.
+                start_uploads()
+                await self._send_update(
+                    client=client,
+                    table_descriptor=csv_table_descriptor,
+                    file_handle_ids=file_handle_ids,
+                    job_timeout=job_timeout,
+                    changes=changes,
+                )
+                changes = None
+                progress_bar.update(size_of_transaction)
+        finally:
+            for task in upload_tasks:
+                if not task.done():
+                    task.cancel()
 
     async def _chunk_and_upload_csv(
         self,
@@ -3924,6 +4445,7 @@ class TableStoreRowMixin:
                 "AppendableRowSetRequest",
             ]
         ] = None,
+        upload_pipeline_depth: int = 2,
     ) -> None:
         """
         Determines if the file we are appending to the table is larger than the
@@ -3943,6 +4465,9 @@ class TableStoreRowMixin:
             job_timeout: The maximum amount of time to wait for a job to complete.
             additional_changes: Additional changes to the table that should execute
                 within this transaction.
+            upload_pipeline_depth: The maximum number of chunks that are uploaded
+                ahead of the transaction that is being applied. The file is split
+                into chunks of `insert_size_bytes / upload_pipeline_depth`.
         """
         if (file_size := os.path.getsize(path_to_csv)) > insert_size_bytes:
             # Apply schema changes before breaking apart and uploading the file
@@ -3967,25 +4492,26 @@ class TableStoreRowMixin:
                 unit="B",
                 leave=None,
             )
+            chunk_size_bytes = max(
+                1, insert_size_bytes // max(1, upload_pipeline_depth)
+            )
             # The original file is read twice, the reason is that on the first pass we
             # are calculating the size of the chunks that we will be uploading and the
             # MD5 hash of the file. On the second pass we are reading in the chunks
             # and uploading them to Synapse.
             with open(file=path_to_csv, mode="rb") as f:
                 header_line = f.readline()
-                size_of_header = len(header_line)
-                file_size = size_of_header
                 md5_hashlib = hashlib.new("md5", usedforsecurity=False)  # nosec
                 md5_hashlib.update(header_line)
                 chunks_to_upload = []
                 size_of_chunk = 0
-                previous_chunk_byte_offset = size_of_header
+                previous_chunk_byte_offset = len(header_line)
                 while chunk := f.readlines(8 * MB):
                     for line in chunk:
-                        md5_hashlib.update(line)
-                        size_of_chunk += len(line)
-                        file_size += size_of_chunk
-                        if size_of_chunk >= insert_size_bytes:
+                        if (
+                            size_of_chunk
+                            and size_of_chunk + len(line) > chunk_size_bytes
+                        ):
                             chunks_to_upload.append(
                                 (
                                     previous_chunk_byte_offset,
@@ -3999,6 +4525,8 @@ class TableStoreRowMixin:
                                 "md5", usedforsecurity=False
                             )  # nosec
                             md5_hashlib.update(header_line)
+                        md5_hashlib.update(line)
+                        size_of_chunk += len(line)
                 if size_of_chunk:
                     chunks_to_upload.append(
                         (
@@ -4008,33 +4536,35 @@ class TableStoreRowMixin:
                         )
                     )
 
-                update_tasks = []
-                wait_for_update_semaphore = asyncio.Semaphore(value=1)
-                part = 0
-                for byte_chunk_offset, size_of_chunk, md5 in chunks_to_upload:
-                    update_tasks.append(
-                        asyncio.create_task(
-                            self._stream_and_update_from_disk(
-                                client=client,
-                                encoded_header=header_line,
-                                size_of_chunk=size_of_chunk,
-                                path_to_csv=path_to_csv,
-                                byte_chunk_offset=byte_chunk_offset,
-                                md5=md5,
-                                csv_table_descriptor=csv_table_descriptor,
-                                job_timeout=job_timeout,
-                                progress_bar=progress_bar,
-                                wait_for_update_semaphore=wait_for_update_semaphore,
-                                file_suffix=f"{part}",
-                            )
-                        )
+            client.logger.info(
+                f"[{self.id}:{self.name}]: Found {len(chunks_to_upload)} chunks to upload into table"
+            )
+            await self._upload_chunks_and_apply(
+                client=client,
+                chunks=[
+                    (
+                        size_of_chunk,
+                        partial(
+                            self._upload_chunk_from_disk,
+                            client=client,
+                            encoded_header=header_line,
+                            size_of_chunk=size_of_chunk,
+                            path_to_csv=path_to_csv,
+                            byte_chunk_offset=byte_chunk_offset,
+                            md5=md5,
+                            file_suffix=f"{part}",
+                        ),
                     )
-                    part += 1
-
-                client.logger.info(
-                    f"[{self.id}:{self.name}]: Found {len(chunks_to_upload)} chunks to upload into table"
-                )
-                await asyncio.gather(*update_tasks)
+                    for part, (byte_chunk_offset, size_of_chunk, md5) in enumerate(
+                        chunks_to_upload
+                    )
+                ],
+                csv_table_descriptor=csv_table_descriptor,
+                job_timeout=job_timeout,
+                insert_size_bytes=insert_size_bytes,
+                upload_pipeline_depth=upload_pipeline_depth,
+                progress_bar=progress_bar,
+            )
 
             progress_bar.update(progress_bar.total - progress_bar.n)
             progress_bar.refresh()
@@ -4074,6 +4604,7 @@ class TableStoreRowMixin:
             ]
         ] = None,
         to_csv_kwargs: Optional[Dict[str, Any]] = None,
+        upload_pipeline_depth: int = 2,
     ) -> None:
         """
         Determines the chunks that need to be used to upload the DataFrame to Synapse.
@@ -4097,8 +4628,13 @@ class TableStoreRowMixin:
                 limits.
             to_csv_kwargs: Additional arguments to pass to the `pd.DataFrame.to_csv`
                 function when writing the data to a CSV file.
+            upload_pipeline_depth: The maximum number of chunks that are uploaded
+                ahead of the transaction that is being applied. When the DataFrame is
+                larger than `insert_size_bytes` it is split into chunks of
+                `insert_size_bytes / upload_pipeline_depth`.
         """
         df = convert_dtypes_to_json_serializable(df)
+        chunk_size_bytes = max(1, insert_size_bytes // max(1, upload_pipeline_depth))
         # Loop over the rows of the DF to determine the size/boundries we'll be uploading
         chunks_to_upload = []
         size_of_chunk = 0
@@ -4106,11 +4642,12 @@ class TableStoreRowMixin:
         total_df_bytes = 0
         header_line = None
         md5_hashlib = hashlib.new("md5", usedforsecurity=False)  # nosec
+        # Used when the whole DataFrame fits within a single transaction
+        md5_hashlib_for_df = hashlib.new("md5", usedforsecurity=False)  # nosec
         line_start_index_for_chunk = 0
         line_end_index_for_chunk = 0
         for start in range(0, len(df), 100):
             end = start + 100
-            line_end_index_for_chunk = end
             buffer.seek(0)
             buffer.truncate(0)
             df.iloc[start:end].to_csv(
@@ -4120,15 +4657,14 @@ class TableStoreRowMixin:
                 float_format="%.12g",
                 **(to_csv_kwargs or {}),
             )
-            total_df_bytes += buffer.tell()
-            size_of_chunk += buffer.tell()
+            size_of_rows = buffer.tell()
+            total_df_bytes += size_of_rows
 
             if start == 0:
                 buffer.seek(0)
                 header_line = buffer.readline()
-            md5_hashlib.update(buffer.getvalue())
 
-            if size_of_chunk >= insert_size_bytes:
+            if size_of_chunk and size_of_chunk + size_of_rows > chunk_size_bytes:
                 chunks_to_upload.append(
                     (
                         size_of_chunk,
@@ -4140,6 +4676,11 @@ class TableStoreRowMixin:
                 size_of_chunk = 0
                 line_start_index_for_chunk = line_end_index_for_chunk
                 md5_hashlib = hashlib.new("md5", usedforsecurity=False)  # nosec
+
+            md5_hashlib.update(buffer.getvalue())
+            md5_hashlib_for_df.update(buffer.getvalue())
+            size_of_chunk += size_of_rows
+            line_end_index_for_chunk = end
         if size_of_chunk > 0:
             chunks_to_upload.append(
                 (
@@ -4149,6 +4690,15 @@ class TableStoreRowMixin:
                     line_end_index_for_chunk,
                 )
             )
+        if len(chunks_to_upload) > 1 and total_df_bytes <= insert_size_bytes:
+            chunks_to_upload = [
+                (
+                    total_df_bytes,
+                    md5_hashlib_for_df.hexdigest(),
+                    0,
+                    line_end_index_for_chunk,
+                )
+            ]
 
         client.logger.info(
             f"[{self.id}:{self.name}]: Found {len(chunks_to_upload)} chunks to upload into table"
@@ -4183,39 +4733,36 @@ class TableStoreRowMixin:
             )
             changes = None
 
-        update_tasks = []
-        wait_for_update_semaphore = asyncio.Semaphore(value=1)
-        part = 0
-        for (
-            size_of_chunk,
-            md5,
-            line_start,
-            line_end,
-        ) in chunks_to_upload:
-            update_tasks.append(
-                asyncio.create_task(
-                    self._stream_and_update_from_df(
+        await self._upload_chunks_and_apply(
+            client=client,
+            chunks=[
+                (
+                    size_of_chunk,
+                    partial(
+                        self._upload_chunk_from_df,
                         client=client,
                         size_of_chunk=size_of_chunk,
                         byte_chunk_offset=0,
                         md5=md5,
-                        csv_table_descriptor=csv_table_descriptor,
-                        job_timeout=job_timeout,
-                        progress_bar=progress_bar,
-                        wait_for_update_semaphore=wait_for_update_semaphore,
                         line_start=line_start,
                         line_end=line_end,
                         df=df,
                         header=header_line,
-                        changes=changes,
                         file_suffix=f"{part}",
                         to_csv_kwargs=to_csv_kwargs,
-                    )
+                    ),
                 )
-            )
-            part += 1
-
-        await asyncio.gather(*update_tasks)
+                for part, (size_of_chunk, md5, line_start, line_end) in enumerate(
+                    chunks_to_upload
+                )
+            ],
+            csv_table_descriptor=csv_table_descriptor,
+            job_timeout=job_timeout,
+            insert_size_bytes=insert_size_bytes,
+            upload_pipeline_depth=upload_pipeline_depth,
+            progress_bar=progress_bar,
+            changes=changes,
+        )
         progress_bar.update(progress_bar.total - progress_bar.n)
         progress_bar.refresh()
         progress_bar.close()
@@ -4389,14 +4936,74 @@ class TableDeleteRowMixin:
         return rows_to_delete
 
 
-def infer_column_type_from_data(values: DATA_FRAME_TYPE) -> List[Column]:
+def _max_string_length(
+    column: SERIES_TYPE, chunk_size: int = STRING_LENGTH_CHUNK_SIZE
+) -> int:
+    """
+    Find the length of the longest value in a column that is stored as a string.
+    The column is read in chunks of `chunk_size` rows so that only one chunk of
+    non-null values is held in memory at a time. Lists count their number of
+    items, and any other value counts the length of its string representation.
+
+    Arguments:
+        column: The column to measure.
+        chunk_size: The number of rows that are measured at a time.
+
+    Returns:
+        The length of the longest value, or 0 if every value is null.
+    """
+    max_length = 0
+    for start in range(0, len(column), chunk_size):
+        values = column.iloc[start : start + chunk_size].dropna().to_numpy()
+        if not len(values):
+            continue
+        try:
+            chunk_max_length = max(map(len, values))
+        except TypeError:
+            chunk_max_length = max(
+                len(value) if isinstance(value, (str, list)) else len(str(value))
+                for value in values
+            )
+        max_length = max(max_length, chunk_max_length)
+    return max_length
+
+
+def _floats_are_integers(column: SERIES_TYPE) -> bool:
+    """
+    Check if every non-null value in a floating point column is a whole number.
+
+    Arguments:
+        column: The column to check.
+
+    Returns:
+        True if every non-null value is a finite whole number.
+    """
+    import numpy as np
+
+    values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+    values = values[~np.isnan(values)]
+    return bool(np.isfinite(values).all() and (np.floor(values) == values).all())
+
+
+def infer_column_type_from_data(
+    values: DATA_FRAME_TYPE, sample_size: Optional[int] = None
+) -> List[Column]:
     """
     Return a list of Synapse table [Column][synapseclient.models.table.Column] objects
     that correspond to the columns in the given values.
 
+    Columns with a numeric, boolean or datetime dtype are typed from their dtype.
+    Only columns with an `object` dtype have their values inspected, which may be
+    limited to a random sample of rows with `sample_size`. The maximum length of
+    STRING columns is always measured over every row.
+
     Arguments:
         values: An object that holds the content of the tables. It must be a
             [Pandas DataFrame](http://pandas.pydata.org/pandas-docs/stable/api.html#dataframe)
+        sample_size: The number of rows that are inspected to infer the type of
+            `object` columns. When not set, or when the DataFrame has fewer rows,
+            every row is inspected. A sample that misses a value of another type
+            may infer a type that Synapse will reject when the rows are stored.
 
     Returns:
         A list of Synapse table [Column][synapseclient.table.Column] objects
@@ -4411,8 +5018,9 @@ def infer_column_type_from_data(values: DATA_FRAME_TYPE) -> List[Column]:
         ```
     """
     test_import_pandas()
-    from pandas import DataFrame, isna
-    from pandas.api.types import infer_dtype
+    import numpy as np
+    from pandas import DataFrame
+    from pandas.api.types import infer_dtype, is_object_dtype
 
     if isinstance(values, DataFrame):
         df = values
@@ -4422,19 +5030,28 @@ def infer_column_type_from_data(values: DATA_FRAME_TYPE) -> List[Column]:
             % type(values)
         )
 
+    sample_positions = None
+    if sample_size is not None and len(df) > sample_size:
+        sample_positions = np.sort(
+            np.random.default_rng(0).choice(len(df), size=sample_size, replace=False)
+        )
+
     cols = list()
     for col in df:
         if not col or col.upper() in RESERVED_COLUMN_NAMES:
             continue
-        inferred_type = infer_dtype(df[col], skipna=True)
+        if sample_positions is not None and is_object_dtype(df[col].dtype):
+            inferred_type = infer_dtype(df[col].iloc[sample_positions], skipna=True)
+        else:
+            inferred_type = infer_dtype(df[col], skipna=True)
         if inferred_type == "floating":
             # Check if the column is integers, assuming that the row may be an integer or null
-            if df[col].apply(lambda x: isna(x) or float(x).is_integer()).all():
+            if _floats_are_integers(df[col]):
                 inferred_type = "integer"
 
         column_type = PANDAS_TABLE_TYPE.get(inferred_type, "STRING")
         if column_type == "STRING":
-            maxStrLen = df[col].str.len().max()
+            maxStrLen = _max_string_length(df[col])
             if maxStrLen > 1000:
                 cols.append(
                     Column(
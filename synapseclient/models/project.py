@@ -26,7 +26,7 @@ from synapseclient.models.services.storable_entity_components import (
     FailureStrategy,
     store_entity_components,
 )
-from synapseutils.copy_functions import copy
+from synapseutils.copy_functions import copy_async
 
 if TYPE_CHECKING:
     from synapseclient.models import (
@@ -527,21 +527,16 @@ class Project(
         if not self.id or not destination_id:
             raise ValueError("The project must have an ID and destination_id to copy.")
 
-        loop = asyncio.get_event_loop()
-
         syn = Synapse.get_client(synapse_client=synapse_client)
-        source_and_destination = await loop.run_in_executor(
-            None,
-            lambda: copy(
-                syn=syn,
-                entity=self.id,
-                destinationId=destination_id,
-                excludeTypes=exclude_types or [],
-                skipCopyAnnotations=not copy_annotations,
-                skipCopyWikiPage=not copy_wiki,
-                updateExisting=file_update_existing,
-                setProvenance=file_copy_activity,
-            ),
+        source_and_destination = await copy_async(
+            syn=syn,
+            entity=self.id,
+            destinationId=destination_id,
+            excludeTypes=exclude_types or [],
+            skipCopyAnnotations=not copy_annotations,
+            skipCopyWikiPage=not copy_wiki,
+            updateExisting=file_update_existing,
+            setProvenance=file_copy_activity,
         )
 
         new_project_id = source_and_destination.get(self.id, None)
@@ -15,6 +15,7 @@ from synapseclient.models.services.storable_entity_components import (
 
 if TYPE_CHECKING:
     from synapseclient.models.file import File
+    from synapseclient.models.services.streaming_sync import FileRecordCallback
 
 ManifestSetting = Literal["all", "suppress", "root"]
 
@@ -38,6 +39,7 @@ class StorableContainerSynchronousProtocol(Protocol):
         queue: asyncio.Queue = None,
         include_types: Optional[List[str]] = None,
         manifest: ManifestSetting = "all",
+        batch_downloads: bool = False,
         *,
         synapse_client: Optional[Synapse] = None,
     ) -> Self:
@@ -89,6 +91,14 @@ class StorableContainerSynchronousProtocol(Protocol):
                 - `all` (default): generate `manifest.csv` in every synced directory
                 - `root`: generate `manifest.csv` only in the root `path` directory
                 - `suppress`: do not generate any manifest file
+            batch_downloads: If True and `download_file` is True, the metadata of all
+                files is retrieved first and the files are then downloaded with the
+                download URLs of up to 100 files being requested together, instead of
+                one request per file. Only the download URLs are batched: the
+                metadata, file handle and annotations of each file are still
+                retrieved with one entity bundle request per file, because Synapse
+                has no endpoint that returns them for many entities at once.
+                Ignored when a `queue` is passed in.
             synapse_client: If not passed in and caching was not disabled by
                 `Synapse.allow_client_caching(False)` this will use the last created
                 instance from the Synapse class constructor.
@@ -240,6 +250,105 @@ class StorableContainerSynchronousProtocol(Protocol):
         """
         return self
 
+    def stream_from_synapse(
+        self: Self,
+        path: Optional[str] = None,
+        recursive: bool = True,
+        download_file: bool = True,
+        if_collision: str = COLLISION_OVERWRITE_LOCAL,
+        failure_strategy: FailureStrategy = FailureStrategy.LOG_EXCEPTION,
+        on_file: Optional["FileRecordCallback"] = None,
+        manifest_path: Optional[str] = None,
+        max_pending_files: int = 1000,
+        incremental: bool = False,
+        *,
+        synapse_client: Optional[Synapse] = None,
+    ) -> int:
+        """
+        Sync the files in this container and all possible sub-folders from Synapse
+        with bounded memory. This is intended for containers with a very large number
+        of files where `sync_from_synapse` would hold too many `File` objects.
+
+        Unlike `sync_from_synapse` the `files` and `folders` attributes are not
+        populated. Instead each file is reduced to a compact
+        [SyncFileRecord][synapseclient.models.SyncFileRecord] as soon as it has been
+        retrieved, and the record is passed to `on_file` and/or written to the CSV at
+        `manifest_path`. Folders are listed concurrently, and listing pauses while
+        `max_pending_files` files are waiting to be retrieved.
+
+        Only Files and Folders are synced, links are not followed.
+
+        Arguments:
+            path: An optional path where the file hierarchy will be reproduced. If not
+                specified the files will by default be placed in the synapseCache.
+            recursive: Whether or not to recursively get the entire hierarchy of the
+                folder and sub-folders.
+            download_file: Whether to download the files found or not.
+            if_collision: Determines how to handle file collisions. May be
+
+                - `overwrite.local`
+                - `keep.local`
+                - `keep.both`
+            failure_strategy: Determines how to handle failures when listing a folder
+                or retrieving a file and an exception occurs.
+            on_file: Called with the record of every file that was synced. May be a
+                function or a coroutine function.
+            manifest_path: If set, a CSV with the `path`, `parentId`, `name`, `ID`,
+                `versionNumber`, `dataFileHandleId` and `dataFileMD5Hex` of every file
+                is written to this path as the files are synced.
+            max_pending_files: The maximum number of files that are waiting to be
+                retrieved at any time.
+            incremental: If True, the etag, version, MD5 and local path of every
+                synced file are stored in a `.synapse_sync_state.sqlite` database
+                under `path`. On the next sync, a file whose version and
+                modification time in the folder listing match this state and whose
+                local copy has not changed is not retrieved again. Requires `path`.
+            synapse_client: If not passed in and caching was not disabled by
+                `Synapse.allow_client_caching(False)` this will use the last created
+                instance from the Synapse class constructor.
+
+        Returns:
+            The number of files that were synced.
+
+        Example: Using this function
+            Suppose I want to download every file in a large Project and keep a
+            record of what was downloaded:
+
+            ```python
+            from synapseclient import Synapse
+            from synapseclient.models import Project
+
+            syn = Synapse()
+            syn.login()
+
+            my_project = Project(id="syn12345")
+            file_count = my_project.stream_from_synapse(
+                path="/path/to/folder",
+                manifest_path="/path/to/folder/manifest.csv",
+            )
+            print(f"Synced {file_count} files")
+            ```
+
+            Suppose I want to mirror a Project every day and only download the files
+            that changed since the previous run:
+
+            ```python
+            from synapseclient import Synapse
+            from synapseclient.models import Project
+
+            syn = Synapse()
+            syn.login()
+
+            my_project = Project(id="syn12345")
+            my_project.stream_from_synapse(path="/path/to/folder", incremental=True)
+            ```
+
+        Raises:
+            ValueError: If the container does not have an id set, or if `incremental`
+                is True and no `path` is given.
+        """
+        return 0
+
     def sync_to_synapse(
         self: Self,
         manifest_path: str,
@@ -248,6 +357,7 @@ class StorableContainerSynchronousProtocol(Protocol):
         retries: int = MANIFEST_UPLOAD_MAX_RETRIES,
         merge_existing_annotations: bool = True,
         associate_activity_to_new_version: bool = False,
+        skip_unchanged: bool = False,
         *,
         synapse_client: Synapse | None = None,
     ) -> list["File"]:
@@ -277,6 +387,11 @@ class StorableContainerSynchronousProtocol(Protocol):
             associate_activity_to_new_version: If True and a version update
                 occurs, the existing Synapse activity is associated with the new
                 version.
+            skip_unchanged: If True, the target containers are compared to the
+                manifest before uploading and files whose name, size and MD5
+                already match a File in Synapse are left out of the upload.
+                Their annotations and provenance in the manifest are not applied.
+                Useful when re-running a sync of a mostly unchanged directory.
             synapse_client: If not passed in and caching was not disabled by
                 Synapse.allow_client_caching(False) this will use the last
                 created instance from the Synapse class constructor.
@@ -284,7 +399,8 @@ class StorableContainerSynchronousProtocol(Protocol):
         Returns:
             List of File entities that were created or updated. Returns an
             empty list if dry_run=True or if no rows were eligible for
-            upload.
+            upload. Files skipped because they were unchanged are not
+            included.
 
         Example: Using this function
 
@@ -1151,8 +1151,13 @@ class RecordSet(RecordSetSynchronousProtocol, AccessControllable, BaseJSONSchema
 
         if self.path:
             self.path = os.path.expanduser(self.path)
-            async with client._get_parallel_file_transfer_semaphore(
+            async with client._get_transfer_scheduler(
                 asyncio_event_loop=asyncio.get_running_loop()
+            ).transfer(
+                size=(
+                    os.path.getsize(self.path) if os.path.isfile(self.path) else None
+                ),
+                group=self.parent_id,
             ):
                 from synapseclient.models.file import _upload_file
 
@@ -8,6 +8,7 @@ from synapseclient.models.services.migration_types import (
     MigrationResult,
     MigrationSettings,
     MigrationStatus,
+    MigrationTimings,
     MigrationType,
 )
 from synapseclient.models.services.search import get_id
@@ -16,6 +17,7 @@ from synapseclient.models.services.storable_entity_components import (
     FailureStrategy,
     store_entity_components,
 )
+from synapseclient.models.services.streaming_sync import SyncFileRecord
 
 __all__ = [
     "store_entity_components",
@@ -29,5 +31,7 @@ __all__ = [
     "MigrationType",
     "MigrationKey",
     "MigrationSettings",
+    "MigrationTimings",
     "MigrationError",
+    "SyncFileRecord",
 ]
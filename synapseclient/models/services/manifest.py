@@ -11,20 +11,37 @@ import ast
 import asyncio
 import csv
 import datetime
-import functools
 import io
 import os
 import re
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Iterable, NamedTuple, TypedDict, Union
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Iterable,
+    NamedTuple,
+    TypedDict,
+    Union,
+)
 
 from synapseclient import Synapse
+from synapseclient.api import (
+    get_children,
+    get_entity,
+    get_file_handles_for_download_async,
+)
 from synapseclient.core import utils
+from synapseclient.core.constants import concrete_types
 from synapseclient.core.exceptions import (
     SynapseFileNotFoundError,
     SynapseHTTPError,
+    SynapseManifestValidationError,
     SynapseProvenanceError,
 )
+from synapseclient.core.pool_provider import DEFAULT_NUM_THREADS, get_executor
 from synapseclient.core.utils import (
     bool_or_none,
     datetime_or_none,
@@ -39,7 +56,7 @@ from synapseclient.operations.factory_operations import FileOptions, get_async
 if TYPE_CHECKING:
     from pandas import DataFrame, Series
 
-    from synapseclient.models import UsedEntity, UsedURL
+    from synapseclient.models import Activity, UsedEntity, UsedURL
     from synapseclient.models.file import File
     from synapseclient.models.folder import Folder
 
@@ -57,6 +74,16 @@ DEFAULT_GENERATED_MANIFEST_CSV_KEYS = [
     "activityName",
     "activityDescription",
 ]
+# Columns of the manifest written when streaming a container from Synapse.
+COMPACT_MANIFEST_CSV_KEYS = [
+    "path",
+    "parentId",
+    "name",
+    "ID",
+    "versionNumber",
+    "dataFileHandleId",
+    "dataFileMD5Hex",
+]
 #: Scalar types that Synapse supports as annotation values.
 SynapseAnnotationType = datetime.datetime | float | int | bool | str
 
@@ -87,6 +114,7 @@ NON_ANNOTATION_COLUMNS = frozenset(
         "modifiedOn",
         "synapseURL",
         "dataFileMD5Hex",
+        "dataFileHandleId",
     ]
 )
 
@@ -99,6 +127,10 @@ _COMMAS_OUTSIDE_DOUBLE_QUOTES_PATTERN = re.compile(r",(?=(?:[^\"]*\"[^\"]*\")*[^
 # Valid Synapse file name characters (1–256 chars).
 _FILE_NAME_PATTERN = re.compile(r"^[`\w \-\+\.\(\)]{1,256}$")
 
+# The number of manifest rows handed to a thread at a time when the files of a
+# manifest are checked on the file system.
+_VALIDATION_CHUNK_SIZE = 1000
+
 
 def _manifest_csv_filename(path: str) -> str:
     return os.path.join(os.path.expanduser(path), MANIFEST_CSV_FILENAME)
@@ -372,28 +404,37 @@ async def read_manifest_for_upload(
         combined size of all local files.
 
     Raises:
-        ValueError: If required columns are missing, paths are not unique,
-            files are empty, file names are invalid, or a parentId is not a
+        ValueError: If the path or parentId column is missing.
+        OSError: If the only problem with the manifest is that some of its paths
+            do not exist. Every missing path is listed.
+        SynapseManifestValidationError: If any other row fails validation. Every
+            problem found in the manifest is reported together: missing or
+            duplicate paths, empty files, invalid or duplicate file names,
+            provenance items that are neither a local file path, a URL, nor a
+            valid Synapse ID, and parentIds that do not exist or are not a
             Folder or Project.
-        OSError: If a non-URL path does not exist on disk.
-        SynapseProvenanceError: If a provenance item is neither a local file
-            path, a URL, nor a valid Synapse ID.
-        SynapseHTTPError: If a parentId does not exist in Synapse.
     """
     syn.logger.info(f"Validating manifest: {manifest_path}")
-    df = _clean_manifest(manifest_path)
+    errors: list[str | OSError] = []
+    df = _clean_manifest(manifest_path, errors=errors)
 
-    if df.empty:
+    if df.empty and not errors:
         return [], 0
 
     syn.logger.info("Validating manifest contents...")
-    total_size = _validate_manifest(df)
+    total_size = _validate_manifest(df, errors=errors)
 
     syn.logger.info("Validating provenance and parent containers...")
     df, _ = await asyncio.gather(
-        _sort_and_fix_provenance(syn, df),
-        _check_parent_containers_async(df["parentId"].unique(), syn=syn),
+        _collect_errors_async(_sort_and_fix_provenance(syn, df), errors),
+        _collect_errors_async(
+            _check_parent_containers_async(df["parentId"].unique(), syn=syn), errors
+        ),
     )
+    if errors:
+        if all(isinstance(error, OSError) for error in errors):
+            raise errors[0]
+        raise SynapseManifestValidationError([str(error) for error in errors])
 
     items = _build_upload_files(
         df,
@@ -404,11 +445,17 @@ async def read_manifest_for_upload(
     return items, total_size
 
 
-def _clean_manifest(manifest_path: str) -> DataFrame:
+def _clean_manifest(
+    manifest_path: str, errors: list[str | OSError] | None = None
+) -> DataFrame:
     """Read a manifest CSV and return a cleaned DataFrame ready for validation.
 
     Arguments:
         manifest_path: Path to the CSV manifest file.
+        errors: If given, problems with individual rows are appended to this
+            list instead of being raised, and rows whose path does not exist
+            are dropped so that the remaining rows can still be validated. The
+            paths that do not exist are appended as a single OSError.
 
     Returns:
         A cleaned DataFrame. May be empty if all rows were filtered out.
@@ -425,12 +472,69 @@ def _clean_manifest(manifest_path: str) -> DataFrame:
     _check_required_columns(df)
     _apply_synapse_store_defaults(df)
     df = df.fillna("")
-    df["path"] = df["path"].apply(_check_path_and_normalize)
-    _check_unique_paths(df)
+    df["path"], missing = _normalize_paths(df["path"])
+    if missing.any():
+        error = OSError(
+            "\n".join(
+                f"The path {f} is not a file or does not exist"
+                for f in df.loc[missing, "path"]
+            )
+        )
+        if errors is None:
+            raise error
+        errors.append(error)
+        df = df[~missing].copy()
+    _collect_errors(_check_unique_paths, df, errors=errors)
     _default_name_column(df)
     return df
 
 
+def _collect_errors(
+    check: Callable[[DataFrame], Any], df: DataFrame, errors: list[str | OSError] | None
+) -> Any:
+    """Run a validation check, appending its error message to errors instead of
+    raising when errors is not None.
+
+    Arguments:
+        check: The validation function to call with df.
+        df: The manifest DataFrame to validate.
+        errors: The list that collects error messages, or None to raise.
+
+    Returns:
+        The return value of the check, or None if it failed and the error was
+        collected.
+    """
+    try:
+        return check(df)
+    except (ValueError, OSError) as ex:
+        if errors is None:
+            raise
+        errors.append(str(ex))
+        return None
+
+
+async def _collect_errors_async(
+    coroutine: Coroutine, errors: list[str | OSError]
+) -> Any:
+    """Await a validation coroutine, appending any validation errors it raises to
+    errors.
+
+    Arguments:
+        coroutine: The validation coroutine to await.
+        errors: The list that collects error messages.
+
+    Returns:
+        The result of the coroutine, or None if it failed.
+    """
+    try:
+        return await coroutine
+    except SynapseManifestValidationError as ex:
+        errors.extend(ex.errors)
+    except (ValueError, SynapseHTTPError, SynapseProvenanceError) as ex:
+        errors.append(str(ex))
+    return None
+
+
 def _read_and_filter_errors(manifest_path: str) -> DataFrame:
     """Read a manifest CSV and drop rows with a non-empty error column.
 
@@ -499,12 +603,14 @@ def _default_name_column(df: DataFrame) -> None:
         )
 
 
-def _validate_manifest(df: DataFrame) -> int:
+def _validate_manifest(df: DataFrame, errors: list[str | OSError] | None = None) -> int:
     """Run pure validation checks on a cleaned manifest DataFrame.
 
     Arguments:
         df: A non-empty, cleaned manifest DataFrame as returned by
             _clean_manifest.
+        errors: If given, validation errors are appended to this list instead
+            of being raised.
 
     Returns:
         Combined size in bytes of all local (non-URL) files in the manifest.
@@ -513,9 +619,9 @@ def _validate_manifest(df: DataFrame) -> int:
         ValueError: If any file is empty (0 bytes) or has an invalid name,
             or if (name, parentId) pairs are not unique.
     """
-    total_size = _check_size_each_file(df)
-    _check_file_names(df)
-    return total_size
+    total_size = _collect_errors(_check_size_each_file, df, errors=errors)
+    _collect_errors(_check_file_names, df, errors=errors)
+    return total_size or 0
 
 
 def _apply_synapse_store_defaults(df: "DataFrame") -> None:
@@ -567,9 +673,75 @@ def _expand_path(path: str) -> str:
     return os.path.abspath(os.path.expandvars(os.path.expanduser(path)))
 
 
+def _map_in_threads(func: Callable[[Any], Any], values: list[Any]) -> list[Any]:
+    """Apply func to every value on the threads of a thread pool, which keeps
+    the file system busy when validating manifests with many rows.
+
+    Values are handed to the threads in chunks so that a large manifest does not
+    create a future for every row.
+
+    Arguments:
+        func: A function of one argument, typically a file system call.
+        values: The values to apply func to.
+
+    Returns:
+        The results in the same order as values.
+    """
+    chunks = [
+        values[i : i + _VALIDATION_CHUNK_SIZE]
+        for i in range(0, len(values), _VALIDATION_CHUNK_SIZE)
+    ]
+    if len(chunks) <= 1:
+        return [func(value) for value in values]
+    with get_executor(thread_count=DEFAULT_NUM_THREADS) as executor:
+        results = executor.map(lambda chunk: [func(value) for value in chunk], chunks)
+        return [result for chunk_results in results for result in chunk_results]
+
+
+def _normalize_paths(paths: Series) -> tuple[Series, Series]:
+    """Normalize the path column of a manifest, checking that every local file
+    exists.
+
+    The vectorized form of _check_path_and_normalize. URLs are returned
+    unchanged and the existence of the local files is checked on a thread pool.
+
+    Arguments:
+        paths: The path column of the manifest.
+
+    Returns:
+        A tuple of the normalized paths and a boolean Series that is True for
+        the local paths that do not point to an existing file. Missing paths
+        are returned as they were written in the manifest.
+    """
+    test_import_pandas()
+    import pandas as pd
+
+    is_local = ~paths.map(is_url).astype(bool)
+    local_paths = paths[is_local].map(_expand_path)
+    exists = pd.Series(
+        _map_in_threads(os.path.isfile, local_paths.tolist()),
+        index=local_paths.index,
+        dtype=bool,
+    )
+
+    missing = pd.Series(False, index=paths.index)
+    missing[exists.index] = ~exists
+    normalized = paths.copy()
+    normalized[exists[exists].index] = local_paths[exists]
+    return normalized, missing
+
+
+def _file_size(path: str) -> int:
+    """Return the size of a local file in bytes."""
+    return os.stat(path).st_size
+
+
 def _check_size_each_file(df: DataFrame) -> int:
     """Raise ValueError if any non-URL file in the manifest is empty (0 bytes).
 
+    The files are checked on a thread pool and every empty file is listed in the
+    error.
+
     Arguments:
         df: Manifest DataFrame containing a path column. Rows whose
             path is a URL are skipped.
@@ -581,23 +753,26 @@ def _check_size_each_file(df: DataFrame) -> int:
         ValueError: If any local file referenced by the manifest has a size of
             zero bytes.
     """
-    total = 0
-    for _, row in df.iterrows():
-        file_path = row["path"]
-        if not is_url(file_path):
-            size = os.stat(file_path).st_size
-            if size == 0:
-                raise ValueError(
-                    f"File {file_path} is empty, empty files cannot be uploaded to Synapse"
-                )
-            total += size
-    return total
+    local_paths = [path for path in df["path"] if not is_url(path)]
+    sizes = _map_in_threads(_file_size, local_paths)
+    empty_files = [path for path, size in zip(local_paths, sizes) if size == 0]
+    if empty_files:
+        raise ValueError(
+            "\n".join(
+                f"File {file_path} is empty, empty files cannot be uploaded to Synapse"
+                for file_path in empty_files
+            )
+        )
+    return sum(sizes)
 
 
 def _check_file_names(df: DataFrame) -> None:
     """Validate that each file name is acceptable for Synapse and that all
     (name, parentId) pairs are unique.
 
+    Every invalid name and every duplicated (name, parentId) pair is listed in
+    the error.
+
     Arguments:
         df: Manifest DataFrame containing name and parentId columns.
             All name cells must already be populated (empty names should be
@@ -607,20 +782,30 @@ def _check_file_names(df: DataFrame) -> None:
         ValueError: If any file name contains characters not permitted by
             Synapse, or if two rows share the same name and parentId.
     """
-    for _, row in df.iterrows():
-        file_name = row["name"]
-        if not _FILE_NAME_PATTERN.match(file_name):
-            raise ValueError(
-                f"File name {file_name} cannot be stored to Synapse. Names may contain"
-                " letters, numbers, spaces, underscores, hyphens, periods, plus signs,"
-                " backticks, and parentheses"
-            )
-    if df[["name", "parentId"]].duplicated().any():
-        raise ValueError(
+    messages = []
+    names = df["name"].astype(str)
+    invalid_names = names[~names.str.match(_FILE_NAME_PATTERN)]
+    for file_name in invalid_names:
+        messages.append(
+            f"File name {file_name} cannot be stored to Synapse. Names may contain"
+            " letters, numbers, spaces, underscores, hyphens, periods, plus signs,"
+            " backticks, and parentheses"
+        )
+    duplicated = df[["name", "parentId"]].duplicated(keep=False)
+    if duplicated.any():
+        duplicates = (
+            df.loc[duplicated, ["name", "parentId"]]
+            .drop_duplicates()
+            .itertuples(index=False)
+        )
+        messages.append(
             "All rows in manifest must contain a path with a unique file name and"
             " parent to upload. Files uploaded to the same folder/project (parentId)"
-            " must have unique file names."
+            " must have unique file names. Duplicated: "
+            + ", ".join(f"{name} in {parent_id}" for name, parent_id in duplicates)
         )
+    if messages:
+        raise ValueError("\n".join(messages))
 
 
 async def _sort_and_fix_provenance(syn: Synapse, df: DataFrame) -> DataFrame:
@@ -694,7 +879,8 @@ def _local_path_refs(
 async def _check_parent_containers_async(parent_ids: list[str], syn: Synapse) -> None:
     """Verify that every parentId in the manifest is a valid Synapse container.
 
-    All parent IDs are validated concurrently.
+    Each distinct parent ID is fetched once, and the parent IDs are validated
+    concurrently with at most `syn.max_threads` requests in flight.
 
     Arguments:
         parent_ids: Iterable of Synapse IDs taken from the manifest
@@ -704,17 +890,18 @@ async def _check_parent_containers_async(parent_ids: list[str], syn: Synapse) ->
     Raises:
         SynapseHTTPError: If a parentId does not exist in Synapse.
         ValueError: If a parentId exists but is not a Project or Folder.
+        SynapseManifestValidationError: If more than one parentId is invalid.
     """
+    semaphore = asyncio.Semaphore(max(syn.max_threads, 1))
 
     async def _check_one(syn_id: str) -> None:
-        if not syn_id:
-            return
         try:
-            container = await get_async(
-                synapse_id=syn_id,
-                file_options=FileOptions(download_file=False),
-                synapse_client=syn,
-            )
+            async with semaphore:
+                container = await get_async(
+                    synapse_id=syn_id,
+                    file_options=FileOptions(download_file=False),
+                    synapse_client=syn,
+                )
         except SynapseHTTPError:
             syn.logger.warning(
                 f"\n{syn_id} in the parentId column is not a valid Synapse Id\n"
@@ -729,7 +916,19 @@ async def _check_parent_containers_async(parent_ids: list[str], syn: Synapse) ->
                 f"{syn_id} in the parentId column is not a Folder or Project"
             )
 
-    await asyncio.gather(*[_check_one(syn_id) for syn_id in parent_ids])
+    unique_parent_ids = list(dict.fromkeys(syn_id for syn_id in parent_ids if syn_id))
+    results = await asyncio.gather(
+        *[_check_one(syn_id) for syn_id in unique_parent_ids],
+        return_exceptions=True,
+    )
+    failures = [result for result in results if isinstance(result, BaseException)]
+    for failure in failures:
+        if not isinstance(failure, (ValueError, SynapseHTTPError)):
+            raise failure
+    if len(failures) == 1:
+        raise failures[0]
+    if failures:
+        raise SynapseManifestValidationError([str(failure) for failure in failures])
 
 
 def _build_upload_files(
@@ -959,17 +1158,26 @@ def _parse_literal(value: str) -> int | float | str | None:
     return None
 
 
-async def upload_sync_files(files: list[UploadSyncFile], syn: Synapse) -> list[File]:
+async def upload_sync_files(
+    files: list[UploadSyncFile],
+    syn: Synapse,
+    unchanged_files: dict[str, File] | None = None,
+) -> list[File]:
     """Upload files to Synapse concurrently in an order that honours
-    interdependent provenance dependencies.
+    interdependent provenance dependencies. Files that declare identical
+    provenance share a single Activity.
 
     Arguments:
         files: The list of UploadSyncFile items to upload.
         syn: Authenticated Synapse client.
+        unchanged_files: Files that are already in Synapse, keyed by their local
+            path, as returned by find_unchanged_files_async. They are not stored
+            again, but files that depend on them still receive their IDs for
+            provenance.
 
     Returns:
-        List of File entities that were created or updated, in the same
-        order as the dependency-graph task execution.
+        List of File entities that were created or updated, in the
+        topologically sorted order of the upload plan.
 
     Raises:
         ValueError: If a provenance reference points to a local file not
@@ -978,9 +1186,195 @@ async def upload_sync_files(files: list[UploadSyncFile], syn: Synapse) -> list[F
         RuntimeError: If prerequisite upload tasks fail to complete.
     """
     plan = _build_upload_plan(items=list(files))
-    tasks = _create_upload_tasks(upload_plan=plan, syn=syn)
-    results = await asyncio.gather(*tasks)
-    return list(results)
+
+    unchanged_files = unchanged_files or {}
+    activities = _SharedActivities(syn)
+
+    async def skip_upload(file_path: str) -> File:
+        return unchanged_files[file_path]
+
+    def start_upload(
+        file_path: str, prerequisite_tasks: list[asyncio.Task]
+    ) -> Coroutine[Any, Any, File]:
+        if file_path in unchanged_files:
+            return skip_upload(file_path)
+        upload_item = plan.path_to_upload_item[file_path]
+        return _upload_file_async(
+            file_entity=upload_item.entity,
+            used=upload_item.used,
+            executed=upload_item.executed,
+            activity_name=upload_item.activity_name,
+            activity_description=upload_item.activity_description,
+            prerequisite_tasks=prerequisite_tasks,
+            syn=syn,
+            activities=activities,
+        )
+
+    try:
+        results = await _run_in_dependency_order(
+            path_to_dependencies=plan.path_to_dependencies,
+            start_upload=start_upload,
+            max_concurrent_uploads=_max_concurrent_uploads(syn),
+        )
+    finally:
+        activities.cancel()
+    return [file for path, file in results.items() if path not in unchanged_files]
+
+
+async def find_unchanged_files_async(
+    items: list[UploadSyncFile], syn: Synapse
+) -> dict[str, File]:
+    """Find the manifest files whose content is already stored in Synapse, so that
+    they can be left out of the upload.
+
+    Every target container is listed once instead of looking up each file by
+    name. A local file is unchanged when a File with the same name exists in
+    its parentId (or the File given in the ID column has the same name and
+    parentId), the file handle of that File has the same size, and either the
+    local cache knows that the file was not modified since it was last uploaded
+    or downloaded, or the MD5 of the local file matches. The file handles are
+    retrieved in batches and local files are only hashed when their size matches.
+
+    Arguments:
+        items: The items read from the manifest by read_manifest_for_upload.
+        syn: Authenticated Synapse client.
+
+    Returns:
+        A File with the ID and current version of the Synapse entity for every
+        unchanged file, keyed by local path.
+    """
+    from synapseclient.models.file import File
+
+    semaphore = asyncio.Semaphore(max(syn.max_threads, 1))
+    candidates = [
+        item.entity
+        for item in items
+        if item.entity.synapse_store
+        and item.entity.path
+        and not is_url(item.entity.path)
+    ]
+
+    async def list_files(parent_id: str) -> dict[str, str]:
+        async with semaphore:
+            return {
+                child["name"]: child["id"]
+                async for child in get_children(
+                    parent=parent_id, include_types=["file"], synapse_client=syn
+                )
+            }
+
+    parents_to_list = list(
+        dict.fromkeys(entity.parent_id for entity in candidates if not entity.id)
+    )
+    listings = dict(
+        zip(
+            parents_to_list,
+            await asyncio.gather(*[list_files(parent) for parent in parents_to_list]),
+        )
+    )
+
+    path_to_entity_id = {}
+    for entity in candidates:
+        entity_id = entity.id or listings[entity.parent_id].get(entity.name)
+        if entity_id:
+            path_to_entity_id[entity.path] = entity_id
+
+    async def fetch_entity(entity_id: str) -> dict[str, Any]:
+        async with semaphore:
+            return await get_entity(entity_id=entity_id, synapse_client=syn)
+
+    path_to_entity = dict(
+        zip(
+            path_to_entity_id,
+            await asyncio.gather(
+                *[fetch_entity(entity_id) for entity_id in path_to_entity_id.values()]
+            ),
+        )
+    )
+    entities_by_path = {entity.path: entity for entity in candidates}
+    path_to_entity = {
+        path: remote
+        for path, remote in path_to_entity.items()
+        if remote.get("dataFileHandleId")
+        and remote.get("name") == entities_by_path[path].name
+        and remote.get("parentId") == entities_by_path[path].parent_id
+    }
+
+    file_handles = await get_file_handles_for_download_async(
+        requested_files=[
+            {
+                "fileHandleId": remote["dataFileHandleId"],
+                "associateObjectId": remote["id"],
+                "associateObjectType": "FileEntity",
+            }
+            for remote in path_to_entity.values()
+        ],
+        include_pre_signed_urls=False,
+        synapse_client=syn,
+    )
+
+    async def is_unchanged(path: str, file_handle: dict[str, Any]) -> bool:
+        if file_handle.get(
+            "concreteType"
+        ) == concrete_types.EXTERNAL_FILE_HANDLE or file_handle.get(
+            "contentSize"
+        ) != os.path.getsize(
+            path
+        ):
+            return False
+        if syn.cache.contains(file_handle["id"], path):
+            return True
+        remote_md5 = file_handle.get("contentMd5")
+        if not remote_md5:
+            return False
+        async with semaphore:
+            local_md5 = await asyncio.to_thread(utils.md5_for_file_hex, filename=path)
+        if local_md5 != remote_md5:
+            return False
+        syn.cache.add(file_handle_id=file_handle["id"], path=path, md5=local_md5)
+        return True
+
+    path_to_file_handle = {
+        path: file_handle
+        for path, remote in path_to_entity.items()
+        if (
+            file_handle := file_handles.get(remote["dataFileHandleId"], {}).get(
+                "fileHandle"
+            )
+        )
+    }
+    unchanged = await asyncio.gather(
+        *[
+            is_unchanged(path, file_handle)
+            for path, file_handle in path_to_file_handle.items()
+        ]
+    )
+
+    unchanged_files = {}
+    for (path, file_handle), is_file_unchanged in zip(
+        path_to_file_handle.items(), unchanged
+    ):
+        if is_file_unchanged:
+            remote = path_to_entity[path]
+            unchanged_files[path] = File(
+                id=remote["id"],
+                name=remote["name"],
+                parent_id=remote["parentId"],
+                path=path,
+                version_number=remote.get("versionNumber"),
+                data_file_handle_id=remote["dataFileHandleId"],
+                content_size=file_handle.get("contentSize"),
+                download_file=False,
+            )
+    return unchanged_files
+
+
+def _max_concurrent_uploads(syn: Synapse) -> int:
+    """The number of manifest uploads that are in progress at the same time. This is
+    twice the number of transfer slots of the client so that the next files are
+    being prepared, e.g. MD5 calculation and checking for an existing entity, while
+    others are transferring."""
+    return max(syn.max_threads * 4, 1)
 
 
 @dataclass
@@ -1095,73 +1489,164 @@ def _resolve_file_dependencies(
     return deps
 
 
-def _create_upload_tasks(
-    upload_plan: _UploadPlan,
-    syn: Synapse,
-) -> list[asyncio.Task]:
-    """Build an asyncio task graph that uploads files concurrently while
-    honouring provenance dependencies.
+async def _run_in_dependency_order(
+    path_to_dependencies: dict[str, list[str]],
+    start_upload: Callable[[str, list[asyncio.Task]], Coroutine[Any, Any, File]],
+    max_concurrent_uploads: int,
+) -> dict[str, File]:
+    """Run one upload per file path while honouring provenance dependencies, only
+    creating the task for a file once its dependencies have finished and one of
+    `max_concurrent_uploads` slots is free.
 
     The manifest may declare that file B was derived from file A
     (provenance). A must be uploaded before B so that B's provenance
     record can reference A's Synapse ID. Files with no dependency
     relationship upload concurrently.
 
-    The function iterates over the upload plan's dependency map (already
-    topologically sorted, so dependencies always appear before
-    dependents). For each file it:
-
-    1. Collects the already-created asyncio.Task objects for its
-       prerequisites -- these are guaranteed to exist because of the
-       topological ordering.
-    2. Creates a new asyncio.Task wrapping _upload_file_async, passing
-       the prerequisite tasks in. That function calls asyncio.wait() on
-       them before uploading, so the file will not start uploading until
-       its dependencies finish.
-    3. Stores the new task so later files can reference it as a
-       prerequisite.
-
-    The returned list can be passed directly to asyncio.gather(). The
-    concurrency constraints are encoded inside the tasks themselves
-    (each one awaits its own prerequisites), so gather fires them all
-    off but they naturally serialize where needed.
+    Rather than creating a task for every file up front, where every task for a
+    dependent file sits waiting on its prerequisites, the paths are scheduled from a
+    ready queue:
+
+    1. Paths without dependencies are ready from the start, in the topological
+       order of `path_to_dependencies`.
+    2. While there is a free slot, the next ready path is started. It receives the
+       finished tasks of its prerequisites so their Synapse IDs can be resolved.
+    3. When a task finishes, every dependent whose last prerequisite it was
+       becomes ready. The finished task is only kept around until all of its
+       dependents have been started.
+
+    This keeps the number of live coroutines, and the upload objects they hold,
+    bounded by `max_concurrent_uploads` regardless of the size of the manifest.
 
     Example: if A has no deps, B depends on A, and C has no deps:
         - A and C start uploading immediately (in parallel).
-        - B's task starts but immediately awaits A's task.
-        - Once A finishes, B proceeds with A's Synapse ID available for
+        - B is started once A finishes, with A's Synapse ID available for
           its provenance record.
 
     Arguments:
-        upload_plan: The topologically sorted upload plan produced by
-            _build_upload_plan.
-        syn: Authenticated Synapse client.
+        path_to_dependencies: Maps each file path to the paths that must be
+            uploaded before it, in topological order.
+        start_upload: Called with a path and the finished tasks of its
+            prerequisites, returns the coroutine that uploads the file.
+        max_concurrent_uploads: The maximum number of uploads that are in progress
+            at the same time.
 
     Returns:
-        A list of asyncio tasks, one per file, that can be passed to
-        asyncio.gather for concurrent execution.
+        The uploaded files keyed by path, in the order of `path_to_dependencies`.
+
+    Raises:
+        Exception: The first exception raised by an upload. The uploads that are
+            in progress are cancelled and no further uploads are started.
     """
-    created_tasks_by_path: dict[str, asyncio.Task] = {}
-
-    for file_path, prerequisite_paths in upload_plan.path_to_dependencies.items():
-        # Topological sort guarantees every prerequisite was already created.
-        prerequisite_tasks = [created_tasks_by_path[p] for p in prerequisite_paths]
-
-        upload_item = upload_plan.path_to_upload_item[file_path]
-        file_task = asyncio.create_task(
-            _upload_file_async(
-                file_entity=upload_item.entity,
-                used=upload_item.used,
-                executed=upload_item.executed,
-                activity_name=upload_item.activity_name,
-                activity_description=upload_item.activity_description,
-                prerequisite_tasks=prerequisite_tasks,
-                syn=syn,
+    remaining_dependency_count: dict[str, int] = {}
+    path_to_dependents: dict[str, list[str]] = {}
+    ready_paths: deque[str] = deque()
+    for file_path, prerequisite_paths in path_to_dependencies.items():
+        remaining_dependency_count[file_path] = len(prerequisite_paths)
+        if not prerequisite_paths:
+            ready_paths.append(file_path)
+        for prerequisite_path in prerequisite_paths:
+            path_to_dependents.setdefault(prerequisite_path, []).append(file_path)
+
+    # Finished tasks that still have dependents waiting to be started, along with
+    # the number of those dependents.
+    finished_tasks_by_path: dict[str, asyncio.Task] = {}
+    unstarted_dependent_count: dict[str, int] = {
+        path: len(dependents) for path, dependents in path_to_dependents.items()
+    }
+    results_by_path: dict[str, File] = {}
+    active_tasks: dict[asyncio.Task, str] = {}
+
+    try:
+        while ready_paths or active_tasks:
+            while ready_paths and len(active_tasks) < max_concurrent_uploads:
+                file_path = ready_paths.popleft()
+                prerequisite_tasks = []
+                for prerequisite_path in path_to_dependencies[file_path]:
+                    prerequisite_tasks.append(finished_tasks_by_path[prerequisite_path])
+                    unstarted_dependent_count[prerequisite_path] -= 1
+                    if not unstarted_dependent_count[prerequisite_path]:
+                        del finished_tasks_by_path[prerequisite_path]
+                task = asyncio.create_task(start_upload(file_path, prerequisite_tasks))
+                active_tasks[task] = file_path
+
+            done_tasks, _ = await asyncio.wait(
+                active_tasks, return_when=asyncio.FIRST_COMPLETED
             )
+            for done_task in done_tasks:
+                file_path = active_tasks.pop(done_task)
+                results_by_path[file_path] = done_task.result()
+                if file_path in path_to_dependents:
+                    finished_tasks_by_path[file_path] = done_task
+                    for dependent_path in path_to_dependents.pop(file_path):
+                        remaining_dependency_count[dependent_path] -= 1
+                        if not remaining_dependency_count[dependent_path]:
+                            ready_paths.append(dependent_path)
+    finally:
+        for task in active_tasks:
+            task.cancel()
+
+    return {file_path: results_by_path[file_path] for file_path in path_to_dependencies}
+
+
+class _SharedActivities:
+    """Stores each distinct provenance Activity of an upload batch once.
+
+    Large pipeline outputs often declare identical provenance for thousands of
+    files. Instead of creating one Activity per file, files whose Activity has the
+    same name, description, used and executed items share a single stored
+    Activity, and each of them is only linked to it.
+
+    The Activity is created when it is first requested, concurrently with the
+    uploads that are in progress, with at most `syn.max_threads * 2` creations in
+    flight. Files requesting an Activity that is being created wait for it.
+    """
+
+    def __init__(self, syn: Synapse) -> None:
+        self._syn = syn
+        self._semaphore = asyncio.Semaphore(max(syn.max_threads * 2, 1))
+        self._tasks: dict[tuple, asyncio.Task] = {}
+
+    @staticmethod
+    def _key(activity: Activity) -> tuple:
+        """Identify an Activity by its content. The order of the used and executed
+        items does not matter."""
+        return (
+            activity.name,
+            activity.description,
+            tuple(sorted(repr(item) for item in activity.used)),
+            tuple(sorted(repr(item) for item in activity.executed)),
         )
-        created_tasks_by_path[file_path] = file_task
 
-    return list(created_tasks_by_path.values())
+    async def _create(self, activity: Activity) -> Activity:
+        async with self._semaphore:
+            return await activity.store_async(synapse_client=self._syn)
+
+    async def get(self, activity: Activity) -> Activity:
+        """Return a copy of the stored Activity with the same content, creating it
+        if this is the first request for it.
+
+        Arguments:
+            activity: The Activity declared for a file.
+
+        Returns:
+            An Activity that is already stored, so that storing the file only
+            links the file to it.
+        """
+        key = self._key(activity)
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(self._create(activity))
+            self._tasks[key] = task
+        stored = await asyncio.shield(task)
+        shared = replace(stored)
+        shared._set_last_persistent_instance()
+        return shared
+
+    def cancel(self) -> None:
+        """Cancel the creations that are still in progress."""
+        for task in self._tasks.values():
+            task.cancel()
 
 
 def _build_activity_linkage(
@@ -1262,13 +1747,14 @@ async def _upload_file_async(
     activity_description: str,
     prerequisite_tasks: list[asyncio.Task],
     syn: Synapse,
+    activities: _SharedActivities | None = None,
 ) -> File:
     """Upload a single file, waiting for any provenance dependencies to finish first.
 
-    This function is invoked as an asyncio.Task by _create_upload_tasks. Many
-    instances run concurrently, but each one self-serializes by awaiting only
-    its specific prerequisites. Files with no dependencies start uploading
-    immediately in parallel.
+    This function is invoked as an asyncio.Task by _run_in_dependency_order,
+    which only starts it once its prerequisites have finished, so awaiting the
+    prerequisites returns immediately in that case. Many instances run
+    concurrently.
 
     The flow:
 
@@ -1283,7 +1769,8 @@ async def _upload_file_async(
        IDs using the mapping from step 1.
     3. Attach Activity -- if any provenance references exist, creates an
        Activity with the name, description, and linkages, and attaches it
-       to the file.
+       to the file. When activities is given, an identical Activity that was
+       already stored for another file in the batch is reused.
     4. Store -- calls file_entity.store_async() to perform the actual upload.
     5. Return -- the returned File (now with a Synapse ID) becomes available
        to downstream tasks that depend on it via the resolved mapping.
@@ -1297,6 +1784,7 @@ async def _upload_file_async(
         activity_description: Description for the provenance Activity.
         prerequisite_tasks: Tasks for files that must be uploaded before this one.
         syn: Authenticated Synapse client.
+        activities: The Activities shared by the files of the upload batch.
 
     Returns:
         The stored File entity.
@@ -1343,6 +1831,8 @@ async def _upload_file_async(
             used=used_activity,
             executed=executed_activity,
         )
+        if activities is not None:
+            file_entity.activity = await activities.get(file_entity.activity)
 
     # Step 4: Upload and return the file (now with a Synapse ID).
     await file_entity.store_async(synapse_client=syn)
@@ -1564,17 +2054,19 @@ async def generate_sync_manifest(
     containing folder). Folders that already exist in Synapse with the same
     name and parent are reused rather than re-created.
 
-    Sibling folders at the same depth are created concurrently to reduce
-    latency on wide trees. Directories and files are traversed in sorted
-    order so manifest output is deterministic across runs and platforms.
+    The directories at the same depth are scanned concurrently on a thread
+    pool and all the folders of a depth are created in one concurrent batch,
+    capped by the client's max_threads, to reduce latency on wide trees.
+    Directories and files are written in sorted order so manifest output is
+    deterministic across runs and platforms.
     Directory symlinks encountered inside directory_path are not followed.
     File symlinks are not pruned: the symlink's path is recorded in the
     manifest, and the underlying target's contents are uploaded when the
     manifest is consumed. The root directory_path itself may be a symlink;
     if so, it is resolved to its target and the target is walked. Zero-byte
     files are skipped with a warning, since Synapse rejects empty files.
-    I/O errors raised by os.walk (for example, unreadable subdirectories)
-    are logged and skipped. If no uploadable files are found under
+    I/O errors raised while listing a directory (for example, unreadable
+    subdirectories) are logged and skipped. If no uploadable files are found under
     directory_path, a warning is logged and a header-only manifest is
     written. If a folder store call fails, the exception propagates and no
     manifest is written; any folders already created remain in Synapse and
@@ -1668,105 +2160,131 @@ async def _validate_target_container_async(parent_id: str, client: Synapse) -> N
 async def _collect_manifest_rows_async(
     directory_path: str, parent_id: str, client: Synapse
 ) -> list[ManifestRow]:
-    """Walk directory_path and produce manifest rows for every uploadable file.
-
-        Orchestrates the layer between os.walk (filesystem traversal) and the
-        Synapse folder/file model. Called once by generate_sync_manifest, after
-        path validation and before _write_manifest_csv.
-
-        Algorithm:
-
-        1. Initialize a local-to-Synapse parent map seeded with
-           directory_path → parent_id. Subfolder IDs are added as they are
-           created so descendants can look up their Synapse parent.
-        2. Walk top-down with os.walk. Top-down order matters — a directory's
-           parent is always yielded (and registered) before the directory
-           itself is visited. Walk errors (permission denied, broken paths)
-           are logged via _log_walk_error rather than aborting traversal.
-
-    For each directory:
-
-        3. Prune symlinks and sort dirnames in place via
-           _prune_symlinks_and_sort_dirnames so Synapse folders aren't created
-           for directories os.walk(followlinks=False) won't visit, and
-           descent is deterministic.
-        4. Look up current_parent_id from the map (guaranteed present by the
-           top-down invariant).
-        5. Create sibling folders concurrently via _create_child_folders_async
-           (asyncio.gather over Folder.store_async). Existing Synapse folders
-           with the same name and parent are reused, not duplicated.
-        6. Register each new folder's Synapse ID in the map keyed by its
-           absolute local path so step 4 succeeds when os.walk descends into
-           it on a later iteration.
-        7. Build manifest rows for files in the current directory via
-           _build_manifest_rows. Unreadable and zero-byte files are filtered
-           out with warnings inside that helper.
-
-        Side effect vs return value: the return value is the flat list of
-        ManifestRow entries, but the side effect — creating the Synapse
-        folder hierarchy under parent_id to mirror the local tree — is what
-        makes the rows usable. Without it the parentId values in the rows
-        would point at folders that don't exist yet.
-
-        Async because _create_child_folders_async hits the Synapse API and
-        parallelizes sibling-folder creation. The rest (walking, sorting,
-        building rows) is local I/O and would otherwise be sync.
+    """Scan directory_path and produce manifest rows for every uploadable file.
+
+    Orchestrates the layer between the local filesystem and the Synapse
+    folder/file model. Called once by generate_sync_manifest, after path
+    validation and before _write_manifest_csv.
+
+    Algorithm:
+
+    1. Start with a level holding only directory_path, which maps to
+       parent_id.
+    2. Scan every directory of the level concurrently on a thread pool
+       with _scan_directory. Each directory is listed once with
+       os.scandir, and the stat results of its entries are reused to
+       find the subdirectories and the uploadable files. Scan errors
+       (permission denied, broken paths) are logged via _log_walk_error
+       rather than aborting traversal.
+    3. Create the Synapse folders for every subdirectory found in the
+       level in one batch via _create_child_folders_async. All the
+       folder stores of a level share a single cap of
+       `client.max_threads * 2` concurrent requests. Existing Synapse
+       folders with the same name and parent are reused, not duplicated.
+    4. The subdirectories, paired with the IDs of their new folders,
+       form the next level. Repeat from step 2 until a level is empty.
+    5. Assemble the rows in the order a top-down walk with sorted
+       directory and file names would produce them, so output is
+       deterministic regardless of the order the scans finish in.
+
+    Side effect vs return value: the return value is the flat list of
+    ManifestRow entries, but the side effect — creating the Synapse
+    folder hierarchy under parent_id to mirror the local tree — is what
+    makes the rows usable. Without it the parentId values in the rows
+    would point at folders that don't exist yet.
+
+    Processing a level at a time means that generating the manifest of
+    a wide tree takes one round of filesystem and Synapse latency per
+    level of depth, rather than one per directory.
 
-        Arguments:
-            directory_path: Realpath-resolved local directory to walk.
-            parent_id: Synapse ID of the container that maps to directory_path.
-            client: Authenticated Synapse client.
+    Arguments:
+        directory_path: Realpath-resolved local directory to scan.
+        parent_id: Synapse ID of the container that maps to directory_path.
+        client: Authenticated Synapse client.
 
-        Returns:
-            A list of ManifestRow entries, one per uploadable file.
+    Returns:
+        A list of ManifestRow entries, one per uploadable file.
     """
-    rows: list[ManifestRow] = []
-    # Step 1: seed the local-to-Synapse parent map with the root mapping.
-    local_to_synapse_parent: dict[str, str] = {directory_path: parent_id}
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max(client.max_threads * 2, 1))
+    dirnames_by_path: dict[str, list[str]] = {}
+    rows_by_path: dict[str, list[ManifestRow]] = {}
 
-    # Step 2: walk the input dir.
-    for dirpath, dirnames, filenames in os.walk(
-        directory_path, onerror=functools.partial(_log_walk_error, client)
-    ):
-        # Step 3: prune symlinked dirs and sort in place
-        _prune_symlinks_and_sort_dirnames(dirnames, dirpath)
+    with get_executor(thread_count=DEFAULT_NUM_THREADS) as executor:
 
-        # Step 4: look up the Synapse parent for the current local dir
-        current_parent_id = local_to_synapse_parent[dirpath]
+        async def scan(dirpath: str, current_parent_id: str) -> list[str]:
+            try:
+                dirnames, rows = await loop.run_in_executor(
+                    executor, _scan_directory, dirpath, current_parent_id, client
+                )
+            except OSError as err:
+                _log_walk_error(client, err)
+                return []
+            dirnames_by_path[dirpath] = dirnames
+            rows_by_path[dirpath] = rows
+            return dirnames
+
+        # Step 1: the first level is the root directory
+        level = [(directory_path, parent_id)]
+        while level:
+            # Step 2: scan every directory of the level concurrently
+            level_dirnames = await asyncio.gather(
+                *[
+                    scan(dirpath, current_parent_id)
+                    for dirpath, current_parent_id in level
+                ]
+            )
 
-        # Step 5: create sibling folders concurrently.
-        created = await _create_child_folders_async(
-            parent_id=current_parent_id, dirnames=dirnames, client=client
-        )
-        # Step 6: register each new folder's Synapse ID.
-        for dirname, folder in created.items():
-            local_to_synapse_parent[os.path.join(dirpath, dirname)] = folder.id
+            # Step 3: create the folders of the next level in one batch
+            level_folders = await asyncio.gather(
+                *[
+                    _create_child_folders_async(
+                        parent_id=current_parent_id,
+                        dirnames=dirnames,
+                        client=client,
+                        semaphore=semaphore,
+                    )
+                    for (_, current_parent_id), dirnames in zip(level, level_dirnames)
+                ]
+            )
 
-        # Step 7: build rows for files in this directory and accumulate.
-        rows.extend(_build_manifest_rows(dirpath, filenames, current_parent_id, client))
+            # Step 4: the subdirectories form the next level
+            level = [
+                (os.path.join(dirpath, dirname), folders[dirname].id)
+                for (dirpath, _), dirnames, folders in zip(
+                    level, level_dirnames, level_folders
+                )
+                for dirname in dirnames
+            ]
 
+    # Step 5: assemble the rows in top-down walk order
+    rows: list[ManifestRow] = []
+    pending = [directory_path]
+    while pending:
+        dirpath = pending.pop()
+        rows.extend(rows_by_path.get(dirpath, []))
+        pending.extend(
+            os.path.join(dirpath, dirname)
+            for dirname in reversed(dirnames_by_path.get(dirpath, []))
+        )
     return rows
 
 
 def _log_walk_error(client: Synapse, err: OSError) -> None:
-    """Turn an os.walk I/O error from fatal into logged-and-skipped.
+    """Turn an I/O error raised while scanning a directory from fatal into
+    logged-and-skipped.
 
-    By default os.walk silently ignores any OSError it hits while listing a
-    directory (e.g., permission denied, vanished symlink target, dead mount
-    point). Silent skipping is dangerous during manifest generation because
-    the user would get an incomplete manifest with no indication that some
-    subtree was missed. os.walk accepts an onerror callback that, if
-    provided, is invoked with the OSError instead — which is what
-    _collect_manifest_rows_async wires up via functools.partial.
+    Listing a directory can fail for many reasons (e.g., permission denied,
+    vanished symlink target, dead mount point). Silently skipping such a
+    directory is dangerous during manifest generation because the user would
+    get an incomplete manifest with no indication that some subtree was
+    missed, and raising would abort the whole run over one unreadable
+    directory. _collect_manifest_rows_async calls this instead.
 
     This callback logs a warning through the Synapse client's logger naming
     the offending path (err.filename) and the underlying error message, then
-    returns. Returning normally (rather than raising) is the contract that
-    tells os.walk to keep going, so traversal continues into the rest of the
-    tree.
+    returns, so traversal continues into the rest of the tree.
 
-    The client argument is first only so the caller can bind it via
-    functools.partial, leaving the (err: OSError) signature os.walk requires.
     The client is needed solely to reach client.logger.
 
     Net effect: unreadable directories produce a visible warning but do not
@@ -1777,7 +2295,7 @@ def _log_walk_error(client: Synapse, err: OSError) -> None:
 
     Arguments:
         client: Authenticated Synapse client, used only for its logger.
-        err: The OSError raised by os.walk while listing a directory.
+        err: The OSError raised while listing a directory.
     """
     client.logger.warning(
         f"Skipping unreadable path during manifest generation:"
@@ -1785,25 +2303,55 @@ def _log_walk_error(client: Synapse, err: OSError) -> None:
     )
 
 
-def _prune_symlinks_and_sort_dirnames(dirnames: list[str], dirpath: str) -> None:
-    """Prune symlinked subdirectories and sort the rest in place.
+def _scan_directory(
+    dirpath: str, parent_id: str, client: Synapse
+) -> tuple[list[str], list[ManifestRow]]:
+    """List a directory once and split it into subdirectories and manifest rows.
+
+    Runs on a thread of the pool used by _collect_manifest_rows_async, so many
+    directories are listed and stat'ed at the same time. The os.DirEntry
+    objects returned by os.scandir are reused for every check: the entry type
+    usually comes from the directory listing itself, and each file is stat'ed
+    at most once.
 
-    Mutates dirnames in place — the documented os.walk hook for both
-    pruning the traversal and forcing deterministic descent order.
-    Symlinked subdirectories are dropped so we don't create Synapse
-    folders for directories whose contents os.walk (followlinks=False)
-    won't visit.
+    Symlinked subdirectories are dropped so we don't create Synapse folders
+    for directories whose contents are not scanned. Like os.walk, any other
+    entry that is not a directory (including symlinks to files and broken
+    symlinks) is treated as a file.
 
     Arguments:
-        dirnames: The dirnames list yielded by os.walk for the current dirpath.
-        dirpath: The current directory being walked.
+        dirpath: Absolute directory path to scan.
+        parent_id: Synapse ID of the folder that maps to dirpath.
+        client: Authenticated Synapse client, used only for logging.
+
+    Returns:
+        A tuple of the sorted names of the subdirectories to descend into,
+        and the manifest rows for the uploadable files in dirpath.
+
+    Raises:
+        OSError: If the directory cannot be listed.
     """
-    dirnames[:] = [d for d in dirnames if not os.path.islink(os.path.join(dirpath, d))]
+    dirnames: list[str] = []
+    file_entries: list[os.DirEntry] = []
+    with os.scandir(dirpath) as entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                file_entries.append(entry)
+            elif not entry.is_symlink():
+                dirnames.append(entry.name)
     dirnames.sort()
+    return dirnames, _build_manifest_rows(file_entries, parent_id, client)
 
 
 async def _create_child_folders_async(
-    parent_id: str, dirnames: list[str], client: Synapse
+    parent_id: str,
+    dirnames: list[str],
+    client: Synapse,
+    semaphore: asyncio.Semaphore | None = None,
 ) -> dict[str, Folder]:
     """Create sibling folders concurrently under a shared Synapse parent.
 
@@ -1813,13 +2361,22 @@ async def _create_child_folders_async(
     name-to-Folder mapping does not depend on asyncio.gather preserving
     submission order.
 
+    Arguments:
+        parent_id: Synapse ID of the folder or project to create the folders in.
+        dirnames: The names of the folders to create.
+        client: Authenticated Synapse client.
+        semaphore: Caps the number of folders stored at the same time. Pass the
+            same semaphore to every call of a level so that the cap applies to
+            the whole level. Defaults to a cap of `client.max_threads * 2`.
+
     Returns:
         A dict mapping each input dirname to the Folder that was created or
         reused for it.
     """
     from synapseclient.models.folder import Folder
 
-    semaphore = asyncio.Semaphore(max(client.max_threads * 2, 1))
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(client.max_threads * 2, 1))
 
     # Each task carries its dirname through to the result so the caller can
     # build a name-to-Folder mapping without relying on asyncio.gather's
@@ -1837,29 +2394,26 @@ async def _create_child_folders_async(
 
 
 def _build_manifest_rows(
-    dirpath: str,
-    filenames: Iterable[str],
+    entries: Iterable[os.DirEntry],
     parent_id: str,
     client: Synapse,
 ) -> list[ManifestRow]:
     """Build manifest rows for the uploadable files in a single directory.
 
-    Called once per directory by _collect_manifest_rows_async during the
-    os.walk traversal. All files in a single call share the same parent_id
-    (the Synapse folder corresponding to dirpath). Sync because everything
-    it does is local I/O with no Synapse API calls; the async parent only
-    awaits when creating Synapse folders, not when scanning files.
+    Called once per directory by _scan_directory. All files in a single call
+    share the same parent_id (the Synapse folder corresponding to their
+    directory). Sync because everything it does is local I/O with no
+    Synapse API calls.
 
-    Filenames are sorted before iteration so output is deterministic across
-    runs and platforms (os.walk does not guarantee filename order). Each
-    name is joined with dirpath to form an absolute filepath, then filtered
-    through _is_uploadable_file, which logs and drops unreadable files
-    (broken symlinks, permission errors) and zero-byte files.
+    Entries are sorted by name before iteration so output is deterministic
+    across runs and platforms (os.scandir does not guarantee order). Each
+    entry is filtered through _is_uploadable_file, which logs and drops
+    unreadable files (broken symlinks, permission errors) and zero-byte
+    files.
 
     Arguments:
-        dirpath: Absolute directory path currently being walked.
-        filenames: Filenames yielded by os.walk for dirpath.
-        parent_id: Synapse ID of the folder that maps to dirpath.
+        entries: The os.DirEntry objects of the files in the directory.
+        parent_id: Synapse ID of the folder that maps to the directory.
         client: Authenticated Synapse client, used only for logging.
 
     Returns:
@@ -1868,10 +2422,9 @@ def _build_manifest_rows(
         per uploadable file.
     """
     rows: list[ManifestRow] = []
-    for filename in sorted(filenames):
-        filepath = os.path.join(dirpath, filename)
-        if _is_uploadable_file(filepath, client):
-            rows.append({"path": filepath, "parentId": parent_id})
+    for entry in sorted(entries, key=lambda entry: entry.name):
+        if _is_uploadable_file(entry, client):
+            rows.append({"path": entry.path, "parentId": parent_id})
     return rows
 
 
@@ -1883,25 +2436,27 @@ def _write_manifest_csv(manifest_path: str, rows: list[ManifestRow]) -> None:
         writer.writerows(rows)
 
 
-def _is_uploadable_file(filepath: str, client: Synapse) -> bool:
-    """Return True if filepath can be included in a generated manifest.
+def _is_uploadable_file(entry: os.DirEntry, client: Synapse) -> bool:
+    """Return True if the file of a directory entry can be included in a
+    generated manifest.
 
     Logs a warning and returns False for files that cannot be uploaded:
     unreadable files (broken symlinks, permission errors, races) and
-    zero-byte files (rejected by Synapse).
+    zero-byte files (rejected by Synapse). The stat result is cached on the
+    entry, and symlinks are followed so that the size of the target is used.
     """
     try:
-        size = os.stat(filepath).st_size
+        size = entry.stat().st_size
     except OSError as err:
         client.logger.warning(
             f"Skipping unreadable file during manifest generation:"
-            f" {filepath} ({err})"
+            f" {entry.path} ({err})"
         )
         return False
     if size == 0:
         client.logger.warning(
             f"Skipping zero-byte file (empty files cannot be"
-            f" uploaded to Synapse): {filepath}"
+            f" uploaded to Synapse): {entry.path}"
         )
         return False
     return True
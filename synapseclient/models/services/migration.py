@@ -6,11 +6,13 @@ This module provides native async implementations of the indexing and migration
 
 import asyncio
 import collections.abc
+import contextlib
 import json
 import os
 import sqlite3
 import sys
 import tempfile
+import time
 import traceback
 from typing import (
     TYPE_CHECKING,
@@ -35,7 +37,8 @@ from synapseclient.api.storage_location_services import get_storage_location_set
 from synapseclient.api.table_services import get_columns
 from synapseclient.core import utils
 from synapseclient.core.constants import concrete_types
-from synapseclient.core.exceptions import SynapseError
+from synapseclient.core.exceptions import SynapseError, SynapseHTTPError
+from synapseclient.core.otel_config import get_meter
 from synapseclient.core.upload.multipart_upload import MAX_NUMBER_OF_PARTS
 from synapseclient.core.upload.multipart_upload_async import multipart_copy_async
 from synapseclient.core.utils import test_import_sqlite3
@@ -58,6 +61,7 @@ from .migration_types import (
     MigrationResult,
     MigrationSettings,
     MigrationStatus,
+    MigrationTimings,
     MigrationType,
 )
 
@@ -72,6 +76,27 @@ DEFAULT_PART_SIZE = 100 * utils.MB
 # Batch size for database operations so the batch operations are chunked.
 BATCH_SIZE = 500
 
+# The file handle cells of migrated table attached files are updated with one table
+# transaction per batch. A batch is sent once it holds this many cells or once its
+# oldest cell has waited this many seconds, whichever comes first.
+TABLE_UPDATE_BATCH_SIZE = 1000
+TABLE_UPDATE_MAX_WAIT_SECONDS = 5.0
+
+# Indexing commits after every container and whenever about this many rows have
+# been written since the last commit, so an interrupted index loses little work.
+INDEX_COMMIT_SIZE = 10000
+
+MIGRATION_STAGE_DURATION_HISTOGRAM = get_meter().create_histogram(
+    name="synapse.migration.stage.duration",
+    unit="s",
+    description="Time spent in each stage of a storage migration",
+)
+MIGRATION_COPIED_BYTES_COUNTER = get_meter().create_counter(
+    name="synapse.migration.copied_bytes",
+    unit="By",
+    description="Bytes copied to the destination storage location by migrations",
+)
+
 
 # =============================================================================
 # Indexing Helper Functions
@@ -180,7 +205,9 @@ def _check_indexed(
         True if the entity is already indexed.
     """
     indexed_row = cursor.execute(
-        "select 1 from migrations where id = ?", (entity_id,)
+        "select 1 from migrations where id = ? "
+        "union all select 1 from index_checkpoints where id = ?",
+        (entity_id, entity_id),
     ).fetchone()
 
     if indexed_row:
@@ -194,6 +221,16 @@ def _check_indexed(
 # =============================================================================
 # Database Helper Functions
 # =============================================================================
+_MIGRATION_TIMING_COLUMNS = (
+    ("started_at", "REAL"),
+    ("completed_at", "REAL"),
+    ("queued_seconds", "REAL"),
+    ("copy_seconds", "REAL"),
+    ("update_seconds", "REAL"),
+    ("copied_bytes", "INTEGER"),
+)
+
+
 def _ensure_schema(cursor: sqlite3.Cursor) -> None:
     """Ensure the SQLite database has the required schema.
 
@@ -224,10 +261,36 @@ def _ensure_schema(cursor: sqlite3.Cursor) -> None:
             from_file_handle_id TEXT NULL,
             to_file_handle_id TEXT NULL,
             file_size INTEGER NULL,
+            started_at REAL NULL,
+            completed_at REAL NULL,
+            queued_seconds REAL NULL,
+            copy_seconds REAL NULL,
+            update_seconds REAL NULL,
+            copied_bytes INTEGER NULL,
             PRIMARY KEY (id, type, row_id, col_id, version)
         )
         """)
 
+    # Add the timing columns to indexes created before they existed
+    existing_columns = {
+        row[1] for row in cursor.execute("PRAGMA table_info(migrations)")
+    }
+    for column, column_type in _MIGRATION_TIMING_COLUMNS:
+        if column not in existing_columns:
+            cursor.execute(
+                f"ALTER TABLE migrations ADD COLUMN {column} {column_type} NULL"
+            )
+
+    # migration_batches table
+    # The time spent querying the migrations table for the next items to migrate.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS migration_batches (
+            queried_at REAL NOT NULL,
+            query_seconds REAL NOT NULL,
+            row_count INTEGER NOT NULL
+        )
+        """)
+
     # Index the status column for faster status-based lookups
     cursor.execute("CREATE INDEX IF NOT EXISTS ix_status ON migrations(status)")
     # Index the from_file_handle_id and to_file_handle_id columns for faster file handle-based lookups
@@ -237,6 +300,14 @@ def _ensure_schema(cursor: sqlite3.Cursor) -> None:
         "ON migrations(from_file_handle_id, to_file_handle_id)"
     )
 
+    # index_checkpoints table
+    # The files and tables that have been indexed, including those without any
+    # migratable file handles, so that an interrupted index can resume without
+    # indexing them again.
+    cursor.execute(
+        "CREATE TABLE IF NOT EXISTS index_checkpoints (id TEXT NOT NULL PRIMARY KEY)"
+    )
+
 
 def _prepare_migration_db(
     conn: sqlite3.Connection,
@@ -369,6 +440,18 @@ def _mark_container_indexed(
     )
 
 
+def _record_index_checkpoint(cursor: sqlite3.Cursor, entity_id: str) -> None:
+    """Record that a file or table entity has been indexed.
+
+    Arguments:
+        cursor: The cursor object from the connection to the SQLite database.
+        entity_id: The Synapse ID of the entity.
+    """
+    cursor.execute(
+        "INSERT OR IGNORE INTO index_checkpoints (id) VALUES (?)", (entity_id,)
+    )
+
+
 def _record_indexing_error(
     cursor: sqlite3.Cursor,
     entity_id: str,
@@ -527,6 +610,7 @@ def _update_migration_database(
     to_file_handle_id: str,
     status: MigrationStatus,
     exception: Optional[Exception] = None,
+    timings: Optional[MigrationTimings] = None,
 ) -> None:
     """Update a migration database record as successful or errored.
 
@@ -537,6 +621,7 @@ def _update_migration_database(
         to_file_handle_id: The destination file handle ID.
         status: The migration status.
         exception: The exception that occurred.
+        timings: The time the item spent in each stage of the migration.
     """
     tb_str = (
         "".join(
@@ -553,11 +638,36 @@ def _update_migration_database(
             status = ?,
             to_file_handle_id = ?,
             exception = ?
+    """
+    update_args = [status, to_file_handle_id, tb_str]
+    if timings is not None:
+        update_sql += """,
+            started_at = ?,
+            completed_at = ?,
+            queued_seconds = ?,
+            copy_seconds = ?,
+            update_seconds = ?,
+            copied_bytes = ?
+        """
+        update_args.extend(
+            [
+                timings.started_at,
+                timings.started_at
+                + timings.queued_seconds
+                + timings.copy_seconds
+                + timings.update_seconds,
+                timings.queued_seconds,
+                timings.copy_seconds,
+                timings.update_seconds,
+                timings.copied_bytes,
+            ]
+        )
+    update_sql += """
         WHERE
             id = ?
             AND type = ?
     """
-    update_args = [status, to_file_handle_id, tb_str, key.id, key.type.value]
+    update_args.extend([key.id, key.type.value])
     for arg in ("version", "row_id", "col_id"):
         arg_value = getattr(key, arg)
         if arg_value is not None:
@@ -569,6 +679,38 @@ def _update_migration_database(
     cursor.execute(update_sql, tuple(update_args))
 
 
+def _record_migration_batch(
+    cursor: sqlite3.Cursor, queried_at: float, query_seconds: float, row_count: int
+) -> None:
+    """Record the time spent querying for the next batch of items to migrate, and
+    emit it as an OTel metric. Consecutive queries that returned no items, such as
+    the wakeups while cells wait for their table batch, are added up in a single
+    row so that the table does not grow with every wakeup.
+
+    Arguments:
+        cursor: The cursor object from the connection to the SQLite database.
+        queried_at: When the query started, in seconds since the epoch.
+        query_seconds: The duration of the query.
+        row_count: The number of items returned by the query.
+    """
+    if row_count == 0:
+        cursor.execute(
+            "UPDATE migration_batches SET query_seconds = query_seconds + ? "
+            "WHERE rowid = (SELECT max(rowid) FROM migration_batches) "
+            "AND row_count = 0",
+            (query_seconds,),
+        )
+    if row_count or cursor.rowcount == 0:
+        cursor.execute(
+            "INSERT INTO migration_batches (queried_at, query_seconds, row_count) "
+            "VALUES (?, ?, ?)",
+            (queried_at, query_seconds, row_count),
+        )
+    MIGRATION_STAGE_DURATION_HISTOGRAM.record(
+        query_seconds, {"synapse.migration.stage": "query"}
+    )
+
+
 def _confirm_migration(
     cursor: sqlite3.Cursor,
     dest_storage_location_id: str,
@@ -696,6 +838,10 @@ async def index_files_for_migration_async(
     This is the first step in migrating files to a new storage location. This function itself does not modify the given entity but only update the migrations and migration_settings tables in the SQLite database.
     After indexing, use `migrate_indexed_files_async` to perform the actual migration.
 
+    Entities are indexed concurrently and the progress is committed to the database
+    as indexing goes. Calling this function again with the `db_path` of an index that
+    was interrupted resumes it, skipping every entity that was already indexed.
+
     Arguments:
         entity: The Synapse entity to migrate (Project, Folder, File, or Table). If it is a container (a Project or Folder), its contents will be recursively indexed.
         dest_storage_location_id: The destination storage location ID.
@@ -783,6 +929,8 @@ async def index_files_for_migration_async(
             )
             raise ex.__cause__
     finally:
+        # keep the progress of an interrupted index so that it can be resumed
+        conn.commit()
         conn.close()
 
     return MigrationResult(db_path=db_path, synapse_client=client)
@@ -802,6 +950,8 @@ async def _index_entity_async(
     include_table_files: bool,
     continue_on_error: bool,
     *,
+    worker_semaphore: Optional[asyncio.Semaphore] = None,
+    listing_semaphore: Optional[asyncio.Semaphore] = None,
     synapse_client: Optional[Synapse] = None,
 ) -> None:
     """Recursively index an entity and its children into migrations database.
@@ -816,61 +966,83 @@ async def _index_entity_async(
         file_version_strategy: Strategy for file versions.
         include_table_files: Whether to include table-attached files.
         continue_on_error: Whether to continue on errors.
+        worker_semaphore: Limits the files and tables that are indexed at the same
+            time across every container, see `_index_container_async`.
+        listing_semaphore: Limits the containers that are listed at the same time
+            across every container, see `_index_container_async`. The type of the
+            entity is also looked up under it.
         synapse_client: If not passed in and caching was not disabled by `Synapse.allow_client_caching(False)` this will use the last created instance from the Synapse class constructor.
     """
     entity_id = utils.id_of(entity)
-    retrieved_entity = await get_entity_type(
-        entity_id=entity_id, synapse_client=synapse_client
-    )
+
+    # Check if already indexed, before making any requests for it
+    if _check_indexed(cursor, entity_id, synapse_client):
+        return
+
+    async with listing_semaphore or contextlib.nullcontext():
+        retrieved_entity = await get_entity_type(
+            entity_id=entity_id, synapse_client=synapse_client
+        )
     concrete_type = retrieved_entity.type
+    changes_before = conn.total_changes
 
-    # Check if already indexed
-    is_indexed = _check_indexed(cursor, entity_id, synapse_client)
     try:
-        if not is_indexed:
-            if concrete_type in (
-                concrete_types.FILE_ENTITY,
-                concrete_types.RECORD_SET_ENTITY,
-            ):
-                if file_version_strategy != "skip":
-                    await _index_file_entity_async(
-                        cursor=cursor,
-                        entity=entity,
-                        parent_id=parent_id,
-                        dest_storage_location_id=dest_storage_location_id,
-                        source_storage_location_ids=source_storage_location_ids,
-                        file_version_strategy=file_version_strategy,
-                        synapse_client=synapse_client,
-                    )
-
-            elif concrete_type == concrete_types.TABLE_ENTITY:
-                if include_table_files:
-                    await _index_table_entity_async(
-                        cursor=cursor,
-                        entity_id=entity_id,
-                        parent_id=parent_id,
-                        dest_storage_location_id=dest_storage_location_id,
-                        source_storage_location_ids=source_storage_location_ids,
-                        synapse_client=synapse_client,
-                    )
+        if concrete_type in (
+            concrete_types.FILE_ENTITY,
+            concrete_types.RECORD_SET_ENTITY,
+        ):
+            if file_version_strategy != "skip":
+                await _index_file_entity_async(
+                    cursor=cursor,
+                    entity=entity,
+                    parent_id=parent_id,
+                    dest_storage_location_id=dest_storage_location_id,
+                    source_storage_location_ids=source_storage_location_ids,
+                    file_version_strategy=file_version_strategy,
+                    synapse_client=synapse_client,
+                )
+                _record_index_checkpoint(cursor, entity_id)
 
-            elif concrete_type in (
-                concrete_types.FOLDER_ENTITY,
-                concrete_types.PROJECT_ENTITY,
-            ):
-                await _index_container_async(
-                    conn=conn,
+        elif concrete_type == concrete_types.TABLE_ENTITY:
+            if include_table_files:
+                await _index_table_entity_async(
                     cursor=cursor,
                     entity_id=entity_id,
                     parent_id=parent_id,
                     dest_storage_location_id=dest_storage_location_id,
                     source_storage_location_ids=source_storage_location_ids,
-                    file_version_strategy=file_version_strategy,
-                    include_table_files=include_table_files,
-                    continue_on_error=continue_on_error,
                     synapse_client=synapse_client,
                 )
-        conn.commit()
+                _record_index_checkpoint(cursor, entity_id)
+
+        elif concrete_type in (
+            concrete_types.FOLDER_ENTITY,
+            concrete_types.PROJECT_ENTITY,
+        ):
+            await _index_container_async(
+                conn=conn,
+                cursor=cursor,
+                entity_id=entity_id,
+                parent_id=parent_id,
+                dest_storage_location_id=dest_storage_location_id,
+                source_storage_location_ids=source_storage_location_ids,
+                file_version_strategy=file_version_strategy,
+                include_table_files=include_table_files,
+                continue_on_error=continue_on_error,
+                worker_semaphore=worker_semaphore,
+                listing_semaphore=listing_semaphore,
+                synapse_client=synapse_client,
+            )
+            conn.commit()
+
+        # Entities are indexed concurrently, so commit whenever the rows written
+        # cross a multiple of INDEX_COMMIT_SIZE rather than after every entity.
+        if (
+            conn.in_transaction
+            and changes_before // INDEX_COMMIT_SIZE
+            != conn.total_changes // INDEX_COMMIT_SIZE
+        ):
+            conn.commit()
 
     except IndexingError:
         # this is a recursive function, we don't need to log the error at every level so just
@@ -919,13 +1091,25 @@ async def _index_file_entity_async(
     elif file_version_strategy == "all":
         from synapseclient.operations import FileOptions, get_async
 
-        async for version in _get_version_numbers_async(entity_id, synapse_client):
-            entity = await get_async(
-                synapse_id=entity_id,
-                file_options=FileOptions(download_file=False),
-                synapse_client=synapse_client,
-            )
-            entity_versions.append((entity, version))
+        versions = [
+            version
+            async for version in _get_version_numbers_async(entity_id, synapse_client)
+        ]
+        version_semaphore = asyncio.Semaphore(max(synapse_client.max_threads, 1))
+
+        async def get_version(version: int) -> Any:
+            async with version_semaphore:
+                return await get_async(
+                    synapse_id=entity_id,
+                    version_number=version,
+                    file_options=FileOptions(download_file=False),
+                    synapse_client=synapse_client,
+                )
+
+        version_entities = await asyncio.gather(
+            *(get_version(version) for version in versions)
+        )
+        entity_versions.extend(zip(version_entities, versions))
 
     elif file_version_strategy == "latest":
         entity_versions.append((entity, entity.version_number))
@@ -1061,10 +1245,21 @@ async def _index_container_async(
     include_table_files: bool,
     continue_on_error: bool,
     *,
+    worker_semaphore: Optional[asyncio.Semaphore] = None,
+    listing_semaphore: Optional[asyncio.Semaphore] = None,
     synapse_client: Optional[Synapse] = None,
 ) -> None:
     """Index a container (Project or Folder) and its children.
 
+    Child containers are indexed concurrently. The files and tables of every
+    container share one bounded pool of workers, a child is only handed to a worker
+    once one is free, so the number of tasks does not grow with the number of
+    children. The listings of every container share a second bounded pool, which
+    is only held while a container is listed and not while its children are
+    indexed, so a project with many folders does not list them all at once.
+    Children that were indexed by an earlier, interrupted run are skipped without
+    making any requests.
+
     Arguments:
         conn: The connection to the SQLite database.
         cursor: The cursor object from the connection to the SQLite database.
@@ -1075,15 +1270,18 @@ async def _index_container_async(
         file_version_strategy: Strategy for file versions.
         include_table_files: Whether to include table-attached files.
         continue_on_error: Whether to continue on errors.
+        worker_semaphore: Limits the files and tables that are indexed at the same
+            time. If not given, a pool of `max_threads * 2` workers is created and
+            shared with the child containers.
+        listing_semaphore: Limits the containers that are listed at the same time.
+            If not given, a pool of `max_threads * 2` listings is created and
+            shared with the child containers.
         synapse_client: If not passed in and caching was not disabled by `Synapse.allow_client_caching(False)` this will use the last created instance from the Synapse class constructor.
     """
-    retrieved_entity = await get_entity_type(
-        entity_id=entity_id, synapse_client=synapse_client
-    )
-    concrete_type = retrieved_entity.type
-    synapse_client.logger.info(
-        f'Indexing {concrete_type[concrete_type.rindex(".") + 1 :]} {entity_id}'
-    )
+    if worker_semaphore is None:
+        worker_semaphore = asyncio.Semaphore(max(synapse_client.max_threads * 2, 1))
+    if listing_semaphore is None:
+        listing_semaphore = asyncio.Semaphore(max(synapse_client.max_threads * 2, 1))
 
     # Determine included types
     include_types = []
@@ -1092,21 +1290,30 @@ async def _index_container_async(
     if include_table_files:
         include_types.append("table")
 
-    # Get children using the async API
-    children = []
-    async for child in get_children(
-        parent=entity_id,
-        include_types=include_types,
-        synapse_client=synapse_client,
-    ):
-        children.append(child)
-
     async def index_child(child: Dict[str, Any]) -> None:
         from synapseclient.operations import get_async
 
-        async with synapse_client._get_parallel_file_transfer_semaphore(
+        if child.get("type") == concrete_types.FOLDER_ENTITY:
+            # a folder is only listed, so its ID is all that is needed
+            await _index_entity_async(
+                conn=conn,
+                cursor=cursor,
+                entity=child["id"],
+                parent_id=entity_id,
+                dest_storage_location_id=dest_storage_location_id,
+                source_storage_location_ids=source_storage_location_ids,
+                file_version_strategy=file_version_strategy,
+                include_table_files=include_table_files,
+                continue_on_error=continue_on_error,
+                worker_semaphore=worker_semaphore,
+                listing_semaphore=listing_semaphore,
+                synapse_client=synapse_client,
+            )
+            return
+
+        async with synapse_client._get_transfer_scheduler(
             asyncio_event_loop=asyncio.get_running_loop()
-        ):
+        ).transfer(group=entity_id):
             child_entity = await get_async(
                 synapse_id=child["id"], synapse_client=synapse_client
             )
@@ -1124,10 +1331,54 @@ async def _index_container_async(
                 synapse_client=synapse_client,
             )
 
-    # Process children with as_completed for progress tracking
-    tasks = [asyncio.create_task(index_child(child)) for child in children]
-    for task in asyncio.as_completed(tasks):
-        await task
+    pending_tasks: Set[asyncio.Task] = set()
+    failed_tasks: List[asyncio.Task] = []
+
+    def on_child_done(task: asyncio.Task, holds_worker: bool) -> None:
+        pending_tasks.discard(task)
+        if holds_worker:
+            worker_semaphore.release()
+        if not task.cancelled() and task.exception() is not None:
+            failed_tasks.append(task)
+
+    async with listing_semaphore:
+        retrieved_entity = await get_entity_type(
+            entity_id=entity_id, synapse_client=synapse_client
+        )
+        concrete_type = retrieved_entity.type
+        synapse_client.logger.info(
+            f'Indexing {concrete_type[concrete_type.rindex(".") + 1 :]} {entity_id}'
+        )
+
+        # Get children using the async API, handing each one to a worker as it is
+        # listed
+        async for child in get_children(
+            parent=entity_id,
+            include_types=include_types,
+            synapse_client=synapse_client,
+        ):
+            if failed_tasks:
+                break
+            if _check_indexed(cursor, child["id"], synapse_client):
+                continue
+
+            # a child container only lists its children, the files and tables in it
+            # take their own workers.
+            holds_worker = child.get("type") != concrete_types.FOLDER_ENTITY
+            if holds_worker:
+                await worker_semaphore.acquire()
+            task = asyncio.create_task(index_child(child))
+            pending_tasks.add(task)
+            task.add_done_callback(
+                lambda done_task, holds_worker=holds_worker: on_child_done(
+                    done_task, holds_worker
+                )
+            )
+
+    if pending_tasks:
+        await asyncio.wait(pending_tasks)
+    if failed_tasks:
+        await failed_tasks[0]
 
     # Mark container as indexed
     migration_type = (
@@ -1149,6 +1400,7 @@ async def _migrate_item_async(
     dest_storage_location_id: str,
     semaphore: asyncio.Semaphore,
     *,
+    table_batcher: Optional["_TableCellUpdateBatcher"] = None,
     synapse_client: Optional[Synapse] = None,
 ) -> Dict[str, Any]:
     """Migrate a single item.
@@ -1160,13 +1412,20 @@ async def _migrate_item_async(
         file_size: File size in bytes.
         dest_storage_location_id: The destination storage location ID.
         semaphore: The concurrency semaphore.
+        table_batcher: If given, the cell of a table attached file is updated in a
+            batch with the other cells of its table. The semaphore is released
+            before waiting on the batch.
         synapse_client: If not passed in and caching was not disabled by `Synapse.allow_client_caching(False)` this will use the last created instance from the Synapse class constructor.
 
     Returns:
-        Dictionary with the key, from_file_handle_id, and to_file_handle_id.
+        Dictionary with the key, from_file_handle_id, to_file_handle_id, and the
+        MigrationTimings of the item.
     """
-    async with semaphore:
-        try:
+    timings = MigrationTimings(started_at=time.time())
+    queued_at = time.monotonic()
+    try:
+        async with semaphore:
+            timings.queued_seconds = time.monotonic() - queued_at
             # copy to a new file handle if we haven't already
             if not to_file_handle_id:
                 source_association = {
@@ -1179,12 +1438,21 @@ async def _migrate_item_async(
                     ),
                 }
 
-                to_file_handle_id = await multipart_copy_async(
-                    synapse_client,
-                    source_association,
-                    storage_location_id=dest_storage_location_id,
-                    part_size=_get_part_size(file_size),
-                )
+                transfer_requested_at = time.monotonic()
+                async with synapse_client._get_transfer_scheduler(
+                    asyncio_event_loop=asyncio.get_running_loop()
+                ).transfer(size=file_size, group=key.id):
+                    copy_started_at = time.monotonic()
+                    timings.queued_seconds += copy_started_at - transfer_requested_at
+                    to_file_handle_id = await multipart_copy_async(
+                        synapse_client,
+                        source_association,
+                        storage_location_id=dest_storage_location_id,
+                        part_size=_get_part_size(file_size),
+                    )
+                    timings.copy_seconds = time.monotonic() - copy_started_at
+                    timings.copied_bytes = file_size
+            update_started_at = time.monotonic()
             # Update entity with new file handle
             if key.type == MigrationType.FILE:
                 if key.version is None:
@@ -1201,23 +1469,39 @@ async def _migrate_item_async(
                         to_file_handle_id=to_file_handle_id,
                         synapse_client=synapse_client,
                     )
-            elif key.type == MigrationType.TABLE_ATTACHED_FILE:
+            elif (
+                key.type == MigrationType.TABLE_ATTACHED_FILE and table_batcher is None
+            ):
                 await _migrate_table_attached_file_async(
                     key=key,
                     to_file_handle_id=to_file_handle_id,
                     synapse_client=synapse_client,
                 )
+            timings.update_seconds = time.monotonic() - update_started_at
 
-            return {
-                "key": key,
-                "from_file_handle_id": from_file_handle_id,
-                "to_file_handle_id": to_file_handle_id,
-            }
+        if key.type == MigrationType.TABLE_ATTACHED_FILE and table_batcher is not None:
+            batch_requested_at = time.monotonic()
+            sent_seconds = await table_batcher.update(
+                key=key, to_file_handle_id=to_file_handle_id
+            )
+            # The wait for the batch to fill up and for earlier transactions of
+            # the table is queued time; only sending the transaction is update time
+            timings.queued_seconds += (
+                time.monotonic() - batch_requested_at - sent_seconds
+            )
+            timings.update_seconds += sent_seconds
 
-        except Exception as ex:
-            raise MigrationError(
-                key, from_file_handle_id, to_file_handle_id, cause=ex
-            ) from ex
+        return {
+            "key": key,
+            "from_file_handle_id": from_file_handle_id,
+            "to_file_handle_id": to_file_handle_id,
+            "timings": timings,
+        }
+
+    except Exception as ex:
+        raise MigrationError(
+            key, from_file_handle_id, to_file_handle_id, cause=ex
+        ) from ex
 
 
 async def _create_new_file_version_async(
@@ -1285,25 +1569,218 @@ async def _migrate_table_attached_file_async(
         to_file_handle_id: The new file handle ID.
         synapse_client: If not passed in and caching was not disabled by `Synapse.allow_client_caching(False)` this will use the last created instance from the Synapse class constructor.
     """
-    partial_row = PartialRow(
-        row_id=str(key.row_id),
-        values=[{"key": str(key.col_id), "value": to_file_handle_id}],
+    await _migrate_table_attached_files_async(
+        table_id=key.id,
+        cells=[(key, to_file_handle_id)],
+        synapse_client=synapse_client,
     )
+
+
+async def _migrate_table_attached_files_async(
+    table_id: str,
+    cells: List[Tuple[MigrationKey, str]],
+    *,
+    synapse_client: Optional[Synapse] = None,
+) -> None:
+    """Update the file handle cells of many table attached files of one table with
+    a single table transaction.
+
+    Arguments:
+        table_id: The Synapse ID of the table.
+        cells: The migration keys of the cells and their new file handle IDs.
+        synapse_client: If not passed in and caching was not disabled by `Synapse.allow_client_caching(False)` this will use the last created instance from the Synapse class constructor.
+    """
+    values_by_row: Dict[str, List[Dict[str, str]]] = {}
+    for key, to_file_handle_id in cells:
+        values_by_row.setdefault(str(key.row_id), []).append(
+            {"key": str(key.col_id), "value": to_file_handle_id}
+        )
     partial_row_set = PartialRowSet(
-        table_id=key.id,
-        rows=[partial_row],
+        table_id=table_id,
+        rows=[
+            PartialRow(row_id=row_id, values=values)
+            for row_id, values in values_by_row.items()
+        ],
     )
     appendable_request = AppendableRowSetRequest(
-        entity_id=key.id,
+        entity_id=table_id,
         to_append=partial_row_set,
     )
     transaction = TableUpdateTransaction(
-        entity_id=key.id,
+        entity_id=table_id,
         changes=[appendable_request],
     )
     await transaction.send_job_and_wait_async(synapse_client=synapse_client)
 
 
+class _TableCellUpdateBatcher:
+    """Coalesce the cell updates of migrated table attached files into one table
+    transaction per table and batch.
+
+    The batch of a table is sent once it holds `max_batch_size` cells, once its
+    oldest cell has waited `max_wait_seconds` or when `flush` is called. The
+    transactions of a table are sent one at a time. Every caller of `update` waits
+    for the transaction holding its cell. When a transaction fails because of a
+    bad cell its cells are split in half and sent again until the failing cells
+    are found, so only the callers of those cells get the error and the result of
+    each cell is still recorded on its own. Failures that are not caused by a
+    cell, such as a denied request, a deleted table or a timeout, fail the whole
+    batch at once.
+
+    Attributes:
+        waiting_count: The number of cells that are queued or being sent.
+        cell_queued: Set every time a cell is queued.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = TABLE_UPDATE_BATCH_SIZE,
+        max_wait_seconds: float = TABLE_UPDATE_MAX_WAIT_SECONDS,
+        *,
+        synapse_client: Optional[Synapse] = None,
+    ) -> None:
+        self._max_batch_size = max_batch_size
+        self._max_wait_seconds = max_wait_seconds
+        self._synapse_client = synapse_client
+        self._pending: Dict[str, List[Tuple[MigrationKey, str, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._send_tasks: Set[asyncio.Task] = set()
+        self.waiting_count = 0
+        self.cell_queued = asyncio.Event()
+
+    async def update(self, key: MigrationKey, to_file_handle_id: str) -> float:
+        """Queue the cell of a table attached file and wait until the transaction
+        holding it has finished.
+
+        Arguments:
+            key: The migration key of the cell.
+            to_file_handle_id: The new file handle ID of the cell.
+
+        Returns:
+            The seconds spent sending the transactions that held the cell, without
+            the time the cell waited for its batch or for the table's earlier
+            transactions.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(key.id, [])
+        pending.append((key, to_file_handle_id, future))
+        self.waiting_count += 1
+        self.cell_queued.set()
+        if len(pending) >= self._max_batch_size:
+            self._send(key.id)
+        elif key.id not in self._timers:
+            self._timers[key.id] = loop.call_later(
+                self._max_wait_seconds, self._send, key.id
+            )
+        try:
+            return await future
+        finally:
+            self.waiting_count -= 1
+
+    def flush(self) -> None:
+        """Send the queued cells of every table without waiting for the batches to
+        fill up."""
+        for table_id in list(self._pending):
+            self._send(table_id)
+
+    def close(self) -> None:
+        """Send the queued cells of every table and stop waiting for the batches
+        of cells that are queued later to fill up."""
+        self._max_wait_seconds = 0
+        self.flush()
+
+    def _send(self, table_id: str) -> None:
+        timer = self._timers.pop(table_id, None)
+        if timer is not None:
+            timer.cancel()
+        cells = self._pending.pop(table_id, None)
+        if not cells:
+            return
+        task = asyncio.create_task(self._send_async(table_id, cells))
+        self._send_tasks.add(task)
+        task.add_done_callback(self._send_tasks.discard)
+
+    async def _send_async(
+        self, table_id: str, cells: List[Tuple[MigrationKey, str, asyncio.Future]]
+    ) -> None:
+        async with self._locks.setdefault(table_id, asyncio.Lock()):
+            await self._send_cells_async(table_id, cells)
+
+    async def _send_cells_async(
+        self,
+        table_id: str,
+        cells: List[Tuple[MigrationKey, str, asyncio.Future]],
+        sent_seconds: float = 0.0,
+    ) -> None:
+        """Send the cells in one transaction. When it fails because of its content
+        the batch is split in half and each half is sent again, so a bad cell only
+        fails itself. Any other failure fails every cell of the batch.
+
+        The future of each cell is given the seconds spent sending the
+        transactions that held it, sent_seconds being the time of earlier
+        transactions that failed."""
+        started_at = time.monotonic()
+        try:
+            await _migrate_table_attached_files_async(
+                table_id=table_id,
+                cells=[(key, to_file_handle_id) for key, to_file_handle_id, _ in cells],
+                synapse_client=self._synapse_client,
+            )
+        except Exception as ex:
+            sent_seconds += time.monotonic() - started_at
+            if len(cells) > 1 and _is_cell_error(ex):
+                middle = len(cells) // 2
+                await self._send_cells_async(table_id, cells[:middle], sent_seconds)
+                await self._send_cells_async(table_id, cells[middle:], sent_seconds)
+                return
+            for _, _, future in cells:
+                if not future.done():
+                    future.set_exception(ex)
+        else:
+            sent_seconds += time.monotonic() - started_at
+            for _, _, future in cells:
+                if not future.done():
+                    future.set_result(sent_seconds)
+
+
+def _is_cell_error(ex: Exception) -> bool:
+    """Whether a failed table transaction may have been caused by a single cell,
+    such as a deleted row or an invalid file handle, rather than by the table, the
+    caller's permissions or the connection.
+
+    Arguments:
+        ex: The exception raised while sending the transaction.
+
+    Returns:
+        True if the request was rejected as bad or the transaction job failed.
+    """
+    if isinstance(ex, SynapseHTTPError):
+        response = getattr(ex, "response", None)
+        return response is not None and response.status_code == 400
+    # A transaction job that ran and failed is reported as a plain SynapseError
+    return type(ex) is SynapseError
+
+
+def _record_migration_metrics(timings: MigrationTimings) -> None:
+    """Emit the stage timings and copied bytes of a migrated item as OTel metrics.
+
+    Arguments:
+        timings: The time the item spent in each stage of the migration.
+    """
+    for stage, seconds in (
+        ("queued", timings.queued_seconds),
+        ("copy", timings.copy_seconds),
+        ("update", timings.update_seconds),
+    ):
+        MIGRATION_STAGE_DURATION_HISTOGRAM.record(
+            seconds, {"synapse.migration.stage": stage}
+        )
+    if timings.copied_bytes:
+        MIGRATION_COPIED_BYTES_COUNTER.add(timings.copied_bytes)
+
+
 async def track_migration_results_async(
     conn: sqlite3.Connection,
     cursor: sqlite3.Cursor,
@@ -1313,6 +1790,8 @@ async def track_migration_results_async(
     pending_keys: Set[MigrationKey],
     return_when: str,
     continue_on_error: bool,
+    *,
+    wake_event: Optional[asyncio.Event] = None,
 ) -> None:
     """Track the results of the migration tasks.
 
@@ -1325,25 +1804,38 @@ async def track_migration_results_async(
         pending_keys: The set of pending migration keys.
         return_when: The return when condition for the asyncio.wait.
         continue_on_error: Whether to continue on errors.
+        wake_event: If given, also return once this event is set, even if no task
+            has completed. The event is cleared before returning.
 
     Returns:
         None
     """
+    wake_task = None
+    if wake_event is not None:
+        wake_task = asyncio.create_task(wake_event.wait())
     done, _ = await asyncio.wait(
-        active_tasks,
+        active_tasks | {wake_task} if wake_task else active_tasks,
         return_when=return_when,
     )
+    if wake_task is not None:
+        wake_task.cancel()
+        done.discard(wake_task)
+        wake_event.clear()
     active_tasks -= done
     for completed_task in done:
         to_file_handle_id = None
         ex = None
+        timings = None
         try:
             result = completed_task.result()
             key = result["key"]
             from_file_handle_id = result["from_file_handle_id"]
             to_file_handle_id = result["to_file_handle_id"]
+            timings = result.get("timings")
             status = MigrationStatus.MIGRATED.value
             completed_file_handles.add(from_file_handle_id)
+            if timings is not None:
+                _record_migration_metrics(timings)
 
         except MigrationError as migration_error:
             key = migration_error.key
@@ -1353,7 +1845,14 @@ async def track_migration_results_async(
             completed_file_handles.add(from_file_handle_id)
 
         await asyncio.to_thread(
-            _update_migration_database, conn, cursor, key, to_file_handle_id, status, ex
+            _update_migration_database,
+            conn,
+            cursor,
+            key,
+            to_file_handle_id,
+            status,
+            ex,
+            timings,
         )
         pending_keys.discard(key)
         pending_file_handles.discard(from_file_handle_id)
@@ -1466,23 +1965,37 @@ async def _execute_migration_async(
     completed_file_handles: Set[str] = set()
     pending_keys: Set[MigrationKey] = set()
 
-    semaphore = synapse_client._get_parallel_file_transfer_semaphore(
-        asyncio_event_loop=asyncio.get_running_loop()
-    )
+    # The transfer scheduler orders the copies, this limits how many migration
+    # items are read from the database and waiting on it at the same time.
+    semaphore = asyncio.Semaphore(max(synapse_client.max_threads * 2, 1))
     active_tasks: Set[asyncio.Task] = set()
+    # Cells of table attached files wait for their batch without holding the
+    # semaphore, up to one batch of them is not counted against the query limit.
+    table_batcher = _TableCellUpdateBatcher(synapse_client=synapse_client)
 
     # Initialize last key to an empty key so the first iteration can proceed.
     key = MigrationKey(id="", type=None, row_id=-1, col_id=-1, version=-1)
     while True:
+        limit = min(
+            BATCH_SIZE,
+            semaphore._value
+            - len(active_tasks)
+            + min(table_batcher.waiting_count, TABLE_UPDATE_BATCH_SIZE),
+        )
         # Query next batch — run in a thread to avoid blocking the event loop
         # while SQLite performs the ORDER BY scan.
+        queried_at = time.time()
+        query_started_at = time.monotonic()
         batch = await asyncio.to_thread(
             _query_migration_batch,
             cursor,
             key,
             pending_file_handles,
             completed_file_handles,
-            min(BATCH_SIZE, semaphore._value - len(active_tasks)),
+            limit,
+        )
+        _record_migration_batch(
+            cursor, queried_at, time.monotonic() - query_started_at, len(batch)
         )
         row_count = 0
         for item in batch:
@@ -1528,6 +2041,7 @@ async def _execute_migration_async(
                     file_size=item["file_size"] or 0,
                     dest_storage_location_id=dest_storage_location_id,
                     semaphore=semaphore,
+                    table_batcher=table_batcher,
                     synapse_client=synapse_client,
                 )
             )
@@ -1539,6 +2053,11 @@ async def _execute_migration_async(
             # tasks to conclude.
             break
 
+        if row_count == 0 and limit > 0:
+            # there is room for more items but none can be submitted yet, so send
+            # the waiting table cells rather than letting their batches fill up.
+            table_batcher.flush()
+
         await track_migration_results_async(
             conn,
             cursor,
@@ -1548,10 +2067,12 @@ async def _execute_migration_async(
             pending_keys,
             asyncio.FIRST_COMPLETED,
             continue_on_error,
+            wake_event=table_batcher.cell_queued,
         )
 
     # Wait for any remaining tasks
     if active_tasks:
+        table_batcher.close()
         await track_migration_results_async(
             conn,
             cursor,
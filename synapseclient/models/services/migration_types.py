@@ -94,6 +94,33 @@ class MigrationKey:
     col_id: Optional[int] = None
 
 
+@dataclass
+class MigrationTimings:
+    """The time a migrated item spent in each stage of the migration.
+
+    Attributes:
+        started_at: When the item started migrating, in seconds since the epoch.
+        queued_seconds: Seconds spent waiting for a free migration slot and, when
+            copied, for a transfer slot of the transfer scheduler. For a table
+            attached file whose cell is updated in a batch, this also includes the
+            wait for the batch to be sent and for the earlier transactions of its
+            table.
+        copy_seconds: Seconds spent copying the file handle to the destination
+            storage location. Zero if an earlier copy of the file handle was reused.
+        update_seconds: Seconds spent updating the file entity version or table
+            cell to the new file handle. For a batched table cell, the time spent
+            sending the transactions that held it.
+        copied_bytes: The number of bytes copied, zero if an earlier copy of the
+            file handle was reused.
+    """
+
+    started_at: float
+    queued_seconds: float = 0.0
+    copy_seconds: float = 0.0
+    update_seconds: float = 0.0
+    copied_bytes: int = 0
+
+
 @dataclass
 class MigrationSettings:
     """Settings for a migration index stored in the database.
@@ -225,6 +252,116 @@ class MigrationResult:
         """
         return await asyncio.to_thread(self.get_counts_by_status)
 
+    @property
+    def throughput(self) -> Dict[str, Any]:
+        """Get the aggregate throughput of the migrated items (synchronous).
+
+        Returns:
+            Dictionary with the throughput, see `get_throughput`.
+        """
+        return self.get_throughput()
+
+    def get_throughput(self) -> Dict[str, Any]:
+        """Get the aggregate throughput of the migrated items (synchronous).
+
+        The timings are committed as items complete, so this can be called while a
+        migration is running to see how fast it is going and which stage the items
+        spend their time in.
+
+        Returns:
+            Dictionary with keys:
+            migrated_items, copied_bytes, elapsed_seconds (from the first item
+            starting to the last item completing), bytes_per_second,
+            items_per_second and stage_seconds. stage_seconds maps each stage
+            (queued, copy, update and query, the time spent querying the database
+            for the next items) to the total seconds spent in it. The stages of
+            items migrating at the same time overlap, so their totals can exceed
+            elapsed_seconds.
+        """
+        import sqlite3
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            # indexes created by an older client have no timings
+            columns = {
+                row[1] for row in cursor.execute("PRAGMA table_info(migrations)")
+            }
+            row = (0, None, None, None, None, None, None)
+            if "completed_at" in columns:
+                row = cursor.execute(
+                    """
+                    SELECT
+                        count(*),
+                        sum(copied_bytes),
+                        min(started_at),
+                        max(completed_at),
+                        sum(queued_seconds),
+                        sum(copy_seconds),
+                        sum(update_seconds)
+                    FROM migrations
+                    WHERE status = ? AND completed_at IS NOT NULL
+                    """,
+                    (MigrationStatus.MIGRATED.value,),
+                ).fetchone()
+            tables = {
+                table[0]
+                for table in cursor.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table'"
+                )
+            }
+            query_seconds = 0.0
+            if "migration_batches" in tables:
+                query_seconds = (
+                    cursor.execute(
+                        "SELECT sum(query_seconds) FROM migration_batches"
+                    ).fetchone()[0]
+                    or 0.0
+                )
+        finally:
+            conn.close()
+
+        (
+            migrated_items,
+            copied_bytes,
+            started_at,
+            completed_at,
+            queued_seconds,
+            copy_seconds,
+            update_seconds,
+        ) = row
+        copied_bytes = copied_bytes or 0
+        elapsed_seconds = (
+            completed_at - started_at
+            if started_at is not None and completed_at is not None
+            else 0.0
+        )
+        return {
+            "migrated_items": migrated_items,
+            "copied_bytes": copied_bytes,
+            "elapsed_seconds": elapsed_seconds,
+            "bytes_per_second": (
+                copied_bytes / elapsed_seconds if elapsed_seconds > 0 else 0.0
+            ),
+            "items_per_second": (
+                migrated_items / elapsed_seconds if elapsed_seconds > 0 else 0.0
+            ),
+            "stage_seconds": {
+                "queued": queued_seconds or 0.0,
+                "copy": copy_seconds or 0.0,
+                "update": update_seconds or 0.0,
+                "query": query_seconds,
+            },
+        }
+
+    async def get_throughput_async(self) -> Dict[str, Any]:
+        """Get the aggregate throughput of the migrated items (asynchronous).
+
+        Returns:
+            Dictionary with the throughput, see `get_throughput`.
+        """
+        return await asyncio.to_thread(self.get_throughput)
+
     def get_migrations(self) -> Iterator[Dict[str, Any]]:
         """Iterate over all migration entries (synchronous).
 
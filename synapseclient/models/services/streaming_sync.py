@@ -0,0 +1,536 @@
+"""Services for syncing a container from Synapse with bounded memory.
+
+Instead of building the full tree of File and Folder models in memory, the
+folders of the container are listed by a fixed number of workers and every file
+that is found is placed on a bounded queue. When the queue is full, listing
+pauses until the file workers catch up. Each file is reduced to a compact
+[SyncFileRecord][synapseclient.models.SyncFileRecord] as soon as it has been
+retrieved, the File model itself is not kept.
+
+When syncing incrementally, the state of every synced file is kept in a SQLite
+database at the root of the sync. A file whose version and modification time in
+the folder listing match the state, and whose local copy has not changed, is not
+retrieved again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import inspect
+import io
+import os
+import sqlite3
+from typing import Any, Awaitable, Callable, NamedTuple, Optional, Union
+
+from synapseclient import Synapse
+from synapseclient.api.entity_services import get_children
+from synapseclient.core.constants.concrete_types import FILE_ENTITY, FOLDER_ENTITY
+from synapseclient.core.constants.method_flags import COLLISION_OVERWRITE_LOCAL
+from synapseclient.core.utils import test_import_sqlite3
+from synapseclient.models.services.manifest import COMPACT_MANIFEST_CSV_KEYS
+from synapseclient.models.services.storable_entity_components import FailureStrategy
+
+DEFAULT_MAX_PENDING_FILES = 1000
+SYNC_STATE_DB_FILENAME = ".synapse_sync_state.sqlite"
+# Number of state changes between commits of the sync state database
+SYNC_STATE_COMMIT_INTERVAL = 1000
+
+
+class SyncFileRecord(NamedTuple):
+    """A compact record of a single file found while streaming a container from
+    Synapse.
+
+    Attributes:
+        id: The Synapse ID of the file.
+        version_number: The version of the file that was retrieved.
+        name: The name of the file.
+        parent_id: The Synapse ID of the container the file is in.
+        path: The local path of the file. Only set if the file was downloaded.
+        data_file_handle_id: The ID of the file handle of the file.
+        content_md5: The MD5 of the content of the file.
+    """
+
+    id: str
+    version_number: Optional[int]
+    name: Optional[str]
+    parent_id: Optional[str]
+    path: Optional[str]
+    data_file_handle_id: Optional[str]
+    content_md5: Optional[str]
+
+    def to_manifest_row(self) -> dict[str, Any]:
+        """Convert the record into a row of a compact manifest."""
+        return {
+            "path": self.path or "",
+            "parentId": self.parent_id,
+            "name": self.name,
+            "ID": self.id,
+            "versionNumber": self.version_number,
+            "dataFileHandleId": self.data_file_handle_id,
+            "dataFileMD5Hex": self.content_md5 or "",
+        }
+
+
+FileRecordCallback = Callable[[SyncFileRecord], Union[None, Awaitable[None]]]
+
+
+# =============================================================================
+# Sync State Database Helper Functions
+# =============================================================================
+def _ensure_sync_state_schema(cursor: sqlite3.Cursor) -> None:
+    """Ensure the sync state database has the required schema.
+
+    Arguments:
+        cursor: The cursor object from the connection to the SQLite database.
+    """
+    # The `modified_on` and `version_number` are the values from the folder
+    # listing, they are compared against the listing of the next sync. The local
+    # size and modification time are used to detect changes to the local copy.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sync_state (
+            id TEXT NOT NULL PRIMARY KEY,
+            parent_id TEXT NOT NULL,
+            name TEXT NULL,
+            etag TEXT NULL,
+            version_number INTEGER NULL,
+            modified_on TEXT NULL,
+            path TEXT NULL,
+            data_file_handle_id TEXT NULL,
+            content_md5 TEXT NULL,
+            local_size INTEGER NULL,
+            local_mtime REAL NULL
+        )
+        """)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_sync_state_parent ON sync_state(parent_id)"
+    )
+
+
+def _get_sync_state_for_parent(
+    cursor: sqlite3.Cursor, parent_id: str
+) -> dict[str, tuple]:
+    """Retrieve the state of all files previously synced into a folder.
+
+    Arguments:
+        cursor: The cursor object from the connection to the SQLite database.
+        parent_id: The Synapse ID of the folder.
+
+    Returns:
+        A dictionary of Synapse ID to the row of the file in the `sync_state` table.
+    """
+    results = cursor.execute(
+        """
+        SELECT id, parent_id, name, version_number, modified_on, path,
+            data_file_handle_id, content_md5, local_size, local_mtime
+        FROM sync_state
+        WHERE parent_id = ?
+        """,
+        (parent_id,),
+    )
+    return {row[0]: row for row in results}
+
+
+def _remove_sync_state(cursor: sqlite3.Cursor, entity_ids: list[str]) -> None:
+    """Remove the state of files that are no longer in their folder.
+
+    Arguments:
+        cursor: The cursor object from the connection to the SQLite database.
+        entity_ids: The Synapse IDs of the files to remove.
+    """
+    cursor.executemany(
+        "DELETE FROM sync_state WHERE id = ?",
+        [(entity_id,) for entity_id in entity_ids],
+    )
+
+
+def _record_sync_state(
+    cursor: sqlite3.Cursor,
+    record: SyncFileRecord,
+    etag: Optional[str],
+    modified_on: Optional[str],
+) -> None:
+    """Insert or replace the state of a file that was synced.
+
+    Arguments:
+        cursor: The cursor object from the connection to the SQLite database.
+        record: The record of the file that was synced.
+        etag: The etag of the file that was synced.
+        modified_on: The modification time of the file in the folder listing.
+    """
+    local_size = local_mtime = None
+    if record.path and os.path.isfile(record.path):
+        stat = os.stat(record.path)
+        local_size, local_mtime = stat.st_size, stat.st_mtime
+    cursor.execute(
+        """
+        INSERT OR REPLACE INTO sync_state (
+            id, parent_id, name, etag, version_number, modified_on, path,
+            data_file_handle_id, content_md5, local_size, local_mtime
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            record.id,
+            record.parent_id,
+            record.name,
+            etag,
+            record.version_number,
+            modified_on,
+            record.path,
+            record.data_file_handle_id,
+            record.content_md5,
+            local_size,
+            local_mtime,
+        ),
+    )
+
+
+def _unchanged_record_from_sync_state(
+    child: dict[str, Any], state: Optional[tuple], download_file: bool
+) -> Optional[SyncFileRecord]:
+    """
+    Compare a file in a folder listing against its state from a previous sync.
+
+    Arguments:
+        child: The file from the folder listing.
+        state: The row of the file in the `sync_state` table, if any.
+        download_file: Whether the files are being downloaded.
+
+    Returns:
+        The record of the file if it has not changed since the previous sync,
+        otherwise None.
+    """
+    if state is None:
+        return None
+    (
+        entity_id,
+        parent_id,
+        name,
+        version_number,
+        modified_on,
+        path,
+        data_file_handle_id,
+        content_md5,
+        local_size,
+        local_mtime,
+    ) = state
+    if (
+        version_number != child.get("versionNumber")
+        or modified_on != child.get("modifiedOn")
+        or name != child.get("name")
+    ):
+        return None
+    if download_file:
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if stat.st_size != local_size or stat.st_mtime != local_mtime:
+            return None
+    return SyncFileRecord(
+        id=entity_id,
+        version_number=version_number,
+        name=name,
+        parent_id=parent_id,
+        path=path if download_file else None,
+        data_file_handle_id=data_file_handle_id,
+        content_md5=content_md5,
+    )
+
+
+def _handle_failure(
+    exception: Exception,
+    failure_strategy: Optional[FailureStrategy],
+    client: Synapse,
+) -> None:
+    """Log, raise, or ignore an exception based on the `failure_strategy`."""
+    if failure_strategy is None:
+        return
+    client.logger.exception(exception)
+    if failure_strategy == FailureStrategy.RAISE_EXCEPTION:
+        raise exception
+
+
+async def _list_folders(
+    folder_queue: asyncio.Queue,
+    file_queue: asyncio.Queue,
+    recursive: bool,
+    download_file: bool,
+    on_record: Callable[[SyncFileRecord], Awaitable[None]],
+    state_cursor: Optional[sqlite3.Cursor],
+    failure_strategy: Optional[FailureStrategy],
+    client: Synapse,
+) -> None:
+    """
+    Worker that lists the children of the folders on `folder_queue`. Sub-folders are
+    added back to `folder_queue` and files are added to `file_queue`. Adding a file
+    waits while `file_queue` is full, which pauses the listing.
+
+    Arguments:
+        folder_queue: Queue of `(folder ID, local path)` tuples to list.
+        file_queue: Bounded queue of `(child, local path)` tuples to retrieve.
+        recursive: Whether sub-folders are listed.
+        download_file: Whether the files are being downloaded.
+        on_record: Called with the record of every file that has not changed since
+            the previous sync.
+        state_cursor: A cursor of the sync state database when syncing
+            incrementally.
+        failure_strategy: Determines how to handle a failure to list a folder.
+        client: The Synapse client to use.
+    """
+    while True:
+        folder_id, path = await folder_queue.get()
+        try:
+            previous_state = (
+                _get_sync_state_for_parent(cursor=state_cursor, parent_id=folder_id)
+                if state_cursor
+                else {}
+            )
+            listed_file_ids = set()
+            async for child in get_children(
+                parent=folder_id,
+                include_types=["folder", "file"],
+                synapse_client=client,
+            ):
+                if child.get("type") == FOLDER_ENTITY and recursive:
+                    child_path = (
+                        os.path.join(path, child["name"])
+                        if path and child.get("name")
+                        else None
+                    )
+                    if child_path:
+                        os.makedirs(child_path, exist_ok=True)
+                    folder_queue.put_nowait((child["id"], child_path))
+                elif child.get("type") == FILE_ENTITY:
+                    listed_file_ids.add(child["id"])
+                    unchanged_record = _unchanged_record_from_sync_state(
+                        child=child,
+                        state=previous_state.get(child["id"]),
+                        download_file=download_file,
+                    )
+                    if unchanged_record:
+                        await on_record(unchanged_record)
+                    else:
+                        await file_queue.put((child, path))
+            if state_cursor:
+                _remove_sync_state(
+                    cursor=state_cursor,
+                    entity_ids=[
+                        entity_id
+                        for entity_id in previous_state
+                        if entity_id not in listed_file_ids
+                    ],
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            _handle_failure(ex, failure_strategy=failure_strategy, client=client)
+        finally:
+            folder_queue.task_done()
+
+
+async def _retrieve_files(
+    file_queue: asyncio.Queue,
+    download_file: bool,
+    if_collision: str,
+    on_record: Callable[[SyncFileRecord], Awaitable[None]],
+    state_cursor: Optional[sqlite3.Cursor],
+    failure_strategy: Optional[FailureStrategy],
+    client: Synapse,
+) -> None:
+    """
+    Worker that retrieves, and optionally downloads, the files on `file_queue` and
+    passes a [SyncFileRecord][synapseclient.models.SyncFileRecord] for each of
+    them to `on_record`.
+
+    Arguments:
+        file_queue: Bounded queue of `(child, local path)` tuples to retrieve.
+        download_file: Whether to download the files.
+        if_collision: Determines how to handle file collisions.
+        on_record: Called with the record of every file that was retrieved.
+        state_cursor: A cursor of the sync state database when syncing
+            incrementally.
+        failure_strategy: Determines how to handle a failure to retrieve a file.
+        client: The Synapse client to use.
+    """
+    # Lazy import to avoid circular import
+    from synapseclient.models import File
+
+    while True:
+        child, path = await file_queue.get()
+        try:
+            file = File(
+                id=child["id"],
+                name=child.get("name"),
+                path=path,
+                download_file=download_file,
+                if_collision=if_collision,
+            )
+            await file.get_async(include_activity=False, synapse_client=client)
+            record = SyncFileRecord(
+                id=file.id,
+                version_number=file.version_number,
+                name=file.name,
+                parent_id=file.parent_id,
+                path=file.path if download_file else None,
+                data_file_handle_id=file.data_file_handle_id,
+                content_md5=(
+                    file.file_handle.content_md5 if file.file_handle else None
+                ),
+            )
+            if state_cursor:
+                _record_sync_state(
+                    cursor=state_cursor,
+                    record=record,
+                    etag=file.etag,
+                    modified_on=child.get("modifiedOn"),
+                )
+            await on_record(record)
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            _handle_failure(ex, failure_strategy=failure_strategy, client=client)
+        finally:
+            file_queue.task_done()
+
+
+async def stream_container_from_synapse_async(
+    container_id: str,
+    path: Optional[str] = None,
+    recursive: bool = True,
+    download_file: bool = True,
+    if_collision: str = COLLISION_OVERWRITE_LOCAL,
+    failure_strategy: Optional[FailureStrategy] = FailureStrategy.LOG_EXCEPTION,
+    on_file: Optional[FileRecordCallback] = None,
+    manifest_path: Optional[str] = None,
+    max_pending_files: int = DEFAULT_MAX_PENDING_FILES,
+    incremental: bool = False,
+    *,
+    synapse_client: Optional[Synapse] = None,
+) -> int:
+    """
+    Sync the files in a container from Synapse without holding the tree in memory.
+
+    `synapse_client.max_threads` workers list folders, and twice as many workers
+    retrieve files. At most `max_pending_files` files wait to be retrieved at any
+    time.
+
+    Arguments:
+        container_id: The Synapse ID of the Project or Folder to sync.
+        path: An optional path where the file hierarchy will be reproduced.
+        recursive: Whether or not to sync the files in sub-folders.
+        download_file: Whether to download the files found or not.
+        if_collision: Determines how to handle file collisions.
+        failure_strategy: Determines how to handle failures when listing a folder
+            or retrieving a file.
+        on_file: Called with the record of every file. May be a function or a
+            coroutine function.
+        manifest_path: If set, the record of every file is written to a CSV at this
+            path as it is found.
+        max_pending_files: The maximum number of files that wait to be retrieved.
+        incremental: If True, the state of the synced files is stored in
+            `SYNC_STATE_DB_FILENAME` under `path` and files that have not changed
+            since the previous sync are not retrieved again.
+        synapse_client: The Synapse client to use.
+
+    Returns:
+        The number of files that were synced.
+
+    Raises:
+        ValueError: If `incremental` is True and no `path` is given.
+    """
+    client = Synapse.get_client(synapse_client=synapse_client)
+    state_conn = state_cursor = None
+    if incremental:
+        if not path:
+            raise ValueError("A path is required to sync incrementally.")
+        test_import_sqlite3()
+        state_conn = sqlite3.connect(os.path.join(path, SYNC_STATE_DB_FILENAME))
+        state_cursor = state_conn.cursor()
+        _ensure_sync_state_schema(state_cursor)
+    record_count = 0
+    manifest_file = None
+    manifest_writer = None
+    if manifest_path:
+        manifest_file = io.open(manifest_path, "w", encoding="utf8", newline="")
+        manifest_writer = csv.DictWriter(
+            manifest_file,
+            fieldnames=COMPACT_MANIFEST_CSV_KEYS,
+            restval="",
+            quoting=csv.QUOTE_MINIMAL,
+        )
+        manifest_writer.writeheader()
+
+    async def on_record(record: SyncFileRecord) -> None:
+        nonlocal record_count
+        record_count += 1
+        if state_conn and record_count % SYNC_STATE_COMMIT_INTERVAL == 0:
+            state_conn.commit()
+        if manifest_writer:
+            manifest_writer.writerow(record.to_manifest_row())
+        if on_file:
+            result = on_file(record)
+            if inspect.isawaitable(result):
+                await result
+
+    folder_queue = asyncio.Queue()
+    file_queue = asyncio.Queue(maxsize=max(max_pending_files, 1))
+    folder_queue.put_nowait((container_id, path))
+
+    workers = [
+        asyncio.create_task(
+            _list_folders(
+                folder_queue=folder_queue,
+                file_queue=file_queue,
+                recursive=recursive,
+                download_file=download_file,
+                on_record=on_record,
+                state_cursor=state_cursor,
+                failure_strategy=failure_strategy,
+                client=client,
+            )
+        )
+        for _ in range(max(client.max_threads, 1))
+    ] + [
+        asyncio.create_task(
+            _retrieve_files(
+                file_queue=file_queue,
+                download_file=download_file,
+                if_collision=if_collision,
+                on_record=on_record,
+                state_cursor=state_cursor,
+                failure_strategy=failure_strategy,
+                client=client,
+            )
+        )
+        for _ in range(max(client.max_threads * 2, 1))
+    ]
+
+    async def join_queues() -> None:
+        # Files are only added while folders are being listed, so once every
+        # folder has been listed the file queue can be drained.
+        await folder_queue.join()
+        await file_queue.join()
+
+    join_task = asyncio.create_task(join_queues())
+    try:
+        done, _ = await asyncio.wait(
+            [join_task, *workers], return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in done:
+            # Workers only finish when they raise an exception
+            task.result()
+    finally:
+        for task in [join_task, *workers]:
+            task.cancel()
+        await asyncio.gather(join_task, *workers, return_exceptions=True)
+        if state_conn:
+            state_conn.commit()
+            state_conn.close()
+        if manifest_file:
+            manifest_file.close()
+            client.logger.info(f"Manifest file {manifest_path} has been generated.")
+
+    return record_count
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from dataclasses import dataclass, field, replace
 from datetime import date, datetime
 from typing import Optional, Protocol, Union
@@ -11,10 +13,23 @@ from synapseclient.annotations import (
 )
 from synapseclient.api import evaluation_services
 from synapseclient.core.async_utils import async_to_sync, otel_trace_method
+from synapseclient.core.otel_config import get_meter
 from synapseclient.core.utils import merge_dataclass_entities
 from synapseclient.models import Annotations
 from synapseclient.models.mixins.access_control import AccessControllable
 
+# The largest number of statuses Synapse accepts in one statusBatch request
+SUBMISSION_STATUS_BATCH_SIZE = 500
+
+# The largest page of submission statuses Synapse returns
+SUBMISSION_STATUS_PAGE_SIZE = 100
+
+SUBMISSION_STATUS_BATCH_DURATION_HISTOGRAM = get_meter().create_histogram(
+    name="synapse.evaluation.status_batch.duration",
+    unit="s",
+    description="Time taken by each batch of a submission status batch update",
+)
+
 
 class SubmissionStatusSynchronousProtocol(Protocol):
     """Protocol defining the synchronous interface for SubmissionStatus operations."""
@@ -101,7 +116,7 @@ class SubmissionStatusSynchronousProtocol(Protocol):
     def get_all_submission_statuses(
         evaluation_id: str,
         status: Optional[str] = None,
-        limit: int = 10,
+        limit: Optional[int] = 10,
         offset: int = 0,
         *,
         synapse_client: Optional[Synapse] = None,
@@ -112,8 +127,11 @@ class SubmissionStatusSynchronousProtocol(Protocol):
         Arguments:
             evaluation_id: The ID of the specified Evaluation.
             status: Optionally filter submission statuses by status.
-            limit: Limits the number of entities that will be fetched for this page.
-                   When null it will default to 10, max value 100. Default to 10.
+            limit: Limits the number of submission statuses that will be fetched.
+                   A limit larger than 100, the largest page Synapse returns, is
+                   fetched as several pages that are requested concurrently. When
+                   None every submission status from the offset on is fetched.
+                   Default to 10.
             offset: The offset index determines where this page will start from.
                     An index of 0 is the first entity. Default to 0.
             synapse_client: If not passed in and caching was not disabled by
@@ -156,7 +174,10 @@ class SubmissionStatusSynchronousProtocol(Protocol):
         synapse_client: Optional[Synapse] = None,
     ) -> dict:
         """
-        Update multiple SubmissionStatuses. The maximum batch size is 500.
+        Update multiple SubmissionStatuses. Synapse accepts at most 500 statuses per
+        batch, so more statuses than that are split into a series of batches that
+        are uploaded in order, each with the batch token returned for the previous
+        one. The time taken by each batch is logged.
 
         Arguments:
             evaluation_id: The ID of the Evaluation to which the SubmissionStatus objects belong.
@@ -169,8 +190,8 @@ class SubmissionStatusSynchronousProtocol(Protocol):
                 instance from the Synapse class constructor.
 
         Returns:
-            A BatchUploadResponse object as a JSON dict containing the batch token
-            and other response information.
+            The BatchUploadResponse of the last batch as a JSON dict containing the
+            batch token and other response information.
 
         Example: Batch update submission statuses
             &nbsp;
@@ -685,7 +706,7 @@ class SubmissionStatus(
     async def get_all_submission_statuses_async(
         evaluation_id: str,
         status: Optional[str] = None,
-        limit: int = 10,
+        limit: Optional[int] = 10,
         offset: int = 0,
         *,
         synapse_client: Optional[Synapse] = None,
@@ -696,8 +717,11 @@ class SubmissionStatus(
         Arguments:
             evaluation_id: The ID of the specified Evaluation.
             status: Optionally filter submission statuses by status.
-            limit: Limits the number of entities that will be fetched for this page.
-                   When null it will default to 10, max value 100. Default to 10.
+            limit: Limits the number of submission statuses that will be fetched.
+                   A limit larger than 100, the largest page Synapse returns, is
+                   fetched as several pages that are requested concurrently. When
+                   None every submission status from the offset on is fetched.
+                   Default to 10.
             offset: The offset index determines where this page will start from.
                     An index of 0 is the first entity. Default to 0.
             synapse_client: If not passed in and caching was not disabled by
@@ -733,14 +757,52 @@ class SubmissionStatus(
         response = await evaluation_services.get_all_submission_statuses(
             evaluation_id=evaluation_id,
             status=status,
-            limit=limit,
+            limit=(
+                SUBMISSION_STATUS_PAGE_SIZE
+                if limit is None
+                else min(limit, SUBMISSION_STATUS_PAGE_SIZE)
+            ),
             offset=offset,
             synapse_client=synapse_client,
         )
+        results = response.get("results", [])
+
+        if limit is None or limit > SUBMISSION_STATUS_PAGE_SIZE:
+            # The first page tells how many statuses there are, so the remaining
+            # pages can be requested concurrently
+            end = response.get("totalNumberOfResults", offset + len(results))
+            if limit is not None:
+                end = min(end, offset + limit)
+            client = Synapse.get_client(synapse_client=synapse_client)
+            semaphore = asyncio.Semaphore(max(client.max_threads * 2, 1))
+
+            async def get_page(page_offset: int) -> list[dict]:
+                async with semaphore:
+                    page = await evaluation_services.get_all_submission_statuses(
+                        evaluation_id=evaluation_id,
+                        status=status,
+                        limit=min(SUBMISSION_STATUS_PAGE_SIZE, end - page_offset),
+                        offset=page_offset,
+                        synapse_client=synapse_client,
+                    )
+                return page.get("results", [])
+
+            pages = await asyncio.gather(
+                *(
+                    get_page(page_offset)
+                    for page_offset in range(
+                        offset + SUBMISSION_STATUS_PAGE_SIZE,
+                        end,
+                        SUBMISSION_STATUS_PAGE_SIZE,
+                    )
+                )
+            )
+            for page in pages:
+                results.extend(page)
 
         # Convert each result to a SubmissionStatus object
         submission_statuses = []
-        for status_dict in response.get("results", []):
+        for status_dict in results:
             submission_status = SubmissionStatus()
             submission_status.fill_from_dict(status_dict)
             submission_status._set_last_persistent_instance()
@@ -759,7 +821,10 @@ class SubmissionStatus(
         synapse_client: Optional[Synapse] = None,
     ) -> dict:
         """
-        Update multiple SubmissionStatuses. The maximum batch size is 500.
+        Update multiple SubmissionStatuses. Synapse accepts at most 500 statuses per
+        batch, so more statuses than that are split into a series of batches that
+        are uploaded in order, each with the batch token returned for the previous
+        one. The time taken by each batch is logged.
 
         Arguments:
             evaluation_id: The ID of the Evaluation to which the SubmissionStatus objects belong.
@@ -772,8 +837,8 @@ class SubmissionStatus(
                 instance from the Synapse class constructor.
 
         Returns:
-            A BatchUploadResponse object as a JSON dict containing the batch token
-            and other response information.
+            The BatchUploadResponse of the last batch as a JSON dict containing the
+            batch token and other response information.
 
         Example: Batch update submission statuses
             &nbsp;
@@ -808,25 +873,44 @@ class SubmissionStatus(
             asyncio.run(main())
             ```
         """
+        client = Synapse.get_client(synapse_client=synapse_client)
+
         # Convert SubmissionStatus objects to dictionaries
         status_dicts = []
         for status in statuses:
             status_dict = status.to_synapse_request(synapse_client=synapse_client)
             status_dicts.append(status_dict)
 
-        # Prepare the batch request body
-        request_body = {
-            "statuses": status_dicts,
-            "isFirstBatch": is_first_batch,
-            "isLastBatch": is_last_batch,
-        }
+        batches = [
+            status_dicts[start : start + SUBMISSION_STATUS_BATCH_SIZE]
+            for start in range(0, len(status_dicts), SUBMISSION_STATUS_BATCH_SIZE)
+        ] or [[]]
+
+        response = {}
+        for index, batch in enumerate(batches):
+            # Prepare the batch request body
+            request_body = {
+                "statuses": batch,
+                "isFirstBatch": is_first_batch and index == 0,
+                "isLastBatch": is_last_batch and index == len(batches) - 1,
+            }
 
-        # Add batch token if provided (required for all but first batch)
-        if batch_token:
-            request_body["batchToken"] = batch_token
+            # Add batch token if provided (required for all but first batch)
+            if batch_token:
+                request_body["batchToken"] = batch_token
 
-        return await evaluation_services.batch_update_submission_statuses(
-            evaluation_id=evaluation_id,
-            request_body=request_body,
-            synapse_client=synapse_client,
-        )
+            started = time.perf_counter()
+            response = await evaluation_services.batch_update_submission_statuses(
+                evaluation_id=evaluation_id,
+                request_body=request_body,
+                synapse_client=synapse_client,
+            )
+            elapsed = time.perf_counter() - started
+            SUBMISSION_STATUS_BATCH_DURATION_HISTOGRAM.record(elapsed)
+            client.logger.debug(
+                f"[{evaluation_id}]: Updated submission status batch {index + 1} of "
+                f"{len(batches)} ({len(batch)} statuses) in {elapsed:.2f}s"
+            )
+            batch_token = (response or {}).get("nextUploadToken", batch_token)
+
+        return response
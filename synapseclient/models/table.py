@@ -181,6 +181,7 @@ class TableSynchronousProtocol(Protocol):
         job_timeout: int = 600,
         wait_for_eventually_consistent_view: bool = False,
         wait_for_eventually_consistent_view_timeout: int = 600,
+        use_row_hashes: bool = False,
         synapse_client: Optional[Synapse] = None,
         **kwargs,
     ) -> None:
@@ -308,6 +309,16 @@ class TableSynchronousProtocol(Protocol):
             wait_for_eventually_consistent_view_timeout: The maximum amount of time to
                 wait for a view to be eventually consistent. The default is 600 seconds.
 
+            use_row_hashes: If set to True the existing rows are not queried with the
+                values of the `primary_keys` in chunks of `rows_per_query`. Instead a
+                single query downloads the `primary_keys` and the upserted columns
+                of the whole table, every row on both sides is reduced to a hash,
+                and the rows are matched with a join on the `primary_keys`. Updates
+                are only sent for rows whose hash differs. This is much faster when
+                upserting a large portion of a table, but it reads the entire table,
+                so leave it off when upserting a handful of rows into a large table.
+                The default is False.
+
             synapse_client: If not passed in and caching was not disabled by
                 `Synapse.allow_client_caching(False)` this will use the last created
                 instance from the Synapse class constructor
@@ -415,6 +426,8 @@ class TableSynchronousProtocol(Protocol):
         read_csv_kwargs: Optional[Dict[str, Any]] = None,
         to_csv_kwargs: Optional[Dict[str, Any]] = None,
         job_timeout: int = 600,
+        upload_pipeline_depth: int = 2,
+        schema_inference_sample_size: Optional[int] = None,
         synapse_client: Optional[Synapse] = None,
     ) -> None:
         """
@@ -640,6 +653,22 @@ class TableSynchronousProtocol(Protocol):
                 is reached a `SynapseTimeoutError` will be raised.
                 The default is 600 seconds
 
+            upload_pipeline_depth: When the data is larger than `insert_size_bytes`
+                it is split into chunks of `insert_size_bytes / upload_pipeline_depth`
+                bytes. Up to this many chunks are uploaded while Synapse is applying
+                the previous transaction, and chunks that finished uploading are
+                appended together in a single transaction when their combined size
+                fits within `insert_size_bytes`. Transactions are always applied in
+                the order of the data. A value of 1 uploads one chunk ahead of the
+                transaction that is being applied. The default is 2.
+
+            schema_inference_sample_size: Only used when `schema_storage_strategy`
+                is set to `INFER_FROM_DATA`. The number of randomly sampled rows that
+                are inspected to infer the type of columns that do not have a
+                numeric, boolean or datetime dtype. The maximum size of STRING
+                columns is always measured over every row. When not set every row is
+                inspected.
+
             synapse_client: If not passed in and caching was not disabled by
                 `Synapse.allow_client_caching(False)` this will use the last created
                 instance from the Synapse class constructor.
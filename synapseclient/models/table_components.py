@@ -24,6 +24,25 @@ if TYPE_CHECKING:
     from synapseclient import Synapse
 
 
+LIST_COLUMN_TYPES = {
+    "STRING_LIST",
+    "INTEGER_LIST",
+    "BOOLEAN_LIST",
+    "DATE_LIST",
+    "ENTITYID_LIST",
+    "USERID_LIST",
+}
+
+_BOOLEAN_STRINGS = {
+    "true": True,
+    "t": True,
+    "1": True,
+    "false": False,
+    "f": False,
+    "0": False,
+}
+
+
 @dataclass
 class SumFileSizes:
     """
@@ -615,6 +634,81 @@ class Row:
 
         return result
 
+    @staticmethod
+    def cast_column_values(values: List[Any], column_type: str = "STRING") -> List[Any]:
+        """
+        Convert all the values of a single column of table query results from
+        strings to the correct column type.
+
+        This is the column oriented equivalent of `cast_values`. The conversion for
+        the column type is resolved once for the whole column instead of once for
+        every cell, and the `_LIST` column types are decoded with a single
+        `json.loads` call for the whole column.
+
+        Arguments:
+            values: The values of one column, in row order.
+            column_type: The Synapse column type of the values.
+
+        Returns:
+            A new list with the converted values. Empty strings and None are
+            converted to None.
+
+        See: <https://rest-docs.synapse.org/rest/org/sagebionetworks/repo/model/table/ColumnType.html>
+        """
+        if column_type in LIST_COLUMN_TYPES:
+            parse_int = from_unix_epoch_time if column_type == "DATE_LIST" else None
+            if all(field is None or isinstance(field, str) for field in values):
+                try:
+                    # Each value is a JSON array, so the whole column can be
+                    # decoded as one JSON array of arrays.
+                    result = json.loads(
+                        "["
+                        + ",".join(
+                            "null" if field is None or field == "" else field
+                            for field in values
+                        )
+                        + "]",
+                        parse_int=parse_int,
+                    )
+                    if len(result) == len(values):
+                        return result
+                except ValueError:
+                    # Fall back to decoding each value to surface the failing one
+                    pass
+            return [
+                (
+                    None
+                    if field is None or field == ""
+                    else json.loads(field, parse_int=parse_int)
+                )
+                for field in values
+            ]
+
+        if column_type == "DOUBLE":
+            converter = float
+        elif column_type == "INTEGER":
+            converter = int
+        elif column_type == "BOOLEAN":
+
+            def converter(field: Any) -> bool:
+                result = (
+                    _BOOLEAN_STRINGS.get(field.lower(), None)
+                    if isinstance(field, str)
+                    else None
+                )
+                return Row.to_boolean(field) if result is None else result
+
+        elif column_type == "DATE":
+            converter = from_unix_epoch_time
+        else:
+            # STRING-like and unknown column types are kept as is
+            return [None if field is None or field == "" else field for field in values]
+
+        return [
+            None if field is None or field == "" else converter(field)
+            for field in values
+        ]
+
     @classmethod
     def fill_from_dict(cls, data: Dict[str, Any]) -> "Row":
         """Create a Row from a dictionary response."""
@@ -770,7 +864,9 @@ class RowSet:
 
         This method takes a list of row dictionaries containing string values from a table query
         response and converts them to the correct Python types based on the column headers.
-        It applies the same type casting logic as `cast_row` to each row in the collection.
+        It applies the same type casting logic as `cast_row` to each row in the collection,
+        but transposes the rows into columns first so that each column is cast in a
+        single pass with `Row.cast_column_values`.
 
         Arguments:
             rows: A list of row dictionaries, each representing a single table row with
@@ -783,7 +879,22 @@ class RowSet:
             A list of row dictionaries with the 'values' field in each row updated to
             contain properly typed values instead of strings.
         """
-        rows = [cls.cast_row(row, headers) for row in rows]
+        for row in rows:
+            if len(row["values"]) != len(headers):
+                raise ValueError(
+                    f"The number of columns in the csv file does not match the given headers. {len(row['values'])} fields, {len(headers)} headers"
+                )
+        if not rows or not headers:
+            return rows
+
+        columns = [
+            Row.cast_column_values(
+                values=list(values), column_type=header.get("columnType", "STRING")
+            )
+            for header, values in zip(headers, zip(*(row["values"] for row in rows)))
+        ]
+        for row, values in zip(rows, map(list, zip(*columns))):
+            row["values"] = values
         return rows
 
     @classmethod
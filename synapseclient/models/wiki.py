@@ -732,8 +732,15 @@ class WikiPage(WikiPageSynchronousProtocol):
                 wiki_content=self.markdown, synapse_client=synapse_client
             )
             try:
-                async with synapse_client._get_parallel_file_transfer_semaphore(
+                async with synapse_client._get_transfer_scheduler(
                     asyncio_event_loop=asyncio.get_running_loop()
+                ).transfer(
+                    size=(
+                        os.path.getsize(file_path)
+                        if os.path.isfile(file_path)
+                        else None
+                    ),
+                    group=self.owner_id,
                 ):
                     file_handle = await upload_file_handle(
                         syn=synapse_client,
@@ -773,8 +780,15 @@ class WikiPage(WikiPageSynchronousProtocol):
                 else:
                     file_path = attachment
                 try:
-                    async with synapse_client._get_parallel_file_transfer_semaphore(
+                    async with synapse_client._get_transfer_scheduler(
                         asyncio_event_loop=asyncio.get_running_loop()
+                    ).transfer(
+                        size=(
+                            os.path.getsize(file_path)
+                            if os.path.isfile(file_path)
+                            else None
+                        ),
+                        group=self.owner_id,
                     ):
                         file_handle = await upload_file_handle(
                             syn=synapse_client,
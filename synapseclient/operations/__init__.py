@@ -1,4 +1,16 @@
-from synapseclient.operations.delete_operations import delete, delete_async
+from synapseclient.operations.annotation_operations import (
+    AnnotationUpdateResult,
+    BulkAnnotationsResult,
+    bulk_set_annotations,
+    bulk_set_annotations_async,
+)
+from synapseclient.operations.delete_operations import (
+    DeleteResult,
+    bulk_delete,
+    bulk_delete_async,
+    delete,
+    delete_async,
+)
 from synapseclient.operations.download_list_operations import (
     DownloadListItem,
     download_list_add,
@@ -60,6 +72,14 @@ __all__ = [
     # Delete operations
     "delete",
     "delete_async",
+    "DeleteResult",
+    "bulk_delete",
+    "bulk_delete_async",
+    # Annotation operations
+    "AnnotationUpdateResult",
+    "BulkAnnotationsResult",
+    "bulk_set_annotations",
+    "bulk_set_annotations_async",
     # Download list operations
     "DownloadListItem",
     "download_list_files",
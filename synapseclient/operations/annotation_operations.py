@@ -0,0 +1,387 @@
+"""Bulk operations for setting annotations on many Synapse entities."""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+
+from synapseclient.api import get_annotations_async, set_annotations_async
+from synapseclient.core.async_utils import wrap_async_to_sync
+from synapseclient.core.exceptions import SynapseHTTPError
+
+if TYPE_CHECKING:
+    from synapseclient import Synapse
+    from synapseclient.models import EntityView
+
+VIEW_QUERY_BATCH_SIZE = 500
+"""The number of entity IDs looked up in a view per query."""
+
+
+@dataclass
+class AnnotationUpdateResult:
+    """The outcome of setting the annotations of one entity with
+    [synapseclient.operations.bulk_set_annotations][].
+
+    Attributes:
+        id: The ID of the entity.
+        etag: The etag of the entity after its annotations were set. This is not
+            known for entities updated through a view.
+        attempts: The number of times the annotations were written. More than one
+            attempt means the entity was modified concurrently and the update was
+            retried with the refreshed etag.
+        via_view: True if the annotations were set by updating the entity's row in
+            a view.
+        error: The exception raised while setting the annotations, if any.
+    """
+
+    id: str
+    """The ID of the entity."""
+
+    etag: Optional[str] = None
+    """The etag of the entity after its annotations were set. This is not known for
+    entities updated through a view."""
+
+    attempts: int = 0
+    """The number of times the annotations were written. More than one attempt means
+    the entity was modified concurrently and the update was retried with the
+    refreshed etag."""
+
+    via_view: bool = False
+    """True if the annotations were set by updating the entity's row in a view."""
+
+    error: Optional[Exception] = None
+    """The exception raised while setting the annotations, if any."""
+
+    @property
+    def updated(self) -> bool:
+        """True if the annotations of the entity were set."""
+        return self.error is None and (self.via_view or self.attempts > 0)
+
+
+@dataclass
+class BulkAnnotationsResult:
+    """The outcome of [synapseclient.operations.bulk_set_annotations][].
+
+    Attributes:
+        results: One result per entity, in the order the entities were given.
+        elapsed_seconds: The wall clock time the whole update took.
+    """
+
+    results: List[AnnotationUpdateResult] = field(default_factory=list)
+    """One result per entity, in the order the entities were given."""
+
+    elapsed_seconds: float = 0.0
+    """The wall clock time the whole update took."""
+
+    @property
+    def updated(self) -> int:
+        """The number of entities whose annotations were set."""
+        return sum(result.updated for result in self.results)
+
+    @property
+    def failed(self) -> int:
+        """The number of entities whose annotations could not be set."""
+        return sum(result.error is not None for result in self.results)
+
+    @property
+    def retried(self) -> int:
+        """The number of entities that were written again after an etag conflict."""
+        return sum(result.attempts > 1 for result in self.results)
+
+    @property
+    def items_per_second(self) -> float:
+        """The number of entities updated per second of wall clock time."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.updated / self.elapsed_seconds
+
+
+def bulk_set_annotations(
+    annotations: Dict[str, Dict[str, Any]],
+    replace: bool = False,
+    view: Optional["EntityView"] = None,
+    max_retries: int = 3,
+    *,
+    synapse_client: Optional["Synapse"] = None,
+) -> BulkAnnotationsResult:
+    """
+    Set the annotations of many entities at once.
+
+    Each entity's current annotations and etag are fetched, the changes are
+    applied and the result is written back. The fetches and writes of different
+    entities are sent concurrently with at most `synapse_client.max_threads * 2`
+    requests in flight. When an entity is modified by someone else between the
+    fetch and the write, Synapse rejects the write with a 412 status; the
+    annotations are then fetched again and the write is retried up to
+    `max_retries` times. A failure does not stop the other updates; it is recorded
+    on the entity's result instead.
+
+    Arguments:
+        annotations: A mapping of entity ID to the annotations to set on it. A
+            value of None removes the annotation.
+        replace: If True, annotations of the entity that are not in the mapping are
+            removed. By default they are kept.
+        view: An entity view that contains the entities. Entities that are rows of
+            the view, and whose annotations are all columns of the view, are updated
+            with [update_rows][synapseclient.models.EntityView.update_rows] in a few
+            large transactions instead of one request each. This is not used when
+            `replace` is True. Entities that are not in the view, or whose rows
+            could not be updated, are updated one at a time.
+        max_retries: The number of times the write of an entity is retried after
+            an etag conflict.
+        synapse_client: If not passed in and caching was not disabled by
+            `Synapse.allow_client_caching(False)` this will use the last created
+            instance from the Synapse class constructor.
+
+    Returns:
+        The result of each update and the throughput of the whole call.
+
+    Example: Annotating many files
+        ```python
+        from synapseclient import Synapse
+        from synapseclient.operations import bulk_set_annotations
+
+        syn = Synapse()
+        syn.login()
+
+        result = bulk_set_annotations(
+            {
+                "syn123": {"species": "Homo sapiens", "reviewed": True},
+                "syn456": {"species": "Mus musculus", "obsolete": None},
+            }
+        )
+        print(f"{result.updated} updated at {result.items_per_second:.1f}/s")
+        for item in result.results:
+            if item.error:
+                print(f"{item.id} failed: {item.error}")
+        ```
+    """
+    return wrap_async_to_sync(
+        coroutine=bulk_set_annotations_async(
+            annotations=annotations,
+            replace=replace,
+            view=view,
+            max_retries=max_retries,
+            synapse_client=synapse_client,
+        )
+    )
+
+
+async def bulk_set_annotations_async(
+    annotations: Dict[str, Dict[str, Any]],
+    replace: bool = False,
+    view: Optional["EntityView"] = None,
+    max_retries: int = 3,
+    *,
+    synapse_client: Optional["Synapse"] = None,
+) -> BulkAnnotationsResult:
+    """
+    Set the annotations of many entities at once asynchronously.
+
+    Each entity's current annotations and etag are fetched, the changes are
+    applied and the result is written back. The fetches and writes of different
+    entities are sent concurrently with at most `synapse_client.max_threads * 2`
+    requests in flight. When an entity is modified by someone else between the
+    fetch and the write, Synapse rejects the write with a 412 status; the
+    annotations are then fetched again and the write is retried up to
+    `max_retries` times. A failure does not stop the other updates; it is recorded
+    on the entity's result instead.
+
+    Arguments:
+        annotations: A mapping of entity ID to the annotations to set on it. A
+            value of None removes the annotation.
+        replace: If True, annotations of the entity that are not in the mapping are
+            removed. By default they are kept.
+        view: An entity view that contains the entities. Entities that are rows of
+            the view, and whose annotations are all columns of the view, are updated
+            with [update_rows_async][synapseclient.models.EntityView.update_rows_async]
+            in a few large transactions instead of one request each. This is not
+            used when `replace` is True. Entities that are not in the view, or
+            whose rows could not be updated, are updated one at a time.
+        max_retries: The number of times the write of an entity is retried after
+            an etag conflict.
+        synapse_client: If not passed in and caching was not disabled by
+            `Synapse.allow_client_caching(False)` this will use the last created
+            instance from the Synapse class constructor.
+
+    Returns:
+        The result of each update and the throughput of the whole call.
+
+    Example: Annotating the files of a view
+        ```python
+        import asyncio
+        from synapseclient import Synapse
+        from synapseclient.models import EntityView
+        from synapseclient.operations import bulk_set_annotations_async
+
+        async def main():
+            syn = Synapse()
+            syn.login()
+
+            view = await EntityView(id="syn789").get_async()
+            result = await bulk_set_annotations_async(
+                {"syn123": {"species": "Homo sapiens"}}, view=view
+            )
+            print(f"{result.updated} updated in {result.elapsed_seconds:.1f}s")
+
+        asyncio.run(main())
+        ```
+    """
+    from synapseclient import Synapse
+
+    client = Synapse.get_client(synapse_client=synapse_client)
+    started = time.perf_counter()
+    results = {
+        entity_id: AnnotationUpdateResult(id=entity_id) for entity_id in annotations
+    }
+
+    updated_in_view: Set[str] = set()
+    if view is not None and not replace:
+        updated_in_view = await _set_annotations_through_view(
+            view=view, annotations=annotations, client=client
+        )
+        for entity_id in updated_in_view:
+            results[entity_id].via_view = True
+
+    semaphore = asyncio.Semaphore(max(client.max_threads * 2, 1))
+
+    async def set_entity_annotations(entity_id: str) -> None:
+        result = results[entity_id]
+        try:
+            while True:
+                async with semaphore:
+                    current = await get_annotations_async(
+                        entity_id, synapse_client=client
+                    )
+                result.attempts += 1
+                try:
+                    async with semaphore:
+                        stored = await set_annotations_async(
+                            annotations=_apply_annotation_changes(
+                                current, annotations[entity_id], replace
+                            ),
+                            synapse_client=client,
+                        )
+                except SynapseHTTPError as ex:
+                    if (
+                        ex.response is None
+                        or ex.response.status_code != 412
+                        or result.attempts > max_retries
+                    ):
+                        raise
+                    client.logger.debug(
+                        f"[{entity_id}]: Etag conflict while setting annotations, retrying"
+                    )
+                    continue
+                result.etag = stored["etag"]
+                return
+        except Exception as ex:
+            result.error = ex
+
+    await asyncio.gather(
+        *(
+            set_entity_annotations(entity_id)
+            for entity_id in results
+            if entity_id not in updated_in_view
+        )
+    )
+
+    bulk_result = BulkAnnotationsResult(
+        results=list(results.values()),
+        elapsed_seconds=time.perf_counter() - started,
+    )
+    client.logger.info(
+        f"Set annotations on {bulk_result.updated} of {len(results)} entities in "
+        f"{bulk_result.elapsed_seconds:.2f}s ({bulk_result.items_per_second:.1f}/s, "
+        f"{bulk_result.retried} retried after an etag conflict, "
+        f"{bulk_result.failed} failed)"
+    )
+    return bulk_result
+
+
+def _apply_annotation_changes(
+    current: Dict[str, Any], changes: Dict[str, Any], replace: bool
+):
+    """Apply the requested changes to annotations fetched from Synapse, keeping the
+    etag they were fetched with."""
+    from synapseclient.models import Annotations
+
+    merged = {} if replace else (Annotations.from_dict(current) or {})
+    for key, value in changes.items():
+        if value is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = value
+    return Annotations(annotations=merged, id=current["id"], etag=current["etag"])
+
+
+async def _set_annotations_through_view(
+    view: "EntityView",
+    annotations: Dict[str, Dict[str, Any]],
+    client: "Synapse",
+) -> Set[str]:
+    """Update the rows of the view for entities that are in it and whose changed
+    annotations are all columns of the view.
+
+    Returns:
+        The IDs of the entities that were updated.
+    """
+    if not view.columns:
+        await view.get_async(include_columns=True, synapse_client=client)
+
+    candidates = [
+        entity_id
+        for entity_id, changes in annotations.items()
+        if changes and all(key in view.columns for key in changes)
+    ]
+    in_view: Set[str] = set()
+    for start in range(0, len(candidates), VIEW_QUERY_BATCH_SIZE):
+        batch = candidates[start : start + VIEW_QUERY_BATCH_SIZE]
+        id_list = ", ".join(f"'{entity_id}'" for entity_id in batch)
+        rows = await view.query_async(
+            query=f"SELECT id FROM {view.id} WHERE id IN ({id_list})",
+            include_row_id_and_row_version=False,
+            synapse_client=client,
+        )
+        in_view.update(str(entity_id) for entity_id in rows["id"])
+
+    # Rows are only updated for the columns that are given, so entities changing
+    # different annotations are written in separate transactions
+    by_columns: Dict[tuple, List[str]] = {}
+    for entity_id in candidates:
+        if entity_id in in_view:
+            by_columns.setdefault(tuple(annotations[entity_id]), []).append(entity_id)
+
+    updated: Set[str] = set()
+    for columns, entity_ids in by_columns.items():
+        values = {"id": entity_ids}
+        for column in columns:
+            column_type = view.columns[column].column_type
+            is_list = column_type is not None and column_type.value.endswith("_LIST")
+            values[column] = [
+                _view_cell_value(annotations[entity_id][column], is_list)
+                for entity_id in entity_ids
+            ]
+        try:
+            await view.update_rows_async(
+                values=values, primary_keys=["id"], synapse_client=client
+            )
+        except Exception as ex:
+            client.logger.warning(
+                f"Could not update {len(entity_ids)} rows of {view.id}, setting their "
+                f"annotations one entity at a time instead: {ex}"
+            )
+            continue
+        updated.update(entity_ids)
+    return updated
+
+
+def _view_cell_value(value: Any, is_list: bool) -> Any:
+    """The cell value of a view column for an annotation value."""
+    if value is None:
+        return None
+    if is_list:
+        return value if isinstance(value, list) else [value]
+    if isinstance(value, list) and len(value) == 1:
+        return value[0]
+    return value
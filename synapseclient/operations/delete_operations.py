@@ -1,10 +1,13 @@
 """Factory method for deleting resources from Synapse."""
 
-from typing import TYPE_CHECKING, Optional, Union
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union
 
-from synapseclient.api import delete_entity
+from synapseclient.api import delete_entity, get_entity_headers, get_entity_path
 from synapseclient.core.async_utils import wrap_async_to_sync
-from synapseclient.core.utils import is_synapse_id_str
+from synapseclient.core.constants.concrete_types import FOLDER_ENTITY, PROJECT_ENTITY
+from synapseclient.core.utils import get_synid_and_version, is_synapse_id_str
 
 if TYPE_CHECKING:
     from synapseclient import Synapse
@@ -30,6 +33,41 @@ if TYPE_CHECKING:
     )
 
 
+@dataclass
+class DeleteResult:
+    """The outcome of deleting one entity, or one version of an entity, with
+    [synapseclient.operations.bulk_delete][].
+
+    Attributes:
+        id: The ID of the entity.
+        version: The version that was deleted, or None if the whole entity was.
+        deleted: True if the delete request for this item, or for the container
+            that covers it, succeeded.
+        covered_by: The ID of a container deleted by the same call that already
+            removes this item. No delete request is sent for covered items.
+        error: The exception raised while deleting this item, or the container
+            that covers it, if any.
+    """
+
+    id: str
+    """The ID of the entity."""
+
+    version: Optional[int] = None
+    """The version that was deleted, or None if the whole entity was."""
+
+    deleted: bool = False
+    """True if the delete request for this item, or for the container that covers
+    it, succeeded."""
+
+    covered_by: Optional[str] = None
+    """The ID of a container deleted by the same call that already removes this
+    item. No delete request is sent for covered items."""
+
+    error: Optional[Exception] = None
+    """The exception raised while deleting this item, or the container that covers
+    it, if any."""
+
+
 def delete(
     entity: Union[
         str,
@@ -454,8 +492,6 @@ async def delete_async(
 
     # Handle string synapse ID
     if isinstance(entity, str):
-        from synapseclient.core.utils import get_synid_and_version
-
         synapse_id = is_synapse_id_str(entity)
         if not synapse_id:
             raise ValueError(
@@ -602,3 +638,254 @@ async def delete_async(
             "EntityView, Evaluation, File, Folder, Grid, JSONSchema, MaterializedView, "
             "Project, RecordSet, SchemaOrganization, SubmissionView, Table, Team, VirtualTable."
         )
+
+
+def bulk_delete(
+    entities: List[Union[str, Any]],
+    version_only: bool = False,
+    *,
+    synapse_client: Optional["Synapse"] = None,
+) -> List[DeleteResult]:
+    """
+    Delete many entities, or many entity versions, at once.
+
+    Items that are removed anyway because a container that contains them is
+    deleted by the same call are skipped, and the remaining deletes are sent
+    concurrently with at most `synapse_client.max_threads * 2` requests in flight.
+    A failure does not stop the other deletes; it is recorded on the item's
+    result instead, and on the results of the items its delete covers.
+
+    Arguments:
+        entities: Synapse ID strings (e.g. "syn123" or "syn123.4") or entity
+            instances accepted by [synapseclient.operations.delete][].
+        version_only: If True, only the version given by each item is deleted.
+            See [synapseclient.operations.delete][].
+        synapse_client: If not passed in and caching was not disabled by
+            `Synapse.allow_client_caching(False)` this will use the last created
+            instance from the Synapse class constructor.
+
+    Returns:
+        One DeleteResult per unique item, in the order the items were given.
+
+    Example: Deleting scratch files and folders
+        The file inside `syn200` is not sent a delete request of its own:
+
+        ```python
+        from synapseclient import Synapse
+        from synapseclient.operations import bulk_delete
+
+        syn = Synapse()
+        syn.login()
+
+        results = bulk_delete(["syn200", "syn201", "syn300"])
+        for result in results:
+            if result.error:
+                print(f"{result.id} failed: {result.error}")
+        ```
+    """
+    return wrap_async_to_sync(
+        coroutine=bulk_delete_async(
+            entities=entities,
+            version_only=version_only,
+            synapse_client=synapse_client,
+        )
+    )
+
+
+async def bulk_delete_async(
+    entities: List[Union[str, Any]],
+    version_only: bool = False,
+    *,
+    synapse_client: Optional["Synapse"] = None,
+) -> List[DeleteResult]:
+    """
+    Delete many entities, or many entity versions, at once asynchronously.
+
+    Items that are removed anyway because a container that contains them is
+    deleted by the same call are skipped, and the remaining deletes are sent
+    concurrently with at most `synapse_client.max_threads * 2` requests in flight.
+    A failure does not stop the other deletes; it is recorded on the item's
+    result instead, and on the results of the items its delete covers.
+
+    Arguments:
+        entities: Synapse ID strings (e.g. "syn123" or "syn123.4") or entity
+            instances accepted by [synapseclient.operations.delete_async][].
+        version_only: If True, only the version given by each item is deleted.
+            See [synapseclient.operations.delete_async][].
+        synapse_client: If not passed in and caching was not disabled by
+            `Synapse.allow_client_caching(False)` this will use the last created
+            instance from the Synapse class constructor.
+
+    Returns:
+        One DeleteResult per unique item, in the order the items were given.
+
+    Example: Deleting old versions of many files
+        ```python
+        import asyncio
+        from synapseclient import Synapse
+        from synapseclient.operations import bulk_delete_async
+
+        async def main():
+            syn = Synapse()
+            syn.login()
+
+            results = await bulk_delete_async(
+                ["syn123.1", "syn123.2", "syn456.1"], version_only=True
+            )
+            print(sum(result.deleted for result in results), "versions deleted")
+
+        asyncio.run(main())
+        ```
+    """
+    from synapseclient import Synapse
+
+    client = Synapse.get_client(synapse_client=synapse_client)
+    semaphore = asyncio.Semaphore(max(client.max_threads * 2, 1))
+
+    items: Dict[Tuple[str, Optional[int]], Union[str, Any]] = {}
+    for entity in entities:
+        items.setdefault(_bulk_delete_key(entity, version_only), entity)
+    results = {key: DeleteResult(id=key[0], version=key[1]) for key in items.keys()}
+
+    whole_entity_ids = {entity_id for entity_id, version in items if version is None}
+    for (entity_id, version), result in results.items():
+        if version is not None and entity_id in whole_entity_ids:
+            result.covered_by = entity_id
+
+    container_types = (
+        await _get_container_types(items, whole_entity_ids, synapse_client=client)
+        if whole_entity_ids and len(items) > 1
+        else {}
+    )
+    if container_types:
+
+        async def get_ancestors(entity_id: str) -> List[str]:
+            async with semaphore:
+                try:
+                    path = await get_entity_path(entity_id, synapse_client=client)
+                except Exception:
+                    # The delete request reports the problem with this entity
+                    return []
+            return [header["id"] for header in path["path"][:-1]]
+
+        # Only an item that is not already covered and is not a Project can sit
+        # under one of the containers
+        synapse_ids = list(
+            {
+                entity_id
+                for (entity_id, _), result in results.items()
+                if result.covered_by is None
+                and is_synapse_id_str(entity_id)
+                and container_types.get(entity_id) != PROJECT_ENTITY
+            }
+        )
+        ancestors = dict(
+            zip(
+                synapse_ids,
+                await asyncio.gather(*(get_ancestors(i) for i in synapse_ids)),
+            )
+        )
+        for (entity_id, _), result in results.items():
+            if result.covered_by is not None:
+                continue
+            # The outermost container is the one whose delete request is sent
+            result.covered_by = next(
+                (
+                    ancestor_id
+                    for ancestor_id in ancestors.get(entity_id, [])
+                    if ancestor_id in container_types
+                ),
+                None,
+            )
+
+    async def delete_item(key: Tuple[str, Optional[int]]) -> None:
+        async with semaphore:
+            try:
+                await delete_async(
+                    entity=items[key],
+                    version_only=version_only,
+                    synapse_client=client,
+                )
+                results[key].deleted = True
+            except Exception as ex:
+                results[key].error = ex
+
+    await asyncio.gather(
+        *(
+            delete_item(key)
+            for key, result in results.items()
+            if result.covered_by is None
+        )
+    )
+
+    # A covered item shares the outcome of the container whose delete removed it
+    for result in results.values():
+        container = result
+        while container.covered_by is not None:
+            container = results[(container.covered_by, None)]
+        if container is not result:
+            result.deleted = container.deleted
+            result.error = container.error
+    return list(results.values())
+
+
+async def _get_container_types(
+    items: Dict[Tuple[str, Optional[int]], Union[str, Any]],
+    whole_entity_ids: Set[str],
+    *,
+    synapse_client: "Synapse",
+) -> Dict[str, Optional[str]]:
+    """The concrete type of each whole-entity item that is a Folder or Project.
+
+    The type is taken from the entity instance when one was given; the types of
+    ID strings are looked up in batches. If the lookup fails every ID string is
+    treated as a possible container, so that no descendant is deleted twice.
+    """
+    from synapseclient.models import Folder, Project
+
+    container_types = {}
+    unknown_ids = []
+    for (entity_id, version), entity in items.items():
+        if version is not None or entity_id not in whole_entity_ids:
+            continue
+        if isinstance(entity, Project):
+            container_types[entity_id] = PROJECT_ENTITY
+        elif isinstance(entity, Folder):
+            container_types[entity_id] = FOLDER_ENTITY
+        elif isinstance(entity, str) and is_synapse_id_str(entity_id):
+            unknown_ids.append(entity_id)
+
+    if unknown_ids:
+        try:
+            headers = await get_entity_headers(
+                unknown_ids, synapse_client=synapse_client
+            )
+        except Exception:
+            container_types.update({entity_id: None for entity_id in unknown_ids})
+        else:
+            container_types.update(
+                {
+                    header.id: header.type
+                    for header in headers
+                    if header.type in (FOLDER_ENTITY, PROJECT_ENTITY)
+                }
+            )
+    return container_types
+
+
+def _bulk_delete_key(
+    entity: Union[str, Any], version_only: bool
+) -> Tuple[str, Optional[int]]:
+    """The (ID, version) pair identifying what deleting this item removes. The
+    version is None when the whole entity is deleted. A version given in an ID
+    string is kept even when version_only is False, so that "syn123.4" is not
+    mistaken for "syn123"; its delete is refused by delete_async unless the
+    whole entity is deleted by the same call."""
+    if isinstance(entity, str):
+        if not is_synapse_id_str(entity):
+            return entity, None
+        return get_synid_and_version(entity)
+
+    entity_id = str(getattr(entity, "id", None) or entity)
+    version = getattr(entity, "version_number", None) if version_only else None
+    return entity_id, version
@@ -2073,52 +2073,25 @@ class TableQueryResult(TableAbstractBaseClass):
         test_import_pandas()
         import pandas as pd
 
-        # To turn a TableQueryResult into a data frame, we add a page of rows
-        # at a time on the untested theory that it's more efficient than
-        # adding a single row at a time to the data frame.
-
-        def construct_rownames(rowset, offset=0):
-            try:
-                return (
-                    row_labels_from_rows(rowset["rows"])
-                    if rowIdAndVersionInIndex
-                    else None
-                )
-            except KeyError:
-                # if we don't have row id and version, just number the rows
-                # python3 cast range to list for safety
-                return list(range(offset, offset + len(rowset["rows"])))
+        # To turn a TableQueryResult into a data frame, every page of rows is
+        # transposed into per-column lists in a single pass and the data frame
+        # is constructed once after all the pages have been read.
+        headers = self.rowset["headers"]
+        row_ids = []
+        row_versions = []
+        row_etags = []
+        columns = [[] for _ in headers]
+
+        def append_page(rows):
+            for row in rows:
+                row_ids.append(row.get("rowId"))
+                row_versions.append(row.get("versionNumber"))
+                row_etags.append(row.get("etag"))
+            for column, values in zip(columns, zip(*(row["values"] for row in rows))):
+                column.extend(values)
 
         # first page of rows
-        offset = 0
-        rownames = construct_rownames(self.rowset, offset)
-        offset += len(self.rowset["rows"])
-        series = collections.OrderedDict()
-
-        if not rowIdAndVersionInIndex:
-            # Since we use an OrderedDict this must happen before we construct the other columns
-            # add row id, verison, and etag as rows
-            append_etag = False  # only useful when (not rowIdAndVersionInIndex), hooray for lazy variables!
-            series["ROW_ID"] = pd.Series(
-                name="ROW_ID", data=[row["rowId"] for row in self.rowset["rows"]]
-            )
-            series["ROW_VERSION"] = pd.Series(
-                name="ROW_VERSION",
-                data=[row["versionNumber"] for row in self.rowset["rows"]],
-            )
-
-            row_etag = [row.get("etag") for row in self.rowset["rows"]]
-            if any(row_etag):
-                append_etag = True
-                series["ROW_ETAG"] = pd.Series(name="ROW_ETAG", data=row_etag)
-
-        for i, header in enumerate(self.rowset["headers"]):
-            column_name = header.name
-            series[column_name] = pd.Series(
-                name=column_name,
-                data=[row["values"][i] for row in self.rowset["rows"]],
-                index=rownames,
-            )
+        append_page(self.rowset["rows"])
 
         # subsequent pages of rows
         while self.nextPageToken:
@@ -2126,43 +2099,34 @@ class TableQueryResult(TableAbstractBaseClass):
             self.rowset = RowSet.from_json(result["queryResults"])
             self.nextPageToken = result.get("nextPageToken", None)
             self.i = 0
+            append_page(self.rowset["rows"])
 
-            rownames = construct_rownames(self.rowset, offset)
-            offset += len(self.rowset["rows"])
-
-            if not rowIdAndVersionInIndex:
-                # TODO: Look into why this isn't being assigned
-                series["ROW_ID"].append(
-                    pd.Series(
-                        name="ROW_ID", data=[row["id"] for row in self.rowset["rows"]]
-                    )
-                )
-                series["ROW_VERSION"].append(
-                    pd.Series(
-                        name="ROW_VERSION",
-                        data=[row["version"] for row in self.rowset["rows"]],
-                    )
-                )
-                if append_etag:
-                    series["ROW_ETAG"] = pd.Series(
-                        name="ROW_ETAG",
-                        data=[row.get("etag") for row in self.rowset["rows"]],
+        series = collections.OrderedDict()
+        index = None
+        if rowIdAndVersionInIndex:
+            if all(row_id is not None for row_id in row_ids) and all(
+                version is not None for version in row_versions
+            ):
+                index = [
+                    "_".join(
+                        map(str, (row_id, version, etag) if etag else (row_id, version))
                     )
+                    for row_id, version, etag in zip(row_ids, row_versions, row_etags)
+                ]
+            else:
+                # if we don't have row id and version, just number the rows
+                index = list(range(len(row_ids)))
+        else:
+            # Since we use an OrderedDict this must happen before we construct the other columns
+            # add row id, verison, and etag as rows
+            series["ROW_ID"] = pd.Series(name="ROW_ID", data=row_ids)
+            series["ROW_VERSION"] = pd.Series(name="ROW_VERSION", data=row_versions)
+            if any(row_etags):
+                series["ROW_ETAG"] = pd.Series(name="ROW_ETAG", data=row_etags)
 
-            for i, header in enumerate(self.rowset["headers"]):
-                column_name = header.name
-                series[column_name] = pd.concat(
-                    [
-                        series[column_name],
-                        pd.Series(
-                            name=column_name,
-                            data=[row["values"][i] for row in self.rowset["rows"]],
-                            index=rownames,
-                        ),
-                    ],
-                    # can't verify integrity when indices are just numbers instead of 'rowid_rowversion'
-                    verify_integrity=rowIdAndVersionInIndex,
-                )
+        for header, values in zip(headers, columns):
+            column_name = header.name
+            series[column_name] = pd.Series(name=column_name, data=values, index=index)
 
         return pd.DataFrame(data=series)
 
@@ -5,7 +5,13 @@ The ``synapseutils`` package provides both higher level beta functions as well a
 """
 
 # flake8: noqa F401 unclear who is using these
-from .copy_functions import changeFileMetaData, copy, copyFileHandles, copyWiki
+from .copy_functions import (
+    changeFileMetaData,
+    copy,
+    copy_async,
+    copyFileHandles,
+    copyWiki,
+)
 from .describe_functions import describe
 from .migrate_functions import index_files_for_migration, migrate_indexed_files
 from .monitor import notify_me_async, notifyMe, with_progress_bar
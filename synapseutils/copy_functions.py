@@ -1,3 +1,4 @@
+import asyncio
 import itertools
 import json
 import math
@@ -16,7 +17,10 @@ from synapseclient import (
     Table,
     Wiki,
 )
+from synapseclient.api import get_child, get_children, get_entity
+from synapseclient.api.user_services import get_user_profile_by_id
 from synapseclient.core.cache import Cache
+from synapseclient.core.constants import concrete_types
 from synapseclient.core.constants.limits import MAX_FILE_HANDLE_PER_COPY_REQUEST
 from synapseclient.core.exceptions import SynapseHTTPError
 
@@ -406,6 +410,84 @@ def copy(
     return mapping
 
 
+async def copy_async(
+    syn: synapseclient.Synapse,
+    entity: str,
+    destinationId: str,
+    skipCopyWikiPage: bool = False,
+    skipCopyAnnotations: bool = False,
+    **kwargs,
+) -> typing.Dict[str, str]:
+    """
+    The asynchronous version of [synapseutils.copy][]. It accepts the same arguments
+    and returns the same mapping, but copies the tree concurrently:
+
+    - Folders are listed and created as soon as their parent exists.
+    - File handles owned by other users are copied in batches of up to
+      `MAX_FILE_HANDLE_PER_COPY_REQUEST` across many files.
+    - At most `syn.max_threads * 2` entities are read or created at a time.
+
+    Arguments:
+        syn: A Synapse object with user's login, e.g. syn = synapseclient.login()
+        entity: A synapse entity ID
+        destinationId: Synapse ID of a folder/project that the copied entity is being copied to
+        skipCopyWikiPage: Skip copying the wiki pages.
+        skipCopyAnnotations: Skips copying the annotations.
+        version: (File copy only) Can specify version of a file. Default to None
+        updateExisting: (File copy only) When the destination has an entity that has the same name,
+                        users can choose to update that entity. It must be the same entity type
+                        Default to False
+        setProvenance: (File copy only) Has three values to set the provenance of the copied entity:
+                        traceback: Sets to the source entity
+                        existing: Sets to source entity's original provenance (if it exists)
+                        None: No provenance is set
+        excludeTypes: (Folder/Project copy only) Accepts a list of entity types (file, table, link)
+                        which determines which entity types to not copy. Defaults to an empty list.
+
+    Returns:
+        A mapping between the original and copied entity: {'syn1234':'syn33455'}
+
+    Example: Using this function
+        Copying everything in a project except tables:
+
+            import asyncio
+            import synapseutils
+            import synapseclient
+            syn = synapseclient.login()
+            asyncio.run(synapseutils.copy_async(syn, "syn123450", "syn345678", excludeTypes=["table"]))
+    """
+    updateLinks = kwargs.get("updateLinks", True)
+    updateSynIds = kwargs.get("updateSynIds", True)
+    entitySubPageId = kwargs.get("entitySubPageId", None)
+    destinationSubPageId = kwargs.get("destinationSubPageId", None)
+
+    mapping = await _AsyncCopier(
+        syn, skipCopyAnnotations=skipCopyAnnotations, **kwargs
+    ).copy(entity, destinationId)
+    if not skipCopyWikiPage:
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max(syn.max_threads * 2, 1))
+
+        async def copy_wiki(oldEnt: str) -> None:
+            async with semaphore:
+                await loop.run_in_executor(
+                    None,
+                    lambda: copyWiki(
+                        syn,
+                        oldEnt,
+                        mapping[oldEnt],
+                        entitySubPageId=entitySubPageId,
+                        destinationSubPageId=destinationSubPageId,
+                        updateLinks=updateLinks,
+                        updateSynIds=updateSynIds,
+                        entityMap=mapping,
+                    ),
+                )
+
+        await asyncio.gather(*(copy_wiki(oldEnt) for oldEnt in list(mapping)))
+    return mapping
+
+
 def _copyRecursive(
     syn: synapseclient.Synapse,
     entity: str,
@@ -750,6 +832,317 @@ def _copyLink(syn, entity, destinationId, updateExisting=False):
             raise e
 
 
+class _AsyncCopier:
+    """
+    Copies a tree of entities for [synapseutils.copy_async][] with the `models`
+    layer. Every entity read, file handle copy request and entity creation holds
+    a slot of a shared semaphore so the whole copy is bounded by
+    `syn.max_threads * 2` requests in flight.
+
+    Files whose file handle was created by another user collect in
+    `pending_handle_copies` until `MAX_FILE_HANDLE_PER_COPY_REQUEST` of them can
+    be copied with a single request.
+    """
+
+    def __init__(
+        self,
+        syn: synapseclient.Synapse,
+        skipCopyAnnotations: bool = False,
+        **kwargs,
+    ) -> None:
+        self.syn = syn
+        self.skip_copy_annotations = skipCopyAnnotations
+        self.version = kwargs.get("version", None)
+        self.set_provenance = kwargs.get("setProvenance", "traceback")
+        self.exclude_types = kwargs.get("excludeTypes", [])
+        self.update_existing = kwargs.get("updateExisting", False)
+        self.mapping: typing.Dict[str, str] = dict()
+        self.pending_handle_copies = []
+        self.batch_tasks: typing.List[asyncio.Task] = []
+        self._semaphore = asyncio.Semaphore(max(syn.max_threads * 2, 1))
+        self._owner_id = None
+
+    async def copy(self, entity: str, destinationId: str) -> typing.Dict[str, str]:
+        """Copies `entity` into `destinationId` and returns the mapping of the old
+        to the new IDs of everything that was copied."""
+        # Check that passed in excludeTypes is file, table, and link
+        if not isinstance(self.exclude_types, list):
+            raise ValueError("Excluded types must be a list")
+        elif not all([i in ["file", "link", "table"] for i in self.exclude_types]):
+            raise ValueError(
+                "Excluded types can only be a list of these values: file, table, and link"
+            )
+
+        try:
+            await self._copy_entity(
+                synapseclient.core.utils.id_of(entity), destinationId
+            )
+            self._copy_pending_file_handles()
+            await asyncio.gather(*self.batch_tasks)
+        except BaseException:
+            for task in self.batch_tasks:
+                task.cancel()
+            raise
+        return self.mapping
+
+    async def _copy_entity(self, entity_id: str, destination_id: str) -> None:
+        async with self._semaphore:
+            ent, permissions, access_requirements = await asyncio.gather(
+                get_entity(entity_id, synapse_client=self.syn),
+                self.syn.rest_get_async(f"/entity/{entity_id}/permissions"),
+                self.syn.rest_get_async(f"/entity/{entity_id}/accessRequirement"),
+            )
+        if ent["id"] == destination_id:
+            raise ValueError("destinationId cannot be the same as entity id")
+
+        concrete_type = ent["concreteType"]
+        if (
+            concrete_type
+            in (concrete_types.PROJECT_ENTITY, concrete_types.FOLDER_ENTITY)
+            and self.version is not None
+        ):
+            raise ValueError("Cannot specify version when copying a project of folder")
+
+        # Don't copy entities without DOWNLOAD permissions
+        if not permissions["canDownload"]:
+            self.syn.logger.warning(
+                "%s not copied - this file lacks download permission" % ent["id"]
+            )
+            return
+        # If there are any access requirements, don't copy files
+        if access_requirements["results"]:
+            self.syn.logger.warning(
+                "{} not copied - this file has access restrictions".format(ent["id"])
+            )
+            return
+
+        copied_id = None
+        if concrete_type == concrete_types.PROJECT_ENTITY:
+            copied_id = await self._copy_project(ent, destination_id)
+        elif concrete_type == concrete_types.FOLDER_ENTITY:
+            copied_id = await self._copy_folder(ent, destination_id)
+        elif (
+            concrete_type == concrete_types.FILE_ENTITY
+            and "file" not in self.exclude_types
+        ):
+            # The mapping is recorded once the file has been created, which for
+            # files waiting on a file handle copy happens in a later batch.
+            await self._copy_file(ent, destination_id)
+            return
+        elif (
+            concrete_type == concrete_types.LINK_ENTITY
+            and "link" not in self.exclude_types
+        ):
+            copied_id = await self._run_in_executor(
+                lambda: _copyLink(
+                    self.syn,
+                    ent["id"],
+                    destination_id,
+                    updateExisting=self.update_existing,
+                )
+            )
+        elif (
+            concrete_type == concrete_types.TABLE_ENTITY
+            and "table" not in self.exclude_types
+        ):
+            copied_id = await self._run_in_executor(
+                lambda: _copyTable(
+                    self.syn,
+                    ent["id"],
+                    destination_id,
+                    updateExisting=self.update_existing,
+                )
+            )
+        self._record(ent["id"], copied_id)
+
+    async def _run_in_executor(self, func: typing.Callable[[], str]) -> str:
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(None, func)
+
+    def _record(self, entity_id: str, copied_id: typing.Optional[str]) -> None:
+        # This is currently done because copyLink returns None sometimes
+        if copied_id is not None:
+            self.mapping[entity_id] = copied_id
+            self.syn.logger.info("Copied %s to %s" % (entity_id, copied_id))
+        else:
+            self.syn.logger.info("%s not copied" % entity_id)
+
+    async def _copy_children(
+        self,
+        parent_id: str,
+        destination_id: str,
+        include_types: typing.List[str] = None,
+    ) -> None:
+        async with self._semaphore:
+            children = [
+                child
+                async for child in get_children(
+                    parent=parent_id,
+                    include_types=include_types,
+                    synapse_client=self.syn,
+                )
+            ]
+        await asyncio.gather(
+            *(self._copy_entity(child["id"], destination_id) for child in children)
+        )
+
+    async def _check_name_is_free(
+        self, name: str, destination_id: str, entity_type: str
+    ) -> None:
+        if self.update_existing:
+            return
+        if (
+            await get_child(
+                entity_name=name, parent_id=destination_id, synapse_client=self.syn
+            )
+            is not None
+        ):
+            raise ValueError(
+                'An entity named "%s" already exists in this location. %s could not be copied'
+                % (name, entity_type)
+            )
+
+    async def _copy_project(self, ent: dict, destination_id: str) -> str:
+        from synapseclient.models import Project
+
+        async with self._semaphore:
+            destination = await get_entity(destination_id, synapse_client=self.syn)
+        if destination["concreteType"] != concrete_types.PROJECT_ENTITY:
+            raise ValueError(
+                "You must give a destinationId of a new project to copy projects"
+            )
+        # Projects include Docker repos, and Docker repos cannot be copied
+        # with the Synapse rest API. Entity views currently also aren't
+        # supported
+        await self._copy_children(
+            ent["id"],
+            destination_id,
+            include_types=["folder", "file", "table", "link"],
+        )
+
+        if not self.skip_copy_annotations:
+            async with self._semaphore:
+                source, project = await asyncio.gather(
+                    Project(id=ent["id"]).get_async(synapse_client=self.syn),
+                    Project(id=destination_id).get_async(synapse_client=self.syn),
+                )
+                project.annotations = source.annotations
+                await project.store_async(synapse_client=self.syn)
+        return destination_id
+
+    async def _copy_folder(self, ent: dict, destination_id: str) -> str:
+        from synapseclient.models import Folder
+
+        async with self._semaphore:
+            await self._check_name_is_free(ent["name"], destination_id, "Folder")
+            source = await Folder(id=ent["id"]).get_async(synapse_client=self.syn)
+            new_folder = Folder(
+                name=source.name,
+                parent_id=destination_id,
+                description=source.description,
+            )
+            if not self.skip_copy_annotations:
+                new_folder.annotations = source.annotations
+            await new_folder.store_async(synapse_client=self.syn)
+        await self._copy_children(ent["id"], new_folder.id)
+        return new_folder.id
+
+    async def _copy_file(self, ent: dict, destination_id: str) -> None:
+        from synapseclient.models import Activity, File, UsedEntity
+
+        async with self._semaphore:
+            source = await File(
+                id=ent["id"], version_number=self.version, download_file=False
+            ).get_async(
+                include_activity=self.set_provenance == "existing",
+                synapse_client=self.syn,
+            )
+            await self._check_name_is_free(source.name, destination_id, "File")
+            if self._owner_id is None:
+                self._owner_id = (
+                    await get_user_profile_by_id(synapse_client=self.syn)
+                )["ownerId"]
+
+        if self.set_provenance == "traceback":
+            activity = Activity(
+                name="Copied file",
+                used=[
+                    UsedEntity(
+                        target_id=source.id,
+                        target_version_number=source.version_number,
+                    )
+                ],
+            )
+        elif self.set_provenance == "existing":
+            activity = source.activity
+        elif self.set_provenance is None or self.set_provenance.lower() == "none":
+            activity = None
+        else:
+            raise ValueError(
+                "setProvenance must be one of None, existing, or traceback"
+            )
+
+        new_file = File(
+            name=source.name,
+            parent_id=destination_id,
+            data_file_handle_id=source.data_file_handle_id,
+            activity=activity,
+            download_file=False,
+        )
+        if not self.skip_copy_annotations:
+            new_file.annotations = source.annotations
+
+        # If the user created the file, reuse its fileHandleId else copy the fileHandle
+        if source.file_handle.created_by == self._owner_id:
+            await self._create_file(source.id, new_file)
+        else:
+            self.pending_handle_copies.append((source, new_file))
+            if len(self.pending_handle_copies) >= MAX_FILE_HANDLE_PER_COPY_REQUEST:
+                self._copy_pending_file_handles()
+
+    def _copy_pending_file_handles(self) -> None:
+        if not self.pending_handle_copies:
+            return
+        batch = self.pending_handle_copies
+        self.pending_handle_copies = []
+        self.batch_tasks.append(
+            asyncio.create_task(self._copy_file_handles_and_create_files(batch))
+        )
+
+    async def _copy_file_handles_and_create_files(self, batch: list) -> None:
+        copy_file_handle_request = _create_batch_file_handle_copy_request(
+            [source.data_file_handle_id for source, _ in batch],
+            ["FileEntity"] * len(batch),
+            [source.id for source, _ in batch],
+            [source.file_handle.content_type for source, _ in batch],
+            [source.file_handle.file_name for source, _ in batch],
+        )
+        async with self._semaphore:
+            copied_file_handles = await self.syn.rest_post_async(
+                "/filehandles/copy",
+                body=json.dumps(copy_file_handle_request),
+                endpoint=self.syn.fileHandleEndpoint,
+            )
+        for (_, new_file), copyResult in zip(
+            batch, copied_file_handles.get("copyResults")
+        ):
+            # Check if failurecodes exist
+            if copyResult.get("failureCode") is not None:
+                raise ValueError(
+                    "%s dataFileHandleId: %s"
+                    % (copyResult["failureCode"], copyResult["originalFileHandleId"])
+                )
+            new_file.data_file_handle_id = copyResult["newFileHandle"]["id"]
+        await asyncio.gather(
+            *(self._create_file(source.id, new_file) for source, new_file in batch)
+        )
+
+    async def _create_file(self, entity_id: str, new_file) -> None:
+        async with self._semaphore:
+            await new_file.store_async(synapse_client=self.syn)
+        self._record(entity_id, new_file.id)
+
+
 def _getSubWikiHeaders(wikiHeaders, subPageId, mapping=None):
     """
     Function to assist in getting wiki headers of subwikipages
@@ -9,7 +9,18 @@ import os
 import re
 import sys
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from deprecated import deprecated
 from tqdm import tqdm
@@ -45,6 +56,11 @@ from synapseclient.core.utils import (
 )
 from synapseclient.entity import is_container
 from synapseclient.models import Activity, File, UsedEntity, UsedURL
+from synapseclient.models.services.manifest import (
+    _max_concurrent_uploads,
+    _run_in_dependency_order,
+    _SharedActivities,
+)
 
 from .monitor import notify_me_async
 
@@ -486,54 +502,12 @@ class _SyncUploader:
             path_to_file_check=resolved_file_checks,
         )
 
-    def _build_tasks_from_dependency_graph(
-        self, dependency_graph: DependencyGraph
-    ) -> List[asyncio.Task]:
-        """
-        Build the asyncio tasks that will be used to upload the files in the correct
-        order based on their dependencies.
-
-        Arguments:
-            dependency_graph: The graph that represents the dependencies of the files to
-                be uploaded.
-
-        Return:
-            A list of asyncio tasks that will upload the files in the correct order.
-
-        """
-        created_tasks_by_path = {}
-
-        # Because the graph is sorted in topological order, we can iterate over the
-        # paths in order and create a task for each file. This ensures that before we
-        # get to any files that have a dependency the Task to save the dependency has
-        # already been created.
-        for (
-            file_path,
-            dependent_file_paths,
-        ) in dependency_graph.path_to_dependencies.items():
-            dependent_tasks = []
-            for dependent_file in dependent_file_paths:
-                if dependency_graph.path_to_file_check.get(dependent_file, None):
-                    dependent_tasks.append(created_tasks_by_path.get(dependent_file))
-
-            upload_item = dependency_graph.path_to_upload_item.get(file_path)
-            file_task = asyncio.create_task(
-                coro=self._upload_item_async(
-                    item=upload_item.entity,
-                    used=upload_item.used,
-                    executed=upload_item.executed,
-                    activity_name=upload_item.activity_name,
-                    activity_description=upload_item.activity_description,
-                    dependent_futures=dependent_tasks,
-                )
-            )
-            created_tasks_by_path.update({file_path: file_task})
-
-        return created_tasks_by_path.values()
-
     async def upload(self, items: Iterable[_SyncUploadItem]) -> None:
         """Upload a number of files to Synapse as provided in the manifest file. This
-        will handle ordering the files based on their dependency graph.
+        will handle ordering the files based on their dependency graph. The upload of
+        a file is only started once its dependencies have been uploaded and there is
+        a free upload slot, so the number of in progress uploads stays bounded. Files
+        that declare identical provenance share a single Activity.
 
         Arguments:
             items: The list of items to upload.
@@ -542,11 +516,30 @@ class _SyncUploader:
             None
         """
         dependency_graph = self._build_dependency_graph(items=[i for i in items])
-        tasks = self._build_tasks_from_dependency_graph(
-            dependency_graph=dependency_graph
-        )
+        activities = _SharedActivities(self.syn)
 
-        await asyncio.gather(*tasks)
+        def start_upload(
+            file_path: str, prerequisite_tasks: List[asyncio.Task]
+        ) -> Coroutine[Any, Any, File]:
+            upload_item = dependency_graph.path_to_upload_item.get(file_path)
+            return self._upload_item_async(
+                item=upload_item.entity,
+                used=upload_item.used,
+                executed=upload_item.executed,
+                activity_name=upload_item.activity_name,
+                activity_description=upload_item.activity_description,
+                dependent_futures=prerequisite_tasks,
+                activities=activities,
+            )
+
+        try:
+            await _run_in_dependency_order(
+                path_to_dependencies=dependency_graph.path_to_dependencies,
+                start_upload=start_upload,
+                max_concurrent_uploads=_max_concurrent_uploads(self.syn),
+            )
+        finally:
+            activities.cancel()
 
     def _build_activity_linkage(
         self, used_or_executed: Iterable[str], resolved_file_ids: Dict[str, str]
@@ -597,6 +590,7 @@ class _SyncUploader:
         activity_name: str,
         activity_description: str,
         dependent_futures: List[asyncio.Future],
+        activities: Optional[_SharedActivities] = None,
     ) -> File:
         resolved_file_ids = {}
         if dependent_futures:
@@ -623,6 +617,8 @@ class _SyncUploader:
                 used=used_activity,
                 executed=executed_activity,
             )
+            if activities is not None:
+                item.activity = await activities.get(item.activity)
         await item.store_async(synapse_client=self.syn)
         return item
 
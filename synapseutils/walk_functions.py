@@ -2,6 +2,8 @@ import os
 import typing
 
 import synapseclient
+from synapseclient.api import walk_children
+from synapseclient.core.async_utils import wrap_async_generator_to_sync_generator
 from synapseclient.entity import is_container
 
 
@@ -19,6 +21,8 @@ def walk(
         "dataset",
         "materializedview",
     ],
+    maxConcurrency: typing.Optional[int] = None,
+    ordered: bool = True,
 ):
     """
     Traverse through the hierarchy of files and folders stored under the synId.
@@ -29,6 +33,13 @@ def walk(
         synId: A synapse ID of a folder or project
         includeTypes: Must be a list of entity types (ie.["file", "table"])
                         The "folder" type is always included so the hierarchy can be traversed
+        maxConcurrency: If set, the folders are listed concurrently with at most this
+                        many folders being listed at the same time. Sub-folders are listed
+                        as soon as their parent has been listed rather than one at a time.
+        ordered: Only used with maxConcurrency. If True, the results are yielded in the
+                        same order as the sequential walk. If False, the results are
+                        yielded as soon as each folder has been listed, a folder is still
+                        always yielded before its sub-folders.
 
     Example: Print Project & Files in slash delimited format
         Traversing through a project and print out each Folder and File
@@ -63,6 +74,12 @@ def walk(
                 print(dirname) #All the folders in the directory path
                 print(filename) #All the files in the directory path
 
+    Example: Walking a large project concurrently
+        Listing up to 20 folders at the same time
+
+            for dirpath, dirname, filename in walk(syn, "syn1234", maxConcurrency=20):
+                print(dirpath)
+
     This is a high level sequence diagram of the walk function:
 
     ```mermaid
@@ -97,6 +114,14 @@ def walk(
     # Ensure that "folder" is included so the hierarchy can be traversed
     if "folder" not in includeTypes:
         includeTypes.append("folder")
+    if maxConcurrency is not None:
+        return _help_walk_concurrently(
+            syn=syn,
+            syn_id=synId,
+            include_types=includeTypes,
+            max_concurrency=maxConcurrency,
+            ordered=ordered,
+        )
     return _help_walk(syn=syn, syn_id=synId, include_types=includeTypes)
 
 
@@ -157,3 +182,42 @@ def _help_walk(
             newpath=newpath,
         ):
             yield x
+
+
+def _help_walk_concurrently(
+    syn: synapseclient.Synapse,
+    syn_id: str,
+    include_types: typing.List[str],
+    max_concurrency: int,
+    ordered: bool = True,
+):
+    """Helper function that traverses through the hierarchy of files and folders
+    stored under the synId, listing up to `max_concurrency` folders at the same time.
+    Has the same behavior as os.walk()
+
+    Arguments:
+        syn: A synapse object: syn = synapseclient.login()- Must be logged into synapse
+        syn_id: A synapse ID of a folder or project
+        include_types: Must be a list of entity types (ie. ["file", "table"]) which can be found here:
+                    http://rest-docs.synapse.org/rest/org/sagebionetworks/repo/model/EntityType.html
+                    The "folder" type is always included so the hierarchy can be traversed.
+        max_concurrency: The maximum number of folders listed at the same time.
+        ordered: If True, the results are yielded in the same order as `_help_walk`.
+    """
+    start_entity = syn.get(syn_id, downloadFile=False)
+    if not is_container(start_entity):
+        return
+    for dirpath, dirs, nondirs in wrap_async_generator_to_sync_generator(
+        walk_children,
+        parent=syn_id,
+        parent_path=start_entity["name"],
+        include_types=include_types,
+        max_concurrency=max_concurrency,
+        ordered=ordered,
+        synapse_client=syn,
+    ):
+        yield (
+            dirpath,
+            [(child["name"], child["id"]) for child in dirs],
+            [(child["name"], child["id"]) for child in nondirs],
+        )
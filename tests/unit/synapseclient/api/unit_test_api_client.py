@@ -0,0 +1,94 @@
+"""Unit tests for the paginated helpers in api_client."""
+
+import asyncio
+import urllib.parse
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from synapseclient.api.api_client import rest_get_paginated_async
+
+
+class TestRestGetPaginatedAsync:
+    """Tests for rest_get_paginated_async."""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.items = [{"id": i} for i in range(95)]
+        self.include_total = True
+        self.truncate_at = {}
+        self.requested_offsets = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        async def rest_get_async(uri, **kwargs):
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(uri).query)
+            limit = int(query["limit"][0])
+            offset = int(query["offset"][0])
+            self.requested_offsets.append(offset)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            # Later pages answer first to check the items are still yielded in order
+            for _ in range(len(self.items) - offset):
+                await asyncio.sleep(0)
+            self.in_flight -= 1
+            page = self.items[offset : offset + self.truncate_at.get(offset, limit)]
+            response = {"results": page}
+            if self.include_total:
+                response["totalNumberOfResults"] = len(self.items)
+            return response
+
+        self.client = MagicMock(max_threads=5)
+        self.client.rest_get_async.side_effect = rest_get_async
+        with patch("synapseclient.Synapse.get_client", return_value=self.client):
+            yield
+
+    async def _get_all(self, **kwargs):
+        return [
+            item
+            async for item in rest_get_paginated_async(
+                uri="/teamMembers/1", limit=10, **kwargs
+            )
+        ]
+
+    async def test_concurrent_results_are_yielded_in_order(self):
+        # WHEN all pages are requested concurrently
+        results = await self._get_all(concurrent=True)
+
+        # THEN every page up to the total number of results is requested once
+        assert sorted(self.requested_offsets) == list(range(0, 95, 10))
+        # AND the items are the same as when the pages are requested in sequence
+        assert results == self.items
+        assert results == await self._get_all()
+
+    async def test_concurrent_requests_are_bounded(self):
+        # GIVEN a client with a single thread
+        self.client.max_threads = 1
+
+        # WHEN all pages are requested concurrently
+        results = await self._get_all(concurrent=True)
+
+        # THEN no more than two pages are requested at a time
+        assert results == self.items
+        assert self.max_in_flight == 2
+
+    async def test_truncated_pages_are_completed(self):
+        # GIVEN a page that the service truncates
+        self.truncate_at[20] = 4
+
+        # WHEN all pages are requested concurrently
+        results = await self._get_all(concurrent=True)
+
+        # THEN the missing items of the truncated page are requested
+        assert results == self.items
+        assert 24 in self.requested_offsets
+
+    async def test_pages_are_requested_until_one_is_empty_without_a_total(self):
+        # GIVEN an endpoint that does not report the total number of results
+        self.include_total = False
+
+        # WHEN all pages are requested concurrently starting at an offset
+        results = await self._get_all(concurrent=True, offset=35)
+
+        # THEN every item from the offset is yielded once
+        assert results == self.items[35:]
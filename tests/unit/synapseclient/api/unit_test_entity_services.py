@@ -1,10 +1,14 @@
 """Unit tests for entity_services utility functions."""
 
+import asyncio
+import json
+import os
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
 import synapseclient.api.entity_services as entity_services
+from synapseclient.core.constants.concrete_types import FILE_ENTITY, FOLDER_ENTITY
 from synapseclient.core.exceptions import (
     SynapseAuthenticationError,
     SynapseFileNotFoundError,
@@ -247,6 +251,43 @@ class TestIsSynapseId:
             await entity_services.is_synapse_id("syn123456", synapse_client=None)
 
 
+class TestGetEntityHeaders:
+    """Tests for get_entity_headers function."""
+
+    @patch("synapseclient.Synapse")
+    async def test_get_entity_headers_batched(self, mock_synapse):
+        # GIVEN a mock client that returns a header for every entity but one
+        mock_client = AsyncMock()
+        mock_synapse.get_client.return_value = mock_client
+
+        async def mock_rest_post(uri, body):
+            return {
+                "results": [
+                    {"id": reference["targetId"], "type": FILE_ENTITY}
+                    for reference in json.loads(body)["references"]
+                    if reference["targetId"] != "syn42"
+                ]
+            }
+
+        mock_client.rest_post_async.side_effect = mock_rest_post
+
+        # WHEN I get the headers of more entities than fit in a single request
+        headers = await entity_services.get_entity_headers(
+            entity_ids=[f"syn{i}" for i in range(250)], synapse_client=None
+        )
+
+        # THEN the entities are requested in batches of 100
+        batch_sizes = [
+            len(json.loads(call.kwargs["body"])["references"])
+            for call in mock_client.rest_post_async.await_args_list
+        ]
+        assert batch_sizes == [100, 100, 50]
+        # AND the entity that was not found is left out
+        assert len(headers) == 249
+        assert headers[0].id == "syn0"
+        assert headers[0].type == FILE_ENTITY
+
+
 class TestGetEntitiesByMd5:
     """Tests for get_entities_by_md5 function."""
 
@@ -290,3 +331,153 @@ class TestGetEntitiesByMd5:
         # THEN I expect empty results
         assert result["results"] == []
         mock_client.rest_get_async.assert_awaited_once()
+
+
+class TestWalkChildren:
+    """Tests for walk_children function."""
+
+    TREE = {
+        "syn1": [
+            {"id": "syn3", "name": "b_folder", "type": FOLDER_ENTITY},
+            {"id": "syn2", "name": "a_folder", "type": FOLDER_ENTITY},
+            {"id": "syn10", "name": "root_file", "type": FILE_ENTITY},
+        ],
+        "syn2": [
+            {"id": "syn4", "name": "nested", "type": FOLDER_ENTITY},
+            {"id": "syn11", "name": "a_file", "type": FILE_ENTITY},
+        ],
+        "syn3": [{"id": "syn12", "name": "b_file", "type": FILE_ENTITY}],
+        "syn4": [],
+    }
+
+    @pytest.fixture(autouse=True)
+    def init_syn(self, syn) -> None:
+        self.syn = syn
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _mock_get_children(self, parent, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # Deeper folders respond faster to shuffle the completion order
+        await asyncio.sleep(0.01 if parent == "syn2" else 0.001)
+        self.in_flight -= 1
+        for child in self.TREE[parent]:
+            yield child
+
+    async def _walk(self, **kwargs) -> list:
+        with patch.object(
+            entity_services, "get_children", side_effect=self._mock_get_children
+        ):
+            return [
+                (dirpath, [d["id"] for d in dirs], [n["id"] for n in nondirs])
+                async for dirpath, dirs, nondirs in entity_services.walk_children(
+                    parent="syn1",
+                    parent_path="root",
+                    include_types=["folder", "file"],
+                    synapse_client=self.syn,
+                    **kwargs,
+                )
+            ]
+
+    async def test_walk_children_ordered(self):
+        # WHEN I walk the tree in order with the sub-folders sorted by name
+        results = await self._walk(
+            max_concurrency=4, dir_sort_key=lambda child: child["name"]
+        )
+
+        # THEN the results are in the order of a sequential depth-first walk
+        assert results == [
+            (("root", "syn1"), ["syn3", "syn2"], ["syn10"]),
+            ((os.path.join("root", "a_folder"), "syn2"), ["syn4"], ["syn11"]),
+            (
+                (os.path.join("root", "a_folder", "nested"), "syn4"),
+                [],
+                [],
+            ),
+            ((os.path.join("root", "b_folder"), "syn3"), [], ["syn12"]),
+        ]
+
+    async def test_walk_children_unordered(self):
+        # WHEN I walk the tree without ordering
+        results = await self._walk(max_concurrency=4, ordered=False)
+
+        # THEN every folder is yielded once
+        container_ids = [dirpath[1] for dirpath, _, _ in results]
+        assert sorted(container_ids) == ["syn1", "syn2", "syn3", "syn4"]
+        # AND the fast folder is yielded before the slow one
+        assert container_ids.index("syn3") < container_ids.index("syn2")
+        # AND every folder is yielded before its sub-folders
+        assert container_ids.index("syn2") < container_ids.index("syn4")
+
+    async def test_walk_children_max_concurrency(self):
+        # WHEN I walk the tree with a concurrency of 1
+        await self._walk(max_concurrency=1)
+
+        # THEN only one folder is listed at a time
+        assert self.max_in_flight == 1
+
+        # WHEN I walk the tree with a higher concurrency
+        await self._walk(max_concurrency=4)
+
+        # THEN sibling folders are listed at the same time
+        assert self.max_in_flight == 2
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    async def test_walk_children_reads_ahead_one_level(self, ordered):
+        # GIVEN a consumer that has only received the root folder
+        listed = []
+
+        async def mock_get_children(parent, **kwargs):
+            listed.append(parent)
+            for child in self.TREE[parent]:
+                yield child
+
+        with patch.object(
+            entity_services, "get_children", side_effect=mock_get_children
+        ):
+            walk = entity_services.walk_children(
+                parent="syn1",
+                parent_path="root",
+                include_types=["folder", "file"],
+                ordered=ordered,
+                synapse_client=self.syn,
+            )
+            await walk.__anext__()
+            for _ in range(20):
+                await asyncio.sleep(0)
+
+            # THEN only the sub-folders of the root are listed ahead
+            assert sorted(listed) == ["syn1", "syn2", "syn3"]
+            await walk.aclose()
+
+    async def test_walk_children_not_recursive(self):
+        # WHEN I walk the tree without recursion
+        results = await self._walk(recursive=False)
+
+        # THEN only the root is listed
+        assert results == [(("root", "syn1"), ["syn3", "syn2"], ["syn10"])]
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    async def test_walk_children_listing_error_raised(self, ordered):
+        # GIVEN a sub-folder that fails to be listed
+        async def mock_get_children(parent, **kwargs):
+            if parent == "syn3":
+                raise SynapseHTTPError("failed to list")
+            for child in self.TREE[parent]:
+                yield child
+
+        # WHEN I walk the tree
+        # THEN the error is raised
+        with patch.object(
+            entity_services, "get_children", side_effect=mock_get_children
+        ):
+            with pytest.raises(SynapseHTTPError, match="failed to list"):
+                async for _ in entity_services.walk_children(
+                    parent="syn1",
+                    parent_path="root",
+                    include_types=["folder", "file"],
+                    ordered=ordered,
+                    synapse_client=self.syn,
+                ):
+                    pass
@@ -0,0 +1,56 @@
+"""Unit tests for file_services utility functions."""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+from synapseclient.api import file_services
+
+
+class TestGetFileHandlesForDownload:
+    """Tests for get_file_handles_for_download_async function."""
+
+    @patch("synapseclient.Synapse")
+    async def test_get_file_handles_for_download_batched(self, mock_synapse):
+        # GIVEN a mock client that returns the requested file handles
+        mock_client = AsyncMock()
+        mock_synapse.get_client.return_value = mock_client
+
+        async def mock_rest_post(uri, body, endpoint):
+            requested_files = json.loads(body)["requestedFiles"]
+            return {
+                "requestedFiles": [
+                    {
+                        "fileHandleId": requested["fileHandleId"],
+                        "preSignedURL": f"url_{requested['fileHandleId']}",
+                    }
+                    for requested in requested_files
+                ]
+            }
+
+        mock_client.rest_post_async.side_effect = mock_rest_post
+
+        # AND more file handles than fit in a single request
+        requested_files = [
+            {
+                "fileHandleId": str(i),
+                "associateObjectId": f"syn{i}",
+                "associateObjectType": "FileEntity",
+            }
+            for i in range(250)
+        ]
+
+        # WHEN I get the file handles
+        results = await file_services.get_file_handles_for_download_async(
+            requested_files=requested_files, synapse_client=None
+        )
+
+        # THEN the file handles are requested in batches of 100
+        assert mock_client.rest_post_async.await_count == 3
+        batch_sizes = [
+            len(json.loads(call.kwargs["body"])["requestedFiles"])
+            for call in mock_client.rest_post_async.await_args_list
+        ]
+        assert batch_sizes == [100, 100, 50]
+        # AND every result is keyed by its file handle ID
+        assert len(results) == 250
+        assert results["42"]["preSignedURL"] == "url_42"
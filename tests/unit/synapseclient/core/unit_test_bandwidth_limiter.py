@@ -0,0 +1,126 @@
+"""Unit tests for synapseclient.core.bandwidth_limiter"""
+
+import threading
+import time
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+
+import synapseclient.core.upload.multipart_upload_async as multipart_upload_async
+from synapseclient.core.bandwidth_limiter import BandwidthLimiter, TokenBucket
+from synapseclient.core.exceptions import SynapseHTTPError
+from synapseclient.core.upload.multipart_upload_async import UploadAttemptAsync
+
+
+class TestTokenBucket:
+    def test_no_limit(self) -> None:
+        # GIVEN a bucket without a limit
+        bucket = TokenBucket()
+
+        # WHEN a large amount is consumed
+        with patch("synapseclient.core.bandwidth_limiter.time.sleep") as mock_sleep:
+            bucket.consume(10**12)
+
+        # THEN the caller does not wait
+        mock_sleep.assert_not_called()
+
+    def test_invalid_limit(self) -> None:
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+        with pytest.raises(ValueError):
+            TokenBucket().bytes_per_second = -1
+
+    def test_limit_is_enforced(self) -> None:
+        # GIVEN a bucket limited to 1000 bytes per second
+        bucket = TokenBucket(1000)
+
+        # WHEN 1000 bytes are consumed in 4 pieces after the burst was used
+        bucket.consume(1000)
+        start = time.monotonic()
+        for _ in range(4):
+            bucket.consume(250)
+        elapsed = time.monotonic() - start
+
+        # THEN it took about a second
+        assert elapsed >= 0.7
+
+    def test_limit_removed_while_waiting(self) -> None:
+        # GIVEN a bucket that is far in debt
+        bucket = TokenBucket(1)
+        bucket.consume(10**6)
+
+        # WHEN the limit is removed while a thread is waiting
+        waiting_thread = threading.Thread(target=bucket.consume, args=(1,))
+        waiting_thread.start()
+        time.sleep(0.1)
+        bucket.bytes_per_second = None
+        waiting_thread.join(timeout=5)
+
+        # THEN the waiting thread continues
+        assert not waiting_thread.is_alive()
+
+
+class TestBandwidthLimiter:
+    def test_upload_and_download_count_towards_combined(self) -> None:
+        # GIVEN a limiter with only a combined limit
+        limiter = BandwidthLimiter(combined_bytes_per_second=1000)
+
+        with (
+            patch.object(limiter.combined, "consume") as mock_combined,
+            patch.object(limiter.upload, "consume") as mock_upload,
+            patch.object(limiter.download, "consume") as mock_download,
+        ):
+            # WHEN bytes are uploaded and downloaded
+            limiter.consume_upload(10)
+            limiter.consume_download(20)
+
+            # THEN both directions count towards the combined limit
+            assert [call.args[0] for call in mock_combined.call_args_list] == [10, 20]
+            mock_upload.assert_called_once_with(10)
+            mock_download.assert_called_once_with(20)
+
+
+class TestUploadAttemptAsync:
+    def test_every_put_attempt_is_charged(self) -> None:
+        # GIVEN an upload whose first PUT of a part is rejected with an expired URL
+        syn = MagicMock()
+        upload = UploadAttemptAsync(
+            syn=syn,
+            dest_file_name="file.txt",
+            upload_request_payload={"partSizeBytes": 4},
+            part_request_body_provider_fn=None,
+            md5_fn=None,
+            force_restart=False,
+        )
+        session = MagicMock()
+
+        with (
+            patch.object(
+                multipart_upload_async,
+                "_raise_for_status_httpx",
+                side_effect=[
+                    SynapseHTTPError(response=MagicMock(status_code=403)),
+                    None,
+                ],
+            ),
+            patch.object(
+                upload,
+                "_refresh_pre_signed_part_urls",
+                return_value=("https://bucket/part1?refreshed", {}),
+            ),
+        ):
+            # WHEN the part is put
+            upload._put_part_with_retry(
+                session=session,
+                body=b"data",
+                part_url="https://bucket/part1",
+                signed_headers={},
+                part_number=1,
+            )
+
+        # THEN the bytes of both attempts count towards the bandwidth limit
+        assert session.put.call_count == 2
+        assert syn._bandwidth_limiter.consume_upload.call_args_list == [
+            call(4),
+            call(4),
+        ]
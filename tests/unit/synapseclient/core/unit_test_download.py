@@ -585,6 +585,52 @@ class TestDownloadFileHandle:
                 synapse_client=self.syn,
             )
 
+    async def test_prefetched_file_handle_result(self) -> None:
+        """Verify that a file handle result retrieved in a batch request is used
+        instead of requesting the file handle again"""
+        file_handle_result = {
+            "fileHandleId": "123",
+            "fileHandle": {
+                "id": "123",
+                "concreteType": concrete_types.S3_FILE_HANDLE,
+                "contentMd5": "someMD5",
+            },
+            "preSignedURL": "asdf.com",
+        }
+
+        with (
+            patch.object(os, "makedirs"),
+            patch(
+                GET_FILE_HANDLE_FOR_DOWNLOAD,
+                new_callable=AsyncMock,
+            ) as mock_getFileHandleDownload,
+            patch(
+                DOWNLOAD_FROM_URL,
+                new_callable=AsyncMock,
+            ) as mock_download_from_URL,
+            patch.object(self.syn, "cache"),
+        ):
+            await download_by_file_handle(
+                file_handle_id=123,
+                synapse_id=456,
+                entity_type="FileEntity",
+                destination="/myfakepath",
+                file_handle_result=file_handle_result,
+                synapse_client=self.syn,
+            )
+
+            mock_getFileHandleDownload.assert_not_awaited()
+            mock_download_from_URL.assert_called_once_with(
+                url="asdf.com",
+                destination="/myfakepath",
+                entity_id=456,
+                file_handle_associate_type="FileEntity",
+                file_handle_id="123",
+                expected_md5="someMD5",
+                progress_bar=ANY,
+                synapse_client=self.syn,
+            )
+
 
 class TestDownloadFromUrlMultiThreaded:
     @pytest.fixture(autouse=True, scope="function")
@@ -866,6 +912,37 @@ class TestDownloadFromUrl:
     def init_syn(self, syn: Synapse) -> None:
         self.syn = syn
 
+    def test_download_is_bandwidth_limited(self, syn: Synapse) -> None:
+        # GIVEN a file that is streamed in several chunks
+        url = "https://fakeurl.com/limited.txt"
+        contents = "\n".join(str(i) for i in range(1000))
+        contents_md5 = hashlib.md5(contents.encode("utf-8")).hexdigest()
+        mock_requests_get = MockRequestGetFunction(
+            [create_mock_response(url, "stream", contents=contents, buffer_size=1024)]
+        )
+
+        with (
+            patch.object(syn._requests_session, "get", side_effect=mock_requests_get),
+            patch.object(
+                Synapse, "_generate_headers", side_effect=mock_generate_headers
+            ),
+            patch.object(syn._bandwidth_limiter, "consume_download") as mock_consume,
+        ):
+            # WHEN the file is downloaded
+            download_from_url(
+                url=url,
+                destination=tempfile.gettempdir(),
+                entity_id=OBJECT_ID,
+                file_handle_associate_type=OBJECT_TYPE,
+                expected_md5=contents_md5,
+                synapse_client=syn,
+            )
+
+        # THEN every chunk waits for the bandwidth limit
+        chunk_sizes = [consumed.args[0] for consumed in mock_consume.call_args_list]
+        assert len(chunk_sizes) > 1
+        assert sum(chunk_sizes) == len(contents)
+
     async def test_download_end_early_retry(self, syn: Synapse) -> None:
         """
         -------Test to ensure download retry even if connection ends early--------
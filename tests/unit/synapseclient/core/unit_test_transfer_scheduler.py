@@ -0,0 +1,204 @@
+"""Unit tests for synapseclient.core.transfer_scheduler"""
+
+import asyncio
+from typing import List, Optional
+
+import pytest
+
+from synapseclient.core.transfer_scheduler import TransferPolicy, TransferScheduler
+
+
+async def _transfer_in_order(
+    scheduler: TransferScheduler,
+    requests: List[tuple],
+) -> List[str]:
+    """Hold the only transfer slot while every request is queued, then release it
+    and return the names of the requests in the order they were started."""
+    started = []
+    release_blocker = asyncio.Event()
+
+    async def blocker() -> None:
+        async with scheduler.transfer():
+            await release_blocker.wait()
+
+    async def transfer(name: str, size: Optional[int], group: Optional[str]) -> None:
+        async with scheduler.transfer(size=size, group=group):
+            started.append(name)
+            await asyncio.sleep(0)
+
+    blocker_task = asyncio.create_task(blocker())
+    await asyncio.sleep(0)
+    tasks = [
+        asyncio.create_task(transfer(name, size, group))
+        for name, size, group in requests
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.pending_transfer_count == len(requests)
+
+    release_blocker.set()
+    await asyncio.gather(blocker_task, *tasks)
+    return started
+
+
+class TestTransferScheduler:
+    async def test_fifo(self) -> None:
+        # GIVEN a scheduler with the default FIFO policy
+        scheduler = TransferScheduler(max_active_transfers=1, max_active_parts=1)
+        assert scheduler.policy == TransferPolicy.FIFO
+
+        # WHEN transfers of different sizes are pending
+        started = await _transfer_in_order(
+            scheduler, [("big", 100, None), ("small", 1, None), ("medium", 10, None)]
+        )
+
+        # THEN they are started in the order they were requested
+        assert started == ["big", "small", "medium"]
+
+    async def test_shortest_first(self) -> None:
+        # GIVEN a scheduler with a SHORTEST_FIRST policy
+        scheduler = TransferScheduler(
+            max_active_transfers=1,
+            max_active_parts=1,
+            policy=TransferPolicy.SHORTEST_FIRST,
+        )
+
+        # WHEN transfers of different sizes are pending
+        started = await _transfer_in_order(
+            scheduler,
+            [
+                ("unknown", None, None),
+                ("big", 100, None),
+                ("small", 1, None),
+                ("medium", 10, None),
+            ],
+        )
+
+        # THEN the smallest are started first and the unknown size is started last
+        assert started == ["small", "medium", "big", "unknown"]
+
+    async def test_fair(self) -> None:
+        # GIVEN a scheduler with a FAIR policy
+        scheduler = TransferScheduler(
+            max_active_transfers=1, max_active_parts=1, policy=TransferPolicy.FAIR
+        )
+
+        # WHEN one container has many more pending transfers than another
+        started = await _transfer_in_order(
+            scheduler,
+            [
+                ("a1", 1, "syn1"),
+                ("a2", 1, "syn1"),
+                ("a3", 1, "syn1"),
+                ("b1", 1, "syn2"),
+                ("b2", 1, "syn2"),
+            ],
+        )
+
+        # THEN the containers take turns
+        assert started == ["a1", "b1", "a2", "b2", "a3"]
+
+    async def test_max_active_transfers(self) -> None:
+        # GIVEN a scheduler that allows 2 active transfers
+        scheduler = TransferScheduler(max_active_transfers=2, max_active_parts=1)
+        active = 0
+        max_active = 0
+
+        async def transfer() -> None:
+            nonlocal active, max_active
+            async with scheduler.transfer(size=1):
+                active += 1
+                max_active = max(max_active, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        # WHEN 10 transfers are requested at the same time
+        await asyncio.gather(*[transfer() for _ in range(10)])
+
+        # THEN no more than 2 were active at the same time
+        assert max_active == 2
+        assert scheduler.active_transfer_count == 0
+        assert scheduler.pending_transfer_count == 0
+
+    async def test_transfer_is_reentrant(self) -> None:
+        # GIVEN a scheduler that allows a single active transfer
+        scheduler = TransferScheduler(max_active_transfers=1, max_active_parts=1)
+
+        # WHEN a transfer slot is requested while one is already held
+        async with scheduler.transfer(size=1) as outer:
+            async with scheduler.transfer(size=1) as inner:
+                # THEN the held slot is used instead of waiting for a new one
+                assert inner is outer
+                assert scheduler.active_transfer_count == 1
+
+        assert scheduler.active_transfer_count == 0
+
+    async def test_parts_are_shared_between_transfers(self) -> None:
+        # GIVEN a scheduler with 2 part slots
+        scheduler = TransferScheduler(max_active_transfers=2, max_active_parts=2)
+        part_order = []
+
+        async def transfer(name: str, part_count: int) -> None:
+            async with scheduler.transfer():
+
+                async def part() -> None:
+                    async with scheduler.part():
+                        part_order.append(name)
+                        await asyncio.sleep(0.01)
+
+                await asyncio.gather(*[part() for _ in range(part_count)])
+
+        # WHEN a large file is started before a small file
+        large = asyncio.create_task(transfer("large", 10))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(transfer("small", 2))
+        await asyncio.gather(large, small)
+
+        # THEN the parts of the small file do not wait for every part of the large
+        # file, they are given part slots as soon as the large file has one in flight
+        assert part_order.index("small") < 4
+        assert part_order.count("small") == 2
+        assert part_order.count("large") == 10
+
+    async def test_cancelled_waiter_does_not_hold_slot(self) -> None:
+        # GIVEN a scheduler with a single active transfer slot that is held
+        scheduler = TransferScheduler(max_active_transfers=1, max_active_parts=1)
+        release_blocker = asyncio.Event()
+
+        async def blocker() -> None:
+            async with scheduler.transfer():
+                await release_blocker.wait()
+
+        async def transfer() -> None:
+            async with scheduler.transfer():
+                pass
+
+        blocker_task = asyncio.create_task(blocker())
+        await asyncio.sleep(0)
+        waiting_task = asyncio.create_task(transfer())
+        await asyncio.sleep(0)
+
+        # WHEN the waiting transfer is cancelled
+        waiting_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting_task
+        release_blocker.set()
+        await blocker_task
+
+        # THEN a new transfer is started without waiting
+        await asyncio.wait_for(transfer(), timeout=1)
+        assert scheduler.active_transfer_count == 0
+
+    async def test_policy_change(self) -> None:
+        # GIVEN a scheduler with a FIFO policy
+        scheduler = TransferScheduler(
+            max_active_transfers=1, max_active_parts=1, policy="fifo"
+        )
+
+        # WHEN the policy is changed
+        scheduler.policy = TransferPolicy.SHORTEST_FIRST
+        started = await _transfer_in_order(
+            scheduler, [("big", 100, None), ("small", 1, None)]
+        )
+
+        # THEN the new policy is used for the pending transfers
+        assert started == ["small", "big"]
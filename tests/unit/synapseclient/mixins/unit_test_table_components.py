@@ -1,10 +1,11 @@
+import asyncio
 import os
 import re
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from io import BytesIO
 from typing import Any, Dict, List, Optional
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import numpy as np
 import pandas as pd
@@ -18,7 +19,8 @@ from synapseclient.core.constants.concrete_types import (
     QUERY_RESULT,
     QUERY_TABLE_CSV_REQUEST,
 )
-from synapseclient.core.utils import MB
+from synapseclient.core.exceptions import SynapseTimeoutError
+from synapseclient.core.utils import MB, from_unix_epoch_time
 from synapseclient.models import Activity, Column
 from synapseclient.models.mixins.table_components import (
     ColumnMixin,
@@ -29,17 +31,23 @@ from synapseclient.models.mixins.table_components import (
     SnapshotRequest,
     TableDeleteRowMixin,
     TableStoreMixin,
+    TableStoreRowMixin,
     TableUpdateTransaction,
     TableUpsertMixin,
     ViewSnapshotMixin,
     ViewStoreMixin,
     ViewUpdateMixin,
     _construct_partial_rows_for_upsert,
+    _construct_partial_rows_with_row_hashes,
+    _max_string_length,
     _query_table_csv,
     _query_table_next_page,
     _query_table_row_set,
+    _rowset_to_pandas_df,
+    _wait_for_eventually_consistent_changes,
     convert_dtypes_to_json_serializable,
     csv_to_pandas_df,
+    infer_column_type_from_data,
 )
 from synapseclient.models.table_components import (
     ActionRequiredCount,
@@ -957,6 +965,7 @@ class TestTableUpsertMixin:
                 update_size_bytes=1.9 * MB,
                 insert_size_bytes=900 * MB,
                 job_timeout=600,
+                use_row_hashes=False,
                 synapse_client=self.syn,
             )
 
@@ -1732,6 +1741,228 @@ class TestTableUpsertMixin:
         assert len(syn_id_and_etags) == 1
         assert syn_id_and_etags["syn456"] == "etag1"
 
+    async def test_construct_partial_rows_with_row_hashes(self):
+        # GIVEN an entity with a primary key, an integer and a list column
+        test_instance = self.ClassForTest(
+            id="syn123",
+            columns={
+                "col1": Column(name="col1", column_type=ColumnType.STRING, id="id1"),
+                "col2": Column(name="col2", column_type=ColumnType.INTEGER, id="id2"),
+                "col3": Column(
+                    name="col3", column_type=ColumnType.STRING_LIST, id="id3"
+                ),
+            },
+        )
+
+        # AND the rows that are already in the table
+        results = convert_dtypes_to_json_serializable(
+            pd.DataFrame(
+                {
+                    "ROW_ID": [1, 2, 3, 4],
+                    "ROW_VERSION": [1, 1, 1, 1],
+                    "col1": ["A", "B", "C", None],
+                    "col2": [1, 2, 3, 4],
+                    "col3": [["a"], ["b"], [], ["d"]],
+                }
+            )
+        )
+
+        # AND data to upsert where B changes col2, C clears col3 and D is new
+        values = convert_dtypes_to_json_serializable(
+            pd.DataFrame(
+                {
+                    "col1": ["A", "B", "C", "D"],
+                    "col2": [1, 20, 3, 4],
+                    "col3": [["a"], ["b"], None, ["d"]],
+                }
+            )
+        )
+
+        # WHEN I construct the partial rows with row hashes
+        with patch.object(
+            test_instance,
+            "query_async",
+            new=AsyncMock(return_value=results),
+            create=True,
+        ) as mock_query:
+            (
+                rows_to_update,
+                indexes_with_changes,
+                indexes_without_changes,
+                syn_id_and_etags,
+            ) = await _construct_partial_rows_with_row_hashes(
+                entity=test_instance,
+                values=values,
+                primary_keys=["col1"],
+                contains_etag=False,
+                wait_for_eventually_consistent_view=False,
+                synapse_client=self.syn,
+            )
+
+        # THEN the table is queried once without a WHERE clause
+        mock_query.assert_awaited_once_with(
+            query='SELECT "col1", "col2", "col3" FROM syn123',
+            synapse_client=self.syn,
+        )
+
+        # AND only the changed cell of B is sent
+        assert len(rows_to_update) == 1
+        assert rows_to_update[0].row_id == 2
+        assert rows_to_update[0].etag is None
+        assert rows_to_update[0].values == [{"key": "id2", "value": 20}]
+        assert indexes_with_changes == [1]
+
+        # AND an empty list and a missing value are the same, D is left to insert
+        assert sorted(indexes_without_changes) == [0, 2]
+        assert syn_id_and_etags == {}
+
+    async def test_construct_partial_rows_with_row_hashes_etags_for_view(self):
+        # GIVEN an entity with an id column that is tracked in a view
+        test_instance = self.ClassForTest(
+            id="syn123",
+            columns={
+                "id": Column(name="id", column_type=ColumnType.ENTITYID, id="id0"),
+                "col1": Column(name="col1", column_type=ColumnType.STRING, id="id1"),
+                "col2": Column(name="col2", column_type=ColumnType.INTEGER, id="id2"),
+            },
+        )
+        results = pd.DataFrame(
+            {
+                "ROW_ID": [1, 2],
+                "ROW_VERSION": [1, 1],
+                "ROW_ETAG": ["etag1", "etag2"],
+                "id": ["syn1", "syn2"],
+                "col1": ["A", "B"],
+                "col2": [1, 2],
+            }
+        )
+        values = pd.DataFrame({"col1": ["A", "B"], "col2": [10, None]})
+
+        # WHEN I construct the partial rows with row hashes
+        with patch.object(
+            test_instance,
+            "query_async",
+            new=AsyncMock(return_value=results),
+            create=True,
+        ) as mock_query:
+            (
+                rows_to_update,
+                indexes_with_changes,
+                indexes_without_changes,
+                syn_id_and_etags,
+            ) = await _construct_partial_rows_with_row_hashes(
+                entity=test_instance,
+                values=values,
+                primary_keys=["col1"],
+                contains_etag=True,
+                wait_for_eventually_consistent_view=True,
+                synapse_client=self.syn,
+            )
+
+        # THEN the etag and id columns are queried
+        mock_query.assert_awaited_once_with(
+            query='SELECT ROW_ETAG, id, "col1", "col2" FROM syn123',
+            synapse_client=self.syn,
+        )
+
+        # AND both rows are updated with their etags
+        assert [row.row_id for row in rows_to_update] == [1, 2]
+        assert [row.etag for row in rows_to_update] == ["etag1", "etag2"]
+        assert rows_to_update[0].values == [{"key": "id2", "value": 10}]
+        assert rows_to_update[1].values == [{"key": "id2", "value": None}]
+        assert indexes_with_changes == [0, 1]
+        assert indexes_without_changes == []
+        assert syn_id_and_etags == {"syn1": "etag1", "syn2": "etag2"}
+
+    async def test_construct_partial_rows_with_row_hashes_integral_doubles(self):
+        # GIVEN an entity with a DOUBLE column that only holds whole numbers
+        test_instance = self.ClassForTest(
+            id="syn123",
+            columns={
+                "col1": Column(name="col1", column_type=ColumnType.STRING, id="id1"),
+                "col2": Column(name="col2", column_type=ColumnType.DOUBLE, id="id2"),
+            },
+        )
+
+        # AND the table returns the numbers as floats
+        results = pd.DataFrame(
+            {
+                "ROW_ID": [1, 2, 3],
+                "ROW_VERSION": [1, 1, 1],
+                "col1": ["A", "B", "C"],
+                "col2": [1.0, 2.0, None],
+            }
+        )
+
+        # AND the data being upserted holds the same numbers as integers
+        values = convert_dtypes_to_json_serializable(
+            pd.DataFrame(
+                {"col1": ["A", "B", "C"], "col2": [1, 3, None]}
+            ).convert_dtypes()
+        )
+
+        # WHEN I construct the partial rows with row hashes
+        with patch.object(
+            test_instance,
+            "query_async",
+            new=AsyncMock(return_value=results),
+            create=True,
+        ):
+            (
+                rows_to_update,
+                indexes_with_changes,
+                indexes_without_changes,
+                _,
+            ) = await _construct_partial_rows_with_row_hashes(
+                entity=test_instance,
+                values=values,
+                primary_keys=["col1"],
+                contains_etag=False,
+                wait_for_eventually_consistent_view=False,
+                synapse_client=self.syn,
+            )
+
+        # THEN only the row whose value differs is updated
+        assert [row.row_id for row in rows_to_update] == [2]
+        assert indexes_with_changes == [1]
+        assert sorted(indexes_without_changes) == [0, 2]
+
+    async def test_construct_partial_rows_with_row_hashes_duplicate_keys(self):
+        # GIVEN a table that contains the same primary key twice
+        test_instance = self.ClassForTest(
+            id="syn123",
+            columns={
+                "col1": Column(name="col1", column_type=ColumnType.STRING, id="id1"),
+                "col2": Column(name="col2", column_type=ColumnType.INTEGER, id="id2"),
+            },
+        )
+        results = pd.DataFrame(
+            {
+                "ROW_ID": [1, 2],
+                "ROW_VERSION": [1, 1],
+                "col1": ["A", "A"],
+                "col2": [1, 2],
+            }
+        )
+
+        # WHEN I construct the partial rows with row hashes
+        # THEN a ValueError is raised
+        with patch.object(
+            test_instance,
+            "query_async",
+            new=AsyncMock(return_value=results),
+            create=True,
+        ):
+            with pytest.raises(ValueError, match="must be unique in the table"):
+                await _construct_partial_rows_with_row_hashes(
+                    entity=test_instance,
+                    values=pd.DataFrame({"col1": ["A"], "col2": [3]}),
+                    primary_keys=["col1"],
+                    contains_etag=False,
+                    wait_for_eventually_consistent_view=False,
+                    synapse_client=self.syn,
+                )
+
 
 class TestQuery:
     """Test suite for the Query.to_synapse_request method."""
@@ -2031,6 +2262,150 @@ class TestViewUpdateMixin:
             )
 
 
+class TestWaitForEventuallyConsistentChanges:
+    @pytest.fixture(autouse=True, scope="function")
+    def init_syn(self, syn: Synapse) -> None:
+        self.syn = syn
+
+    @dataclass
+    class ClassForTest(ViewUpdateMixin, QueryMixin):
+        id: Optional[str] = None
+        name: Optional[str] = None
+        columns: Dict[str, Column] = field(default_factory=dict)
+
+    def bundle(self, count: int, last_updated_on: str) -> MagicMock:
+        return MagicMock(query_count=count, last_updated_on=last_updated_on)
+
+    async def test_backoff_and_last_updated_on_pre_check(self):
+        # GIVEN a view with 4 changed rows probed in chunks of 2
+        test_instance = self.ClassForTest(id="syn123")
+        row_update_results = [
+            MagicMock(entities_with_changes_applied=["syn1", "syn2", "syn3", "syn4"])
+        ]
+        synids_and_etags = {f"syn{i}": f"etag{i}" for i in range(1, 5)}
+
+        # AND a view that is not updated for two polls, then is fully updated
+        table_query_results = [
+            # Poll 1: the first poll probes every chunk
+            self.bundle(2, "t1"),
+            self.bundle(2, "t1"),
+            # Poll 2: the view was not updated, only the first chunk is probed
+            self.bundle(2, "t1"),
+            # Poll 3: the view was updated, every chunk is probed
+            self.bundle(0, "t2"),
+            self.bundle(0, "t2"),
+        ]
+
+        # WHEN I wait for the changes
+        with (
+            patch(
+                "synapseclient.models.mixins.table_components._table_query",
+                side_effect=table_query_results,
+            ) as mock_table_query,
+            patch(
+                "synapseclient.models.mixins.table_components.ETAG_PROBE_CHUNK_SIZE", 2
+            ),
+            patch(
+                "synapseclient.models.mixins.table_components.asyncio.sleep",
+                new_callable=AsyncMock,
+            ) as mock_sleep,
+            patch.object(test_instance, "query_async") as mock_query_async,
+        ):
+            await _wait_for_eventually_consistent_changes(
+                entity=test_instance,
+                original_synids_and_etags_to_track=synids_and_etags,
+                wait_for_eventually_consistent_view_timeout=600,
+                row_update_results=row_update_results,
+                synapse_client=self.syn,
+            )
+
+        # THEN only count queries were sent, with one chunk of etags each
+        assert mock_table_query.await_count == 5
+        assert (
+            mock_table_query.await_args_list[0].kwargs["query"]
+            == "select etag from syn123 where etag IN ('etag1','etag2')"
+        )
+        assert (
+            mock_table_query.await_args_list[1].kwargs["query"]
+            == "select etag from syn123 where etag IN ('etag3','etag4')"
+        )
+        assert mock_table_query.await_args_list[0].kwargs["part_mask"] == 0x2 | 0x80
+        mock_query_async.assert_not_called()
+
+        # AND the time between polls doubled while no progress was made
+        assert [call.args[0] for call in mock_sleep.await_args_list] == [1, 2]
+
+    async def test_partially_updated_chunk(self):
+        # GIVEN a view where one of the two changed rows has been updated
+        test_instance = self.ClassForTest(id="syn123")
+        row_update_results = [MagicMock(entities_with_changes_applied=["syn1", "syn2"])]
+        synids_and_etags = {"syn1": "etag1", "syn2": "etag2"}
+
+        # WHEN I wait for the changes
+        with (
+            patch(
+                "synapseclient.models.mixins.table_components._table_query",
+                side_effect=[self.bundle(1, "t1"), self.bundle(0, "t2")],
+            ),
+            patch(
+                "synapseclient.models.mixins.table_components.asyncio.sleep",
+                new_callable=AsyncMock,
+            ) as mock_sleep,
+            patch.object(
+                test_instance,
+                "query_async",
+                return_value=pd.DataFrame({"etag": ["etag2"]}),
+            ) as mock_query_async,
+        ):
+            await _wait_for_eventually_consistent_changes(
+                entity=test_instance,
+                original_synids_and_etags_to_track=synids_and_etags,
+                wait_for_eventually_consistent_view_timeout=600,
+                row_update_results=row_update_results,
+                synapse_client=self.syn,
+            )
+
+        # THEN the rows are only queried for the partially updated chunk
+        mock_query_async.assert_awaited_once_with(
+            query="select etag from syn123 where etag IN ('etag1','etag2')",
+            synapse_client=self.syn,
+            include_row_id_and_row_version=False,
+        )
+
+        # AND the poll interval is reset since progress was made
+        assert [call.args[0] for call in mock_sleep.await_args_list] == [1]
+
+    async def test_timeout(self):
+        # GIVEN a view that is never updated
+        test_instance = self.ClassForTest(id="syn123")
+        row_update_results = [MagicMock(entities_with_changes_applied=["syn1"])]
+
+        # WHEN I wait for the changes with no time to wait
+        # THEN a SynapseTimeoutError is raised and the wait time is recorded
+        with (
+            patch(
+                "synapseclient.models.mixins.table_components._table_query",
+                return_value=self.bundle(1, "t1"),
+            ),
+            patch(
+                "synapseclient.models.mixins.table_components.EVENTUAL_CONSISTENCY_WAIT_HISTOGRAM"
+            ) as mock_histogram,
+        ):
+            with pytest.raises(SynapseTimeoutError):
+                await _wait_for_eventually_consistent_changes(
+                    entity=test_instance,
+                    original_synids_and_etags_to_track={"syn1": "etag1"},
+                    wait_for_eventually_consistent_view_timeout=0,
+                    row_update_results=row_update_results,
+                    synapse_client=self.syn,
+                )
+        mock_histogram.record.assert_called_once()
+        assert mock_histogram.record.call_args.args[1] == {
+            "synapse.id": "syn123",
+            "synapse.timed_out": True,
+        }
+
+
 class TestQueryResultBundle:
     """Test suite for the QueryResultBundle.fill_from_dict method."""
 
@@ -2569,6 +2944,150 @@ class TestViewSnapshotMixin:
             assert result == expected_result
 
 
+class TestTableStoreRowMixin:
+    @pytest.fixture(autouse=True, scope="function")
+    def init_syn(self, syn: Synapse) -> None:
+        self.syn = syn
+
+    @dataclass
+    class ClassForTest(TableStoreRowMixin):
+        id: Optional[str] = "syn123"
+        name: Optional[str] = "test_table"
+        columns: Dict[str, Column] = field(default_factory=dict)
+
+    async def test_upload_chunks_and_apply_in_order_and_bounded(self):
+        # GIVEN 4 chunks whose uploads finish in reverse order
+        test_instance = self.ClassForTest()
+        in_flight = 0
+        max_in_flight = 0
+
+        def make_upload(index: int):
+            async def upload() -> str:
+                nonlocal in_flight, max_in_flight
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                await asyncio.sleep(0.01 * (4 - index))
+                in_flight -= 1
+                return f"fh{index}"
+
+            return upload
+
+        chunks = [(100, make_upload(index)) for index in range(4)]
+        sent_file_handles = []
+
+        async def send_update(**kwargs):
+            sent_file_handles.append(kwargs["file_handle_ids"])
+
+        with patch.object(test_instance, "_send_update", side_effect=send_update):
+            # WHEN I upload the chunks with a pipeline depth of 2 and room for a
+            # single chunk per transaction
+            await test_instance._upload_chunks_and_apply(
+                client=self.syn,
+                chunks=chunks,
+                csv_table_descriptor=None,
+                job_timeout=600,
+                insert_size_bytes=100,
+                upload_pipeline_depth=2,
+                progress_bar=MagicMock(),
+            )
+
+        # THEN the transactions are applied in the order of the chunks
+        assert sent_file_handles == [["fh0"], ["fh1"], ["fh2"], ["fh3"]]
+        # AND no more than 2 chunks were uploading at once
+        assert max_in_flight == 2
+
+    async def test_upload_chunks_and_apply_batches_ready_chunks(self):
+        # GIVEN 3 chunks that upload immediately
+        test_instance = self.ClassForTest()
+
+        def make_upload(index: int):
+            async def upload() -> str:
+                return f"fh{index}"
+
+            return upload
+
+        chunks = [(100, make_upload(index)) for index in range(3)]
+        sent = []
+
+        async def send_update(**kwargs):
+            sent.append((kwargs["file_handle_ids"], kwargs["changes"]))
+            await asyncio.sleep(0.01)
+
+        with patch.object(test_instance, "_send_update", side_effect=send_update):
+            # WHEN two chunks fit within a single transaction
+            await test_instance._upload_chunks_and_apply(
+                client=self.syn,
+                chunks=chunks,
+                csv_table_descriptor=None,
+                job_timeout=600,
+                insert_size_bytes=200,
+                upload_pipeline_depth=2,
+                progress_bar=MagicMock(),
+                changes=["schema_change"],
+            )
+
+        # THEN the chunks that finished uploading together are batched
+        # AND the additional changes are only sent with the first transaction
+        assert sent == [(["fh0", "fh1"], ["schema_change"]), (["fh2"], None)]
+
+    async def test_upload_chunks_and_apply_upload_failure(self):
+        # GIVEN a chunk that fails to upload
+        test_instance = self.ClassForTest()
+
+        async def failing_upload() -> str:
+            raise ValueError("upload failed")
+
+        with patch.object(test_instance, "_send_update") as mock_send_update:
+            # WHEN I upload the chunks
+            # THEN the error is raised
+            with pytest.raises(ValueError, match="upload failed"):
+                await test_instance._upload_chunks_and_apply(
+                    client=self.syn,
+                    chunks=[(100, failing_upload)],
+                    csv_table_descriptor=None,
+                    job_timeout=600,
+                    insert_size_bytes=100,
+                    upload_pipeline_depth=2,
+                    progress_bar=MagicMock(),
+                )
+            # AND no transaction is sent
+            mock_send_update.assert_not_called()
+
+    async def test_chunk_and_upload_csv_splits_by_pipeline_depth(self, tmp_path):
+        # GIVEN a CSV that is larger than the insert size
+        test_instance = self.ClassForTest()
+        path_to_csv = tmp_path / "data.csv"
+        lines = [b"col1\n"] + [f"{i:04d}\n".encode() for i in range(20)]
+        path_to_csv.write_bytes(b"".join(lines))
+
+        with (
+            patch.object(test_instance, "_send_update") as mock_send_update,
+            patch.object(
+                test_instance, "_upload_chunks_and_apply"
+            ) as mock_upload_chunks_and_apply,
+        ):
+            # WHEN I upload it with a pipeline depth of 2
+            await test_instance._chunk_and_upload_csv(
+                path_to_csv=str(path_to_csv),
+                insert_size_bytes=40,
+                csv_table_descriptor=None,
+                schema_change_request=None,
+                client=self.syn,
+                job_timeout=600,
+                upload_pipeline_depth=2,
+            )
+
+        # THEN the schema changes are applied before the rows
+        mock_send_update.assert_awaited_once()
+        # AND the rows are split into chunks of at most half of the insert size
+        chunks = mock_upload_chunks_and_apply.call_args.kwargs["chunks"]
+        assert [size for size, _ in chunks] == [20, 20, 20, 20, 20]
+        assert chunks[1][1].keywords["byte_chunk_offset"] == len(b"col1\n") + 20
+        assert (
+            mock_upload_chunks_and_apply.call_args.kwargs["upload_pipeline_depth"] == 2
+        )
+
+
 class TestTableDeleteRowMixin:
     fake_query = "SELECT * FROM syn123"
 
@@ -3070,6 +3589,41 @@ class TestRow:
         assert result == [123, 456, 789]
         assert all(isinstance(val, int) for val in result)
 
+    @pytest.mark.parametrize(
+        "column_type,values,expected",
+        [
+            ("STRING", ["a", "", None], ["a", None, None]),
+            ("INTEGER", ["1", "", "3"], [1, None, 3]),
+            ("DOUBLE", ["1.5", None], [1.5, None]),
+            ("BOOLEAN", ["true", "f", ""], [True, False, None]),
+            ("STRING_LIST", ['["a", "b"]', ""], [["a", "b"], None]),
+            ("UNKNOWN_TYPE", ["x"], ["x"]),
+        ],
+    )
+    def test_cast_column_values(self, column_type, values, expected):
+        """Test cast_column_values converts a whole column at once."""
+        # WHEN casting a column of values
+        result = Row.cast_column_values(values=values, column_type=column_type)
+
+        # THEN the values match the per-cell cast_values conversion
+        assert result == expected
+        assert result == [
+            Row.cast_values([value], [{"columnType": column_type}])[0]
+            for value in values
+        ]
+
+    def test_cast_column_values_dates(self):
+        """Test cast_column_values with DATE and DATE_LIST column types."""
+        # WHEN casting epoch millisecond values
+        dates = Row.cast_column_values(values=["1421365", None], column_type="DATE")
+        date_lists = Row.cast_column_values(
+            values=["[1421365, 0]"], column_type="DATE_LIST"
+        )
+
+        # THEN they are converted to datetimes
+        assert dates == [from_unix_epoch_time(1421365), None]
+        assert date_lists == [[from_unix_epoch_time(1421365), from_unix_epoch_time(0)]]
+
 
 class TestActionRequiredCount:
     """Test suite for the ActionRequiredCount.fill_from_dict method."""
@@ -3278,6 +3832,16 @@ class TestRowSet:
         assert result.rows[1].etag == "etag-2"
         assert result.rows[1].values == ["B", 2, False]
 
+    def test_cast_row_set_mismatched_columns(self, sample_header_data):
+        """Test cast_row_set raises when a row does not match the headers."""
+        # GIVEN a row with fewer values than headers
+        rows = [{"rowId": 1, "versionNumber": 1, "values": ["A", "1"]}]
+
+        # WHEN casting the rows
+        # THEN a ValueError is raised
+        with pytest.raises(ValueError, match="2 fields, 3 headers"):
+            RowSet.cast_row_set(rows, sample_header_data)
+
 
 class TestQueryNextPageToken:
     """Test suite for the QueryNextPageToken.fill_from_dict method."""
@@ -3689,6 +4253,85 @@ class TestQueryTableNextPage:
             assert result.select_columns[0].id == "12345"
 
 
+class TestRowsetToPandasDf:
+    """Test suite for the _rowset_to_pandas_df function."""
+
+    @pytest.fixture(autouse=True, scope="function")
+    def init_syn(self, syn: Synapse) -> None:
+        self.syn = syn
+
+    @staticmethod
+    def _bundle(rows, next_page_token=None) -> QueryResultBundle:
+        return QueryResultBundle.fill_from_dict(
+            {
+                "queryResult": {
+                    "queryResults": {
+                        "tableId": "syn123456",
+                        "headers": [
+                            {"name": "col1", "columnType": "STRING", "id": "1"},
+                            {"name": "col2", "columnType": "INTEGER", "id": "2"},
+                        ],
+                        "rows": rows,
+                    },
+                    "nextPageToken": next_page_token,
+                }
+            }
+        )
+
+    def test_rowset_to_pandas_df_multiple_pages(self):
+        """Test that all pages are combined into a single DataFrame."""
+        # GIVEN a first page that points to a second page
+        first_page = self._bundle(
+            rows=[
+                {"rowId": 1, "versionNumber": 1, "values": ["a", "1"]},
+                {"rowId": 2, "versionNumber": 1, "values": ["b", "2"]},
+            ],
+            next_page_token={"token": "next-token"},
+        )
+        second_page = self._bundle(
+            rows=[{"rowId": 3, "versionNumber": 2, "values": ["c", "3"]}]
+        )
+
+        with patch(
+            "synapseclient.models.mixins.table_components._query_table_next_page",
+            return_value=second_page,
+        ) as mock_next_page:
+            # WHEN converting the rowset to a DataFrame
+            df = _rowset_to_pandas_df(
+                query_result_bundle=first_page,
+                synapse_client=self.syn,
+                row_id_and_version_in_index=False,
+            )
+
+        # THEN the next page is requested once
+        mock_next_page.assert_called_once()
+        # AND the rows of both pages are in the DataFrame
+        assert list(df.columns) == ["ROW_ID", "ROW_VERSION", "col1", "col2"]
+        assert df["ROW_ID"].tolist() == [1, 2, 3]
+        assert df["ROW_VERSION"].tolist() == [1, 1, 2]
+        assert df["col1"].tolist() == ["a", "b", "c"]
+        assert df["col2"].tolist() == [1, 2, 3]
+
+    def test_rowset_to_pandas_df_row_id_and_version_in_index(self):
+        """Test that the index is built from the row id, version and etag."""
+        # GIVEN a single page with an etag on one row
+        bundle = self._bundle(
+            rows=[
+                {"rowId": 1, "versionNumber": 1, "values": ["a", "1"]},
+                {"rowId": 2, "versionNumber": 3, "etag": "e", "values": ["b", ""]},
+            ]
+        )
+
+        # WHEN converting the rowset to a DataFrame
+        df = _rowset_to_pandas_df(query_result_bundle=bundle, synapse_client=self.syn)
+
+        # THEN the index contains the row labels
+        assert list(df.index) == ["1_1", "2_3_e"]
+        assert list(df.columns) == ["col1", "col2"]
+        assert df.loc["2_3_e", "col1"] == "b"
+        assert pd.isna(df.loc["2_3_e", "col2"])
+
+
 class TestCsvToPandasDf:
     """Test suite for csv_to_pandas_df function focusing on date and list columns."""
 
@@ -4261,3 +4904,83 @@ class TestConvertDtypesToJsonSerializable:
         ).convert_dtypes()
         pd.testing.assert_frame_equal(result, expected_result, check_dtype=False)
         assert is_object_dtype(result.nullable_int_col)
+
+
+class TestInferColumnTypeFromData:
+    """Test suite for the infer_column_type_from_data function."""
+
+    def test_infer_column_types(self):
+        # GIVEN a DataFrame with columns of every inferred type
+        df = pd.DataFrame(
+            {
+                "int_col": [1, 2, 3],
+                "whole_float_col": [1.0, None, 3.0],
+                "float_col": [1.5, None, np.inf],
+                "bool_col": [True, False, True],
+                "date_col": pd.to_datetime(["2021-01-01", "2021-01-02", None]),
+                "string_col": ["a", "bb", None],
+                "mixed_col": ["a", 12345, None],
+                "list_col": [["a", "b"], ["c"], None],
+                "large_col": ["x" * 1001, "y", None],
+                "ROW_ID": [1, 2, 3],
+            }
+        )
+
+        # WHEN I infer the column types
+        columns = infer_column_type_from_data(df)
+
+        # THEN the types and sizes are inferred, and reserved columns are skipped
+        assert [
+            (column.name, column.column_type, column.maximum_size) for column in columns
+        ] == [
+            ("int_col", ColumnType.INTEGER, None),
+            ("whole_float_col", ColumnType.INTEGER, None),
+            ("float_col", ColumnType.DOUBLE, None),
+            ("bool_col", ColumnType.BOOLEAN, None),
+            ("date_col", ColumnType.DATE, None),
+            ("string_col", ColumnType.STRING, 50),
+            ("mixed_col", ColumnType.STRING, 50),
+            ("list_col", ColumnType.STRING, 50),
+            ("large_col", ColumnType.LARGETEXT, None),
+        ]
+
+    def test_max_string_length_across_chunks(self):
+        # GIVEN a string column where the longest value is in the last chunk
+        column = pd.Series(["a"] * 5 + [None, "b" * 100])
+
+        # WHEN I measure the column 2 rows at a time
+        max_length = _max_string_length(column, chunk_size=2)
+
+        # THEN the longest value is found
+        assert max_length == 100
+
+    def test_max_string_length_all_null(self):
+        # GIVEN a column without any values
+        column = pd.Series([None, None], dtype=object)
+
+        # WHEN I measure the column
+        # THEN the length is 0
+        assert _max_string_length(column) == 0
+
+    def test_infer_column_types_with_sample(self):
+        # GIVEN an object column with a single string amongst integers
+        df = pd.DataFrame(
+            {
+                "object_col": pd.Series([1] * 999 + ["a" * 100], dtype=object),
+                "float_col": [1.0] * 999 + [1.5],
+            }
+        )
+
+        # WHEN I infer the column types with a sample that does not include it
+        sampled_columns = infer_column_type_from_data(df, sample_size=10)
+
+        # THEN the object column is typed from the sample
+        assert sampled_columns[0].column_type == ColumnType.INTEGER
+
+        # AND columns with a numeric dtype are still checked on every row
+        assert sampled_columns[1].column_type == ColumnType.DOUBLE
+
+        # AND inspecting every row finds the string
+        columns = infer_column_type_from_data(df)
+        assert columns[0].column_type == ColumnType.STRING
+        assert columns[0].maximum_size == 150
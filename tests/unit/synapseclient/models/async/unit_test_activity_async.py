@@ -284,6 +284,44 @@ class TestActivity:
             assert result_of_store.executed[1].target_id == SYN_789
             assert result_of_store.executed[1].target_version_number == 1
 
+    async def test_store_stored_activity_with_parent_only_links_it(self) -> None:
+        # GIVEN an activity that has been stored
+        with patch(
+            "synapseclient.models.activity.create_activity",
+            new_callable=AsyncMock,
+            return_value=self.get_example_synapse_activity_output(),
+        ):
+            activity = await Activity(name=ACTIVITY_NAME).store_async(
+                synapse_client=self.syn
+            )
+
+        # WHEN we store it with a parent
+        with (
+            patch(
+                "synapseclient.models.activity.put_entity_generated_by",
+                new_callable=AsyncMock,
+                return_value=self.get_example_synapse_activity_output(),
+            ) as patch_put_generated_by,
+            patch(
+                "synapseclient.models.activity.set_entity_provenance",
+                new_callable=AsyncMock,
+                return_value=self.get_example_synapse_activity_output(),
+            ) as patch_set_provenance,
+        ):
+            await activity.store_async(parent="syn999", synapse_client=self.syn)
+
+            # THEN the parent is linked to it without updating the activity
+            patch_put_generated_by.assert_awaited_once_with(
+                entity_id="syn999", activity_id=SYN_123, synapse_client=self.syn
+            )
+            patch_set_provenance.assert_not_called()
+
+            # AND once it is changed the activity is updated as well
+            activity.name = "new name"
+            await activity.store_async(parent="syn999", synapse_client=self.syn)
+            patch_set_provenance.assert_awaited_once()
+            assert patch_put_generated_by.await_count == 1
+
     async def test_from_parent(self) -> None:
         # GIVEN a parent with an activity
         parent = File("syn999", version_number=1)
@@ -708,7 +708,7 @@ class TestFolder:
         # WHEN I call `copy` with the Folder object
         with (
             patch(
-                "synapseclient.models.folder.copy",
+                "synapseclient.models.folder.copy_async",
                 return_value=(copy_mapping),
             ) as mocked_copy,
             patch(
@@ -10,7 +10,12 @@ import pandas as pd
 import pytest
 
 from synapseclient import Synapse
-from synapseclient.core.exceptions import SynapseProvenanceError
+from synapseclient.core import utils
+from synapseclient.core.exceptions import (
+    SynapseManifestValidationError,
+    SynapseProvenanceError,
+)
+from synapseclient.models.file import File
 from synapseclient.models.services.manifest import (
     NON_ANNOTATION_COLUMNS,
     UploadSyncFile,
@@ -27,10 +32,10 @@ from synapseclient.models.services.manifest import (
     _check_unique_paths,
     _clean_manifest,
     _convert_value,
-    _create_upload_tasks,
     _default_name_column,
     _expand_path,
     _local_path_refs,
+    _normalize_paths,
     _parse_annotation_cell,
     _parse_force_version,
     _parse_literal,
@@ -39,10 +44,12 @@ from synapseclient.models.services.manifest import (
     _resolve_provenance_column,
     _resolve_provenance_item,
     _resolve_row,
+    _run_in_dependency_order,
     _sort_and_fix_provenance,
     _split_csv_cell,
     _upload_file_async,
     _validate_manifest,
+    find_unchanged_files_async,
     read_manifest_for_upload,
     upload_sync_files,
 )
@@ -118,8 +125,58 @@ class TestReadManifestForUpload:
         csv = f"path,parentId\n{f},syn1\n"
         manifest = tmp_path / "manifest.csv"
         manifest.write_text(csv)
-        with pytest.raises(ValueError, match="empty"):
-            await read_manifest_for_upload(str(manifest), self.syn, True, False)
+        with (
+            patch(
+                "synapseclient.models.services.manifest._check_parent_containers_async",
+                new=AsyncMock(),
+            ),
+        ):
+            with pytest.raises(ValueError, match="empty"):
+                await read_manifest_for_upload(str(manifest), self.syn, True, False)
+
+    async def test_all_errors_reported_together(self, tmp_path: Path) -> None:
+        """Every problem in the manifest is reported in a single error."""
+        empty = tmp_path / "empty.txt"
+        empty.write_text("")
+        bad_name = tmp_path / "bad!name.txt"
+        bad_name.write_text("content")
+        missing = tmp_path / "missing.txt"
+        csv = f"path,parentId\n{empty},syn1\n{bad_name},syn1\n{missing},syn1\n"
+        manifest = tmp_path / "manifest.csv"
+        manifest.write_text(csv)
+        with (
+            patch(
+                "synapseclient.models.services.manifest._check_parent_containers_async",
+                new=AsyncMock(
+                    side_effect=ValueError("syn1 is not a Folder or Project")
+                ),
+            ),
+        ):
+            with pytest.raises(SynapseManifestValidationError) as ex:
+                await read_manifest_for_upload(str(manifest), self.syn, True, False)
+
+        assert len(ex.value.errors) == 4
+        assert "missing.txt is not a file" in ex.value.errors[0]
+        assert "empty files cannot be uploaded" in ex.value.errors[1]
+        assert "cannot be stored to Synapse" in ex.value.errors[2]
+        assert "not a Folder or Project" in ex.value.errors[3]
+
+    async def test_only_missing_paths_raises_os_error(self, tmp_path: Path) -> None:
+        """A manifest whose only problem is missing paths still raises OSError."""
+        f = tmp_path / "file.txt"
+        f.write_text("content")
+        missing = tmp_path / "missing.txt"
+        csv = f"path,parentId\n{f},syn1\n{missing},syn1\n"
+        manifest = tmp_path / "manifest.csv"
+        manifest.write_text(csv)
+        with (
+            patch(
+                "synapseclient.models.services.manifest._check_parent_containers_async",
+                new=AsyncMock(),
+            ),
+        ):
+            with pytest.raises(OSError, match="missing.txt is not a file"):
+                await read_manifest_for_upload(str(manifest), self.syn, True, False)
 
     async def test_valid_manifest_returns_items_and_size(self, tmp_path: Path) -> None:
         """A valid manifest returns one upload item and the correct total file size."""
@@ -412,6 +469,26 @@ class TestValidateManifest:
             _validate_manifest(df)
 
 
+class TestNormalizePaths:
+    def test_paths_normalized_and_missing_reported(self, tmp_path: Path) -> None:
+        """Local paths are made absolute, URLs are kept, and missing files are
+        flagged without being changed."""
+        f = tmp_path / "data.txt"
+        f.write_text("content")
+        url = "https://example.com/file.csv"
+        missing = str(tmp_path / "missing.txt")
+        relative = os.path.relpath(str(f))
+        paths = pd.Series([relative, url, missing])
+
+        with patch(
+            "synapseclient.models.services.manifest._VALIDATION_CHUNK_SIZE", new=1
+        ):
+            normalized, is_missing = _normalize_paths(paths)
+
+        assert normalized.tolist() == [str(f), url, missing]
+        assert is_missing.tolist() == [False, False, True]
+
+
 class TestApplySynapseStoreDefaults:
     def test_creates_column_when_missing(self) -> None:
         """Creates synapseStore column defaulting to True for local paths."""
@@ -530,6 +607,24 @@ class TestCheckSizeEachFile:
         total = _check_size_each_file(df)
         assert total == f.stat().st_size
 
+    def test_every_empty_file_is_listed(self, tmp_path: Path) -> None:
+        """All empty files are listed when the files are checked on a thread pool."""
+        paths = []
+        for i in range(5):
+            f = tmp_path / f"file{i}.txt"
+            f.write_text("" if i % 2 else "data")
+            paths.append(str(f))
+        df = pd.DataFrame({"path": paths})
+        with patch(
+            "synapseclient.models.services.manifest._VALIDATION_CHUNK_SIZE", new=2
+        ):
+            with pytest.raises(ValueError) as ex:
+                _check_size_each_file(df)
+        assert str(ex.value).splitlines() == [
+            f"File {paths[1]} is empty, empty files cannot be uploaded to Synapse",
+            f"File {paths[3]} is empty, empty files cannot be uploaded to Synapse",
+        ]
+
     def test_all_urls_returns_zero(self) -> None:
         """If every row is a URL, the total size is zero."""
         df = pd.DataFrame({"path": ["https://a.com/f1", "https://b.com/f2"]})
@@ -850,6 +945,41 @@ class TestCheckParentContainersAsync:
             with pytest.raises(SynapseHTTPError):
                 await _check_parent_containers_async(["syn999"], syn=self.syn)
 
+    async def test_each_parent_checked_once(self) -> None:
+        """Duplicate parent IDs are only fetched once."""
+        from synapseclient.models.folder import Folder
+
+        with patch(
+            "synapseclient.models.services.manifest.get_async",
+            new=AsyncMock(return_value=MagicMock(spec=Folder)),
+        ) as mock_get:
+            await _check_parent_containers_async(
+                ["syn1", "syn2", "syn1", "", "syn2"], syn=self.syn
+            )
+        assert sorted(
+            call.kwargs["synapse_id"] for call in mock_get.call_args_list
+        ) == [
+            "syn1",
+            "syn2",
+        ]
+
+    async def test_every_invalid_parent_is_reported(self) -> None:
+        """When several parents are invalid they are all reported together."""
+        from synapseclient.core.exceptions import SynapseHTTPError
+
+        async def mock_get(synapse_id: str, **kwargs: Any) -> Any:
+            if synapse_id == "syn1":
+                raise SynapseHTTPError("Not found")
+            return MagicMock()
+
+        with patch("synapseclient.models.services.manifest.get_async", new=mock_get):
+            with pytest.raises(SynapseManifestValidationError) as ex:
+                await _check_parent_containers_async(["syn1", "syn2"], syn=self.syn)
+        assert ex.value.errors == [
+            "Not found",
+            "syn2 in the parentId column is not a Folder or Project",
+        ]
+
 
 class TestBuildUploadItems:
     def test_parent_id_mapped_to_parent_id(self) -> None:
@@ -1391,9 +1521,55 @@ class TestSyncToSynapseAsync:
                 send_messages=False,
                 synapse_client=self.syn,
             )
-            mock_upload.assert_awaited_once_with(mock_items, syn=self.syn)
+            mock_upload.assert_awaited_once_with(
+                mock_items, syn=self.syn, unchanged_files={}
+            )
             assert result is mock_uploaded
 
+    async def test_skip_unchanged_reports_planned_and_skipped(
+        self, tmp_path: Path
+    ) -> None:
+        """With skip_unchanged=True, unchanged files are passed to the uploader and
+        the planned and skipped counts are logged before uploading."""
+        manifest = tmp_path / "manifest.csv"
+
+        from synapseclient.models import Project
+
+        project = Project(id="syn123", name="test")
+        project._last_persistent_instance = project
+
+        mock_items = [MagicMock(), MagicMock(), MagicMock()]
+        unchanged = {"/a.txt": File(id="syn1", content_size=40)}
+
+        with (
+            patch(
+                "synapseclient.models.mixins.storable_container.read_manifest_for_upload",
+                new=AsyncMock(return_value=(mock_items, 100)),
+            ),
+            patch(
+                "synapseclient.models.mixins.storable_container.find_unchanged_files_async",
+                new=AsyncMock(return_value=unchanged),
+            ),
+            patch(
+                "synapseclient.models.mixins.storable_container.upload_sync_files",
+                new=AsyncMock(return_value=[]),
+            ) as mock_upload,
+            patch.object(self.syn.logger, "info") as mock_info,
+        ):
+            await project.sync_to_synapse_async(
+                manifest_path=str(manifest),
+                send_messages=False,
+                skip_unchanged=True,
+                synapse_client=self.syn,
+            )
+            mock_upload.assert_awaited_once_with(
+                mock_items, syn=self.syn, unchanged_files=unchanged
+            )
+            mock_info.assert_any_call(
+                "About to upload 2 files with a total size of 60 bytes. Skipping 1"
+                " unchanged files."
+            )
+
     async def test_empty_items_skips_upload(self, tmp_path: Path) -> None:
         """When read_manifest_for_upload returns no items, the uploader is not called and [] is returned."""
         f = tmp_path / "manifest.csv"
@@ -1476,6 +1652,20 @@ class TestUploadSyncFiles:
     def init_syn(self, syn: Synapse) -> None:
         self.syn = syn
 
+    @pytest.fixture(autouse=True)
+    def mock_create_activity(self):
+        created = []
+
+        async def create_activity(request, synapse_client=None):
+            created.append(request)
+            return {**request, "id": f"act{len(created)}", "etag": "etag"}
+
+        with patch(
+            "synapseclient.models.activity.create_activity",
+            side_effect=create_activity,
+        ) as self.mock_create_activity:
+            yield
+
     async def test_single_item_no_provenance(self) -> None:
         """A single item with no dependencies is uploaded and returned."""
         item = _make_item("/a.txt", file_id="syn1")
@@ -1549,6 +1739,143 @@ class TestUploadSyncFiles:
         assert len(results) == 2
         assert call_order.index("dep") < call_order.index("main")
 
+    async def test_unchanged_files_are_not_stored(self, tmp_path: Path) -> None:
+        """Unchanged files are not stored, but their IDs are used for the
+        provenance of the files that depend on them."""
+        f_dep = tmp_path / "dep.txt"
+        f_dep.write_text("dep")
+        f_main = tmp_path / "main.txt"
+        f_main.write_text("main")
+        dep_item = _make_item(str(f_dep), file_id=None)
+        main_item = _make_item(str(f_main), file_id="syn_main", used=[str(f_dep)])
+        unchanged = File(id="syn_dep", path=str(f_dep))
+
+        results = await upload_sync_files(
+            [dep_item, main_item],
+            syn=self.syn,
+            unchanged_files={str(f_dep): unchanged},
+        )
+
+        assert results == [main_item.entity]
+        dep_item.entity.store_async.assert_not_called()
+        assert main_item.entity.activity.used[0].target_id == "syn_dep"
+
+    async def test_identical_activities_are_created_once(self) -> None:
+        """Files that declare identical provenance are linked to a single stored
+        Activity."""
+        items = [
+            _make_item("/a.txt", used=["syn1", "syn2"], activity_name="align"),
+            _make_item("/b.txt", used=["syn2", "syn1"], activity_name="align"),
+            _make_item("/c.txt", used=["syn1", "syn2"], activity_name="align"),
+            _make_item("/d.txt", used=["syn3"], activity_name="align"),
+        ]
+
+        await upload_sync_files(items, syn=self.syn)
+
+        assert self.mock_create_activity.call_count == 2
+        activities = [item.entity.activity for item in items]
+        assert [activity.id for activity in activities] == [
+            "act1",
+            "act1",
+            "act1",
+            "act2",
+        ]
+        # Every file has its own copy which is only linked when the file is stored
+        assert len({id(activity) for activity in activities}) == 4
+        assert not any(activity.has_changed for activity in activities)
+
+
+class TestFindUnchangedFilesAsync:
+    @pytest.fixture(autouse=True)
+    def init_syn(self, syn: Synapse) -> None:
+        self.syn = syn
+
+    async def test_files_compared_by_name_size_and_md5(self, tmp_path: Path) -> None:
+        """Only files with the same name, size and MD5 as a File in the target
+        container are unchanged, and each container is listed once."""
+        unchanged = tmp_path / "unchanged.txt"
+        unchanged.write_text("same")
+        resized = tmp_path / "resized.txt"
+        resized.write_text("longer content")
+        edited = tmp_path / "edited.txt"
+        edited.write_text("edit")
+        new = tmp_path / "new.txt"
+        new.write_text("new")
+        items = [
+            UploadSyncFile(
+                entity=File(path=str(f), name=f.name, parent_id="syn1"),
+                used=[],
+                executed=[],
+                activity_name=None,
+                activity_description=None,
+            )
+            for f in (unchanged, resized, edited, new)
+        ]
+        children = {
+            "unchanged.txt": "syn11",
+            "resized.txt": "syn12",
+            "edited.txt": "syn13",
+        }
+
+        async def mock_get_children(parent: str, **kwargs: Any):
+            for name, child_id in children.items():
+                yield {"name": name, "id": child_id}
+
+        async def mock_get_entity(entity_id: str, **kwargs: Any) -> dict:
+            name = {child_id: name for name, child_id in children.items()}[entity_id]
+            return {
+                "id": entity_id,
+                "name": name,
+                "parentId": "syn1",
+                "versionNumber": 2,
+                "dataFileHandleId": f"fh{entity_id}",
+            }
+
+        def file_handle(entity_id: str, size: int, md5: str) -> dict:
+            return {
+                "fileHandle": {
+                    "id": f"fh{entity_id}",
+                    "contentSize": size,
+                    "contentMd5": md5,
+                    "concreteType": "org.sagebionetworks.repo.model.file.S3FileHandle",
+                }
+            }
+
+        file_handles = {
+            "fhsyn11": file_handle("syn11", 4, utils.md5_for_file_hex(str(unchanged))),
+            "fhsyn12": file_handle("syn12", 4, "abc"),
+            "fhsyn13": file_handle("syn13", 4, "abc"),
+        }
+
+        with (
+            patch(
+                "synapseclient.models.services.manifest.get_children",
+                side_effect=mock_get_children,
+            ) as mock_children,
+            patch(
+                "synapseclient.models.services.manifest.get_entity",
+                side_effect=mock_get_entity,
+            ),
+            patch(
+                "synapseclient.models.services.manifest.get_file_handles_for_download_async",
+                new=AsyncMock(return_value=file_handles),
+            ) as mock_file_handles,
+            patch.object(self.syn.cache, "contains", return_value=False),
+            patch.object(self.syn.cache, "add") as mock_cache_add,
+        ):
+            result = await find_unchanged_files_async(items, syn=self.syn)
+
+        assert list(result) == [str(unchanged)]
+        assert result[str(unchanged)].id == "syn11"
+        assert result[str(unchanged)].version_number == 2
+        mock_children.assert_called_once()
+        assert mock_file_handles.call_args.kwargs["include_pre_signed_urls"] is False
+        mock_cache_add.assert_called_once_with(
+            file_handle_id="fhsyn11",
+            path=str(unchanged),
+            md5=utils.md5_for_file_hex(str(unchanged)),
+        )
+
 
 class TestBuildDependencyGraph:
     def test_no_provenance(self) -> None:
@@ -1621,67 +1948,126 @@ class TestBuildDependencyGraph:
         assert graph.path_to_file_check[str(f1)] is True
 
 
-class TestCreateUploadTasks:
-    async def test_creates_tasks_for_each_item(self) -> None:
-        """One asyncio task is created per item in the upload plan."""
-        from synapseclient.models.services.manifest import _UploadPlan
+class TestRunInDependencyOrder:
+    async def test_uploads_each_path_in_topological_order(self) -> None:
+        """Every path is uploaded once and the results follow the plan order."""
+        uploaded = []
 
-        item_a = _make_item("/a.txt", file_id="syn1")
-        item_b = _make_item("/b.txt", file_id="syn2")
+        async def start_upload(file_path, prerequisite_tasks):
+            uploaded.append(file_path)
+            return _make_file_mock(file_path, f"syn_{file_path}")
 
-        plan = _UploadPlan(
-            path_to_dependencies={"/a.txt": [], "/b.txt": []},
-            path_to_upload_item={"/a.txt": item_a, "/b.txt": item_b},
-            path_to_file_check={},
+        results = await _run_in_dependency_order(
+            path_to_dependencies={"/a.txt": [], "/b.txt": [], "/c.txt": []},
+            start_upload=start_upload,
+            max_concurrent_uploads=2,
         )
-        mock_syn = MagicMock(spec=Synapse)
-
-        tasks = _create_upload_tasks(plan, mock_syn)
-        assert len(tasks) == 2
-        # Clean up tasks to avoid warnings
-        for t in tasks:
-            t.cancel()
-        await asyncio.gather(*tasks, return_exceptions=True)
-
-    async def test_dependent_task_receives_prerequisite(self, tmp_path: Path) -> None:
-        """A dependent item's task receives its prerequisite task."""
-        from synapseclient.models.services.manifest import _UploadPlan
-
-        f_dep = tmp_path / "dep.txt"
-        f_dep.write_text("dep")
-        f_main = tmp_path / "main.txt"
-        f_main.write_text("main")
 
-        dep_item = _make_item(str(f_dep), file_id="syn1")
-        main_item = _make_item(str(f_main), file_id="syn2", used=[str(f_dep)])
+        assert sorted(uploaded) == ["/a.txt", "/b.txt", "/c.txt"]
+        assert list(results) == ["/a.txt", "/b.txt", "/c.txt"]
+        assert results["/b.txt"].id == "syn_/b.txt"
+
+    async def test_dependent_started_after_prerequisite(self) -> None:
+        """A dependent path is only started once its prerequisite finished, and it
+        receives the finished prerequisite task."""
+        events = []
+        received_prerequisites = {}
+
+        async def start_upload(file_path, prerequisite_tasks):
+            events.append(f"start {file_path}")
+            received_prerequisites[file_path] = prerequisite_tasks
+            await asyncio.sleep(0.01)
+            events.append(f"end {file_path}")
+            return _make_file_mock(file_path, f"syn_{file_path}")
+
+        await _run_in_dependency_order(
+            path_to_dependencies={"/dep.txt": [], "/main.txt": ["/dep.txt"]},
+            start_upload=start_upload,
+            max_concurrent_uploads=10,
+        )
 
-        plan = _UploadPlan(
-            path_to_dependencies={str(f_dep): [], str(f_main): [str(f_dep)]},
-            path_to_upload_item={str(f_dep): dep_item, str(f_main): main_item},
-            path_to_file_check={str(f_dep): True},
+        assert events == [
+            "start /dep.txt",
+            "end /dep.txt",
+            "start /main.txt",
+            "end /main.txt",
+        ]
+        (prerequisite_task,) = received_prerequisites["/main.txt"]
+        assert prerequisite_task.done()
+        assert prerequisite_task.result().id == "syn_/dep.txt"
+
+    async def test_tasks_are_created_lazily(self) -> None:
+        """No more than max_concurrent_uploads coroutines exist at the same time."""
+        created = 0
+        finished = 0
+        max_alive = 0
+
+        async def upload(file_path):
+            nonlocal finished
+            await asyncio.sleep(0)
+            finished += 1
+            return _make_file_mock(file_path, "syn1")
+
+        def start_upload(file_path, prerequisite_tasks):
+            nonlocal created, max_alive
+            created += 1
+            max_alive = max(max_alive, created - finished)
+            return upload(file_path)
+
+        paths = {f"/{i}.txt": [] for i in range(50)}
+        # Every 10th path depends on the path before it
+        for i in range(1, 50, 10):
+            paths[f"/{i}.txt"] = [f"/{i - 1}.txt"]
+
+        results = await _run_in_dependency_order(
+            path_to_dependencies=paths,
+            start_upload=start_upload,
+            max_concurrent_uploads=3,
         )
-        mock_syn = MagicMock(spec=Synapse)
 
-        tasks = _create_upload_tasks(plan, mock_syn)
-        assert len(tasks) == 2
-        # Clean up tasks to avoid warnings
-        for t in tasks:
-            t.cancel()
-        await asyncio.gather(*tasks, return_exceptions=True)
+        assert len(results) == 50
+        assert created == 50
+        assert max_alive <= 3
+
+    async def test_failure_cancels_in_progress_uploads(self) -> None:
+        """The first failure is raised and the uploads in progress are cancelled."""
+        cancelled = []
+
+        async def start_upload(file_path, prerequisite_tasks):
+            if file_path == "/bad.txt":
+                raise ValueError("Failure during upload")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(file_path)
+                raise
+
+        with pytest.raises(ValueError, match="Failure during upload"):
+            await _run_in_dependency_order(
+                path_to_dependencies={
+                    "/slow.txt": [],
+                    "/bad.txt": [],
+                    "/never.txt": ["/bad.txt"],
+                },
+                start_upload=start_upload,
+                max_concurrent_uploads=10,
+            )
+        await asyncio.sleep(0)
+
+        assert cancelled == ["/slow.txt"]
 
     async def test_empty_plan_returns_empty(self) -> None:
-        """An empty upload plan produces no tasks."""
-        from synapseclient.models.services.manifest import _UploadPlan
+        """An empty upload plan starts no uploads."""
+        start_upload = MagicMock()
 
-        plan = _UploadPlan(
+        results = await _run_in_dependency_order(
             path_to_dependencies={},
-            path_to_upload_item={},
-            path_to_file_check={},
+            start_upload=start_upload,
+            max_concurrent_uploads=10,
         )
-        mock_syn = MagicMock(spec=Synapse)
 
-        tasks = _create_upload_tasks(plan, mock_syn)
-        assert tasks == []
+        assert results == {}
+        start_upload.assert_not_called()
 
 
 class TestBuildActivityLinkage:
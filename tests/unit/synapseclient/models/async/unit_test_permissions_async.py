@@ -1,10 +1,12 @@
 """Unit tests for permissions-related functionality in the AccessControllable mixin."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from synapseclient import Synapse
+from synapseclient.api.entity_services import EntityHeader
 from synapseclient.core.exceptions import SynapseHTTPError
 from synapseclient.models import File, Folder, Project
 from synapseclient.models.mixins.access_control import AclListResult, BenefactorTracker
@@ -17,6 +19,7 @@ class TestDeletePermissionsAsync:
     def setup_method(self):
         """Set up test fixtures."""
         self.synapse_client = MagicMock(spec=Synapse)
+        self.synapse_client.max_threads = 5
         self.synapse_client.logger = MagicMock()
         self.synapse_client.silent = True
 
@@ -396,6 +399,7 @@ class TestDeletePermissionsAsync:
         # GIVEN a file and a custom synapse client
         file = File(id="syn123")
         custom_client = MagicMock(spec=Synapse)
+        custom_client.max_threads = 5
         custom_client.logger = MagicMock()
         custom_client.silent = True
 
@@ -592,7 +596,7 @@ class TestBenefactorTrackerComprehensive:
         """Test parallel entity tracking."""
         # GIVEN a tracker
         tracker = BenefactorTracker()
-        mock_client = MagicMock()
+        mock_client = MagicMock(max_threads=5)
 
         entity_ids = ["syn123", "syn456", "syn789"]
         benefactor_responses = [
@@ -624,7 +628,7 @@ class TestBenefactorTrackerComprehensive:
         # GIVEN a tracker with some already processed entities
         tracker = BenefactorTracker()
         tracker.processed_entities.add("syn123")
-        mock_client = MagicMock()
+        mock_client = MagicMock(max_threads=5)
 
         entity_ids = ["syn123", "syn456"]  # syn123 already processed
 
@@ -719,6 +723,101 @@ class TestBenefactorTrackerComprehensive:
         # THEN it should return False
         assert will_affect is False
 
+    async def test_track_entities_bounds_concurrent_requests(self):
+        """Test that benefactor lookups wait on the tracker's semaphore."""
+        # GIVEN a tracker and a client allowing one thread
+        tracker = BenefactorTracker()
+        mock_client = MagicMock(max_threads=1)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def get_benefactor(entity_id, synapse_client):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return MagicMock(id="syn1")
+
+        with patch(
+            "synapseclient.models.mixins.access_control.get_entity_benefactor",
+            side_effect=get_benefactor,
+        ) as mock_get_benefactor:
+            # WHEN tracking many entities, some of them repeated
+            await tracker.track_entity_benefactor(
+                entity_ids=[f"syn{i}" for i in range(10)] + ["syn2", "syn3"],
+                synapse_client=mock_client,
+            )
+
+        # THEN each entity is looked up once with at most two requests in flight
+        assert mock_get_benefactor.call_count == 10
+        assert max_in_flight == 2
+
+    async def test_get_acl_fetches_only_unique_benefactors(self):
+        """Test that ACLs are only fetched for benefactors and fetched once."""
+        # GIVEN a tracker where syn2 and syn3 inherit from syn1
+        tracker = BenefactorTracker()
+        tracker.entity_benefactors.update(
+            {"syn1": "syn1", "syn2": "syn1", "syn3": "syn1"}
+        )
+        mock_client = MagicMock(max_threads=5)
+
+        with patch(
+            "synapseclient.models.mixins.access_control.get_entity_acl",
+            return_value={"resourceAccess": []},
+        ) as mock_get_acl:
+            # WHEN building the ACL result twice
+            for _ in range(2):
+                await File(id="syn1")._build_acl_result_from_entities(
+                    entities_by_id={
+                        "syn1": File(id="syn1"),
+                        "syn2": File(id="syn2"),
+                        "syn3": File(id="syn3"),
+                    },
+                    client=mock_client,
+                    benefactor_tracker=tracker,
+                )
+
+        # THEN only the benefactor's ACL is requested, and only once
+        mock_get_acl.assert_called_once_with(
+            entity_id="syn1", synapse_client=mock_client
+        )
+
+    async def test_user_group_names_are_reused(self):
+        """Test that user and group names are only fetched once per run."""
+        from synapseclient.core.models.acl import AclEntry, EntityAcl
+
+        # GIVEN ACL metadata for two principals
+        entity_metadata = {
+            "syn1": {
+                "acl": EntityAcl(
+                    entity_id="syn1",
+                    acl_entries=[
+                        AclEntry(principal_id=1, permissions=["READ"]),
+                        AclEntry(principal_id=2, permissions=["READ"]),
+                    ],
+                )
+            }
+        }
+        user_group_names = {"1": "known_user"}
+
+        with patch(
+            "synapseclient.models.mixins.access_control.get_user_group_headers_batch",
+            return_value=[{"ownerId": "2", "userName": "new_user"}],
+        ) as mock_headers:
+            # WHEN fetching the names twice with the same memo
+            for _ in range(2):
+                names = await File(id="syn1")._fetch_user_group_info(
+                    entity_metadata,
+                    MagicMock(),
+                    user_group_names=user_group_names,
+                )
+
+        # THEN only the unknown principal is requested, and only once
+        mock_headers.assert_called_once()
+        assert mock_headers.call_args[0][0] == ["2"]
+        assert names == {"1": "known_user", "2": "new_user"}
+
 
 class TestListAclAsyncComprehensive:
     """Comprehensive unit tests for list_acl_async method in AccessControllable."""
@@ -727,6 +826,7 @@ class TestListAclAsyncComprehensive:
     def setup_method(self):
         """Set up test fixtures."""
         self.synapse_client = MagicMock(spec=Synapse)
+        self.synapse_client.max_threads = 5
         self.synapse_client.logger = MagicMock()
         self.synapse_client.silent = True
 
@@ -1173,6 +1273,43 @@ class TestListAclAsyncComprehensive:
         # AND entities should be collected
         folder._collect_entities.assert_called_once()
 
+    async def test_list_acl_fetches_only_the_benefactor_acl(self):
+        """Test that a tree inheriting from one benefactor costs one ACL request."""
+        # GIVEN a folder with files and a sub-folder with files
+        folder = Folder(id="syn1")
+        sub_folder = Folder(id="syn6")
+        folder.files = [File(id=f"syn{i}") for i in range(2, 6)]
+        folder.folders = [sub_folder]
+        sub_folder.files = [File(id="syn7"), File(id="syn8")]
+        for container in (folder, sub_folder):
+            container._synced_from_synapse = True
+
+        # AND every entity inherits its ACL from the folder
+        async def get_entity_headers(entity_ids, synapse_client):
+            return [
+                EntityHeader(id=entity_id, benefactor_id=1) for entity_id in entity_ids
+            ]
+
+        self.mock_get_acl.return_value = {"id": "syn1", "resourceAccess": []}
+        self.mock_get_user_headers.return_value = []
+
+        # WHEN listing the ACLs of the whole tree
+        with patch(
+            "synapseclient.models.mixins.access_control.get_entity_headers",
+            side_effect=get_entity_headers,
+        ) as mock_get_headers:
+            result = await folder.list_acl_async(
+                recursive=True, include_container_content=True
+            )
+
+        # THEN only the benefactor's ACL is requested
+        self.mock_get_acl.assert_called_once_with(
+            entity_id="syn1", synapse_client=self.synapse_client
+        )
+        # AND the benefactors are looked up once per container
+        assert mock_get_headers.call_count == 2
+        assert [acl.entity_id for acl in result.all_entity_acls] == ["syn1"]
+
     async def test_list_acl_mixed_permissions(self):
         """Test ACL listing with complex permission combinations."""
         # GIVEN a file with complex ACL
@@ -607,7 +607,7 @@ class TestProject:
         # WHEN I call `copy` with the Project object
         with (
             patch(
-                "synapseclient.models.project.copy",
+                "synapseclient.models.project.copy_async",
                 return_value=(copy_mapping),
             ) as mocked_copy,
             patch(
@@ -1,7 +1,6 @@
 """Unit tests for the RecordSet model."""
 
 import os
-from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -287,15 +286,6 @@ class TestRecordSet:
 
         entity_response = _get_record_set_entity_response()
 
-        # Mock the parallel file transfer semaphore
-        mock_semaphore = MagicMock()
-
-        @asynccontextmanager
-        async def mock_semaphore_ctx(*args, **kwargs):
-            yield mock_semaphore
-
-        self.syn._get_parallel_file_transfer_semaphore = mock_semaphore_ctx
-
         # WHEN I call store_async
         with (
             patch(
@@ -388,15 +378,6 @@ class TestRecordSet:
 
         parent = Folder(id=PARENT_ID)
 
-        # Mock semaphore
-        mock_semaphore = MagicMock()
-
-        @asynccontextmanager
-        async def mock_semaphore_ctx(*args, **kwargs):
-            yield mock_semaphore
-
-        self.syn._get_parallel_file_transfer_semaphore = mock_semaphore_ctx
-
         # WHEN I call store_async with a parent object
         with (
             patch(
@@ -455,15 +436,6 @@ class TestRecordSet:
             description="Updated description"
         )
 
-        # Mock the semaphore
-        mock_semaphore = MagicMock()
-
-        @asynccontextmanager
-        async def mock_semaphore_ctx(*args, **kwargs):
-            yield mock_semaphore
-
-        self.syn._get_parallel_file_transfer_semaphore = mock_semaphore_ctx
-
         # WHEN I call store_async and an existing entity is found
         with (
             patch(
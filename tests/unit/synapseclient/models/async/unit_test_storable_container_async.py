@@ -1,8 +1,10 @@
 """Unit tests for StorableContainer"""
 
+import asyncio
 import csv
 import os
 import platform
+import sqlite3
 import uuid
 from pathlib import Path
 from typing import Any
@@ -11,8 +13,18 @@ from unittest.mock import AsyncMock, patch
 import pytest
 
 from synapseclient import Synapse
-from synapseclient.models import File, Folder, Project
+from synapseclient.core.constants.concrete_types import FILE_ENTITY, FOLDER_ENTITY
+from synapseclient.core.exceptions import SynapseError
+from synapseclient.models import (
+    FailureStrategy,
+    File,
+    FileHandle,
+    Folder,
+    Project,
+    SyncFileRecord,
+)
 from synapseclient.models.services import manifest as manifest_module
+from synapseclient.models.services.streaming_sync import SYNC_STATE_DB_FILENAME
 
 
 def _write_manifest(rows: list[dict], tmp_path: Path) -> Path:
@@ -380,7 +392,10 @@ class TestCollectManifestRows:
         observed: list[tuple[str, list[str]]] = []
 
         async def fake_create_child_folders_async(
-            parent_id: str, dirnames: list[str], client: Synapse
+            parent_id: str,
+            dirnames: list[str],
+            client: Synapse,
+            semaphore: asyncio.Semaphore | None = None,
         ) -> dict[str, Folder]:
             observed.append((parent_id, list(dirnames)))
             return {d: Folder(name=d, id=f"syn_{d}") for d in dirnames}
@@ -429,7 +444,10 @@ class TestCollectManifestRows:
         # AND a fake _create_child_folders_async that assigns deterministic
         # ids so the test can distinguish root vs. nested rows by parentId
         async def fake_create_child_folders_async(
-            parent_id: str, dirnames: list[str], client: Synapse
+            parent_id: str,
+            dirnames: list[str],
+            client: Synapse,
+            semaphore: asyncio.Semaphore | None = None,
         ) -> dict[str, Folder]:
             return {d: Folder(name=d, id=f"syn_{d}") for d in dirnames}
 
@@ -471,7 +489,10 @@ class TestCollectManifestRows:
         observed: list[tuple[str, list[str]]] = []
 
         async def fake_create_child_folders_async(
-            parent_id: str, dirnames: list[str], client: Synapse
+            parent_id: str,
+            dirnames: list[str],
+            client: Synapse,
+            semaphore: asyncio.Semaphore | None = None,
         ) -> dict[str, Folder]:
             observed.append((parent_id, list(dirnames)))
             return {d: Folder(name=d, id=f"syn_{d}") for d in dirnames}
@@ -499,6 +520,101 @@ class TestCollectManifestRows:
             "gamma.txt": "syn_gamma",
         }
 
+    async def test_folders_of_a_level_share_one_cap(
+        self, tmp_path: Path, syn: Synapse
+    ) -> None:
+        """The folders of every directory in a level are created concurrently,
+        but no more than max_threads * 2 at a time, and the rows are still
+        emitted in top-down walk order."""
+        # GIVEN two directories with three subdirectories each
+        src = tmp_path / "src"
+        for parent in ("a", "b"):
+            for child in ("x", "y", "z"):
+                (src / parent / child).mkdir(parents=True)
+                (src / parent / child / "f.txt").write_text("data")
+            (src / parent / "g.txt").write_text("data")
+
+        # AND a fake Folder.store_async that records how many stores are
+        # running at the same time
+        active = 0
+        max_active = 0
+
+        async def fake_store_async(self: Any, *args: Any, **kwargs: Any) -> Any:
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            self.id = f"syn_{self.parent_id}_{self.name}"
+            return self
+
+        # WHEN we collect manifest rows with a client limited to one thread
+        with (
+            patch.object(Synapse, "max_threads", new=1),
+            patch("synapseclient.models.Folder.store_async", new=fake_store_async),
+        ):
+            rows = await manifest_module._collect_manifest_rows_async(
+                directory_path=str(src), parent_id="synROOT", client=syn
+            )
+
+        # THEN the six folders of the second level were stored two at a time
+        assert max_active == 2
+        # AND the rows are in the order of a sorted top-down walk
+        assert [os.path.relpath(row["path"], str(src)) for row in rows] == [
+            os.path.join("a", "g.txt"),
+            os.path.join("a", "x", "f.txt"),
+            os.path.join("a", "y", "f.txt"),
+            os.path.join("a", "z", "f.txt"),
+            os.path.join("b", "g.txt"),
+            os.path.join("b", "x", "f.txt"),
+            os.path.join("b", "y", "f.txt"),
+            os.path.join("b", "z", "f.txt"),
+        ]
+        assert rows[1]["parentId"] == "syn_syn_synROOT_a_x"
+
+    async def test_unreadable_directory_is_logged_and_skipped(
+        self, tmp_path: Path, syn: Synapse
+    ) -> None:
+        """A directory that cannot be listed is logged and the rest of the
+        tree is still scanned."""
+        # GIVEN a tree where listing one subdirectory fails
+        src = tmp_path / "src"
+        (src / "bad").mkdir(parents=True)
+        (src / "good").mkdir()
+        (src / "good" / "f.txt").write_text("data")
+        original_scan = manifest_module._scan_directory
+
+        def fake_scan(dirpath: str, parent_id: str, client: Synapse) -> Any:
+            if os.path.basename(dirpath) == "bad":
+                raise PermissionError(13, "permission denied", dirpath)
+            return original_scan(dirpath, parent_id, client)
+
+        async def fake_create_child_folders_async(
+            parent_id: str,
+            dirnames: list[str],
+            client: Synapse,
+            semaphore: asyncio.Semaphore | None = None,
+        ) -> dict[str, Folder]:
+            return {d: Folder(name=d, id=f"syn_{d}") for d in dirnames}
+
+        # WHEN we collect manifest rows
+        with (
+            patch.object(manifest_module, "_scan_directory", new=fake_scan),
+            patch.object(
+                manifest_module,
+                "_create_child_folders_async",
+                new=fake_create_child_folders_async,
+            ),
+            patch.object(syn.logger, "warning") as mock_warning,
+        ):
+            rows = await manifest_module._collect_manifest_rows_async(
+                directory_path=str(src), parent_id="synROOT", client=syn
+            )
+
+        # THEN the error is logged and the readable directory produces a row
+        assert "permission denied" in mock_warning.call_args.args[0]
+        assert rows == [{"path": str(src / "good" / "f.txt"), "parentId": "syn_good"}]
+
 
 class TestLogWalkError:
     """Tests for manifest._log_walk_error."""
@@ -591,99 +707,86 @@ class TestCreateChildFolders:
         assert observed_parent_ids == ["synROOT"] * len(dirnames)
 
 
-class TestPruneSymlinksAndSortDirnames:
-    """Tests for manifest._prune_symlinks_and_sort_dirnames."""
+class TestScanDirectory:
+    """Tests for manifest._scan_directory."""
 
-    def test_sorts_dirnames_in_place(self, tmp_path: Path) -> None:
-        """Plain directories are sorted in place; the original list object is
-        mutated (os.walk relies on identity, not return value)."""
-        # GIVEN three real directories and an unsorted dirnames list referring to them
+    def test_returns_sorted_dirnames_and_rows(
+        self, tmp_path: Path, syn: Synapse
+    ) -> None:
+        """Subdirectories are returned in sorted order and every file in the
+        directory becomes a row under the supplied parent_id."""
+        # GIVEN three real directories and two files, created out of order
         for name in ("c", "a", "b"):
             (tmp_path / name).mkdir()
-        dirnames = ["c", "a", "b"]
+        for name in ("z.txt", "y.txt"):
+            (tmp_path / name).write_text("data")
 
-        # WHEN we prune and sort
-        manifest_module._prune_symlinks_and_sort_dirnames(dirnames, str(tmp_path))
+        # WHEN we scan the directory
+        dirnames, rows = manifest_module._scan_directory(str(tmp_path), "syn1", syn)
 
-        # AND the caller's list is sorted alphabetically
+        # THEN the subdirectories are sorted alphabetically
         assert dirnames == ["a", "b", "c"]
+        # AND the files are rows in sorted order
+        assert rows == [
+            {"path": str(tmp_path / "y.txt"), "parentId": "syn1"},
+            {"path": str(tmp_path / "z.txt"), "parentId": "syn1"},
+        ]
 
     @pytest.mark.skipif(
         platform.system() == "Windows",
         reason="Symlink creation requires elevated privileges on Windows.",
     )
-    def test_drops_symlinked_subdirectories(self, tmp_path: Path) -> None:
-        """Symlinked subdirectories are pruned so we don't mirror folders whose
-        contents os.walk(followlinks=False) won't visit."""
+    def test_drops_symlinked_subdirectories(self, tmp_path: Path, syn: Synapse) -> None:
+        """Symlinked subdirectories are dropped so we don't mirror folders
+        whose contents are not scanned, and are not treated as files."""
         # GIVEN one real subdirectory and one symlink pointing at another
-        # directory, both listed in dirnames
-        real = tmp_path / "real"
-        real.mkdir()
+        # directory
+        (tmp_path / "real").mkdir()
         target = tmp_path / "target"
         target.mkdir()
-        link = tmp_path / "link"
-        os.symlink(str(target), str(link))
-
-        dirnames = ["link", "real"]
-
-        # WHEN we prune and sort
-        manifest_module._prune_symlinks_and_sort_dirnames(dirnames, str(tmp_path))
+        os.symlink(str(target), str(tmp_path / "link"))
 
-        # THEN only the real directory remains; the symlink was dropped
-        assert dirnames == ["real"]
+        # WHEN we scan the directory
+        dirnames, rows = manifest_module._scan_directory(str(tmp_path), "syn1", syn)
 
-    def test_empty_list_unchanged(self, tmp_path: Path) -> None:
-        """An empty list remains empty."""
-        # GIVEN an empty dirnames list
-        dirnames: list[str] = []
-        # WHEN we prune and sort
-        manifest_module._prune_symlinks_and_sort_dirnames(dirnames, str(tmp_path))
-        # THEN it is still empty
-        assert dirnames == []
+        # THEN only the real directories remain; the symlink was dropped
+        assert dirnames == ["real", "target"]
+        assert rows == []
 
-    @pytest.mark.skipif(
-        platform.system() == "Windows",
-        reason="Symlink creation requires elevated privileges on Windows.",
-    )
-    def test_prunes_symlinks_and_sorts_in_one_call(self, tmp_path: Path) -> None:
-        """Symlinks are pruned AND the surviving entries are sorted in a
-        single call. The prune-only and sort-only tests cover each behavior
-        in isolation, so this guards against a future change where one step
-        accidentally undoes the other (e.g., sort happening before prune
-        and reintroducing the link, or prune leaving the list in walk
-        order)."""
-        # GIVEN two real subdirs and one symlinked subdir, in non-sorted
-        # order with the symlink between them
-        for name in ("c", "a"):
-            (tmp_path / name).mkdir()
-        target = tmp_path / "target"
-        target.mkdir()
-        link = tmp_path / "link"
-        os.symlink(str(target), str(link))
+    def test_empty_directory(self, tmp_path: Path, syn: Synapse) -> None:
+        """An empty directory has no subdirectories and no rows."""
+        assert manifest_module._scan_directory(str(tmp_path), "syn1", syn) == (
+            [],
+            [],
+        )
 
-        dirnames = ["c", "link", "a"]
+    def test_missing_directory_raises(self, tmp_path: Path, syn: Synapse) -> None:
+        """A directory that cannot be listed raises OSError for the caller to
+        log."""
+        with pytest.raises(OSError):
+            manifest_module._scan_directory(str(tmp_path / "nope"), "syn1", syn)
 
-        # WHEN we prune and sort
-        manifest_module._prune_symlinks_and_sort_dirnames(dirnames, str(tmp_path))
 
-        # THEN the symlink is gone and the remaining real dirs are sorted
-        assert dirnames == ["a", "c"]
+def _dir_entries(dirpath: Path) -> dict[str, os.DirEntry]:
+    """Return the os.DirEntry objects of a directory keyed by name."""
+    with os.scandir(dirpath) as entries:
+        return {entry.name: entry for entry in entries}
 
 
 class TestBuildManifestRows:
     """Tests for manifest._build_manifest_rows."""
 
     def test_returns_rows_in_sorted_order(self, tmp_path: Path, syn: Synapse) -> None:
-        """Filenames are visited in sorted order so manifest output is
+        """Entries are visited in sorted order so manifest output is
         deterministic regardless of filesystem yield order."""
-        # GIVEN three real files and an unsorted filenames list
+        # GIVEN three real files and an unsorted list of their entries
         for name in ("c.txt", "a.txt", "b.txt"):
             (tmp_path / name).write_text("data")
+        entries = _dir_entries(tmp_path)
 
         # WHEN we build manifest rows under "syn1"
         rows = manifest_module._build_manifest_rows(
-            dirpath=str(tmp_path),
-            filenames=["c.txt", "a.txt", "b.txt"],
+            entries=[entries["c.txt"], entries["a.txt"], entries["b.txt"]],
             parent_id="syn1",
             client=syn,
         )
@@ -698,18 +801,20 @@ class TestBuildManifestRows:
         assert all(row["parentId"] == "syn1" for row in rows)
 
     def test_skips_zero_byte_and_missing(self, tmp_path: Path, syn: Synapse) -> None:
-        """Zero-byte files and unreadable/missing files are dropped via
-        _is_uploadable_file."""
-        # GIVEN one real non-empty file and one zero-byte file (and a
-        # filename for a file that doesn't exist on disk)
+        """Zero-byte files and files removed after the directory was listed
+        are dropped via _is_uploadable_file."""
+        # GIVEN one real non-empty file, one zero-byte file and one file that
+        # is deleted after the directory was listed
         (tmp_path / "ok.txt").write_text("hello")
         (tmp_path / "empty.txt").write_text("")
+        (tmp_path / "missing.txt").write_text("gone")
+        entries = _dir_entries(tmp_path)
+        (tmp_path / "missing.txt").unlink()
 
-        # WHEN we build manifest rows for all three filenames
+        # WHEN we build manifest rows for all three entries
         with patch.object(syn.logger, "warning"):
             rows = manifest_module._build_manifest_rows(
-                dirpath=str(tmp_path),
-                filenames=["ok.txt", "empty.txt", "missing.txt"],
+                entries=entries.values(),
                 parent_id="syn1",
                 client=syn,
             )
@@ -718,13 +823,12 @@ class TestBuildManifestRows:
         # and missing files are filtered out
         assert [os.path.basename(row["path"]) for row in rows] == ["ok.txt"]
 
-    def test_empty_filenames_returns_empty(self, tmp_path: Path, syn: Synapse) -> None:
-        """No filenames produce no rows."""
-        # GIVEN an empty filenames list
+    def test_empty_entries_returns_empty(self, syn: Synapse) -> None:
+        """No entries produce no rows."""
+        # GIVEN an empty entries list
         # WHEN we build manifest rows
         rows = manifest_module._build_manifest_rows(
-            dirpath=str(tmp_path),
-            filenames=[],
+            entries=[],
             parent_id="syn1",
             client=syn,
         )
@@ -741,7 +845,10 @@ class TestIsUploadableFile:
         f = tmp_path / "ok.txt"
         f.write_text("hello")
         # THEN the result is True
-        assert manifest_module._is_uploadable_file(str(f), syn) is True
+        assert (
+            manifest_module._is_uploadable_file(_dir_entries(tmp_path)["ok.txt"], syn)
+            is True
+        )
 
     def test_zero_byte_file_skipped(self, tmp_path: Path, syn: Synapse) -> None:
         """A zero-byte file is skipped because Synapse rejects empty uploads."""
@@ -749,13 +856,585 @@ class TestIsUploadableFile:
         f = tmp_path / "empty.txt"
         f.write_text("")
         # THEN the result is False (Synapse rejects empty uploads)
-        assert manifest_module._is_uploadable_file(str(f), syn) is False
-
-    def test_missing_file_skipped(self, tmp_path: Path, syn: Synapse) -> None:
-        """A path that doesn't exist (e.g. broken symlink, race) is skipped
-        rather than raising OSError up to the caller."""
-        # GIVEN a path that doesn't exist on disk (e.g. broken symlink,
-        # race against rmdir)
-        missing = tmp_path / "nope.txt"
+        assert (
+            manifest_module._is_uploadable_file(
+                _dir_entries(tmp_path)["empty.txt"], syn
+            )
+            is False
+        )
+
+    @pytest.mark.skipif(
+        platform.system() == "Windows",
+        reason="Symlink creation requires elevated privileges on Windows.",
+    )
+    def test_broken_symlink_skipped(self, tmp_path: Path, syn: Synapse) -> None:
+        """An entry whose target doesn't exist (e.g. broken symlink, race) is
+        skipped rather than raising OSError up to the caller."""
+        # GIVEN a symlink pointing at a path that doesn't exist on disk
+        os.symlink(str(tmp_path / "nope.txt"), str(tmp_path / "link.txt"))
         # THEN the result is False rather than raising OSError
-        assert manifest_module._is_uploadable_file(str(missing), syn) is False
+        assert (
+            manifest_module._is_uploadable_file(_dir_entries(tmp_path)["link.txt"], syn)
+            is False
+        )
+
+
+class TestStreamFromSynapse:
+    """Tests for StorableContainer.stream_from_synapse_async."""
+
+    @pytest.fixture(autouse=True)
+    def init_syn(self, syn: Synapse) -> None:
+        self.syn = syn
+
+    @staticmethod
+    def _children_by_parent() -> dict[str, list[dict[str, Any]]]:
+        return {
+            "syn1": [
+                {"id": "syn2", "name": "sub", "type": FOLDER_ENTITY},
+                {"id": "syn10", "name": "a.txt", "type": FILE_ENTITY},
+            ],
+            "syn2": [
+                {"id": "syn11", "name": "b.txt", "type": FILE_ENTITY},
+                {"id": "syn12", "name": "c.txt", "type": FILE_ENTITY},
+            ],
+        }
+
+    @staticmethod
+    async def _fake_file_get(file: File, **kwargs) -> File:
+        file.version_number = 2
+        file.parent_id = "syn1" if file.id == "syn10" else "syn2"
+        file.data_file_handle_id = f"fh_{file.id}"
+        file.file_handle = FileHandle(content_md5=f"md5_{file.id}")
+        file.etag = f"etag_{file.id}"
+        return file
+
+    def _patch_synapse(self, children_by_parent: dict[str, list[dict[str, Any]]]):
+        async def mock_get_children(parent: str, **kwargs):
+            for child in children_by_parent.get(parent, []):
+                yield child
+
+        return (
+            patch(
+                "synapseclient.models.services.streaming_sync.get_children",
+                side_effect=mock_get_children,
+            ),
+            patch.object(
+                File, "get_async", autospec=True, side_effect=self._fake_file_get
+            ),
+        )
+
+    async def test_records_passed_to_callback(self, tmp_path: Path) -> None:
+        # GIVEN a folder with a file and a sub-folder containing two files
+        records = []
+        children_patch, get_patch = self._patch_synapse(self._children_by_parent())
+
+        # WHEN I stream the folder without downloading the files
+        with children_patch, get_patch as mock_get:
+            count = await Folder(id="syn1", name="root").stream_from_synapse_async(
+                path=str(tmp_path),
+                download_file=False,
+                on_file=records.append,
+                synapse_client=self.syn,
+            )
+
+        # THEN every file is retrieved and reduced to a record
+        assert count == 3
+        assert mock_get.call_count == 3
+        assert sorted(records) == [
+            SyncFileRecord(
+                id="syn10",
+                version_number=2,
+                name="a.txt",
+                parent_id="syn1",
+                path=None,
+                data_file_handle_id="fh_syn10",
+                content_md5="md5_syn10",
+            ),
+            SyncFileRecord(
+                id="syn11",
+                version_number=2,
+                name="b.txt",
+                parent_id="syn2",
+                path=None,
+                data_file_handle_id="fh_syn11",
+                content_md5="md5_syn11",
+            ),
+            SyncFileRecord(
+                id="syn12",
+                version_number=2,
+                name="c.txt",
+                parent_id="syn2",
+                path=None,
+                data_file_handle_id="fh_syn12",
+                content_md5="md5_syn12",
+            ),
+        ]
+        # AND the local folder hierarchy is created
+        assert (tmp_path / "sub").is_dir()
+
+    async def test_not_recursive_skips_sub_folders(self) -> None:
+        # GIVEN a folder with a file and a sub-folder
+        records = []
+        children_patch, get_patch = self._patch_synapse(self._children_by_parent())
+
+        # WHEN I stream the folder without recursion and an async callback
+        async def on_file(record: SyncFileRecord) -> None:
+            records.append(record)
+
+        with children_patch, get_patch:
+            count = await Folder(id="syn1", name="root").stream_from_synapse_async(
+                recursive=False,
+                download_file=False,
+                on_file=on_file,
+                synapse_client=self.syn,
+            )
+
+        # THEN only the file directly in the folder is synced
+        assert count == 1
+        assert [record.id for record in records] == ["syn10"]
+
+    async def test_manifest_written(self, tmp_path: Path) -> None:
+        # GIVEN a folder with a file and a sub-folder containing two files
+        manifest_path = tmp_path / "manifest.csv"
+        children_patch, get_patch = self._patch_synapse(self._children_by_parent())
+
+        # WHEN I stream the folder with a manifest path
+        with children_patch, get_patch:
+            await Folder(id="syn1", name="root").stream_from_synapse_async(
+                download_file=False,
+                manifest_path=str(manifest_path),
+                synapse_client=self.syn,
+            )
+
+        # THEN a compact manifest is written with a row for every file
+        with open(manifest_path, newline="", encoding="utf8") as manifest_file:
+            reader = csv.DictReader(manifest_file)
+            rows = sorted(reader, key=lambda row: row["ID"])
+        assert reader.fieldnames == manifest_module.COMPACT_MANIFEST_CSV_KEYS
+        assert [row["ID"] for row in rows] == ["syn10", "syn11", "syn12"]
+        assert rows[1] == {
+            "path": "",
+            "parentId": "syn2",
+            "name": "b.txt",
+            "ID": "syn11",
+            "versionNumber": "2",
+            "dataFileHandleId": "fh_syn11",
+            "dataFileMD5Hex": "md5_syn11",
+        }
+
+    async def test_pending_files_are_bounded(self) -> None:
+        # GIVEN a folder with many files
+        children = {
+            "syn1": [
+                {"id": f"syn{i}", "name": f"{i}.txt", "type": FILE_ENTITY}
+                for i in range(100, 150)
+            ]
+        }
+        children_patch, _ = self._patch_synapse(children)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_get(file: File, **kwargs) -> File:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return file
+
+        # WHEN I stream the folder with a small bound on pending files
+        with (
+            children_patch,
+            patch.object(File, "get_async", autospec=True, side_effect=slow_get),
+            patch(
+                "synapseclient.models.services.streaming_sync.asyncio.Queue",
+                wraps=asyncio.Queue,
+            ) as mock_queue,
+        ):
+            count = await Folder(id="syn1", name="root").stream_from_synapse_async(
+                download_file=False,
+                max_pending_files=5,
+                synapse_client=self.syn,
+            )
+
+        # THEN every file is synced through a queue bounded by `max_pending_files`
+        assert count == 50
+        mock_queue.assert_any_call(maxsize=5)
+        assert max_in_flight <= max(self.syn.max_threads * 2, 1)
+
+    async def test_failure_raised_with_raise_exception(self) -> None:
+        # GIVEN a folder where retrieving a file fails
+        children_patch, _ = self._patch_synapse(self._children_by_parent())
+
+        # WHEN I stream the folder with the RAISE_EXCEPTION failure strategy
+        with (
+            children_patch,
+            patch.object(
+                File,
+                "get_async",
+                autospec=True,
+                side_effect=SynapseError("failed to get file"),
+            ),
+        ):
+            # THEN the exception is raised
+            with pytest.raises(SynapseError, match="failed to get file"):
+                await Folder(id="syn1", name="root").stream_from_synapse_async(
+                    download_file=False,
+                    failure_strategy=FailureStrategy.RAISE_EXCEPTION,
+                    synapse_client=self.syn,
+                )
+
+    async def test_failure_logged_by_default(self) -> None:
+        # GIVEN a folder where retrieving a file fails
+        children_patch, _ = self._patch_synapse(self._children_by_parent())
+
+        # WHEN I stream the folder with the default failure strategy
+        with (
+            children_patch,
+            patch.object(
+                File,
+                "get_async",
+                autospec=True,
+                side_effect=SynapseError("failed to get file"),
+            ),
+        ):
+            count = await Folder(id="syn1", name="root").stream_from_synapse_async(
+                download_file=False, synapse_client=self.syn
+            )
+
+        # THEN the failures are skipped
+        assert count == 0
+
+    async def test_incremental_skips_unchanged_files(self, tmp_path: Path) -> None:
+        # GIVEN a folder that has been synced incrementally
+        children = self._children_by_parent()
+        for child in children["syn1"] + children["syn2"]:
+            child.update({"versionNumber": 2, "modifiedOn": "2024-01-01T00:00:00Z"})
+        children_patch, get_patch = self._patch_synapse(children)
+        folder = Folder(id="syn1", name="root")
+        with children_patch, get_patch as mock_get:
+            await folder.stream_from_synapse_async(
+                path=str(tmp_path),
+                download_file=False,
+                incremental=True,
+                synapse_client=self.syn,
+            )
+        assert mock_get.call_count == 3
+
+        # WHEN one file is updated, one is removed, and I sync again
+        children["syn2"] = [
+            {**children["syn2"][0], "modifiedOn": "2024-02-01T00:00:00Z"}
+        ]
+        records = []
+        children_patch, get_patch = self._patch_synapse(children)
+        with children_patch, get_patch as mock_get:
+            count = await folder.stream_from_synapse_async(
+                path=str(tmp_path),
+                download_file=False,
+                on_file=records.append,
+                incremental=True,
+                synapse_client=self.syn,
+            )
+
+        # THEN only the updated file is retrieved again
+        assert mock_get.call_count == 1
+        assert mock_get.call_args.args[0].id == "syn11"
+        # AND the unchanged file is still reported
+        assert count == 2
+        records_by_id = {record.id: record for record in records}
+        assert sorted(records_by_id) == ["syn10", "syn11"]
+        assert records_by_id["syn10"].content_md5 == "md5_syn10"
+        # AND the removed file is dropped from the state
+        with sqlite3.connect(tmp_path / SYNC_STATE_DB_FILENAME) as conn:
+            state = conn.execute(
+                "SELECT id, etag, modified_on FROM sync_state ORDER BY id"
+            ).fetchall()
+        assert state == [
+            ("syn10", "etag_syn10", "2024-01-01T00:00:00Z"),
+            ("syn11", "etag_syn11", "2024-02-01T00:00:00Z"),
+        ]
+
+    async def test_incremental_retrieves_locally_changed_files(
+        self, tmp_path: Path
+    ) -> None:
+        # GIVEN a file that has been downloaded incrementally
+        children = {
+            "syn1": [
+                {
+                    "id": "syn10",
+                    "name": "a.txt",
+                    "type": FILE_ENTITY,
+                    "versionNumber": 2,
+                    "modifiedOn": "2024-01-01T00:00:00Z",
+                }
+            ]
+        }
+
+        async def fake_download(file: File, **kwargs) -> File:
+            await self._fake_file_get(file)
+            file.path = os.path.join(file.path, file.name)
+            with open(file.path, "w", encoding="utf8") as local_file:
+                local_file.write("content")
+            return file
+
+        children_patch, _ = self._patch_synapse(children)
+        folder = Folder(id="syn1", name="root")
+        get_patch = patch.object(
+            File, "get_async", autospec=True, side_effect=fake_download
+        )
+        with children_patch, get_patch as mock_get:
+            await folder.stream_from_synapse_async(
+                path=str(tmp_path), incremental=True, synapse_client=self.syn
+            )
+            # WHEN the file is not changed locally
+            await folder.stream_from_synapse_async(
+                path=str(tmp_path), incremental=True, synapse_client=self.syn
+            )
+            # THEN it is not retrieved again
+            assert mock_get.call_count == 1
+
+            # WHEN the file is changed locally
+            (tmp_path / "a.txt").write_text("changed content")
+            await folder.stream_from_synapse_async(
+                path=str(tmp_path), incremental=True, synapse_client=self.syn
+            )
+            # THEN it is retrieved again
+            assert mock_get.call_count == 2
+
+    async def test_incremental_requires_path(self) -> None:
+        # WHEN I sync incrementally without a path
+        # THEN a ValueError is raised
+        with pytest.raises(ValueError, match="path is required"):
+            await Folder(id="syn1", name="root").stream_from_synapse_async(
+                incremental=True, synapse_client=self.syn
+            )
+
+
+class TestWalkAsync:
+    """Tests for StorableContainer.walk_async."""
+
+    @pytest.fixture(autouse=True)
+    def init_syn(self, syn: Synapse) -> None:
+        self.syn = syn
+
+    async def test_concurrent_walk_matches_sequential_walk(self) -> None:
+        # GIVEN a folder with a file and two sub-folders
+        tree = {
+            "syn1": [
+                {"id": "syn3", "name": "b", "type": FOLDER_ENTITY},
+                {"id": "syn2", "name": "a", "type": FOLDER_ENTITY},
+                {"id": "syn10", "name": "a.txt", "type": FILE_ENTITY},
+            ],
+            "syn2": [{"id": "syn11", "name": "b.txt", "type": FILE_ENTITY}],
+            "syn3": [],
+        }
+
+        async def mock_get_children(parent: str, **kwargs):
+            for child in tree[parent]:
+                yield child
+
+        # WHEN I walk the folder sequentially and concurrently
+        with (
+            patch(
+                "synapseclient.models.mixins.storable_container.get_children",
+                side_effect=mock_get_children,
+            ),
+            patch(
+                "synapseclient.api.entity_services.get_children",
+                side_effect=mock_get_children,
+            ),
+        ):
+            folder = Folder(id="syn1", name="root")
+            sequential = [
+                result async for result in folder.walk_async(synapse_client=self.syn)
+            ]
+            concurrent = [
+                result
+                async for result in folder.walk_async(
+                    max_concurrency=2, synapse_client=self.syn
+                )
+            ]
+
+        # THEN both walks yield the same results in the same order
+        assert concurrent == sequential
+        assert [dirpath for dirpath, _, _ in concurrent] == [
+            ("root", "syn1"),
+            (os.path.join("root", "a"), "syn2"),
+            (os.path.join("root", "b"), "syn3"),
+        ]
+
+    async def test_concurrent_walk_with_ascii_tree_raises(self) -> None:
+        # WHEN I walk concurrently while displaying the ASCII tree
+        # THEN a ValueError is raised
+        with pytest.raises(ValueError, match="display_ascii_tree"):
+            async for _ in Folder(id="syn1", name="root").walk_async(
+                max_concurrency=2, display_ascii_tree=True, synapse_client=self.syn
+            ):
+                pass
+
+
+class TestBatchDownloads:
+    """Tests for StorableContainer.sync_from_synapse_async with batch_downloads."""
+
+    @pytest.fixture(autouse=True)
+    def init_syn(self, syn: Synapse) -> None:
+        self.syn = syn
+
+    async def test_files_downloaded_with_batched_file_handles(
+        self, tmp_path: Path
+    ) -> None:
+        # GIVEN a folder with a file and a sub-folder containing a file
+        tree = {
+            "syn1": [
+                {"id": "syn2", "name": "sub", "type": FOLDER_ENTITY},
+                {"id": "syn10", "name": "a.txt", "type": FILE_ENTITY},
+            ],
+            "syn2": [{"id": "syn11", "name": "b.txt", "type": FILE_ENTITY}],
+        }
+
+        async def mock_get_children(parent: str, **kwargs):
+            for child in tree[parent]:
+                yield child
+
+        async def mock_file_get(file: File, **kwargs) -> File:
+            # The metadata is retrieved without downloading the file
+            assert file.download_file is False
+            file.data_file_handle_id = file.id.replace("syn", "10")
+            return file
+
+        async def mock_folder_get(folder: Folder, **kwargs) -> Folder:
+            return folder
+
+        async def mock_download(download_location, file, **kwargs) -> None:
+            file.path = os.path.join(download_location, file.name)
+
+        file_handle_results = {
+            "1010": {"fileHandleId": "1010", "preSignedURL": "url_10"},
+            "1011": {"fileHandleId": "1011", "preSignedURL": "url_11"},
+        }
+
+        # WHEN I sync the folder with batch_downloads
+        with (
+            patch(
+                "synapseclient.models.mixins.storable_container.get_children",
+                side_effect=mock_get_children,
+            ),
+            patch.object(File, "get_async", autospec=True, side_effect=mock_file_get),
+            patch.object(
+                Folder, "get_async", autospec=True, side_effect=mock_folder_get
+            ),
+            patch(
+                "synapseclient.models.mixins.storable_container.get_file_handles_for_download_async",
+                new_callable=AsyncMock,
+                return_value=file_handle_results,
+            ) as mock_get_file_handles,
+            patch(
+                "synapseclient.models.mixins.storable_container.download_file_entity_model",
+                side_effect=mock_download,
+            ) as mock_download_file,
+        ):
+            folder = await Folder(id="syn1", name="root").sync_from_synapse_async(
+                path=str(tmp_path),
+                manifest="suppress",
+                batch_downloads=True,
+                synapse_client=self.syn,
+            )
+
+        # THEN the file handles of both files are requested together
+        mock_get_file_handles.assert_awaited_once()
+        assert mock_get_file_handles.call_args.kwargs["requested_files"] == [
+            {
+                "fileHandleId": "1010",
+                "associateObjectId": "syn10",
+                "associateObjectType": "FileEntity",
+            },
+            {
+                "fileHandleId": "1011",
+                "associateObjectId": "syn11",
+                "associateObjectType": "FileEntity",
+            },
+        ]
+        # AND each file is downloaded to its directory with its file handle
+        assert mock_download_file.call_count == 2
+        downloads = {
+            call.kwargs["file"].id: (
+                call.kwargs["download_location"],
+                call.kwargs["file_handle_result"],
+            )
+            for call in mock_download_file.call_args_list
+        }
+        assert downloads == {
+            "syn10": (str(tmp_path), file_handle_results["1010"]),
+            "syn11": (
+                os.path.join(str(tmp_path), "sub"),
+                file_handle_results["1011"],
+            ),
+        }
+        assert folder.files[0].path == os.path.join(str(tmp_path), "a.txt")
+        assert folder.folders[0].files[0].path == os.path.join(
+            str(tmp_path), "sub", "b.txt"
+        )
+
+    async def test_next_batch_is_requested_while_files_download(
+        self, tmp_path: Path
+    ) -> None:
+        # GIVEN a folder with enough files for three batches of file handles
+        folder = Folder(id="syn1", name="root")
+        folder.files = [
+            File(id=f"syn{i}", name=f"{i}.txt", data_file_handle_id=f"10{i}")
+            for i in range(10, 15)
+        ]
+        first_download_started = asyncio.Event()
+        release_first_download = asyncio.Event()
+        downloaded = []
+
+        async def mock_get_file_handles(requested_files, **kwargs):
+            return {
+                requested["fileHandleId"]: {"fileHandleId": requested["fileHandleId"]}
+                for requested in requested_files
+            }
+
+        async def mock_download(download_location, file, **kwargs) -> None:
+            if file.id == "syn10":
+                # A large file that is still downloading
+                first_download_started.set()
+                await release_first_download.wait()
+            downloaded.append(file.id)
+
+        with (
+            patch(
+                "synapseclient.models.mixins.storable_container.MAX_FILE_HANDLE_PER_BATCH_REQUEST",
+                2,
+            ),
+            patch(
+                "synapseclient.models.mixins.storable_container.get_file_handles_for_download_async",
+                side_effect=mock_get_file_handles,
+            ) as mock_get_file_handles_call,
+            patch(
+                "synapseclient.models.mixins.storable_container.download_file_entity_model",
+                side_effect=mock_download,
+            ),
+        ):
+            # WHEN the files are downloaded in batches
+            download_task = asyncio.create_task(
+                folder._download_files_in_batches(
+                    path=str(tmp_path),
+                    if_collision="overwrite.local",
+                    failure_strategy=FailureStrategy.LOG_EXCEPTION,
+                    synapse_client=self.syn,
+                )
+            )
+            await first_download_started.wait()
+            for _ in range(20):
+                await asyncio.sleep(0)
+
+            # THEN every batch is requested and the other files are downloaded
+            # while the first file is still downloading
+            assert mock_get_file_handles_call.await_count == 3
+            assert sorted(downloaded) == ["syn11", "syn12", "syn13", "syn14"]
+
+            release_first_download.set()
+            await download_task
+
+        assert downloaded[-1] == "syn10"
+        assert all(file.download_file for file in folder.files)
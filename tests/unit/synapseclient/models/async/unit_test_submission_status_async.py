@@ -1,5 +1,6 @@
 """Unit tests for the synapseclient.models.SubmissionStatus class."""
 
+import asyncio
 from typing import Dict, Union
 from unittest.mock import AsyncMock, patch
 
@@ -478,6 +479,114 @@ class TestSubmissionStatus:
             assert request_body["batchToken"] == batch_token
             assert request_body["isFirstBatch"] is False
 
+    async def test_get_all_submission_statuses_pages_concurrently(self) -> None:
+        """Test that a limit above the page size is fetched as concurrent pages."""
+        # GIVEN an evaluation with 250 statuses
+        total = 250
+        in_flight = 0
+        max_in_flight = 0
+
+        async def get_page(evaluation_id, status, limit, offset, synapse_client):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return {
+                "totalNumberOfResults": total,
+                "results": [
+                    {"id": str(i), "status": "RECEIVED"}
+                    for i in range(offset, min(offset + limit, total))
+                ],
+            }
+
+        # WHEN I get every status after the first 20
+        with (
+            patch.object(self.syn, "_max_threads", 1),
+            patch(
+                "synapseclient.api.evaluation_services.get_all_submission_statuses",
+                side_effect=get_page,
+            ) as mock_get_all,
+        ):
+            result = await SubmissionStatus.get_all_submission_statuses_async(
+                evaluation_id=EVALUATION_ID,
+                limit=None,
+                offset=20,
+                synapse_client=self.syn,
+            )
+
+        # THEN the pages are requested by offset, at most two at a time
+        assert [call.kwargs["offset"] for call in mock_get_all.call_args_list] == [
+            20,
+            120,
+            220,
+        ]
+        assert max_in_flight == 2
+        # AND the statuses are returned in order
+        assert [status.id for status in result] == [str(i) for i in range(20, 250)]
+
+    async def test_get_all_submission_statuses_stops_at_limit(self) -> None:
+        """Test that no more statuses than the limit are fetched."""
+
+        async def get_page(evaluation_id, status, limit, offset, synapse_client):
+            return {
+                "totalNumberOfResults": 1000,
+                "results": [{"id": str(i)} for i in range(offset, offset + limit)],
+            }
+
+        with patch(
+            "synapseclient.api.evaluation_services.get_all_submission_statuses",
+            side_effect=get_page,
+        ) as mock_get_all:
+            result = await SubmissionStatus.get_all_submission_statuses_async(
+                evaluation_id=EVALUATION_ID,
+                limit=150,
+                synapse_client=self.syn,
+            )
+
+        assert [
+            (call.kwargs["offset"], call.kwargs["limit"])
+            for call in mock_get_all.call_args_list
+        ] == [(0, 100), (100, 50)]
+        assert len(result) == 150
+
+    async def test_batch_update_splits_into_batches_with_tokens(self) -> None:
+        """Test that more statuses than the batch limit are sent as a series."""
+        # GIVEN more statuses than fit in two batches
+        statuses = [
+            SubmissionStatus(id=str(i), etag="etag", status_version=1, status="SCORED")
+            for i in range(1100)
+        ]
+        responses = [
+            {"nextUploadToken": "token1"},
+            {"nextUploadToken": "token2"},
+            {"state": "COMPLETE"},
+        ]
+
+        # WHEN I update them
+        with patch(
+            "synapseclient.api.evaluation_services.batch_update_submission_statuses",
+            new_callable=AsyncMock,
+            side_effect=responses,
+        ) as mock_batch_update:
+            result = await SubmissionStatus.batch_update_submission_statuses_async(
+                evaluation_id=EVALUATION_ID,
+                statuses=statuses,
+                synapse_client=self.syn,
+            )
+
+        # THEN they are sent in three batches chained by the batch token
+        request_bodies = [
+            call.kwargs["request_body"] for call in mock_batch_update.call_args_list
+        ]
+        assert [len(body["statuses"]) for body in request_bodies] == [500, 500, 100]
+        assert [
+            (body["isFirstBatch"], body["isLastBatch"], body.get("batchToken"))
+            for body in request_bodies
+        ] == [(True, False, None), (False, False, "token1"), (False, True, "token2")]
+        # AND the response of the last batch is returned
+        assert result == {"state": "COMPLETE"}
+
     def test_set_last_persistent_instance(self) -> None:
         """Test setting the last persistent instance."""
         # GIVEN a SubmissionStatus
@@ -17,6 +17,7 @@ class TestDeletePermissions:
     def setup_method(self):
         """Set up test fixtures."""
         self.synapse_client = MagicMock(spec=Synapse)
+        self.synapse_client.max_threads = 5
         self.synapse_client.logger = MagicMock()
         self.synapse_client.silent = True
 
@@ -381,6 +382,7 @@ class TestDeletePermissions:
         # GIVEN a file and a custom synapse client
         file = File(id="syn123")
         custom_client = MagicMock(spec=Synapse)
+        custom_client.max_threads = 5
         custom_client.logger = MagicMock()
         custom_client.silent = True
 
@@ -566,7 +568,7 @@ class TestBenefactorTrackerComprehensive:
         """Test parallel entity tracking."""
         # GIVEN a tracker
         tracker = BenefactorTracker()
-        mock_client = MagicMock()
+        mock_client = MagicMock(max_threads=5)
 
         entity_ids = ["syn123", "syn456", "syn789"]
         benefactor_responses = [
@@ -598,7 +600,7 @@ class TestBenefactorTrackerComprehensive:
         # GIVEN a tracker with some already processed entities
         tracker = BenefactorTracker()
         tracker.processed_entities.add("syn123")
-        mock_client = MagicMock()
+        mock_client = MagicMock(max_threads=5)
 
         entity_ids = ["syn123", "syn456"]  # syn123 already processed
 
@@ -701,6 +703,7 @@ class TestListAclAsyncComprehensive:
     def setup_method(self):
         """Set up test fixtures."""
         self.synapse_client = MagicMock(spec=Synapse)
+        self.synapse_client.max_threads = 5
         self.synapse_client.logger = MagicMock()
         self.synapse_client.silent = True
 
@@ -0,0 +1,198 @@
+"""Unit tests for bulk annotation operations."""
+
+import asyncio
+from collections import OrderedDict
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from synapseclient.core.exceptions import SynapseHTTPError
+from synapseclient.models import Column, ColumnType
+from synapseclient.operations.annotation_operations import bulk_set_annotations_async
+
+
+def _http_error(status_code: int) -> SynapseHTTPError:
+    return SynapseHTTPError(
+        f"{status_code} Client Error:", response=MagicMock(status_code=status_code)
+    )
+
+
+class TestBulkSetAnnotations:
+    """Tests for bulk_set_annotations_async."""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.client = MagicMock(max_threads=5)
+        self.stored = {
+            "syn1": {"species": {"type": "STRING", "value": ["human"]}},
+            "syn2": {"count": {"type": "LONG", "value": ["1"]}},
+        }
+        self.etags = {"syn1": 1, "syn2": 1}
+        self.put_errors = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        async def track():
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0)
+            self.in_flight -= 1
+
+        async def get_annotations(entity_id, synapse_client=None):
+            await track()
+            return {
+                "id": entity_id,
+                "etag": f"etag-{self.etags[entity_id]}",
+                "annotations": self.stored[entity_id],
+            }
+
+        async def set_annotations(annotations, synapse_client=None):
+            await track()
+            errors = self.put_errors.get(annotations.id)
+            if errors:
+                raise errors.pop(0)
+            assert annotations.etag == f"etag-{self.etags[annotations.id]}"
+            self.stored[annotations.id] = annotations.annotations
+            self.etags[annotations.id] += 1
+            return {"etag": f"etag-{self.etags[annotations.id]}"}
+
+        with (
+            patch("synapseclient.Synapse.get_client", return_value=self.client),
+            patch(
+                "synapseclient.operations.annotation_operations.get_annotations_async",
+                side_effect=get_annotations,
+            ) as self.mock_get,
+            patch(
+                "synapseclient.operations.annotation_operations.set_annotations_async",
+                side_effect=set_annotations,
+            ) as self.mock_set,
+        ):
+            yield
+
+    async def test_changes_are_merged_into_current_annotations(self):
+        # GIVEN changes that add, replace and remove annotations
+        result = await bulk_set_annotations_async(
+            {
+                "syn1": {"species": "mouse", "reviewed": True},
+                "syn2": {"count": None, "tissue": ["brain", "liver"]},
+            }
+        )
+
+        # THEN annotations that are not changed are kept
+        assert self.stored == {
+            "syn1": {"species": "mouse", "reviewed": True},
+            "syn2": {"tissue": ["brain", "liver"]},
+        }
+        # AND the new etag of every entity is reported
+        assert [(r.id, r.etag, r.attempts) for r in result.results] == [
+            ("syn1", "etag-2", 1),
+            ("syn2", "etag-2", 1),
+        ]
+        assert result.updated == 2
+        assert result.failed == 0
+
+    async def test_replace_removes_other_annotations(self):
+        # WHEN the annotations of an entity are replaced
+        await bulk_set_annotations_async({"syn1": {"reviewed": False}}, replace=True)
+
+        # THEN only the given annotations remain
+        assert self.stored["syn1"] == {"reviewed": False}
+
+    async def test_requests_are_bounded(self):
+        # GIVEN many entities and a client with a single thread
+        self.client.max_threads = 1
+        for i in range(3, 20):
+            self.stored[f"syn{i}"] = {}
+            self.etags[f"syn{i}"] = 1
+
+        # WHEN their annotations are set
+        result = await bulk_set_annotations_async(
+            {entity_id: {"reviewed": True} for entity_id in self.stored}
+        )
+
+        # THEN no more than two requests are in flight at a time
+        assert result.updated == 19
+        assert self.max_in_flight == 2
+
+    async def test_etag_conflicts_are_retried_with_a_refreshed_etag(self):
+        # GIVEN an entity that is modified after its annotations are fetched
+        self.put_errors["syn1"] = [_http_error(412)]
+
+        # WHEN its annotations are set
+        result = await bulk_set_annotations_async({"syn1": {"species": "mouse"}})
+
+        # THEN the annotations are fetched again and written with the new etag
+        assert self.mock_get.await_count == 2
+        assert result.results[0].attempts == 2
+        assert result.results[0].etag == "etag-2"
+        assert result.retried == 1
+        assert self.stored["syn1"] == {"species": "mouse"}
+
+    async def test_failures_are_recorded_per_entity(self):
+        # GIVEN one entity that keeps conflicting and one that cannot be written
+        self.put_errors["syn1"] = [_http_error(412) for _ in range(5)]
+        self.put_errors["syn2"] = [_http_error(403)]
+        self.stored["syn3"] = {}
+        self.etags["syn3"] = 1
+
+        # WHEN their annotations are set
+        result = await bulk_set_annotations_async(
+            {
+                "syn1": {"a": 1},
+                "syn2": {"a": 1},
+                "syn3": {"a": 1},
+            },
+            max_retries=2,
+        )
+
+        # THEN the conflicting entity is written at most max_retries more times
+        assert result.results[0].attempts == 3
+        assert result.results[0].error.response.status_code == 412
+        # AND other errors are not retried
+        assert result.results[1].attempts == 1
+        assert result.results[1].error.response.status_code == 403
+        # AND the other entities are still updated
+        assert result.results[2].updated
+        assert (result.updated, result.failed) == (1, 2)
+
+    async def test_entities_in_a_view_are_updated_through_its_rows(self):
+        # GIVEN a view that contains syn1 and has a column for its annotation
+        view = MagicMock(
+            id="syn99",
+            columns=OrderedDict(
+                id=Column(name="id", column_type=ColumnType.ENTITYID),
+                species=Column(name="species", column_type=ColumnType.STRING),
+            ),
+        )
+        view.query_async = AsyncMock(return_value=pd.DataFrame({"id": ["syn1"]}))
+        view.update_rows_async = AsyncMock()
+
+        # WHEN annotations are set for syn1, syn2 which is not in the view and
+        # syn3 whose annotation is not a column of the view
+        self.stored["syn3"] = {}
+        self.etags["syn3"] = 1
+        result = await bulk_set_annotations_async(
+            {
+                "syn1": {"species": ["mouse"]},
+                "syn2": {"species": "rat"},
+                "syn3": {"tissue": "brain"},
+            },
+            view=view,
+        )
+
+        # THEN only the candidates are looked up in the view
+        query = view.query_async.call_args.kwargs["query"]
+        assert query == "SELECT id FROM syn99 WHERE id IN ('syn1', 'syn2')"
+        # AND the row of syn1 is updated with a single value
+        view.update_rows_async.assert_awaited_once()
+        assert view.update_rows_async.call_args.kwargs["values"] == {
+            "id": ["syn1"],
+            "species": ["mouse"],
+        }
+        # AND the other entities are updated one at a time
+        assert [r.via_view for r in result.results] == [True, False, False]
+        assert sorted(
+            call.kwargs["annotations"].id for call in self.mock_set.call_args_list
+        ) == ["syn2", "syn3"]
+        assert result.updated == 3
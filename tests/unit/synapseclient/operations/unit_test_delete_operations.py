@@ -1,10 +1,13 @@
 """Unit tests for delete_operations routing logic."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from synapseclient.operations.delete_operations import delete_async
+from synapseclient.api.entity_services import EntityHeader
+from synapseclient.core.constants.concrete_types import FILE_ENTITY, FOLDER_ENTITY
+from synapseclient.operations.delete_operations import bulk_delete_async, delete_async
 
 
 class TestDeleteStringIdRoute:
@@ -482,3 +485,184 @@ class TestDeleteSyncWrapper:
         # THEN wrap_async_to_sync is called
         assert result is None
         mock_wrap.assert_called_once()
+
+
+class TestBulkDelete:
+    """Tests for bulk_delete_async."""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.client = MagicMock(max_threads=5)
+        self.paths = {
+            "syn1": ["syn0", "syn1"],
+            "syn2": ["syn0", "syn1", "syn2"],
+            "syn3": ["syn0", "syn1", "syn2", "syn3"],
+            "syn4": ["syn0", "syn4"],
+        }
+
+        self.folders = {"syn1", "syn2"}
+
+        async def get_entity_path(entity_id, synapse_client=None):
+            return {"path": [{"id": i} for i in self.paths[entity_id]]}
+
+        async def get_entity_headers(entity_ids, synapse_client=None):
+            return [
+                EntityHeader(
+                    id=i, type=FOLDER_ENTITY if i in self.folders else FILE_ENTITY
+                )
+                for i in entity_ids
+            ]
+
+        with (
+            patch("synapseclient.Synapse.get_client", return_value=self.client),
+            patch(
+                "synapseclient.operations.delete_operations.get_entity_path",
+                side_effect=get_entity_path,
+            ) as self.mock_get_entity_path,
+            patch(
+                "synapseclient.operations.delete_operations.get_entity_headers",
+                side_effect=get_entity_headers,
+            ) as self.mock_get_entity_headers,
+            patch(
+                "synapseclient.operations.delete_operations.delete_entity",
+                new_callable=AsyncMock,
+            ) as self.mock_delete_entity,
+        ):
+            yield
+
+    def _deleted(self):
+        return sorted(
+            (call.kwargs["entity_id"], call.kwargs["version_number"])
+            for call in self.mock_delete_entity.call_args_list
+        )
+
+    async def test_descendants_of_deleted_containers_are_skipped(self):
+        # GIVEN a folder, two of its descendants, an unrelated file and a duplicate
+        results = await bulk_delete_async(["syn3", "syn1", "syn2", "syn4", "syn1"])
+
+        # THEN only the outermost container and the unrelated file are deleted
+        assert self._deleted() == [("syn1", None), ("syn4", None)]
+        # AND every unique ID has a result in the order it was given
+        assert [(r.id, r.deleted, r.covered_by) for r in results] == [
+            ("syn3", True, "syn1"),
+            ("syn1", True, None),
+            ("syn2", True, "syn1"),
+            ("syn4", True, None),
+        ]
+
+    async def test_versions_are_deleted_unless_the_entity_is(self):
+        # GIVEN versions of two entities, one of which is deleted entirely
+        results = await bulk_delete_async(
+            ["syn4.1", "syn4.2", "syn3.1", "syn3"], version_only=True
+        )
+
+        # THEN only the versions of the entity that is kept are deleted
+        assert self._deleted() == [("syn3", None), ("syn4", 1), ("syn4", 2)]
+        assert results[2].covered_by == "syn3"
+        assert all(r.error is None for r in results)
+
+    async def test_versioned_ids_are_not_merged_with_the_entity(self):
+        # GIVEN a versioned ID next to its unversioned entity, and one on its own
+        results = await bulk_delete_async(["syn4.1", "syn4", "syn3.1"])
+
+        # THEN the whole entity is deleted and covers its version
+        assert self._deleted() == [("syn4", None)]
+        assert [(r.id, r.version, r.deleted, r.covered_by) for r in results] == [
+            ("syn4", 1, True, "syn4"),
+            ("syn4", None, True, None),
+            ("syn3", 1, False, None),
+        ]
+        # AND the lone version is refused without version_only
+        assert isinstance(results[2].error, ValueError)
+
+    async def test_failures_are_recorded_per_item(self):
+        # GIVEN a delete request that fails for one entity
+        async def delete_entity(entity_id, version_number=None, synapse_client=None):
+            if entity_id == "syn4":
+                raise ValueError("boom")
+
+        self.mock_delete_entity.side_effect = delete_entity
+
+        # WHEN deleting two unrelated entities
+        results = await bulk_delete_async(["syn4", "syn3"])
+
+        # THEN the other entity is still deleted
+        assert isinstance(results[0].error, ValueError)
+        assert not results[0].deleted
+        assert results[1].deleted
+
+    async def test_failed_container_delete_is_recorded_on_covered_items(self):
+        # GIVEN a delete request that fails for a container
+        error = ValueError("boom")
+
+        async def delete_entity(entity_id, version_number=None, synapse_client=None):
+            if entity_id == "syn1":
+                raise error
+
+        self.mock_delete_entity.side_effect = delete_entity
+
+        # WHEN deleting it with a descendant and a version of that descendant
+        results = await bulk_delete_async(["syn3.1", "syn3", "syn1"], version_only=True)
+
+        # THEN no item covered by the container is reported as deleted
+        assert self._deleted() == [("syn1", None)]
+        assert [(r.covered_by, r.deleted, r.error) for r in results] == [
+            ("syn3", False, error),
+            ("syn1", False, error),
+            (None, False, error),
+        ]
+
+    async def test_deletes_are_bounded(self):
+        # GIVEN a client allowing one thread and many unrelated entities
+        self.client.max_threads = 1
+        in_flight = 0
+        max_in_flight = 0
+
+        async def delete_entity(entity_id, version_number=None, synapse_client=None):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+
+        self.mock_delete_entity.side_effect = delete_entity
+        for i in range(10, 30):
+            self.paths[f"syn{i}"] = ["syn0", f"syn{i}"]
+
+        # WHEN deleting them
+        results = await bulk_delete_async([f"syn{i}" for i in range(10, 30)])
+
+        # THEN at most two requests are in flight at a time
+        assert all(r.deleted for r in results)
+        assert max_in_flight == 2
+
+    async def test_paths_are_not_looked_up_without_containers(self):
+        # GIVEN many files and no container
+        for i in range(10, 30):
+            self.paths[f"syn{i}"] = ["syn0", f"syn{i}"]
+
+        # WHEN deleting them
+        results = await bulk_delete_async([f"syn{i}" for i in range(10, 30)])
+
+        # THEN their types are looked up in one call and no path is requested
+        assert all(r.deleted for r in results)
+        self.mock_get_entity_headers.assert_awaited_once()
+        self.mock_get_entity_path.assert_not_called()
+
+    async def test_container_instances_are_not_looked_up(self):
+        # GIVEN a Folder instance and a file ID under it
+        from synapseclient.models import Folder
+
+        folder = Folder(id="syn1")
+        folder.delete_async = AsyncMock(return_value=None)
+        results = await bulk_delete_async([folder, "syn3"])
+
+        # THEN only the ID string's type is looked up
+        self.mock_get_entity_headers.assert_awaited_once_with(
+            ["syn3"], synapse_client=self.client
+        )
+        # AND the file is covered by the folder
+        assert [(r.id, r.covered_by) for r in results] == [
+            ("syn1", None),
+            ("syn3", "syn1"),
+        ]
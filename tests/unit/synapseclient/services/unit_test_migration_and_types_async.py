@@ -14,7 +14,11 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from synapseclient.core.constants import concrete_types
-from synapseclient.core.exceptions import SynapseError
+from synapseclient.core.exceptions import (
+    SynapseError,
+    SynapseHTTPError,
+    SynapseTimeoutError,
+)
 from synapseclient.models.services.migration import (
     BATCH_SIZE,
     DEFAULT_PART_SIZE,
@@ -43,8 +47,11 @@ from synapseclient.models.services.migration import (
     _migrate_table_attached_file_async,
     _prepare_migration_db,
     _query_migration_batch,
+    _record_index_checkpoint,
     _record_indexing_error,
+    _record_migration_batch,
     _retrieve_index_settings,
+    _TableCellUpdateBatcher,
     _update_migration_database,
     _verify_storage_location_ownership_async,
     index_files_for_migration_async,
@@ -58,6 +65,7 @@ from synapseclient.models.services.migration_types import (
     MigrationResult,
     MigrationSettings,
     MigrationStatus,
+    MigrationTimings,
     MigrationType,
 )
 
@@ -256,7 +264,7 @@ def _make_mock_client():
     client.rest_get_async = AsyncMock()
     client.rest_put_async = AsyncMock()
     client.logger = MagicMock()
-    client._get_parallel_file_transfer_semaphore.return_value = asyncio.Semaphore(10)
+    client.max_threads = 5
     return client
 
 
@@ -622,12 +630,90 @@ class TestMigrationResult:
         finally:
             os.unlink(csv_path)
 
+    def test_get_throughput(self, db_file):
+        conn = sqlite3.connect(db_file)
+        try:
+            cursor = conn.cursor()
+            for entity_id, started_at, copied_bytes in (
+                ("syn3", 100.0, 1000),
+                ("syn4", 102.0, 0),
+            ):
+                cursor.execute(
+                    """INSERT INTO migrations (id, type, status)
+                       VALUES (?, ?, ?)""",
+                    (
+                        entity_id,
+                        MigrationType.FILE.value,
+                        MigrationStatus.INDEXED.value,
+                    ),
+                )
+                _update_migration_database(
+                    conn,
+                    cursor,
+                    MigrationKey(entity_id, MigrationType.FILE),
+                    "fh_dst",
+                    MigrationStatus.MIGRATED.value,
+                    timings=MigrationTimings(
+                        started_at=started_at,
+                        queued_seconds=1.0,
+                        copy_seconds=2.0 if copied_bytes else 0.0,
+                        update_seconds=1.0,
+                        copied_bytes=copied_bytes,
+                    ),
+                )
+            _record_migration_batch(cursor, 99.0, 0.5, 2)
+            conn.commit()
+        finally:
+            conn.close()
+
+        throughput = MigrationResult(db_path=db_file).get_throughput()
+
+        # from the first start at 100 to the last completion at 102 + 2
+        assert throughput["migrated_items"] == 2
+        assert throughput["copied_bytes"] == 1000
+        assert throughput["elapsed_seconds"] == 4.0
+        assert throughput["bytes_per_second"] == 250.0
+        assert throughput["items_per_second"] == 0.5
+        assert throughput["stage_seconds"] == {
+            "queued": 2.0,
+            "copy": 2.0,
+            "update": 2.0,
+            "query": 0.5,
+        }
+
+    def test_get_throughput_without_migrated_items(self, db_file):
+        throughput = MigrationResult(db_path=db_file).throughput
+        assert throughput["migrated_items"] == 0
+        assert throughput["bytes_per_second"] == 0.0
+
 
 # =============================================================================
 # migration.py – pure helper functions
 # =============================================================================
 
 
+class TestRecordMigrationBatch:
+    def test_consecutive_empty_queries_share_one_row(self):
+        conn = sqlite3.connect(":memory:")
+        cursor = conn.cursor()
+        _ensure_schema(cursor)
+
+        for queried_at, row_count in enumerate([2, 0, 0, 0, 1, 0]):
+            _record_migration_batch(cursor, float(queried_at), 0.5, row_count)
+
+        rows = cursor.execute(
+            "SELECT queried_at, query_seconds, row_count FROM migration_batches "
+            "ORDER BY rowid"
+        ).fetchall()
+        assert rows == [
+            (0.0, 0.5, 2),
+            (1.0, 1.5, 0),
+            (4.0, 0.5, 1),
+            (5.0, 0.5, 0),
+        ]
+        conn.close()
+
+
 class TestGetDefaultDbPath:
     def test_returns_path_with_entity_id(self):
         path = _get_default_db_path("syn123")
@@ -731,6 +817,32 @@ class TestEnsureSchema:
         # Running again should not raise
         _ensure_schema(cursor)
 
+    def test_adds_timing_columns_to_an_older_index(self):
+        conn = sqlite3.connect(":memory:")
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE migrations (
+                id TEXT NOT NULL,
+                type INTEGER NOT NULL,
+                version INTEGER NULL,
+                row_id INTEGER NULL,
+                col_id INTEGER NULL,
+                parent_id NULL,
+                status INTEGER NOT NULL,
+                exception TEXT NULL,
+                from_storage_location_id NULL,
+                from_file_handle_id TEXT NULL,
+                to_file_handle_id TEXT NULL,
+                file_size INTEGER NULL,
+                PRIMARY KEY (id, type, row_id, col_id, version)
+            )
+            """)
+
+        _ensure_schema(cursor)
+
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(migrations)")}
+        assert {"started_at", "completed_at", "copy_seconds", "copied_bytes"} <= columns
+
 
 class TestCheckIndexed:
     def test_not_indexed(self, in_memory_db):
@@ -746,6 +858,13 @@ class TestCheckIndexed:
         conn.commit()
         assert _check_indexed(cursor, "syn1", synapse_client=MagicMock()) is True
 
+    def test_checkpointed_entity_is_indexed(self, in_memory_db):
+        conn, cursor = in_memory_db
+        _record_index_checkpoint(cursor, "syn2")
+        _record_index_checkpoint(cursor, "syn2")
+        conn.commit()
+        assert _check_indexed(cursor, "syn2", synapse_client=MagicMock()) is True
+
 
 class TestMarkContainerIndexed:
     def test_inserts_row(self, in_memory_db):
@@ -1059,6 +1178,31 @@ class TestUpdateMigrationDatabase:
         assert row[0] == MigrationStatus.ERRORED.value
         assert "disk full" in row[1]
 
+    def test_stores_timings(self, in_memory_db):
+        conn, cursor = in_memory_db
+        self._insert_indexed_file(cursor)
+        key = MigrationKey("syn1", MigrationType.FILE, version=1)
+        timings = MigrationTimings(
+            started_at=1000.0,
+            queued_seconds=1.5,
+            copy_seconds=3.0,
+            update_seconds=0.5,
+            copied_bytes=2048,
+        )
+        _update_migration_database(
+            conn,
+            cursor,
+            key,
+            "fh_dest",
+            MigrationStatus.MIGRATED.value,
+            timings=timings,
+        )
+        row = cursor.execute(
+            "SELECT started_at, completed_at, queued_seconds, copy_seconds, "
+            "update_seconds, copied_bytes FROM migrations WHERE id='syn1'"
+        ).fetchone()
+        assert row == (1000.0, 1005.0, 1.5, 3.0, 0.5, 2048)
+
 
 class TestConfirmMigration:
     def test_force_returns_true(self, in_memory_db):
@@ -1357,6 +1501,44 @@ class TestIndexFilesForMigrationAsyncValidation:
         finally:
             os.unlink(db_path)
 
+    @pytest.mark.asyncio
+    async def test_progress_is_kept_when_indexing_fails(self):
+        client = _make_mock_client()
+        entity = _make_entity("syn1")
+        indexing_err = IndexingError("syn3", concrete_types.FILE_ENTITY)
+        indexing_err.__cause__ = RuntimeError("network down")
+
+        async def _index_then_fail(conn, cursor, **kwargs):
+            _record_index_checkpoint(cursor, "syn2")
+            raise indexing_err
+
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            with (
+                patch(f"{MODULE}.Synapse.get_client", return_value=client),
+                patch(
+                    f"{MODULE}._verify_storage_location_ownership_async",
+                    new=AsyncMock(),
+                ),
+                patch(f"{MODULE}._index_entity_async", side_effect=_index_then_fail),
+            ):
+                with pytest.raises(RuntimeError, match="network down"):
+                    await index_files_for_migration_async(
+                        entity=entity,
+                        dest_storage_location_id="99",
+                        db_path=db_path,
+                        synapse_client=client,
+                    )
+
+            conn = sqlite3.connect(db_path)
+            try:
+                assert _check_indexed(conn.cursor(), "syn2", synapse_client=client)
+            finally:
+                conn.close()
+        finally:
+            os.unlink(db_path)
+
 
 # =============================================================================
 # _index_entity_async
@@ -1540,6 +1722,31 @@ class TestIndexEntityAsync:
 
         mock_index_file.assert_not_awaited()
 
+    @pytest.mark.asyncio
+    async def test_indexed_file_is_checkpointed(self, in_memory_db):
+        conn, cursor = in_memory_db
+        client = _make_mock_client()
+        mock_entity_type = AsyncMock(
+            return_value=self._mock_entity_type(concrete_types.FILE_ENTITY)
+        )
+
+        with (
+            patch(f"{MODULE}.get_entity_type", new=mock_entity_type),
+            patch(
+                f"{MODULE}._index_file_entity_async", new=AsyncMock()
+            ) as mock_index_file,
+        ):
+            # a file without migratable versions adds no migrations rows
+            await _index_entity_async(**self._common_kwargs(conn, cursor, client))
+            await _index_entity_async(**self._common_kwargs(conn, cursor, client))
+
+        # the second call is skipped without any requests
+        mock_index_file.assert_awaited_once()
+        mock_entity_type.assert_awaited_once()
+        assert cursor.execute("SELECT id FROM index_checkpoints").fetchall() == [
+            ("syn3",)
+        ]
+
     @pytest.mark.asyncio
     async def test_error_without_continue_raises_indexing_error(self, in_memory_db):
         conn, cursor = in_memory_db
@@ -1684,6 +1891,40 @@ class TestIndexFileEntityAsync:
         ).fetchone()[0]
         assert count == 3
 
+    @pytest.mark.asyncio
+    async def test_all_strategy_gets_each_version_by_number(self):
+        conn, cursor = self._make_cursor()
+        client = _make_mock_client()
+        entity = _make_entity("syn3", file_handle=_make_file_handle())
+
+        async def _mock_versions(entity_id, syn_client):
+            for v in [1, 2]:
+                yield v
+
+        with (
+            patch(f"{MODULE}._get_version_numbers_async", _mock_versions),
+            patch(
+                "synapseclient.operations.get_async", new=AsyncMock(return_value=entity)
+            ) as mock_get,
+        ):
+            await _index_file_entity_async(
+                cursor=cursor,
+                entity=entity,
+                parent_id="syn1",
+                dest_storage_location_id="99",
+                source_storage_location_ids=[],
+                file_version_strategy="all",
+                synapse_client=client,
+            )
+
+        assert sorted(
+            call.kwargs["version_number"] for call in mock_get.await_args_list
+        ) == [1, 2]
+        versions = cursor.execute(
+            "SELECT version FROM migrations WHERE id='syn3' ORDER BY version"
+        ).fetchall()
+        assert versions == [(1,), (2,)]
+
     @pytest.mark.asyncio
     async def test_already_migrated_file_skipped(self):
         conn, cursor = self._make_cursor()
@@ -1986,6 +2227,152 @@ class TestIndexContainerAsync:
         assert "file" not in captured_types
         assert "folder" not in captured_types
 
+    @pytest.mark.asyncio
+    async def test_skips_children_indexed_by_an_earlier_run(self):
+        conn = sqlite3.connect(":memory:")
+        cursor = conn.cursor()
+        _ensure_schema(cursor)
+        _record_index_checkpoint(cursor, "syn3")
+        _mark_container_indexed(cursor, "syn4", MigrationType.FOLDER.value, "syn1")
+        conn.commit()
+
+        client = _make_mock_client()
+        et = MagicMock()
+        et.type = concrete_types.PROJECT_ENTITY
+
+        async def _mock_get_children(parent, include_types, synapse_client):
+            yield {"id": "syn3", "type": concrete_types.FILE_ENTITY}
+            yield {"id": "syn4", "type": concrete_types.FOLDER_ENTITY}
+            yield {"id": "syn5", "type": concrete_types.FILE_ENTITY}
+
+        with (
+            patch(f"{MODULE}.get_entity_type", new=AsyncMock(return_value=et)),
+            patch(f"{MODULE}.get_children", _mock_get_children),
+            patch(
+                "synapseclient.operations.get_async",
+                new=AsyncMock(side_effect=lambda synapse_id, **kwargs: synapse_id),
+            ) as mock_get,
+            patch(f"{MODULE}._index_entity_async", new=AsyncMock()) as mock_index,
+        ):
+            await _index_container_async(
+                conn=conn,
+                cursor=cursor,
+                entity_id="syn1",
+                parent_id=None,
+                dest_storage_location_id="99",
+                source_storage_location_ids=[],
+                file_version_strategy="new",
+                include_table_files=False,
+                continue_on_error=False,
+                synapse_client=client,
+            )
+
+        assert [call.kwargs["synapse_id"] for call in mock_get.await_args_list] == [
+            "syn5"
+        ]
+        assert [call.kwargs["entity"] for call in mock_index.await_args_list] == [
+            "syn5"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_files_are_indexed_by_a_bounded_pool_of_workers(self):
+        conn = sqlite3.connect(":memory:")
+        cursor = conn.cursor()
+        _ensure_schema(cursor)
+        conn.commit()
+
+        client = _make_mock_client()
+        et = MagicMock()
+        et.type = concrete_types.FOLDER_ENTITY
+        active = 0
+        max_active = 0
+
+        async def _mock_get_children(parent, include_types, synapse_client):
+            for i in range(10):
+                yield {"id": f"syn{100 + i}", "type": concrete_types.FILE_ENTITY}
+
+        async def _index_file(entity, **kwargs):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        with (
+            patch(f"{MODULE}.get_entity_type", new=AsyncMock(return_value=et)),
+            patch(f"{MODULE}.get_children", _mock_get_children),
+            patch(
+                "synapseclient.operations.get_async",
+                new=AsyncMock(side_effect=lambda synapse_id, **kwargs: synapse_id),
+            ),
+            patch(
+                f"{MODULE}._index_entity_async", new=AsyncMock(side_effect=_index_file)
+            ) as mock_index,
+        ):
+            await _index_container_async(
+                conn=conn,
+                cursor=cursor,
+                entity_id="syn2",
+                parent_id="syn1",
+                dest_storage_location_id="99",
+                source_storage_location_ids=[],
+                file_version_strategy="new",
+                include_table_files=False,
+                continue_on_error=False,
+                worker_semaphore=asyncio.Semaphore(3),
+                synapse_client=client,
+            )
+
+        assert mock_index.await_count == 10
+        assert max_active == 3
+
+    @pytest.mark.asyncio
+    async def test_folders_are_listed_by_a_bounded_pool(self):
+        conn = sqlite3.connect(":memory:")
+        cursor = conn.cursor()
+        _ensure_schema(cursor)
+        conn.commit()
+
+        client = _make_mock_client()
+        et = MagicMock()
+        et.type = concrete_types.FOLDER_ENTITY
+        listed = []
+        active = 0
+        max_active = 0
+
+        async def _mock_get_children(parent, include_types, synapse_client):
+            nonlocal active, max_active
+            listed.append(parent)
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if parent == "syn2":
+                for i in range(10):
+                    yield {"id": f"syn{100 + i}", "type": concrete_types.FOLDER_ENTITY}
+
+        with (
+            patch(f"{MODULE}.get_entity_type", new=AsyncMock(return_value=et)),
+            patch(f"{MODULE}.get_children", _mock_get_children),
+        ):
+            await _index_container_async(
+                conn=conn,
+                cursor=cursor,
+                entity_id="syn2",
+                parent_id="syn1",
+                dest_storage_location_id="99",
+                source_storage_location_ids=[],
+                file_version_strategy="new",
+                include_table_files=False,
+                continue_on_error=False,
+                listing_semaphore=asyncio.Semaphore(3),
+                synapse_client=client,
+            )
+
+        # every folder is listed, but no more than three at a time
+        assert sorted(listed) == sorted(["syn2"] + [f"syn{100 + i}" for i in range(10)])
+        assert max_active == 3
+
 
 # =============================================================================
 # _migrate_item_async
@@ -2019,6 +2406,7 @@ class TestMigrateItemAsync:
 
         assert result["to_file_handle_id"] == "fh_new"
         assert result["from_file_handle_id"] == "fh_old"
+        assert result["timings"].copied_bytes == 1024
         mock_create.assert_awaited_once()
 
     @pytest.mark.asyncio
@@ -2043,6 +2431,8 @@ class TestMigrateItemAsync:
 
         mock_copy.assert_not_awaited()
         assert result["to_file_handle_id"] == "fh_existing"
+        assert result["timings"].copied_bytes == 0
+        assert result["timings"].copy_seconds == 0.0
 
     @pytest.mark.asyncio
     async def test_migrates_versioned_file(self):
@@ -2098,6 +2488,76 @@ class TestMigrateItemAsync:
 
         mock_table.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_table_attached_file_waits_on_batch_without_semaphore(self):
+        client = _make_mock_client()
+        key = MigrationKey(
+            "syn5", MigrationType.TABLE_ATTACHED_FILE, row_id=1, col_id=2
+        )
+        semaphore = asyncio.Semaphore(1)
+        table_batcher = MagicMock()
+
+        async def _update(key, to_file_handle_id):
+            # the semaphore was released before waiting on the batch
+            assert not semaphore.locked()
+            return 0.0
+
+        table_batcher.update = AsyncMock(side_effect=_update)
+
+        with (
+            patch(
+                f"{MODULE}.multipart_copy_async", new=AsyncMock(return_value="fh_new")
+            ),
+            patch(
+                f"{MODULE}._migrate_table_attached_file_async", new=AsyncMock()
+            ) as mock_table,
+        ):
+            result = await _migrate_item_async(
+                key=key,
+                from_file_handle_id="fh_old",
+                to_file_handle_id=None,
+                file_size=512,
+                dest_storage_location_id="99",
+                semaphore=semaphore,
+                table_batcher=table_batcher,
+                synapse_client=client,
+            )
+
+        table_batcher.update.assert_awaited_once_with(
+            key=key, to_file_handle_id="fh_new"
+        )
+        mock_table.assert_not_awaited()
+        assert result["to_file_handle_id"] == "fh_new"
+
+    @pytest.mark.asyncio
+    async def test_wait_on_table_batch_is_recorded_as_queued_time(self):
+        client = _make_mock_client()
+        key = MigrationKey(
+            "syn5", MigrationType.TABLE_ATTACHED_FILE, row_id=1, col_id=2
+        )
+        table_batcher = MagicMock()
+
+        async def _update(key, to_file_handle_id):
+            # the cell waits for its batch, then its transaction takes 0.01s
+            await asyncio.sleep(0.05)
+            return 0.01
+
+        table_batcher.update = AsyncMock(side_effect=_update)
+
+        result = await _migrate_item_async(
+            key=key,
+            from_file_handle_id="fh_old",
+            to_file_handle_id="fh_new",
+            file_size=512,
+            dest_storage_location_id="99",
+            semaphore=asyncio.Semaphore(1),
+            table_batcher=table_batcher,
+            synapse_client=client,
+        )
+
+        assert result["timings"].queued_seconds >= 0.04
+        assert result["timings"].update_seconds < 0.04
+
     @pytest.mark.asyncio
     async def test_exception_wrapped_as_migration_error(self):
         client = _make_mock_client()
@@ -2201,6 +2661,172 @@ class TestMigrateTableAttachedFileAsync:
         mock_transaction.send_job_and_wait_async.assert_awaited_once()
 
 
+# =============================================================================
+# _TableCellUpdateBatcher
+# =============================================================================
+
+
+class TestTableCellUpdateBatcher:
+    @staticmethod
+    def _key(table_id="syn5", row_id=1, col_id=2):
+        return MigrationKey(
+            table_id, MigrationType.TABLE_ATTACHED_FILE, row_id=row_id, col_id=col_id
+        )
+
+    @pytest.mark.asyncio
+    async def test_cells_of_a_table_are_sent_in_one_transaction(self):
+        client = _make_mock_client()
+        batcher = _TableCellUpdateBatcher(max_wait_seconds=60, synapse_client=client)
+        mock_transaction = MagicMock()
+        mock_transaction.send_job_and_wait_async = AsyncMock()
+
+        with patch(
+            f"{MODULE}.TableUpdateTransaction", return_value=mock_transaction
+        ) as mock_transaction_cls:
+            updates = [
+                asyncio.create_task(batcher.update(self._key(row_id=1, col_id=2), "a")),
+                asyncio.create_task(batcher.update(self._key(row_id=1, col_id=3), "b")),
+                asyncio.create_task(batcher.update(self._key(row_id=2, col_id=2), "c")),
+            ]
+            await asyncio.sleep(0)
+            assert batcher.waiting_count == 3
+            batcher.flush()
+            await asyncio.gather(*updates)
+
+        mock_transaction.send_job_and_wait_async.assert_awaited_once()
+        partial_row_set = mock_transaction_cls.call_args.kwargs["changes"][0].to_append
+        assert partial_row_set.table_id == "syn5"
+        assert [(row.row_id, row.values) for row in partial_row_set.rows] == [
+            ("1", [{"key": "2", "value": "a"}, {"key": "3", "value": "b"}]),
+            ("2", [{"key": "2", "value": "c"}]),
+        ]
+        assert batcher.waiting_count == 0
+
+    @pytest.mark.asyncio
+    async def test_full_batch_is_sent_without_waiting(self):
+        client = _make_mock_client()
+        batcher = _TableCellUpdateBatcher(
+            max_batch_size=2, max_wait_seconds=60, synapse_client=client
+        )
+
+        with patch(
+            f"{MODULE}._migrate_table_attached_files_async", new=AsyncMock()
+        ) as mock_send:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    *(
+                        batcher.update(self._key(row_id=row_id), "fh")
+                        for row_id in range(4)
+                    )
+                ),
+                timeout=5,
+            )
+
+        assert [len(call.kwargs["cells"]) for call in mock_send.await_args_list] == [
+            2,
+            2,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_is_sent_after_max_wait(self):
+        client = _make_mock_client()
+        batcher = _TableCellUpdateBatcher(max_wait_seconds=0.01, synapse_client=client)
+
+        with patch(
+            f"{MODULE}._migrate_table_attached_files_async", new=AsyncMock()
+        ) as mock_send:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    batcher.update(self._key("syn5"), "a"),
+                    batcher.update(self._key("syn6"), "b"),
+                ),
+                timeout=5,
+            )
+
+        # one transaction per table
+        assert sorted(
+            call.kwargs["table_id"] for call in mock_send.await_args_list
+        ) == ["syn5", "syn6"]
+
+    @pytest.mark.asyncio
+    async def test_failed_transaction_fails_every_cell(self):
+        client = _make_mock_client()
+        batcher = _TableCellUpdateBatcher(max_batch_size=2, synapse_client=client)
+
+        with patch(
+            f"{MODULE}._migrate_table_attached_files_async",
+            new=AsyncMock(side_effect=SynapseError("table locked")),
+        ):
+            results = await asyncio.gather(
+                batcher.update(self._key(row_id=1), "a"),
+                batcher.update(self._key(row_id=2), "b"),
+                return_exceptions=True,
+            )
+
+        assert [str(result) for result in results] == ["table locked"] * 2
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_only_fails_the_bad_cell(self):
+        client = _make_mock_client()
+        batcher = _TableCellUpdateBatcher(max_batch_size=4, synapse_client=client)
+
+        async def send(table_id, cells, synapse_client):
+            if any(key.row_id == 3 for key, _ in cells):
+                raise SynapseError("row 3 was deleted")
+
+        with patch(
+            f"{MODULE}._migrate_table_attached_files_async",
+            new=AsyncMock(side_effect=send),
+        ) as mock_send:
+            results = await asyncio.gather(
+                *(
+                    batcher.update(self._key(row_id=row_id), "fh")
+                    for row_id in range(4)
+                ),
+                return_exceptions=True,
+            )
+
+        # the batch is split until the bad cell is sent on its own
+        assert [type(result) for result in results] == [float] * 3 + [SynapseError]
+        assert str(results[3]) == "row 3 was deleted"
+        assert [len(call.kwargs["cells"]) for call in mock_send.await_args_list] == [
+            4,
+            2,
+            2,
+            1,
+            1,
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error",
+        [
+            SynapseHTTPError("forbidden", response=MagicMock(status_code=403)),
+            SynapseTimeoutError("timed out"),
+            ConnectionError("connection reset"),
+        ],
+    )
+    async def test_failure_not_caused_by_a_cell_fails_the_whole_batch(self, error):
+        client = _make_mock_client()
+        batcher = _TableCellUpdateBatcher(max_batch_size=4, synapse_client=client)
+
+        with patch(
+            f"{MODULE}._migrate_table_attached_files_async",
+            new=AsyncMock(side_effect=error),
+        ) as mock_send:
+            results = await asyncio.gather(
+                *(
+                    batcher.update(self._key(row_id=row_id), "fh")
+                    for row_id in range(4)
+                ),
+                return_exceptions=True,
+            )
+
+        # the batch is not split
+        mock_send.assert_awaited_once()
+        assert results == [error] * 4
+
+
 # =============================================================================
 # track_migration_results_async
 # =============================================================================
@@ -2264,6 +2890,47 @@ class TestTrackMigrationResultsAsync:
         assert from_fh in completed_fh
         assert key not in pending_keys
 
+    @pytest.mark.asyncio
+    async def test_timings_are_stored_and_emitted(self):
+        conn, cursor = self._make_db()
+        key = MigrationKey("syn3", MigrationType.FILE, version=1)
+        timings = MigrationTimings(
+            started_at=1000.0, copy_seconds=2.0, copied_bytes=4096
+        )
+
+        async def _successful_migrate():
+            return {
+                "key": key,
+                "from_file_handle_id": "fh_src",
+                "to_file_handle_id": "fh_dst",
+                "timings": timings,
+            }
+
+        task = asyncio.create_task(_successful_migrate())
+        await asyncio.sleep(0)
+
+        with (
+            patch(f"{MODULE}.MIGRATION_STAGE_DURATION_HISTOGRAM") as mock_histogram,
+            patch(f"{MODULE}.MIGRATION_COPIED_BYTES_COUNTER") as mock_counter,
+        ):
+            await track_migration_results_async(
+                conn=conn,
+                cursor=cursor,
+                active_tasks={task},
+                pending_file_handles={"fh_src"},
+                completed_file_handles=set(),
+                pending_keys={key},
+                return_when=asyncio.ALL_COMPLETED,
+                continue_on_error=False,
+            )
+
+        row = cursor.execute(
+            "SELECT copy_seconds, copied_bytes FROM migrations WHERE id='syn3'"
+        ).fetchone()
+        assert row == (2.0, 4096)
+        mock_histogram.record.assert_any_call(2.0, {"synapse.migration.stage": "copy"})
+        mock_counter.add.assert_called_once_with(4096)
+
     @pytest.mark.asyncio
     async def test_failed_task_marks_errored(self):
         conn, cursor = self._make_db()
@@ -2325,6 +2992,35 @@ class TestTrackMigrationResultsAsync:
                 continue_on_error=False,
             )
 
+    @pytest.mark.asyncio
+    async def test_returns_when_woken_before_a_task_completes(self):
+        conn, cursor = self._make_db()
+        blocked = asyncio.Event()
+        task = asyncio.create_task(blocked.wait())
+        wake_event = asyncio.Event()
+        wake_event.set()
+        active_tasks = {task}
+
+        await asyncio.wait_for(
+            track_migration_results_async(
+                conn=conn,
+                cursor=cursor,
+                active_tasks=active_tasks,
+                pending_file_handles=set(),
+                completed_file_handles=set(),
+                pending_keys=set(),
+                return_when=asyncio.FIRST_COMPLETED,
+                continue_on_error=False,
+                wake_event=wake_event,
+            ),
+            timeout=5,
+        )
+
+        assert active_tasks == {task}
+        assert not wake_event.is_set()
+        blocked.set()
+        await task
+
 
 # =============================================================================
 # migrate_indexed_files_async
@@ -2446,6 +3142,7 @@ class TestExecuteMigrationAsync:
             dest_storage_location_id,
             semaphore,
             *,
+            table_batcher,
             synapse_client,
         ):
             return {
@@ -2466,6 +3163,11 @@ class TestExecuteMigrationAsync:
 
         row = cursor.execute("SELECT status FROM migrations WHERE id='syn3'").fetchone()
         assert row[0] == MigrationStatus.MIGRATED.value
+        # every query for the next batch is recorded
+        batches = cursor.execute(
+            "SELECT row_count FROM migration_batches ORDER BY queried_at"
+        ).fetchall()
+        assert batches[0] == (1,)
 
     @pytest.mark.asyncio
     async def test_empty_db_completes_without_error(self):
@@ -2500,6 +3202,7 @@ class TestExecuteMigrationAsync:
             dest_storage_location_id,
             semaphore,
             *,
+            table_batcher,
             synapse_client,
         ):
             err = MigrationError(key, from_file_handle_id)
@@ -2518,3 +3221,60 @@ class TestExecuteMigrationAsync:
 
         row = cursor.execute("SELECT status FROM migrations WHERE id='syn3'").fetchone()
         assert row[0] == MigrationStatus.ERRORED.value
+
+    @pytest.mark.asyncio
+    async def test_table_attached_files_are_updated_in_one_transaction(self):
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        cursor = conn.cursor()
+        _ensure_schema(cursor)
+        cells = [(1, 2, "fh_a"), (1, 3, "fh_b"), (2, 2, "fh_c")]
+        for row_id, col_id, from_fh in cells:
+            cursor.execute(
+                """INSERT INTO migrations (id, type, row_id, col_id, status, from_file_handle_id, file_size)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    "syn5",
+                    MigrationType.TABLE_ATTACHED_FILE.value,
+                    row_id,
+                    col_id,
+                    MigrationStatus.INDEXED.value,
+                    from_fh,
+                    1024,
+                ),
+            )
+        conn.commit()
+        client = _make_mock_client()
+
+        async def _copy(synapse_client, source_association, **kwargs):
+            return source_association["fileHandleId"] + "_new"
+
+        with (
+            patch(f"{MODULE}.multipart_copy_async", new=AsyncMock(side_effect=_copy)),
+            patch(
+                f"{MODULE}._migrate_table_attached_files_async", new=AsyncMock()
+            ) as mock_send,
+        ):
+            await asyncio.wait_for(
+                _execute_migration_async(
+                    conn=conn,
+                    cursor=cursor,
+                    dest_storage_location_id="99",
+                    create_table_snapshots=False,
+                    continue_on_error=False,
+                    synapse_client=client,
+                ),
+                timeout=5,
+            )
+
+        mock_send.assert_awaited_once()
+        assert sorted(
+            (key.row_id, key.col_id, to_fh)
+            for key, to_fh in mock_send.await_args.kwargs["cells"]
+        ) == [(row_id, col_id, f"{from_fh}_new") for row_id, col_id, from_fh in cells]
+        rows = cursor.execute(
+            "SELECT status, to_file_handle_id FROM migrations ORDER BY row_id, col_id"
+        ).fetchall()
+        assert rows == [
+            (MigrationStatus.MIGRATED.value, f"{from_fh}_new")
+            for _, _, from_fh in cells
+        ]
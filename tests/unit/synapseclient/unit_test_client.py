@@ -9,6 +9,7 @@ import logging
 import os
 import tempfile
 import typing
+import urllib.parse as urllib_parse
 import urllib.request as urllib_request
 import uuid
 from copy import deepcopy
@@ -63,6 +64,7 @@ from synapseclient.core.logging_setup import (
     SILENT_LOGGER_NAME,
 )
 from synapseclient.core.models.dict_object import DictObject
+from synapseclient.core.transfer_scheduler import TransferPolicy
 from synapseclient.core.upload import upload_functions
 from synapseclient.evaluation import Submission, SubmissionStatus
 
@@ -2418,6 +2420,56 @@ class TestRestCalls:
         assert self._rest_call_auth_test(auth=auth) is auth
 
 
+class TestGetPaginated:
+    """Verifies the behavior of _GET_paginated on the synapse client."""
+
+    @pytest.fixture(autouse=True, scope="function")
+    def init_syn(self, syn: Synapse) -> None:
+        self.syn = syn
+        self.items = [{"id": i} for i in range(95)]
+        self.include_total = True
+        self.truncate_at = {}
+        self.requested_offsets = []
+
+        def rest_get(uri):
+            query = urllib_parse.parse_qs(urllib_parse.urlparse(uri).query)
+            limit = int(query["limit"][0])
+            offset = int(query["offset"][0])
+            self.requested_offsets.append(offset)
+            page = self.items[offset : offset + self.truncate_at.get(offset, limit)]
+            response = {"results": page}
+            if self.include_total:
+                response["totalNumberOfResults"] = len(self.items)
+            return response
+
+        with patch.object(self.syn, "restGET", side_effect=rest_get):
+            yield
+
+    def test_concurrent_results_are_yielded_in_order(self) -> None:
+        # WHEN all pages are requested concurrently
+        results = list(self.syn._GET_paginated("/teamMembers/1", concurrent=True))
+
+        # THEN every page up to the total number of results is requested once
+        assert sorted(self.requested_offsets) == list(range(0, 95, 20))
+        # AND the items are the same as when the pages are requested in sequence
+        assert results == self.items
+        assert results == list(self.syn._GET_paginated("/teamMembers/1"))
+
+    def test_truncated_pages_are_completed(self) -> None:
+        # GIVEN a page that the service truncates and no total number of results
+        self.truncate_at[45] = 7
+        self.include_total = False
+
+        # WHEN all pages are requested concurrently starting at an offset
+        results = list(
+            self.syn._GET_paginated("/teamMembers/1", offset=5, concurrent=True)
+        )
+
+        # THEN every item from the offset is yielded once
+        assert results == self.items[5:]
+        assert 52 in self.requested_offsets
+
+
 class TestSetAnnotations:
     @pytest.fixture(autouse=True, scope="function")
     def init_syn(self, syn: Synapse) -> None:
@@ -2566,6 +2618,56 @@ def test_transfer_config_values_overridable(mock_config_dict: MagicMock) -> None
     assert syn.use_boto_sts_transfers
 
 
+@patch("synapseclient.api.configuration_services.get_config_section_dict")
+def test_transfer_policy_config(mock_config_dict: MagicMock) -> None:
+    """Verify reading transfer.transfer_policy from synapseConfig"""
+    mock_config_dict.return_value = {}
+    syn = Synapse(skip_checks=True, cache_client=False)
+    assert TransferPolicy.FIFO == syn.transfer_policy
+
+    mock_config_dict.return_value = {"transfer_policy": "FAIR"}
+    syn = Synapse(skip_checks=True, cache_client=False)
+    assert TransferPolicy.FAIR == syn.transfer_policy
+
+    # changing the policy applies to schedulers that were already created
+    scheduler = syn._get_transfer_scheduler(asyncio_event_loop=MagicMock())
+    syn.transfer_policy = "fifo"
+    assert TransferPolicy.FIFO == scheduler.policy
+
+    mock_config_dict.return_value = {"transfer_policy": "largest_first"}
+    with pytest.raises(ValueError):
+        Synapse(skip_checks=True, cache_client=False)
+
+
+@patch("synapseclient.api.configuration_services.get_config_section_dict")
+def test_bandwidth_limit_config(mock_config_dict: MagicMock) -> None:
+    """Verify reading the transfer bandwidth limits from synapseConfig"""
+    mock_config_dict.return_value = {}
+    syn = Synapse(skip_checks=True, cache_client=False)
+    assert syn.max_upload_bytes_per_second is None
+    assert syn.max_download_bytes_per_second is None
+    assert syn.max_bytes_per_second is None
+
+    mock_config_dict.return_value = {
+        "max_upload_bytes_per_second": "100",
+        "max_download_bytes_per_second": "200",
+        "max_bytes_per_second": "300",
+    }
+    syn = Synapse(skip_checks=True, cache_client=False)
+    assert 100 == syn.max_upload_bytes_per_second
+    assert 200 == syn.max_download_bytes_per_second
+    assert 300 == syn.max_bytes_per_second
+
+    # the limits can be changed at run time
+    syn.max_bytes_per_second = None
+    assert syn._bandwidth_limiter.combined.bytes_per_second is None
+
+    for invalid_value in ("fast", "0", "-5"):
+        mock_config_dict.return_value = {"max_bytes_per_second": invalid_value}
+        with pytest.raises(ValueError):
+            Synapse(skip_checks=True, cache_client=False)
+
+
 def test_store_needs_upload_false_file_handle_id_not_in_local_state(
     syn: Synapse,
 ) -> None:
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import uuid
 from unittest.mock import call, patch
@@ -6,6 +7,8 @@ import pytest
 
 import synapseclient
 import synapseutils
+from synapseclient.core.constants import concrete_types
+from synapseclient.models import File, FileHandle, Folder
 from synapseutils.copy_functions import (
     _batch_iterator_generator,
     _copy_file_handles_batch,
@@ -519,3 +522,194 @@ class TestCopy:
             # Normally this would be the destination project entity - But because the
             # `get` method is mocked, the `store` method is called with the same entity.
             patch_store.assert_called_once_with(self.project_entity)
+
+
+class TestCopyAsync:
+    """Test the concurrent copy engine built on the models layer"""
+
+    @pytest.fixture(autouse=True, scope="function")
+    def init_syn(self, syn):
+        self.syn = syn
+
+    @pytest.fixture(scope="function", autouse=True)
+    def setup_method(self):
+        # syn1 is a folder holding syn2 and the sub folder syn3 which holds syn4
+        self.entities = {
+            "syn1": {
+                "id": "syn1",
+                "name": "top",
+                "concreteType": concrete_types.FOLDER_ENTITY,
+            },
+            "syn2": {
+                "id": "syn2",
+                "name": "a.txt",
+                "concreteType": concrete_types.FILE_ENTITY,
+            },
+            "syn3": {
+                "id": "syn3",
+                "name": "sub",
+                "concreteType": concrete_types.FOLDER_ENTITY,
+            },
+            "syn4": {
+                "id": "syn4",
+                "name": "b.txt",
+                "concreteType": concrete_types.FILE_ENTITY,
+            },
+        }
+        self.children = {"syn1": ["syn2", "syn3"], "syn3": ["syn4"]}
+        self.permissions = {"canDownload": True}
+        self.copy_requests = []
+        self.stored = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _patches(self, owner_id="999"):
+        entities = self.entities
+
+        async def get_entity(entity_id, version_number=None, *, synapse_client=None):
+            return entities[entity_id]
+
+        async def get_children(parent=None, include_types=None, *, synapse_client=None):
+            for child_id in self.children.get(parent, []):
+                yield {"id": child_id}
+
+        async def get_child(entity_name, parent_id=None, *, synapse_client=None):
+            return None
+
+        async def get_user_profile_by_id(id=None, *, synapse_client=None):
+            return {"ownerId": owner_id}
+
+        async def rest_get_async(uri, **kwargs):
+            if uri.endswith("/permissions"):
+                return self.permissions
+            return {"results": []}
+
+        async def rest_post_async(uri, body=None, endpoint=None, **kwargs):
+            request = json.loads(body)
+            self.copy_requests.append(request)
+            return {
+                "copyResults": [
+                    {
+                        "originalFileHandleId": r["originalFile"]["fileHandleId"],
+                        "newFileHandle": {
+                            "id": "copy_" + r["originalFile"]["fileHandleId"]
+                        },
+                    }
+                    for r in request["copyRequests"]
+                ]
+            }
+
+        async def get_file(file, include_activity=False, *, synapse_client=None):
+            file.name = entities[file.id]["name"]
+            file.version_number = 1
+            file.data_file_handle_id = "fh_" + file.id
+            file.file_handle = FileHandle(
+                id=file.data_file_handle_id,
+                created_by="222",
+                content_type="text/plain",
+                file_name=file.name,
+            )
+            return file
+
+        async def get_folder(folder, *, synapse_client=None):
+            folder.name = entities[folder.id]["name"]
+            return folder
+
+        async def store(entity, parent=None, *, synapse_client=None):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0)
+            self.in_flight -= 1
+            entity.id = "new_%s" % len(self.stored)
+            self.stored.append(entity)
+            return entity
+
+        module = "synapseutils.copy_functions"
+        return [
+            patch(f"{module}.get_entity", new=get_entity),
+            patch(f"{module}.get_children", new=get_children),
+            patch(f"{module}.get_child", new=get_child),
+            patch(f"{module}.get_user_profile_by_id", new=get_user_profile_by_id),
+            patch.object(self.syn, "rest_get_async", new=rest_get_async),
+            patch.object(self.syn, "rest_post_async", new=rest_post_async),
+            patch.object(File, "get_async", new=get_file),
+            patch.object(File, "store_async", new=store),
+            patch.object(Folder, "get_async", new=get_folder),
+            patch.object(Folder, "store_async", new=store),
+        ]
+
+    async def _copy(self, owner_id="999", **kwargs):
+        patches = self._patches(owner_id=owner_id)
+        for p in patches:
+            p.start()
+        try:
+            return await synapseutils.copy_async(
+                self.syn, "syn1", "syn100", skipCopyWikiPage=True, **kwargs
+            )
+        finally:
+            for p in patches:
+                p.stop()
+
+    async def test_file_handles_are_copied_in_one_batch_across_folders(self):
+        with patch("synapseutils.copy_functions.MAX_FILE_HANDLE_PER_COPY_REQUEST", 100):
+            mapping = await self._copy()
+
+        assert len(self.copy_requests) == 1
+        copied = [
+            r["originalFile"]["fileHandleId"]
+            for r in self.copy_requests[0]["copyRequests"]
+        ]
+        assert sorted(copied) == ["fh_syn2", "fh_syn4"]
+        new_files = {f.name: f for f in self.stored if isinstance(f, File)}
+        assert new_files["a.txt"].data_file_handle_id == "copy_fh_syn2"
+        assert new_files["b.txt"].activity.used[0].target_id == "syn4"
+        new_ids = {f.name: f.id for f in self.stored}
+        assert mapping == {
+            "syn1": new_ids["top"],
+            "syn2": new_ids["a.txt"],
+            "syn3": new_ids["sub"],
+            "syn4": new_ids["b.txt"],
+        }
+        assert new_files["b.txt"].parent_id == new_ids["sub"]
+
+    async def test_batches_are_split_at_the_service_limit(self):
+        with patch("synapseutils.copy_functions.MAX_FILE_HANDLE_PER_COPY_REQUEST", 1):
+            mapping = await self._copy()
+
+        assert len(self.copy_requests) == 2
+        assert len(mapping) == 4
+
+    async def test_file_handles_owned_by_the_user_are_reused(self):
+        mapping = await self._copy(owner_id="222", setProvenance=None)
+
+        assert self.copy_requests == []
+        new_files = [f for f in self.stored if isinstance(f, File)]
+        assert sorted(f.data_file_handle_id for f in new_files) == [
+            "fh_syn2",
+            "fh_syn4",
+        ]
+        assert all(f.activity is None for f in new_files)
+        assert len(mapping) == 4
+
+    async def test_entities_are_created_with_bounded_parallelism(self):
+        self.children["syn1"] = ["syn%s" % i for i in range(10, 30)]
+        for i in range(10, 30):
+            self.entities["syn%s" % i] = {
+                "id": "syn%s" % i,
+                "name": "%s.txt" % i,
+                "concreteType": concrete_types.FILE_ENTITY,
+            }
+
+        with patch.object(synapseclient.Synapse, "max_threads", new=1):
+            mapping = await self._copy(owner_id="222")
+
+        assert len(mapping) == 21
+        assert self.max_in_flight <= 2
+
+    async def test_entities_without_download_permission_are_not_copied(self):
+        self.permissions = {"canDownload": False}
+
+        mapping = await self._copy()
+
+        assert mapping == {}
+        assert self.stored == []
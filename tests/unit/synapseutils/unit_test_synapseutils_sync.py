@@ -1173,6 +1173,20 @@ async def test_manifest_upload(syn: Synapse) -> None:
 
 
 class TestSyncUploader:
+    @pytest.fixture(scope="function", autouse=True)
+    def mock_create_activity(self):
+        created = []
+
+        async def create_activity(request, synapse_client=None):
+            created.append(request)
+            return {**request, "id": f"act{len(created)}", "etag": "etag"}
+
+        with patch(
+            "synapseclient.models.activity.create_activity",
+            side_effect=create_activity,
+        ) as self.mock_create_activity:
+            yield
+
     @patch("os.path.isfile")
     def test_order_items(self, mock_isfile: MagicMock, syn: Synapse) -> None:
         """Verfy that items are properly ordered according to their provenance."""
@@ -1400,6 +1414,29 @@ class TestSyncUploader:
             i.entity.store_async.assert_called_once()
             assert i.entity.path in paths
 
+    async def test_upload_shares_identical_activities(self, syn: Synapse) -> None:
+        """Files with identical provenance are linked to one Activity that is
+        created once."""
+        items = []
+        for i, used in enumerate([[SYN_123], [SYN_123], [SYN_123, GITHUB_URL]]):
+            entity = File(path=f"/tmp/file{i}", parent_id=SYN_123)
+            entity.store_async = AsyncMock(return_value=entity)
+            items.append(
+                _SyncUploadItem(
+                    entity=entity,
+                    used=used,
+                    executed=[],
+                    activity_name="analysis",
+                    activity_description=None,
+                )
+            )
+
+        await _SyncUploader(syn).upload(items)
+
+        assert self.mock_create_activity.call_count == 2
+        assert [item.entity.activity.id for item in items] == ["act1", "act1", "act2"]
+        assert items[0].entity.activity is not items[1].entity.activity
+
 
 class TestGetFileEntityProvenanceDict:
     """
@@ -3,8 +3,10 @@ from unittest.mock import patch
 
 import pytest
 
+import synapseclient.api.entity_services as entity_services
 import synapseutils
-from synapseutils.walk_functions import _help_walk, walk
+from synapseclient.core.constants.concrete_types import FILE_ENTITY, FOLDER_ENTITY
+from synapseutils.walk_functions import _help_walk, _help_walk_concurrently, walk
 
 
 def test_help_walk_not_container(syn):
@@ -129,3 +131,66 @@ def test_walk_include_types(syn):
             syn=syn, syn_id="syn123", include_types=["file", "folder"]
         )
         assert results == "test"
+
+
+def test_walk_max_concurrency(syn):
+    """Test that walk uses the concurrent helper when maxConcurrency is set"""
+    with patch.object(
+        synapseutils.walk_functions, "_help_walk_concurrently", return_value="test"
+    ) as mock_help_walk:
+        results = walk(syn=syn, synId="syn123", includeTypes=["file"], maxConcurrency=5)
+        mock_help_walk.assert_called_once_with(
+            syn=syn,
+            syn_id="syn123",
+            include_types=["file", "folder"],
+            max_concurrency=5,
+            ordered=True,
+        )
+        assert results == "test"
+
+
+def test_help_walk_concurrently_matches_help_walk(syn):
+    """Test that the concurrent walk has the same output as the sequential walk"""
+    entity = {
+        "id": "syn123",
+        "concreteType": "org.sagebionetworks.repo.model.Project",
+        "name": "parent_folder",
+    }
+    tree = {
+        "syn123": [
+            {"id": "syn2222", "type": FILE_ENTITY, "name": "test_file"},
+            {"id": "syn124", "type": FOLDER_ENTITY, "name": "test_folder"},
+        ],
+        "syn124": [{"id": "syn22223", "type": FILE_ENTITY, "name": "test_file_2"}],
+    }
+
+    async def mock_get_children(parent, **kwargs):
+        for child in tree[parent]:
+            yield child
+
+    with (
+        patch.object(syn, "get", return_value=entity) as mock_syn_get,
+        patch.object(
+            syn,
+            "getChildren",
+            side_effect=lambda syn_id, include_types: iter(tree[syn_id]),
+        ),
+        patch.object(
+            entity_services, "get_children", side_effect=mock_get_children
+        ) as mock_get_children_async,
+    ):
+        expected = list(
+            _help_walk(syn=syn, syn_id="syn123", include_types=["folder", "file"])
+        )
+        result = list(
+            _help_walk_concurrently(
+                syn=syn,
+                syn_id="syn123",
+                include_types=["folder", "file"],
+                max_concurrency=2,
+            )
+        )
+
+        assert result == expected
+        assert mock_syn_get.call_count == 2
+        assert mock_get_children_async.call_count == 2